@@ -0,0 +1,6 @@
+"""
+메모짱 성능 벤치마크 모음
+
+각 벤치마크는 임시 SQLite 데이터베이스를 만들어 실행하며, 프로젝트 루트에서
+`python -m benchmarks.<모듈 이름>` 형태로 실행합니다.
+"""
@@ -0,0 +1,79 @@
+"""
+벤치마크용 Django 초기화 도우미
+"""
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup(db_path, migrate=True, database=None):
+    """지정한 SQLite 파일을 기본 데이터베이스로 사용하도록 Django를 초기화합니다.
+
+    database에 딕셔너리를 넘기면 DATABASES["default"]의 해당 항목을 덮어씁니다.
+    """
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "memojjang.settings")
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = str(db_path)
+    settings.DATABASES["default"].update(database or {})
+    settings.DEBUG = False
+    # DEBUG가 꺼져 있으면 ALLOWED_HOSTS가 비어 있을 때 모든 요청이 거부된다
+    settings.ALLOWED_HOSTS = ["testserver", "localhost", "127.0.0.1"]
+    django.setup()
+    if migrate:
+        from django.core.management import call_command
+        call_command("migrate", verbosity=0)
+
+
+def create_user(username):
+    """벤치마크용 사용자를 만들거나 가져옵니다."""
+    from django.contrib.auth import get_user_model
+
+    user_model = get_user_model()
+    user, _ = user_model.objects.get_or_create(
+        username=username,
+        defaults={"email": f"{username}@example.com"},
+    )
+    return user
+
+
+def create_users(prefix, count, password, **extra):
+    """같은 비밀번호를 쓰는 벤치마크 사용자 여러 명을 한 번의 해싱으로 만듭니다."""
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    user_model = get_user_model()
+    usernames = [f"{prefix}{i}" for i in range(count)]
+    existing = set(user_model.objects.filter(username__in=usernames).values_list("username", flat=True))
+    password_hash = make_password(password)
+    user_model.objects.bulk_create([
+        user_model(username=name, email=f"{name}@example.com", password=password_hash, **extra)
+        for name in usernames
+        if name not in existing
+    ])
+    users = user_model.objects.in_bulk(usernames, field_name="username")
+    return [users[name] for name in usernames]
+
+
+def seed_memos(user, count, content_size=200, batch_size=1000):
+    """bulk_create로 사용자에게 합성 메모를 채웁니다."""
+    from django.db import transaction
+    from memojjang.apps.memos.models import Memo, summarize
+
+    line = "메모짱 벤치마크 본문입니다. "
+    content = (line * (content_size // len(line) + 1))[:content_size]
+    # bulk_create는 save()를 거치지 않으므로 모든 메모에 같은 요약을 미리 계산해 넣는다
+    summary = summarize(content)
+    with transaction.atomic():
+        for start in range(0, count, batch_size):
+            size = min(batch_size, count - start)
+            Memo.objects.bulk_create([
+                Memo(user=user, title=f"벤치마크 메모 {start + i}", content=content, **summary)
+                for i in range(size)
+            ])
@@ -0,0 +1,80 @@
+"""
+벤치마크 결과 집계와 기준값 비교 도우미
+"""
+import json
+import statistics
+
+
+def percentile(values, percent):
+    """정렬하지 않은 값 목록의 백분위수 (선형 보간)"""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def summarize(latencies, elapsed, **extra):
+    """요청별 지연 시간(초)과 전체 경과 시간으로 한 시나리오의 결과를 만듭니다."""
+    result = {
+        "requests": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+    }
+    result.update(extra)
+    return result
+
+
+def save(path, data):
+    """결과를 JSON 파일로 저장합니다."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+
+
+def load(path):
+    """JSON 결과 파일을 읽습니다."""
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare(baseline, current, tolerance=0.25, min_delta_ms=1.0):
+    """두 결과의 시나리오별 지표를 비교해 회귀 목록을 반환합니다.
+
+    지연 시간(p95)은 tolerance 비율과 min_delta_ms를 모두 넘게 늘어나면,
+    처리량은 tolerance 비율을 넘게 줄어들면, 쿼리 수는 한 개라도 늘어나면 회귀로 본다.
+    """
+    regressions = []
+    for name, before in baseline["scenarios"].items():
+        after = current["scenarios"].get(name)
+        if after is None:
+            continue
+        delta = after["p95_ms"] - before["p95_ms"]
+        if delta > before["p95_ms"] * tolerance and delta > min_delta_ms:
+            regressions.append(f"{name}: p95 {before['p95_ms']:.2f}ms -> {after['p95_ms']:.2f}ms")
+        if after["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: 처리량 {before['throughput_rps']:.1f} -> {after['throughput_rps']:.1f} req/s"
+            )
+        if before.get("queries") is not None and after.get("queries") is not None:
+            if after["queries"] > before["queries"]:
+                regressions.append(f"{name}: 쿼리 수 {before['queries']} -> {after['queries']}")
+    return regressions
+
+
+def print_table(data):
+    """시나리오별 결과를 표로 출력합니다."""
+    print(
+        f"{'scenario':<26}{'req':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'req/s':>9}{'queries':>9}{'alloc KB':>10}"
+    )
+    for name, result in data["scenarios"].items():
+        queries = result.get("queries")
+        alloc = result.get("peak_alloc_kb")
+        print(
+            f"{name:<26}{result['requests']:>6}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+            f"{result['p99_ms']:>9.2f}{result['throughput_rps']:>9.1f}"
+            f"{'-' if queries is None else queries:>9}{'-' if alloc is None else f'{alloc:.0f}':>10}"
+        )
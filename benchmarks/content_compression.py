@@ -0,0 +1,146 @@
+"""
+메모 본문 압축 저장 벤치마크
+
+코덱마다 별도 자식 프로세스와 SQLite 파일을 써서 본문 크기별로 메모를 저장하고,
+데이터베이스 파일 크기(그중 검색 인덱스 memos_fts가 차지하는 크기)와 저장/조회 지연
+시간을 측정합니다. "raw"는 압축하지 않는 기준값입니다.
+
+    python -m benchmarks.content_compression --sizes 1000 100000 1000000 --rows 50
+"""
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from . import _django
+
+
+def make_content(size, seed):
+    """압축률이 실제 로그와 비슷하도록 값이 조금씩 다른 로그 줄로 본문을 만듭니다."""
+    rng = random.Random(seed)
+    lines = []
+    length = 0
+    while length < size:
+        line = (
+            f"2026-10-18 09:{rng.randrange(60):02d}:{rng.randrange(60):02d} "
+            f"{rng.choice(['INFO', 'WARN', 'ERROR'])} worker-{rng.randrange(8)} "
+            f"요청 id={rng.getrandbits(64):016x} 처리 시간 {rng.randrange(2000)}ms\n"
+        )
+        lines.append(line)
+        length += len(line.encode("utf-8"))
+    return "".join(lines).encode("utf-8")[:size].decode("utf-8", "ignore")
+
+
+def database_size(connection):
+    """WAL을 체크포인트한 뒤 데이터베이스 파일의 사용 중인 크기(바이트)"""
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        cursor.execute("PRAGMA page_count")
+        page_count = cursor.fetchone()[0]
+        cursor.execute("PRAGMA freelist_count")
+        free_count = cursor.fetchone()[0]
+        cursor.execute("PRAGMA page_size")
+        page_size = cursor.fetchone()[0]
+    return (page_count - free_count) * page_size
+
+
+def search_index_size(connection):
+    """검색 인덱스(memos_fts와 그 섀도 테이블)가 차지하는 크기(바이트)"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name LIKE 'memos_fts%'")
+        return cursor.fetchone()[0]
+
+
+def run_worker(db_path, codec, sizes, rows):
+    """자식 프로세스: 한 코덱으로 본문 크기별 저장/조회 시간과 DB 크기 증가량을 출력합니다."""
+    _django.setup(db_path)
+    from django.conf import settings
+    from django.db import connection
+    from memojjang.apps.memos.models import Memo
+
+    if codec == "raw":
+        settings.MEMO_CONTENT_COMPRESS_THRESHOLD = float("inf")
+    else:
+        settings.MEMO_CONTENT_CODEC = codec
+    user = _django.create_user("compression")
+    results = []
+    for size in sizes:
+        contents = [make_content(size, seed) for seed in range(rows)]
+        before = database_size(connection)
+        fts_before = search_index_size(connection)
+        writes = []
+        ids = []
+        for index, content in enumerate(contents):
+            started = time.perf_counter()
+            memo = Memo.objects.create(user=user, title=f"압축 {size} {index}", content=content)
+            writes.append(time.perf_counter() - started)
+            ids.append(memo.pk)
+        growth = database_size(connection) - before
+        fts_growth = search_index_size(connection) - fts_before
+
+        reads = []
+        for pk in ids:
+            started = time.perf_counter()
+            len(Memo.objects.get(pk=pk).content)
+            reads.append(time.perf_counter() - started)
+        results.append({
+            "size": size,
+            "db_bytes": growth,
+            "fts_bytes": fts_growth,
+            "write_ms": statistics.median(writes) * 1000,
+            "read_ms": statistics.median(reads) * 1000,
+        })
+    print(json.dumps(results))
+
+
+def measure(db_path, codec, sizes, rows):
+    """자식 프로세스에서 한 코덱을 측정해 결과를 반환합니다."""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.content_compression", "--worker",
+         "--db", str(db_path), "--codecs", codec, "--rows", str(rows),
+         "--sizes", *[str(size) for size in sizes]],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=_django.BASE_DIR,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메모 본문 압축 저장 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000, 50000, 500000, 2000000])
+    parser.add_argument("--rows", type=int, default=20, help="본문 크기마다 저장할 메모 수")
+    parser.add_argument("--codecs", nargs="+", default=["raw", "zlib", "lzma", "bz2"])
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.db, args.codecs[0], args.sizes, args.rows)
+        return
+
+    print(
+        f"{'codec':<7}{'size':>10}{'DB/memo (KB)':>15}{'FTS/memo (KB)':>15}{'ratio':>8}"
+        f"{'write p50 (ms)':>16}{'read p50 (ms)':>15}"
+    )
+    raw_bytes = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec in args.codecs:
+            for result in measure(Path(tmp) / f"{codec}.sqlite3", codec, args.sizes, args.rows):
+                per_memo = result["db_bytes"] / args.rows
+                raw_bytes.setdefault(result["size"], per_memo)
+                ratio = per_memo / raw_bytes[result["size"]] if raw_bytes[result["size"]] else 0
+                print(
+                    f"{codec:<7}{result['size']:>10}{per_memo / 1024:>15.1f}"
+                    f"{result['fts_bytes'] / args.rows / 1024:>15.1f}{ratio:>8.2f}"
+                    f"{result['write_ms']:>16.2f}{result['read_ms']:>15.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
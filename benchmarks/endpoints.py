@@ -0,0 +1,647 @@
+"""
+메모짱 엔드포인트 벤치마크
+
+사용자 여러 명에게 합성 메모를 bulk insert로 채운 뒤, memojjang/urls.py의 모든 URL을
+시나리오로 호출해 p50/p95/p99 지연 시간, 처리량, 쿼리 수, 메모리를 측정합니다.
+
+- run: 프로세스 안의 테스트 클라이언트로 시나리오를 순서대로 실행합니다.
+- load: 로컬 HTTP 서버(또는 --url로 지정한 서버)에 여러 스레드로 동시에 요청합니다.
+- compare: 두 결과 JSON을 비교해 회귀가 있으면 0이 아닌 코드로 종료합니다.
+
+    python -m benchmarks.endpoints seed --db bench.sqlite3 --memos 1000000 --users 1000
+    python -m benchmarks.endpoints run --db bench.sqlite3 --output current.json --baseline baseline.json
+    python -m benchmarks.endpoints load --db bench.sqlite3 --concurrency 8 --output http.json
+    python -m benchmarks.endpoints compare baseline.json current.json
+"""
+import argparse
+import itertools
+import json
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.cookiejar import CookieJar
+from pathlib import Path
+from . import _django, _results
+
+PASSWORD = "bench-Password-2026"
+USER_PREFIX = "bench_user_"
+ADMIN_USERNAME = "bench_admin"
+# 태그 필터 시나리오가 쓰는 태그 (측정 사용자의 메모 절반에 붙임)
+BENCH_TAG = "bench"
+# 이력 시나리오용 메모에 쌓아 두는 수정 이력 수
+REVISION_EDITS = 10
+
+
+class Request:
+    """시나리오 한 번이 보내는 요청"""
+
+    def __init__(self, method, path, data=None, json_body=None):
+        self.method = method
+        self.path = path
+        self.data = data
+        self.json_body = json_body
+
+
+class Scenario:
+    """벤치마크 시나리오
+
+    client는 요청을 보낼 클라이언트 종류(anonymous, user, admin, session)이며,
+    session은 매 요청 전에 다시 로그인하는 클라이언트입니다(로그아웃 측정용).
+    """
+
+    def __init__(self, name, url_name, client, build, expect=(200,)):
+        self.name = name
+        self.url_name = url_name
+        self.client = client
+        self.build = build
+        self.expect = expect
+
+
+class Context:
+    """시나리오들이 함께 쓰는 벤치마크 데이터"""
+
+    def __init__(self, user, admin, memo_ids, delete_ids, restore_ids, job_id, revision_memo_id,
+                 next_cursor, run_id):
+        self.user = user
+        self.admin = admin
+        self.memo_ids = memo_ids
+        self.delete_ids = delete_ids
+        self.restore_ids = restore_ids
+        self.job_id = job_id
+        self.revision_memo_id = revision_memo_id
+        self.next_cursor = next_cursor
+        self.run_id = run_id
+
+    def memo_id(self, index):
+        """반복 번호에 따라 돌아가며 사용할 메모 id"""
+        return self.memo_ids[index % len(self.memo_ids)]
+
+
+def url(name, *args):
+    from django.urls import reverse
+
+    return reverse(name, args=args)
+
+
+SCENARIOS = [
+    Scenario("home", "home", "anonymous", lambda ctx, i: Request("GET", url("home"))),
+    Scenario("login_form", "login", "anonymous", lambda ctx, i: Request("GET", url("login"))),
+    Scenario(
+        "login", "login", "anonymous",
+        lambda ctx, i: Request("POST", url("login"), {"username": ctx.user.username, "password": PASSWORD}),
+        expect=(302,),
+    ),
+    Scenario("logout", "logout", "session", lambda ctx, i: Request("GET", url("logout")), expect=(302,)),
+    Scenario("register_form", "register", "anonymous", lambda ctx, i: Request("GET", url("register"))),
+    Scenario(
+        "register", "register", "anonymous",
+        lambda ctx, i: Request("POST", url("register"), {
+            "username": f"bench_reg_{ctx.run_id}_{i}",
+            "email": f"bench_reg_{ctx.run_id}_{i}@example.com",
+            "password1": PASSWORD,
+            "password2": PASSWORD,
+        }),
+        expect=(302,),
+    ),
+    Scenario("memo_list", "memo_list", "user", lambda ctx, i: Request("GET", url("memo_list"))),
+    Scenario(
+        "memo_list_next_page", "memo_list", "user",
+        lambda ctx, i: Request("GET", f"{url('memo_list')}?after={ctx.next_cursor}"),
+    ),
+    Scenario(
+        "memo_list_tag", "memo_list", "user",
+        lambda ctx, i: Request("GET", f"{url('memo_list')}?tag={BENCH_TAG}"),
+    ),
+    Scenario(
+        "memo_search", "memo_search", "user",
+        lambda ctx, i: Request("GET", f"{url('memo_search')}?q=" + urllib.parse.quote("벤치마크 본문")),
+    ),
+    Scenario(
+        "memo_export", "memo_export", "user",
+        lambda ctx, i: Request("GET", f"{url('memo_export')}?format=ndjson"),
+    ),
+    Scenario("memo_create_form", "memo_create", "user", lambda ctx, i: Request("GET", url("memo_create"))),
+    Scenario(
+        "memo_create", "memo_create", "user",
+        lambda ctx, i: Request("POST", url("memo_create"), {"title": f"새 메모 {i}", "content": "벤치마크 작성"}),
+        expect=(302,),
+    ),
+    Scenario(
+        "memo_detail", "memo_detail", "user",
+        lambda ctx, i: Request("GET", url("memo_detail", ctx.memo_id(i))),
+    ),
+    Scenario(
+        "memo_edit_form", "memo_edit", "user",
+        lambda ctx, i: Request("GET", url("memo_edit", ctx.memo_id(i))),
+    ),
+    Scenario(
+        "memo_edit", "memo_edit", "user",
+        lambda ctx, i: Request("POST", url("memo_edit", ctx.memo_id(i)), {
+            "title": f"수정된 메모 {i}",
+            "content": "벤치마크 수정",
+        }),
+        expect=(302,),
+    ),
+    Scenario(
+        "memo_delete_form", "memo_delete", "user",
+        lambda ctx, i: Request("GET", url("memo_delete", ctx.memo_id(i))),
+    ),
+    Scenario(
+        "memo_delete", "memo_delete", "user",
+        lambda ctx, i: Request("POST", url("memo_delete", ctx.delete_ids.pop())),
+        expect=(302,),
+    ),
+    Scenario("memo_trash", "memo_trash", "user", lambda ctx, i: Request("GET", url("memo_trash"))),
+    Scenario(
+        "memo_restore", "memo_restore", "user",
+        lambda ctx, i: Request("POST", url("memo_restore", ctx.restore_ids.pop())),
+        expect=(302,),
+    ),
+    Scenario(
+        "memo_history", "memo_history", "user",
+        lambda ctx, i: Request("GET", url("memo_history", ctx.revision_memo_id)),
+    ),
+    Scenario(
+        "memo_revision", "memo_revision", "user",
+        lambda ctx, i: Request("GET", url("memo_revision", ctx.revision_memo_id, i % REVISION_EDITS + 1)),
+    ),
+    Scenario(
+        "memo_revision_restore", "memo_revision_restore", "user",
+        lambda ctx, i: Request("POST", url("memo_revision_restore", ctx.revision_memo_id, i % REVISION_EDITS + 1)),
+        expect=(302,),
+    ),
+    Scenario(
+        "memo_export_job", "memo_export_job", "user",
+        lambda ctx, i: Request("POST", url("memo_export_job"), {"format": "zip"}),
+        expect=(302,),
+    ),
+    Scenario("job_detail", "job_detail", "user", lambda ctx, i: Request("GET", url("job_detail", ctx.job_id))),
+    Scenario(
+        "api_job_detail", "api_job_detail", "user",
+        lambda ctx, i: Request("GET", url("api_job_detail", ctx.job_id)),
+    ),
+    Scenario(
+        "memo_export_download", "memo_export_download", "user",
+        lambda ctx, i: Request("GET", url("memo_export_download", ctx.job_id)),
+    ),
+    Scenario("api_memo_list", "api_memo_list", "user", lambda ctx, i: Request("GET", url("api_memo_list"))),
+    Scenario(
+        "api_memo_retrieve", "api_memo_retrieve", "user",
+        lambda ctx, i: Request("GET", url("api_memo_retrieve", ctx.memo_id(i))),
+    ),
+    Scenario(
+        "api_memo_batch", "api_memo_batch", "user",
+        lambda ctx, i: Request("POST", url("api_memo_batch"), json_body={
+            "update": [{"id": ctx.memo_id(i + n), "title": f"API 수정 {i}"} for n in range(10)],
+        }),
+    ),
+    Scenario("admin_index", "admin:index", "admin", lambda ctx, i: Request("GET", url("admin:index"))),
+    Scenario(
+        "admin_memo_changelist", "admin:memos_memo_changelist", "admin",
+        lambda ctx, i: Request("GET", url("admin:memos_memo_changelist")),
+    ),
+]
+
+
+def uncovered_urls():
+    """시나리오가 호출하지 않는 memojjang/urls.py의 URL 이름 목록"""
+    from memojjang import urls
+
+    covered = {scenario.url_name for scenario in SCENARIOS}
+    missing = []
+    for pattern in urls.urlpatterns:
+        name = getattr(pattern, "name", None) or f"{getattr(pattern, 'namespace', '')}:index"
+        if name not in covered:
+            missing.append(name)
+    return missing
+
+
+def seed(memos, users, content_size):
+    """벤치마크 사용자와 메모를 채우고 (메모 수, 사용자 수)를 반환합니다.
+
+    이미 채워진 DB면 새로 채우지 않고 기존 데이터의 규모를 반환합니다.
+    """
+    from django.contrib.auth import get_user_model
+    from memojjang.apps.memos.models import Memo
+
+    user_model = get_user_model()
+    if user_model.objects.filter(username=f"{USER_PREFIX}0").exists():
+        memos = Memo.objects.count()
+        users = user_model.objects.filter(username__startswith=USER_PREFIX).count()
+        print(f"기존 데이터 사용: 사용자 {users}명, 메모 {memos}건")
+        return memos, users
+    started = time.perf_counter()
+    bench_users = _django.create_users(USER_PREFIX, users, PASSWORD)
+    _django.create_users(ADMIN_USERNAME, 1, PASSWORD, is_staff=True, is_superuser=True)
+    per_user, extra = divmod(memos, users)
+    for index, user in enumerate(bench_users):
+        _django.seed_memos(user, per_user + (extra if index == 0 else 0), content_size)
+    print(f"시드 완료: 사용자 {users}명, 메모 {memos}건 ({time.perf_counter() - started:.1f}s)")
+    return memos, users
+
+
+def build_context(delete_count):
+    """측정 대상 사용자와 시나리오에 쓸 메모 id를 준비합니다."""
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone as django_timezone
+    from memojjang.apps.jobs.queue import enqueue
+    from memojjang.apps.jobs.worker import Worker
+    from memojjang.apps.memos import tags
+    from memojjang.apps.memos.models import Memo, summarize
+    from memojjang.apps.memos.pagination import paginate_keyset
+
+    user_model = get_user_model()
+    user = user_model.objects.get(username=f"{USER_PREFIX}0")
+    admin = user_model.objects.get(username=f"{ADMIN_USERNAME}0")
+    memo_ids = list(Memo.objects.filter(user=user).values_list("id", flat=True)[:200])
+    content = "삭제할 벤치마크 메모"
+    deletable = Memo.objects.bulk_create([
+        Memo(user=user, title=f"삭제용 메모 {i}", content=content, **summarize(content))
+        for i in range(delete_count)
+    ])
+    deleted_at = django_timezone.now()
+    restorable = Memo.objects.bulk_create([
+        Memo(user=user, title=f"복원용 메모 {i}", content=content, deleted_at=deleted_at, **summarize(content))
+        for i in range(delete_count)
+    ])
+    for memo in Memo.objects.filter(pk__in=memo_ids[::2]):
+        tags.set_memo_tags(memo, [BENCH_TAG])
+    # 이력 시나리오가 쓸, 수정 이력이 REVISION_EDITS개 쌓인 메모
+    revision_memo = Memo.objects.create(user=user, title="이력용 메모", content=content)
+    for number in range(2, REVISION_EDITS + 1):
+        revision_memo.content = f"{content}\n수정 {number}"
+        revision_memo.save_versioned(["content"])
+    # 상태 조회와 내려받기 시나리오가 쓸 완료된 내보내기 작업 (현재 프로세스에서 실행)
+    job = enqueue("memos.export", {"user_id": user.pk, "format": "ndjson"}, user=user)
+    Worker(concurrency=0).run(burst=True)
+    next_cursor = paginate_keyset(Memo.objects.filter(user=user)).next_cursor or ""
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    return Context(
+        user, admin, memo_ids,
+        [memo.pk for memo in deletable], [memo.pk for memo in restorable],
+        job.pk, revision_memo.pk, next_cursor, run_id,
+    )
+
+
+class ClientDriver:
+    """프로세스 안에서 장고 테스트 클라이언트로 요청을 보내는 드라이버"""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+
+    def client(self, kind):
+        from django.test import Client
+
+        client = Client()
+        if kind in ("user", "session"):
+            client.force_login(self.ctx.user)
+        elif kind == "admin":
+            client.force_login(self.ctx.admin)
+        return client
+
+    def login(self, client):
+        client.force_login(self.ctx.user)
+
+    def send(self, client, request):
+        if request.json_body is not None:
+            response = client.post(request.path, json.dumps(request.json_body), content_type="application/json")
+        elif request.method == "POST":
+            response = client.post(request.path, request.data)
+        else:
+            response = client.get(request.path)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response.status_code
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """리다이렉트를 따라가지 않고 3xx 응답을 그대로 돌려받는 처리기"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpDriver:
+    """HTTP 서버에 실제 요청을 보내는 드라이버 (클라이언트마다 별도 쿠키 저장소)"""
+
+    def __init__(self, ctx, base_url):
+        self.ctx = ctx
+        self.base_url = base_url.rstrip("/")
+
+    def client(self, kind):
+        jar = CookieJar()
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar), _NoRedirect())
+        opener.jar = jar
+        # CSRF 쿠키를 받기 위해 로그인 페이지를 먼저 연다
+        self.send(opener, Request("GET", url("login")))
+        if kind in ("user", "session"):
+            self.login(opener)
+        elif kind == "admin":
+            self.login(opener, self.ctx.admin.username)
+        return opener
+
+    def login(self, opener, username=None):
+        self.send(opener, Request("POST", url("login"), {
+            "username": username or self.ctx.user.username,
+            "password": PASSWORD,
+        }))
+
+    def send(self, opener, request):
+        headers = {}
+        body = None
+        csrf_token = next((cookie.value for cookie in opener.jar if cookie.name == "csrftoken"), "")
+        if request.json_body is not None:
+            body = json.dumps(request.json_body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        elif request.method == "POST":
+            body = urllib.parse.urlencode(request.data or {}).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        if request.method == "POST":
+            headers["X-CSRFToken"] = csrf_token
+        http_request = urllib.request.Request(
+            self.base_url + request.path, data=body, headers=headers, method=request.method
+        )
+        try:
+            with opener.open(http_request) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as exc:
+            exc.read()
+            return exc.code
+
+
+def run_scenario(driver, scenario, ctx, requests, warmup, concurrency):
+    """시나리오를 concurrency개 스레드로 requests번 실행하고 지연 시간을 측정합니다."""
+    counter = itertools.count()
+    clients = [driver.client(scenario.client) for _ in range(concurrency)]
+    for client in clients[:1] * warmup:
+        if scenario.client == "session":
+            driver.login(client)
+        driver.send(client, scenario.build(ctx, next(counter)))
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency + 1)
+    remaining = itertools.count()
+
+    def worker(client):
+        barrier.wait()
+        while next(remaining) < requests:
+            index = next(counter)
+            if scenario.client == "session":
+                driver.login(client)
+            request = scenario.build(ctx, index)
+            started = time.perf_counter()
+            status = driver.send(client, request)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if status not in scenario.expect:
+                    errors.append(status)
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        futures = [executor.submit(worker, client) for client in clients]
+        barrier.wait()
+        started = time.perf_counter()
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed, errors, clients[0], counter
+
+
+def measure_client(scenario, ctx, requests, warmup):
+    """프로세스 안에서 시나리오를 측정하고 한 번 더 실행해 쿼리 수와 메모리를 기록합니다."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    driver = ClientDriver(ctx)
+    latencies, elapsed, errors, client, counter = run_scenario(driver, scenario, ctx, requests, warmup, 1)
+    if scenario.client == "session":
+        driver.login(client)
+    request = scenario.build(ctx, next(counter))
+    tracemalloc.start()
+    with CaptureQueriesContext(connection) as queries:
+        driver.send(client, request)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return _results.summarize(
+        latencies, elapsed,
+        errors=len(errors),
+        queries=len(queries),
+        peak_alloc_kb=peak / 1024,
+    )
+
+
+def free_port():
+    """비어 있는 로컬 TCP 포트"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path, port):
+    """벤치마크 DB를 쓰는 로컬 HTTP 서버를 자식 프로세스로 띄우고 준비될 때까지 기다립니다."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.endpoints", "serve", "--db", str(db_path), "--port", str(port)],
+        cwd=_django.BASE_DIR,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("벤치마크 서버가 시작되지 않았습니다.")
+
+
+def process_peak_rss(pid):
+    """리눅스에서 자식 프로세스의 최대 RSS(바이트)를 읽습니다. 알 수 없으면 None을 반환합니다."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def peak_rss_bytes():
+    """현재 프로세스의 최대 RSS(바이트)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def serve(db_path, port):
+    """스레드 방식 WSGI 서버로 memojjang을 제공합니다."""
+    _django.setup(db_path, migrate=False)
+    from socketserver import ThreadingMixIn
+    from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+    from django.core.wsgi import get_wsgi_application
+
+    class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+        daemon_threads = True
+        request_queue_size = 128
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    with make_server("127.0.0.1", port, get_wsgi_application(), ThreadingWSGIServer, QuietHandler) as server:
+        server.serve_forever()
+
+
+def selected_scenarios(names):
+    """--scenarios로 고른 시나리오 목록"""
+    if not names:
+        return SCENARIOS
+    unknown = set(names) - {scenario.name for scenario in SCENARIOS}
+    if unknown:
+        raise SystemExit(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+    return [scenario for scenario in SCENARIOS if scenario.name in names]
+
+
+def run(args, db_path):
+    """run/load 명령: 데이터를 준비하고 시나리오를 측정해 결과를 반환합니다."""
+    _django.setup(db_path)
+    import django
+
+    memos, users = seed(args.memos, args.users, args.content_size)
+    scenarios = selected_scenarios(args.scenarios)
+    concurrency = getattr(args, "concurrency", 1)
+    ctx = build_context((args.requests + args.warmup + 1) * concurrency)
+    meta = {
+        "mode": args.command,
+        "memos": memos,
+        "users": users,
+        "requests": args.requests,
+        "concurrency": concurrency,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "uncovered_urls": uncovered_urls(),
+    }
+    results = {}
+    if args.command == "run":
+        for scenario in scenarios:
+            results[scenario.name] = measure_client(scenario, ctx, args.requests, args.warmup)
+        meta["peak_rss_mb"] = peak_rss_bytes() / 2**20
+        return {"meta": meta, "scenarios": results}
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        port = free_port()
+        server = start_server(db_path, port)
+        base_url = f"http://127.0.0.1:{port}"
+    try:
+        driver = HttpDriver(ctx, base_url)
+        for scenario in scenarios:
+            latencies, elapsed, errors, _, _ = run_scenario(
+                driver, scenario, ctx, args.requests, args.warmup, concurrency
+            )
+            results[scenario.name] = _results.summarize(latencies, elapsed, errors=len(errors))
+        if server is not None:
+            rss = process_peak_rss(server.pid)
+            meta["server_peak_rss_mb"] = rss / 2**20 if rss else None
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    return {"meta": meta, "scenarios": results}
+
+
+def report(data, args):
+    """결과를 출력하고 저장한 뒤, 오류나 기준값 대비 회귀가 있으면 True를 반환합니다."""
+    _results.print_table(data)
+    if data["meta"]["uncovered_urls"]:
+        print(f"시나리오가 없는 URL: {', '.join(data['meta']['uncovered_urls'])}")
+    if args.output:
+        _results.save(args.output, data)
+    failed = False
+    for name, result in data["scenarios"].items():
+        if result["errors"]:
+            failed = True
+            print(f"  -> {name}: 예상하지 못한 응답 {result['errors']}건")
+    if args.baseline:
+        regressions = _results.compare(_results.load(args.baseline), data, args.tolerance)
+        for regression in regressions:
+            print(f"  -> 회귀: {regression}")
+        failed = failed or bool(regressions)
+    return failed
+
+
+def add_run_arguments(parser):
+    parser.add_argument("--db", help="벤치마크 SQLite 파일 (생략하면 임시 파일에 새로 시드)")
+    parser.add_argument("--memos", type=int, default=10000, help="시드할 전체 메모 수")
+    parser.add_argument("--users", type=int, default=10, help="메모를 나눠 가질 사용자 수")
+    parser.add_argument("--content-size", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200, help="시나리오마다 측정할 요청 수")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--scenarios", nargs="+", help="실행할 시나리오 이름 (생략하면 전체)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용하는 성능 저하 비율")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메모짱 엔드포인트 벤치마크")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="벤치마크 데이터만 채웁니다.")
+    seed_parser.add_argument("--db", required=True)
+    seed_parser.add_argument("--memos", type=int, default=10000)
+    seed_parser.add_argument("--users", type=int, default=10)
+    seed_parser.add_argument("--content-size", type=int, default=500)
+
+    add_run_arguments(commands.add_parser("run", help="프로세스 안의 테스트 클라이언트로 측정합니다."))
+    load_parser = commands.add_parser("load", help="HTTP 서버에 동시 요청으로 측정합니다.")
+    add_run_arguments(load_parser)
+    load_parser.add_argument("--concurrency", type=int, default=8)
+    load_parser.add_argument("--url", help="이미 실행 중인 서버 주소 (생략하면 로컬 서버를 띄움)")
+
+    compare_parser = commands.add_parser("compare", help="두 결과 JSON을 비교합니다.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--tolerance", type=float, default=0.25)
+
+    serve_parser = commands.add_parser("serve", help=argparse.SUPPRESS)
+    serve_parser.add_argument("--db", required=True)
+    serve_parser.add_argument("--port", type=int, required=True)
+    args = parser.parse_args()
+
+    if args.command == "seed":
+        _django.setup(args.db)
+        seed(args.memos, args.users, args.content_size)
+    elif args.command == "serve":
+        serve(args.db, args.port)
+    elif args.command == "compare":
+        regressions = _results.compare(_results.load(args.baseline), _results.load(args.current), args.tolerance)
+        for regression in regressions:
+            print(f"회귀: {regression}")
+        print("회귀 없음" if not regressions else f"회귀 {len(regressions)}건")
+        sys.exit(1 if regressions else 0)
+    elif args.db:
+        sys.exit(1 if report(run(args, Path(args.db)), args) else 0)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            sys.exit(1 if report(run(args, Path(tmp) / "bench.sqlite3"), args) else 0)
+
+
+if __name__ == "__main__":
+    main()
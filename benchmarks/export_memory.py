@@ -0,0 +1,101 @@
+"""
+메모 스트리밍 내보내기 메모리 벤치마크
+
+행 수가 다른 사용자들을 준비한 뒤, 사용자마다 별도 자식 프로세스에서 내보내기를
+끝까지 소비하고 그 프로세스의 최대 RSS를 측정합니다. 내보내기가 일정한 메모리로
+스트리밍된다면 행 수가 늘어나도 최대 RSS는 거의 변하지 않아야 합니다.
+
+    python -m benchmarks.export_memory --rows 1000 10000 100000
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from . import _django
+
+def peak_rss_bytes():
+    """현재 프로세스의 최대 RSS(바이트)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB 단위로 보고한다
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_worker(db_path, username, export_format):
+    """자식 프로세스: 한 사용자의 내보내기를 끝까지 소비하고 결과를 JSON으로 출력합니다."""
+    _django.setup(db_path, migrate=False)
+    from memojjang.apps.memos import export
+
+    user = _django.create_user(username)
+    started = time.perf_counter()
+    total_bytes = 0
+    for chunk in export.stream(export.get_format(export_format), export.export_rows(user)):
+        total_bytes += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "peak_rss": peak_rss_bytes(),
+        "bytes": total_bytes,
+        "seconds": elapsed,
+    }))
+
+
+def measure(db_path, username, export_format):
+    """자식 프로세스에서 내보내기를 실행해 측정값을 반환합니다."""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.export_memory", "--worker",
+         "--db", str(db_path), "--user", username, "--format", export_format],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=_django.BASE_DIR,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메모 내보내기 최대 RSS 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--formats", nargs="+", default=["ndjson", "csv", "zip"])
+    parser.add_argument("--content-size", type=int, default=500)
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="가장 작은 행 수 대비 허용하는 최대 RSS 증가 비율")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    parser.add_argument("--user", help=argparse.SUPPRESS)
+    parser.add_argument("--format", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.db, args.user, args.format)
+        return
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.sqlite3"
+        _django.setup(db_path)
+        rows = sorted(args.rows)
+        for count in rows:
+            _django.seed_memos(_django.create_user(f"export_{count}"), count, args.content_size)
+
+        print(f"{'format':<8}{'rows':>10}{'peak RSS (MB)':>16}{'output (MB)':>14}{'rows/s':>12}")
+        for export_format in args.formats:
+            baseline = None
+            for count in rows:
+                result = measure(db_path, f"export_{count}", export_format)
+                peak = result["peak_rss"]
+                baseline = baseline or peak
+                print(
+                    f"{export_format:<8}{count:>10}{peak / 2**20:>16.1f}"
+                    f"{result['bytes'] / 2**20:>14.1f}{count / result['seconds']:>12.0f}"
+                )
+                if peak - baseline > baseline * args.tolerance:
+                    failed = True
+                    print(f"  -> 최대 RSS가 {(peak - baseline) / 2**20:.1f}MB 증가했습니다.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
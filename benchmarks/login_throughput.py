@@ -0,0 +1,119 @@
+"""
+로그인 처리량 벤치마크 (비밀번호 해싱 풀 작업자 수별)
+
+동시 로그인 스레드가 authenticate()를 반복해 부르는 동안, 해싱 풀 작업자 수를 바꿔 가며
+초당 로그인 수와 로그인 지연 시간, 풀 포화로 거절된 요청 수를 측정합니다. 같은 시간 동안
+가벼운 DB 조회를 반복하는 탐침 스레드의 지연 시간도 함께 재서 해싱이 다른 요청을
+얼마나 밀어내는지 보여 줍니다.
+
+    python -m benchmarks.login_throughput --workers 1 2 4 8 --clients 16 --duration 5
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+from . import _django
+from ._results import percentile
+
+PASSWORD = "bench-Password-2026"
+
+
+def run_logins(usernames, duration, probe_user_id):
+    """동시 로그인과 탐침 조회를 duration초 동안 실행하고 결과를 반환합니다."""
+    from django.contrib.auth import authenticate, get_user_model
+    from django.db import connection
+    from memojjang.apps.users.hashing import HashingPoolFull
+
+    user_model = get_user_model()
+    latencies = []
+    probe_latencies = []
+    counts = {"ok": 0, "rejected": 0, "failed": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def login_client(username):
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    user = authenticate(username=username, password=PASSWORD)
+                except HashingPoolFull:
+                    outcome = "rejected"
+                else:
+                    outcome = "ok" if user is not None else "failed"
+                elapsed = time.perf_counter() - started
+                with lock:
+                    counts[outcome] += 1
+                    if outcome == "ok":
+                        latencies.append(elapsed)
+                if outcome == "rejected":
+                    # 실제 클라이언트처럼 Retry-After만큼은 아니어도 잠깐 물러난다
+                    time.sleep(0.01)
+        finally:
+            connection.close()
+
+    def probe():
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                user_model.objects.filter(pk=probe_user_id).exists()
+                probe_latencies.append(time.perf_counter() - started)
+                time.sleep(0.005)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=login_client, args=(name,)) for name in usernames]
+    threads.append(threading.Thread(target=probe))
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "logins_per_s": counts["ok"] / elapsed,
+        "rejected": counts["rejected"],
+        "failed": counts["failed"],
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "probe_p95_ms": percentile(probe_latencies, 95) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그인 처리량 벤치마크")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="해싱 풀 작업자 수")
+    parser.add_argument("--clients", type=int, default=16, help="동시 로그인 스레드 수")
+    parser.add_argument("--queue-limit", type=int, default=16, help="해싱 풀 대기열 한도")
+    parser.add_argument("--duration", type=float, default=5.0, help="작업자 수마다 측정할 시간(초)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _django.setup(Path(tmp) / "login.sqlite3")
+        from django.conf import settings
+        from memojjang.apps.users import hashing
+
+        users = _django.create_users("login_user_", args.clients, PASSWORD)
+        usernames = [user.username for user in users]
+        print(f"clients={args.clients} queue_limit={args.queue_limit} duration={args.duration}s")
+        print(
+            f"{'workers':>8}{'logins/s':>10}{'rejected':>10}{'p50 ms':>9}{'p95 ms':>9}"
+            f"{'probe p95 ms':>14}"
+        )
+        for workers in args.workers:
+            settings.MEMO_HASHING_WORKERS = workers
+            settings.MEMO_HASHING_QUEUE_LIMIT = args.queue_limit
+            hashing.reset_pool()
+            result = run_logins(usernames, args.duration, users[0].pk)
+            print(
+                f"{workers:>8}{result['logins_per_s']:>10.1f}{result['rejected']:>10}"
+                f"{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}{result['probe_p95_ms']:>14.2f}"
+            )
+        hashing.reset_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+메모 수정 이력 저장 공간 벤치마크
+
+큰 메모 하나를 만들고 몇 줄씩 고치는 수정을 반복하면서, 수정 한 번마다 늘어나는 이력
+저장 크기를 매번 본문 전체(압축)를 복사하는 방식과 비교합니다. 가장 오래 걸린 이력
+복원 시간도 함께 측정합니다.
+
+    python -m benchmarks.revision_storage --size 200000 --edits 200
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from . import _django
+from .content_compression import make_content
+
+
+def edit(content, rng, lines_changed):
+    """본문에서 임의의 줄 몇 개를 고치거나 새 줄을 끼워 넣습니다."""
+    lines = content.splitlines(keepends=True)
+    for _ in range(lines_changed):
+        index = rng.randrange(len(lines))
+        if rng.random() < 0.8:
+            lines[index] = f"수정된 줄 {rng.getrandbits(32):08x}\n"
+        else:
+            lines.insert(index, f"추가된 줄 {rng.getrandbits(32):08x}\n")
+    return "".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메모 수정 이력 저장 공간 벤치마크")
+    parser.add_argument("--size", type=int, default=100000, help="메모 본문 크기(UTF-8 바이트)")
+    parser.add_argument("--edits", type=int, default=100, help="반복할 수정 횟수")
+    parser.add_argument("--lines", type=int, default=3, help="수정 한 번에 고치는 줄 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _django.setup(Path(tmp) / "revisions.sqlite3")
+        from django.conf import settings
+        from memojjang.apps.memos import compression, revisions
+        from memojjang.apps.memos.models import Memo, MemoRevision
+
+        rng = random.Random(0)
+        user = _django.create_user("revisions")
+        memo = Memo.objects.create(user=user, title="이력 벤치마크", content=make_content(args.size, 0))
+        full_copy = len(compression.encode(memo.content))
+        writes = []
+        for _ in range(args.edits):
+            memo.content = edit(memo.content, rng, args.lines)
+            full_copy += len(compression.encode(memo.content))
+            started = time.perf_counter()
+            memo.save_versioned(["content"])
+            writes.append(time.perf_counter() - started)
+
+        rebuild_times = []
+        for revision in MemoRevision.objects.filter(memo=memo).defer("data"):
+            started = time.perf_counter()
+            revisions.rebuild(MemoRevision.objects.get(pk=revision.pk))
+            rebuild_times.append(time.perf_counter() - started)
+        stored = revisions.storage_bytes([memo.pk])
+        count = MemoRevision.objects.filter(memo=memo).count()
+        snapshots = MemoRevision.objects.filter(memo=memo, kind=MemoRevision.Kind.SNAPSHOT).count()
+
+    revisions_per_run = args.edits + 1
+    print(f"본문 {args.size} B, 수정 {args.edits}회 (수정마다 {args.lines}줄), "
+          f"스냅숏 간격 {settings.MEMO_REVISION_SNAPSHOT_INTERVAL}")
+    print(f"{'':<16}{'total (KB)':>12}{'per edit (KB)':>15}")
+    print(f"{'full copy':<16}{full_copy / 1024:>12.1f}{full_copy / revisions_per_run / 1024:>15.2f}")
+    print(f"{'snapshot+delta':<16}{stored / 1024:>12.1f}{stored / revisions_per_run / 1024:>15.2f}")
+    print(f"이력 {count}건 (스냅숏 {snapshots}건), 절감 {1 - stored / full_copy:.1%}")
+    print(f"저장 p50 {sorted(writes)[len(writes) // 2] * 1000:.2f} ms, "
+          f"복원 최대 {max(rebuild_times) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
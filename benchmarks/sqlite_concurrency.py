@@ -0,0 +1,107 @@
+"""
+SQLite 동시 쓰기 벤치마크
+
+여러 프로세스가 동시에 "목록 조회 후 메모 작성" 트랜잭션을 반복하며, 기본 SQLite 설정
+(롤백 저널, DEFERRED 트랜잭션, 요청마다 새 연결)과 운영 프로파일(settings.DATABASES:
+WAL, PRAGMA, BEGIN IMMEDIATE, 연결 재사용)의 쓰기 처리량과 잠금 오류 비율을 비교합니다.
+
+    python -m benchmarks.sqlite_concurrency --workers 8 --transactions 200
+"""
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+from . import _django
+
+# 장고 기본값과 같은 SQLite 설정
+BASELINE_DATABASE = {
+    "CONN_MAX_AGE": 0,
+    "CONN_HEALTH_CHECKS": False,
+    "OPTIONS": {},
+}
+
+
+def worker(db_path, database, transactions, username, results):
+    """자식 프로세스: 요청 하나를 흉내 낸 쓰기 트랜잭션을 반복합니다."""
+    _django.setup(db_path, migrate=False, database=database)
+    from django.db import OperationalError, close_old_connections, transaction
+    from memojjang.apps.memos.models import Memo
+
+    user = _django.create_user(username)
+    committed = locked = 0
+    started = time.perf_counter()
+    for i in range(transactions):
+        # 요청 시작/종료 때 장고가 하는 것처럼 오래된 연결을 정리한다
+        close_old_connections()
+        try:
+            with transaction.atomic():
+                Memo.objects.filter(user=user).count()
+                Memo.objects.create(user=user, title=f"동시성 메모 {i}", content="내용")
+            committed += 1
+        except OperationalError as exc:
+            if "locked" not in str(exc):
+                raise
+            locked += 1
+    close_old_connections()
+    results.put((committed, locked, time.perf_counter() - started))
+
+
+def run_profile(name, database, args):
+    """한 프로파일로 벤치마크를 실행하고 결과를 출력합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.sqlite3"
+        context = multiprocessing.get_context("spawn")
+        setup_process = context.Process(target=_migrate, args=(db_path, database, args.workers))
+        setup_process.start()
+        setup_process.join()
+
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=worker,
+                args=(db_path, database, args.transactions, f"writer_{i}", results),
+            )
+            for i in range(args.workers)
+        ]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        outcomes = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+    committed = sum(outcome[0] for outcome in outcomes)
+    locked = sum(outcome[1] for outcome in outcomes)
+    attempts = committed + locked
+    print(
+        f"{name:<10}{committed:>10}{locked:>10}{locked / attempts:>12.1%}"
+        f"{committed / elapsed:>14.0f}"
+    )
+    return committed / elapsed, locked / attempts
+
+
+def _migrate(db_path, database, workers):
+    """벤치마크용 데이터베이스를 만들고 사용자를 준비합니다."""
+    _django.setup(db_path, database=database)
+    for i in range(workers):
+        _django.create_user(f"writer_{i}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 동시 쓰기 벤치마크")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--transactions", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10}{'commits':>10}{'locked':>10}{'lock rate':>12}{'commits/s':>14}")
+    baseline_rate, baseline_errors = run_profile("baseline", BASELINE_DATABASE, args)
+    tuned_rate, tuned_errors = run_profile("tuned", {}, args)
+    print(f"처리량 {tuned_rate / baseline_rate:.1f}배, 잠금 오류 {baseline_errors:.1%} -> {tuned_errors:.1%}")
+    sys.exit(0 if tuned_errors <= baseline_errors else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """작업 상태와 마지막 오류(트레이스백)를 확인하는 관리자 화면"""
+
+    list_display = ("id", "task", "status", "attempts", "max_attempts", "user", "created_at", "finished_at")
+    list_filter = ("status", "task")
+    list_select_related = ("user",)
+    readonly_fields = ("attempts", "locked_by", "result", "error", "created_at", "updated_at", "finished_at")
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "memojjang.apps.jobs"
+    verbose_name = "백그라운드 작업"
+
+    def ready(self):
+        """각 앱의 jobs 모듈을 불러와 작업 함수를 등록합니다."""
+        autodiscover_modules("jobs")
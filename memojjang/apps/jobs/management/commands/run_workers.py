@@ -0,0 +1,65 @@
+import signal
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...registry import task_names
+from ...worker import Worker
+
+
+class Command(BaseCommand):
+    """jobs 테이블의 작업을 프로세스 풀에서 실행하는 워커 명령
+
+    별도 브로커 없이 데이터베이스만으로 동작한다. SIGTERM/SIGINT를 받으면 새 작업을
+    더 가져가지 않고 실행 중인 작업이 끝난 뒤 종료한다.
+    """
+
+    help = "백그라운드 작업 큐(jobs 테이블)의 작업을 프로세스 풀에서 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=getattr(settings, "MEMO_JOB_CONCURRENCY", 2),
+            help="동시에 실행할 작업 수(자식 프로세스 수). 0이면 현재 프로세스에서 한 건씩 실행합니다.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "MEMO_JOB_POLL_INTERVAL", 1.0),
+            help="큐가 비었을 때 다시 확인하는 간격(초)",
+        )
+        parser.add_argument(
+            "--visibility-timeout",
+            type=int,
+            default=getattr(settings, "MEMO_JOB_VISIBILITY_TIMEOUT", 300),
+            help="응답 없는 워커의 작업을 다른 워커가 다시 가져가기까지의 시간(초)",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="지금 실행할 수 있는 작업이 없으면 종료합니다.",
+        )
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 0 or options["poll_interval"] <= 0 or options["visibility_timeout"] < 1:
+            raise CommandError(
+                "--concurrency는 0 이상, --poll-interval과 --visibility-timeout은 0보다 커야 합니다."
+            )
+        worker = Worker(
+            concurrency=options["concurrency"],
+            poll_interval=options["poll_interval"],
+            visibility_timeout=options["visibility_timeout"],
+            log=self.stdout.write if options["verbosity"] > 1 else None,
+        )
+        self.stdout.write(
+            f"워커 {worker.worker_id} 시작 (동시 실행 {options['concurrency']}, "
+            f"작업: {', '.join(task_names()) or '없음'})"
+        )
+        previous = {sig: signal.signal(sig, worker.stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            stats = worker.run(burst=options["burst"])
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+        self.stdout.write(self.style.SUCCESS(
+            f"워커 종료: 완료 {stats['succeeded']}건, 재시도 예정 {stats['retried']}건, 실패 {stats['failed']}건"
+        ))
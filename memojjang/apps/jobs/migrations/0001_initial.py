@@ -0,0 +1,44 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:46
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.TextField(verbose_name='작업 이름')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='인자')),
+                ('status', models.TextField(choices=[('queued', '대기'), ('running', '실행 중'), ('succeeded', '완료'), ('failed', '실패')], default='queued', verbose_name='상태')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='시도 횟수')),
+                ('max_attempts', models.PositiveIntegerField(default=3, verbose_name='최대 시도 횟수')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='실행 가능 일시')),
+                ('locked_by', models.TextField(blank=True, default='', verbose_name='실행 중인 워커')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='결과')),
+                ('error', models.TextField(blank=True, default='', verbose_name='마지막 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일시')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='종료일시')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to=settings.AUTH_USER_MODEL, verbose_name='요청한 사용자')),
+            ],
+            options={
+                'verbose_name': '작업',
+                'verbose_name_plural': '작업 목록',
+                'db_table': 'jobs',
+                'ordering': ['-id'],
+                'indexes': [models.Index(condition=models.Q(('status__in', ['queued', 'running'])), fields=['run_after', 'id'], name='jobs_ready_idx')],
+            },
+        ),
+    ]
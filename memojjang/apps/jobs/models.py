@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from .registry import get_task
+
+
+class Job(models.Model):
+    """백그라운드 작업 모델
+
+    요청 안에서 끝낼 수 없는 무거운 작업을 기록해 두면 run_workers 명령이
+    가져가 실행합니다. 별도 브로커 없이 이 테이블 하나가 큐 역할을 합니다.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "대기"
+        RUNNING = "running", "실행 중"
+        SUCCEEDED = "succeeded", "완료"
+        FAILED = "failed", "실패"
+
+    # 아직 끝나지 않아 워커가 가져갈 수 있는 상태
+    ACTIVE_STATUSES = (Status.QUEUED, Status.RUNNING)
+
+    task = models.TextField(
+        verbose_name="작업 이름"
+    )
+    payload = models.JSONField(
+        verbose_name="인자",
+        default=dict,
+        blank=True
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        verbose_name="요청한 사용자",
+        on_delete=models.CASCADE,
+        related_name="jobs",
+        null=True,
+        blank=True
+    )
+    status = models.TextField(
+        verbose_name="상태",
+        choices=Status.choices,
+        default=Status.QUEUED
+    )
+    attempts = models.PositiveIntegerField(
+        verbose_name="시도 횟수",
+        default=0
+    )
+    max_attempts = models.PositiveIntegerField(
+        verbose_name="최대 시도 횟수",
+        default=3
+    )
+    # 대기 중이면 실행할 수 있는 시각, 실행 중이면 가시성 제한 시간이 끝나는 시각.
+    # 워커가 응답 없이 이 시각을 넘기면 다른 워커가 작업을 다시 가져간다
+    run_after = models.DateTimeField(
+        verbose_name="실행 가능 일시",
+        default=timezone.now
+    )
+    locked_by = models.TextField(
+        verbose_name="실행 중인 워커",
+        blank=True,
+        default=""
+    )
+    result = models.JSONField(
+        verbose_name="결과",
+        null=True,
+        blank=True
+    )
+    error = models.TextField(
+        verbose_name="마지막 오류",
+        blank=True,
+        default=""
+    )
+    created_at = models.DateTimeField(
+        verbose_name="생성일시",
+        auto_now_add=True
+    )
+    updated_at = models.DateTimeField(
+        verbose_name="수정일시",
+        auto_now=True
+    )
+    finished_at = models.DateTimeField(
+        verbose_name="종료일시",
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        """작업 모델의 메타데이터"""
+        db_table = "jobs"
+        ordering = ["-id"]
+        indexes = [
+            # 워커가 가져갈 작업을 찾는 인덱스 (끝나지 않은 작업만)
+            models.Index(
+                fields=["run_after", "id"],
+                name="jobs_ready_idx",
+                condition=Q(status__in=["queued", "running"])
+            ),
+        ]
+        verbose_name = "작업"
+        verbose_name_plural = "작업 목록"
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status not in self.ACTIVE_STATUSES
+
+    @property
+    def result_url(self):
+        """작업이 끝난 뒤 결과를 받을 수 있는 URL (작업 종류가 제공할 때만)"""
+        if self.status != self.Status.SUCCEEDED:
+            return None
+        task = get_task(self.task)
+        if task is None or task.result_url is None:
+            return None
+        return task.result_url(self)
@@ -0,0 +1,26 @@
+"""
+프로세스 풀의 자식 프로세스에서 실행되는 함수
+
+spawn으로 시작한 자식 프로세스는 장고를 설정하기 전에 이 모듈을 불러오므로,
+여기서는 모델을 불러오는 모듈을 import하지 않는다.
+"""
+import signal
+from django.db import close_old_connections
+from .registry import run_task
+
+
+def init_process():
+    """자식 프로세스를 초기화합니다."""
+    import django
+
+    # Ctrl+C는 부모가 받아 정상 종료를 진행하므로 자식은 무시한다
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    django.setup()
+
+
+def execute_in_process(task_name, payload):
+    """작업을 실행하고, 오래되거나 깨진 DB 연결을 정리합니다."""
+    try:
+        return run_task(task_name, payload)
+    finally:
+        close_old_connections()
@@ -0,0 +1,177 @@
+"""
+데이터베이스 기반 작업 큐
+
+별도 브로커 없이 jobs 테이블 하나로 작업을 주고받습니다.
+
+- enqueue()가 대기(queued) 행을 추가합니다.
+- 워커는 claim()의 UPDATE ... RETURNING 한 문장으로 실행할 작업을 골라 실행 중(running)으로
+  바꾸면서 가져옵니다. 한 문장이므로 여러 워커가 동시에 호출해도 같은 작업을 두 번 가져가지 않습니다.
+- 실행 중인 작업의 run_after는 가시성 제한 시간이 끝나는 시각입니다. 워커가 죽어 결과를
+  기록하지 못하면 그 시각이 지난 뒤 다른 워커가 다시 가져가고, 살아 있는 워커는 heartbeat()로
+  제한 시간을 연장합니다.
+- 결과 기록(complete/fail)은 작업을 가져간 워커와 시도 번호가 그대로일 때만 반영되므로,
+  제한 시간을 넘겨 다른 워커가 다시 가져간 작업의 결과를 덮어쓰지 않습니다.
+- 실패한 작업은 최대 시도 횟수까지 대기 시간을 두 배씩 늘려 가며 다시 실행합니다.
+"""
+import json
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import Job
+from .registry import UnknownTask, get_task
+
+# 부분 인덱스(jobs_ready_idx)를 쓰려면 조건이 인덱스 정의와 같은 상수여야 하므로
+# 상태 값은 바인딩 인자가 아닌 SQL 리터럴로 넣는다
+_ACTIVE = "status IN ('queued', 'running') AND run_after <= %s"
+
+CLAIM_SQL = (
+    "UPDATE jobs SET status = 'running', attempts = attempts + 1,"
+    " locked_by = %s, run_after = %s, updated_at = %s"
+    " WHERE id IN ("
+    "  SELECT id FROM jobs WHERE " + _ACTIVE + " AND attempts < max_attempts"
+    "  ORDER BY run_after, id LIMIT %s"
+    " )"
+    " RETURNING id, task, payload, attempts, max_attempts"
+)
+
+# 마지막 시도 중에 워커가 사라진 작업은 다시 가져가지 않고 실패로 닫는다
+REAP_SQL = (
+    "UPDATE jobs SET status = 'failed', locked_by = '', error = %s,"
+    " finished_at = %s, updated_at = %s"
+    " WHERE " + _ACTIVE + " AND attempts >= max_attempts"
+)
+
+# 오류 메시지(트레이스백)는 끝부분만 저장한다
+ERROR_MAX_LENGTH = 4000
+
+
+class ClaimedJob:
+    """워커가 가져간 작업 한 건"""
+
+    def __init__(self, id, task, payload, attempts, max_attempts):
+        self.id = id
+        self.task = task
+        self.payload = payload
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+
+    def __repr__(self):
+        return f"<ClaimedJob {self.task} #{self.id} attempt {self.attempts}/{self.max_attempts}>"
+
+
+def get_visibility_timeout():
+    return getattr(settings, "MEMO_JOB_VISIBILITY_TIMEOUT", 300)
+
+
+def _db_time(value):
+    """원시 SQL 인자로 쓸 수 있도록 ORM과 같은 형식으로 일시를 변환합니다."""
+    return connection.ops.adapt_datetimefield_value(value)
+
+
+def _load_payload(value):
+    """원시 SQL로 읽은 JSON 컬럼 값을 파이썬 객체로 변환합니다."""
+    return json.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def enqueue(task, payload=None, user=None, delay=0, max_attempts=None):
+    """작업을 큐에 추가하고 Job을 반환합니다.
+
+    payload는 JSON으로 저장할 수 있어야 하며, delay초가 지난 뒤부터 실행됩니다.
+    """
+    registered = get_task(task)
+    if registered is None:
+        raise UnknownTask(task)
+    if max_attempts is None:
+        max_attempts = registered.max_attempts or getattr(settings, "MEMO_JOB_MAX_ATTEMPTS", 3)
+    return Job.objects.create(
+        task=task,
+        payload=payload or {},
+        user=user,
+        max_attempts=max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+async def aenqueue(task, payload=None, user=None, delay=0, max_attempts=None):
+    """enqueue의 비동기 버전"""
+    return await sync_to_async(enqueue)(
+        task, payload, user=user, delay=delay, max_attempts=max_attempts
+    )
+
+
+def claim(worker_id, limit, visibility_timeout=None):
+    """실행할 수 있는 작업을 최대 limit건 가져와 ClaimedJob 목록으로 반환합니다."""
+    if limit < 1:
+        return []
+    if visibility_timeout is None:
+        visibility_timeout = get_visibility_timeout()
+    now = timezone.now()
+    expires = now + timedelta(seconds=visibility_timeout)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(CLAIM_SQL, [worker_id, _db_time(expires), _db_time(now), _db_time(now), limit])
+        rows = cursor.fetchall()
+    # RETURNING의 행 순서는 보장되지 않으므로 가져온 뒤 정렬한다
+    jobs = [
+        ClaimedJob(pk, task, _load_payload(payload), attempts, max_attempts)
+        for pk, task, payload, attempts, max_attempts in rows
+    ]
+    return sorted(jobs, key=lambda job: job.id)
+
+
+def reap():
+    """제한 시간이 지났는데 더 시도할 수 없는 실행 중 작업을 실패로 닫고 그 수를 반환합니다."""
+    now = _db_time(timezone.now())
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(REAP_SQL, ["작업 시간이 가시성 제한 시간을 넘겼습니다.", now, now, now])
+        return cursor.rowcount
+
+
+def heartbeat(worker_id, job_ids, visibility_timeout=None):
+    """실행 중인 작업의 가시성 제한 시간을 연장합니다."""
+    if not job_ids:
+        return 0
+    if visibility_timeout is None:
+        visibility_timeout = get_visibility_timeout()
+    now = timezone.now()
+    return Job.objects.filter(
+        pk__in=job_ids, status=Job.Status.RUNNING, locked_by=worker_id
+    ).update(run_after=now + timedelta(seconds=visibility_timeout), updated_at=now)
+
+
+def _owned(job, worker_id):
+    """아직 이 워커가 이 시도로 실행 중인 작업만 고르는 쿼리셋"""
+    return Job.objects.filter(
+        pk=job.id, status=Job.Status.RUNNING, locked_by=worker_id, attempts=job.attempts
+    )
+
+
+def complete(job, worker_id, result=None):
+    """작업을 완료로 기록합니다. 다른 워커가 다시 가져간 작업이면 False를 반환합니다."""
+    now = timezone.now()
+    return bool(_owned(job, worker_id).update(
+        status=Job.Status.SUCCEEDED, result=result, error="", locked_by="",
+        finished_at=now, updated_at=now,
+    ))
+
+
+def fail(job, worker_id, error):
+    """실패를 기록하고, 시도 횟수가 남았으면 대기 시간을 두고 다시 대기시킵니다.
+
+    다시 대기시켰으면 True, 최종 실패로 닫았으면 False, 다른 워커가 다시 가져간 작업이면
+    None을 반환합니다.
+    """
+    now = timezone.now()
+    error = error[-ERROR_MAX_LENGTH:]
+    if job.attempts < job.max_attempts:
+        delay = getattr(settings, "MEMO_JOB_RETRY_DELAY", 10) * 2 ** (job.attempts - 1)
+        updated = _owned(job, worker_id).update(
+            status=Job.Status.QUEUED, error=error, locked_by="",
+            run_after=now + timedelta(seconds=delay), updated_at=now,
+        )
+        return True if updated else None
+    updated = _owned(job, worker_id).update(
+        status=Job.Status.FAILED, error=error, locked_by="", finished_at=now, updated_at=now,
+    )
+    return False if updated else None
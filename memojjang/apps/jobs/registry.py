@@ -0,0 +1,55 @@
+"""
+백그라운드 작업 함수 등록소
+
+각 앱의 jobs 모듈에서 @register("이름")으로 작업 함수를 등록합니다. 작업 함수는
+JSON으로 저장된 인자(payload) 딕셔너리 하나를 받아 JSON으로 저장할 수 있는 결과를
+반환하며, 워커 프로세스에서 실행되므로 이름으로 다시 찾을 수 있어야 합니다.
+"""
+
+_tasks = {}
+
+
+class UnknownTask(LookupError):
+    """등록되지 않은 작업 이름"""
+
+
+class Task:
+    """등록된 작업 함수와 그 설정"""
+
+    def __init__(self, name, func, max_attempts=None, result_url=None):
+        self.name = name
+        self.func = func
+        self.max_attempts = max_attempts
+        # 끝난 작업(Job)을 받아 결과를 내려받을 URL을 돌려주는 함수
+        self.result_url = result_url
+
+    def __call__(self, payload):
+        return self.func(payload)
+
+
+def register(name, max_attempts=None, result_url=None):
+    """작업 함수를 이름으로 등록하는 데코레이터를 만듭니다."""
+    def decorator(func):
+        if name in _tasks and _tasks[name].func is not func:
+            raise ValueError(f"작업 이름이 중복되었습니다: {name}")
+        _tasks[name] = Task(name, func, max_attempts=max_attempts, result_url=result_url)
+        return func
+    return decorator
+
+
+def get_task(name):
+    """이름에 해당하는 Task를 반환합니다. 없으면 None을 반환합니다."""
+    return _tasks.get(name)
+
+
+def run_task(name, payload):
+    """등록된 작업 함수 하나를 실행하고 결과를 반환합니다."""
+    task = get_task(name)
+    if task is None:
+        raise UnknownTask(name)
+    return task(payload)
+
+
+def task_names():
+    """등록된 작업 이름 목록"""
+    return sorted(_tasks)
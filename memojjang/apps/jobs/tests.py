@@ -0,0 +1,217 @@
+import io
+import os
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from ..memos import jobs as memo_jobs
+from ..memos.models import Memo
+from . import queue
+from .models import Job
+from .registry import UnknownTask, register
+from .worker import Worker
+
+User = get_user_model()
+
+
+@register("tests.echo")
+def echo_task(payload):
+    """인자를 그대로 돌려주는 테스트용 작업"""
+    return {"echo": payload.get("value")}
+
+
+@register("tests.fail", max_attempts=2)
+def failing_task(payload):
+    """항상 실패하는 테스트용 작업"""
+    raise RuntimeError("작업 실패")
+
+
+@override_settings(MEMO_JOB_RETRY_DELAY=0)
+class JobQueueTest(TestCase):
+    """작업 큐(가져오기, 가시성 제한 시간, 재시도) 테스트"""
+
+    def test_enqueue_unknown_task(self):
+        """등록되지 않은 작업은 큐에 넣을 수 없음"""
+        with self.assertRaises(UnknownTask):
+            queue.enqueue("tests.missing")
+
+    def test_claim_marks_running_once(self):
+        """가져간 작업은 실행 중이 되고 다른 워커가 다시 가져가지 않음"""
+        first = queue.enqueue("tests.echo", {"value": 1})
+        second = queue.enqueue("tests.echo", {"value": 2})
+        delayed = queue.enqueue("tests.echo", delay=60)
+        claimed = queue.claim("worker-a", 10)
+        self.assertEqual([job.id for job in claimed], [first.pk, second.pk])
+        self.assertEqual(claimed[0].payload, {"value": 1})
+        self.assertEqual(claimed[0].attempts, 1)
+        self.assertEqual(queue.claim("worker-b", 10), [])
+        first.refresh_from_db()
+        self.assertEqual(first.status, Job.Status.RUNNING)
+        self.assertEqual(first.locked_by, "worker-a")
+        delayed.refresh_from_db()
+        self.assertEqual(delayed.status, Job.Status.QUEUED)
+
+    def test_visibility_timeout_reclaims(self):
+        """제한 시간이 지나면 다른 워커가 다시 가져가고, 이전 워커의 결과는 무시됨"""
+        job = queue.enqueue("tests.echo")
+        (stale,) = queue.claim("worker-a", 1, visibility_timeout=60)
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now() - timedelta(seconds=1))
+        (fresh,) = queue.claim("worker-b", 1)
+        self.assertEqual(fresh.attempts, 2)
+        self.assertFalse(queue.complete(stale, "worker-a", {"from": "a"}))
+        self.assertTrue(queue.complete(fresh, "worker-b", {"from": "b"}))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result, {"from": "b"})
+
+    def test_heartbeat_extends_timeout(self):
+        """heartbeat가 실행 중인 작업의 제한 시간을 연장"""
+        job = queue.enqueue("tests.echo")
+        queue.claim("worker-a", 1, visibility_timeout=1)
+        self.assertEqual(queue.heartbeat("worker-a", [job.pk], visibility_timeout=600), 1)
+        job.refresh_from_db()
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=500))
+
+    def test_reap_expired_last_attempt(self):
+        """마지막 시도 중 제한 시간이 지난 작업은 실패로 닫힘"""
+        job = queue.enqueue("tests.echo", max_attempts=1)
+        queue.claim("worker-a", 1)
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(queue.claim("worker-b", 1), [])
+        self.assertEqual(queue.reap(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+
+    def test_worker_retries_then_fails(self):
+        """실패한 작업은 최대 시도 횟수까지 재시도한 뒤 실패로 기록"""
+        ok = queue.enqueue("tests.echo", {"value": "안녕"})
+        bad = queue.enqueue("tests.fail")
+        stats = Worker(concurrency=0, poll_interval=0.01).run(burst=True)
+        self.assertEqual(stats, {"succeeded": 1, "retried": 1, "failed": 1})
+        ok.refresh_from_db()
+        bad.refresh_from_db()
+        self.assertEqual(ok.result, {"echo": "안녕"})
+        self.assertEqual(bad.status, Job.Status.FAILED)
+        self.assertEqual(bad.attempts, 2)
+        self.assertIn("작업 실패", bad.error)
+
+    def test_worker_with_pool(self):
+        """풀에서 실행한 작업의 결과를 부모가 기록"""
+        jobs = [queue.enqueue("tests.echo", {"value": i}) for i in range(5)]
+        worker = Worker(concurrency=2, poll_interval=0.01, pool_factory=lambda n: ThreadPoolExecutor(n))
+        self.assertEqual(worker.run(burst=True)["succeeded"], 5)
+        self.assertEqual(
+            [job.result for job in Job.objects.filter(pk__in=[job.pk for job in jobs]).order_by("id")],
+            [{"echo": i} for i in range(5)],
+        )
+
+    def test_run_workers_command(self):
+        """run_workers --burst가 큐를 비우고 종료"""
+        queue.enqueue("tests.echo")
+        out = io.StringIO()
+        call_command("run_workers", "--burst", "--concurrency=0", "--poll-interval=0.01", stdout=out)
+        self.assertIn("완료 1건", out.getvalue())
+        self.assertFalse(Job.objects.exclude(status=Job.Status.SUCCEEDED).exists())
+
+
+class JobViewTest(TestCase):
+    """작업 요청과 상태 확인 뷰 테스트"""
+
+    def setUp(self):
+        """로그인한 사용자와 메모, 결과 파일 디렉터리 준비"""
+        self.user = User.objects.create_user(
+            username="jobuser",
+            email="job@example.com",
+            password="testpassword123"
+        )
+        self.other = User.objects.create_user(
+            username="otherjobuser",
+            email="otherjob@example.com",
+            password="testpassword123"
+        )
+        self.client.force_login(self.user)
+        Memo.objects.create(user=self.user, title="내보낼 메모", content="내보낼 내용")
+        files_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(files_dir.cleanup)
+        settings_override = override_settings(MEMO_JOB_FILES_DIR=files_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_export_job_flow(self):
+        """내보내기 작업을 요청하고 상태를 확인한 뒤 결과를 내려받음"""
+        response = self.client.post(reverse("memo_export_job"), {"format": "zip"})
+        job = Job.objects.get(user=self.user)
+        self.assertRedirects(response, reverse("job_detail", args=[job.pk]))
+
+        response = self.client.get(reverse("job_detail", args=[job.pk]))
+        self.assertEqual(response["Refresh"], "2")
+        data = self.client.get(reverse("api_job_detail", args=[job.pk])).json()
+        self.assertEqual(data["status"], "queued")
+        self.assertIsNone(data["result_url"])
+
+        Worker(concurrency=0).run(burst=True)
+        data = self.client.get(reverse("api_job_detail", args=[job.pk])).json()
+        self.assertEqual(data["status"], "succeeded")
+        download_url = reverse("memo_export_download", args=[job.pk])
+        self.assertEqual(data["result_url"], download_url)
+        response = self.client.get(reverse("job_detail", args=[job.pk]))
+        self.assertFalse(response.has_header("Refresh"))
+        self.assertContains(response, download_url)
+
+        response = self.client.get(download_url)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="memos.zip"')
+        with zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))) as archive:
+            self.assertEqual(len(archive.namelist()), 1)
+
+    def test_pending_export_reused(self):
+        """끝나지 않은 내보내기 작업이 있으면 새로 넣지 않고 그 작업으로 보냄"""
+        first = self.client.post(reverse("memo_export_job"), {"format": "ndjson"})
+        second = self.client.post(reverse("memo_export_job"), {"format": "csv"})
+        job = Job.objects.get(user=self.user)
+        self.assertRedirects(first, reverse("job_detail", args=[job.pk]))
+        self.assertRedirects(second, reverse("job_detail", args=[job.pk]))
+        Worker(concurrency=0).run(burst=True)
+        self.client.post(reverse("memo_export_job"), {"format": "csv"})
+        self.assertEqual(Job.objects.filter(user=self.user).count(), 2)
+
+    def test_expired_export_files_purged(self):
+        """보존 기간이 지난 내보내기 파일은 다음 내보내기와 정리 명령이 지움"""
+        self.client.post(reverse("memo_export_job"), {"format": "ndjson"})
+        Worker(concurrency=0).run(burst=True)
+        path = memo_jobs.export_path(Job.objects.get(user=self.user))
+        expired = time.time() - 25 * 3600
+        os.utime(path, (expired, expired))
+        orphan = path.with_name("orphan.csv.part")
+        orphan.write_text("")
+        os.utime(orphan, (expired, expired))
+
+        self.client.post(reverse("memo_export_job"), {"format": "csv"})
+        Worker(concurrency=0).run(burst=True)
+        self.assertFalse(path.exists())
+        self.assertFalse(orphan.exists())
+        latest = memo_jobs.export_path(Job.objects.filter(user=self.user).first())
+        self.assertTrue(latest.exists())
+
+        out = io.StringIO()
+        call_command("purge_memo_exports", "--retention-hours", "0", stdout=out)
+        self.assertIn("내보내기 파일 1개 삭제", out.getvalue())
+        self.assertFalse(latest.exists())
+
+    def test_invalid_export_format(self):
+        """지원하지 않는 형식은 큐에 넣지 않음"""
+        response = self.client.post(reverse("memo_export_job"), {"format": "exe"})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+    def test_jobs_scoped_to_user(self):
+        """다른 사용자의 작업 상태와 결과는 볼 수 없음"""
+        job = queue.enqueue("memos.export", {"user_id": self.other.pk}, user=self.other)
+        self.assertEqual(self.client.get(reverse("job_detail", args=[job.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("api_job_detail", args=[job.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("memo_export_download", args=[job.pk])).status_code, 404)
@@ -0,0 +1,54 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.views.decorators.http import require_GET
+from ..memos.api import api_login_required
+from .models import Job
+
+# 작업이 끝나지 않았을 때 상태 페이지를 다시 불러오는 간격(초)
+POLL_SECONDS = 2
+
+
+def serialize_job(job):
+    """작업 상태를 JSON으로 직렬화할 수 있는 딕셔너리로 변환합니다."""
+    data = {
+        "id": job.pk,
+        "task": job.task,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "result": job.result,
+        "result_url": job.result_url,
+    }
+    if job.status == Job.Status.FAILED:
+        # 트레이스백은 관리자 화면에서만 보여 주고 사용자에게는 실패 사실만 알린다
+        data["error"] = "작업이 실패했습니다."
+    return data
+
+
+@login_required
+def job_detail(request, pk):
+    """작업 상태 뷰
+
+    작업이 끝날 때까지 일정 간격으로 페이지를 다시 불러오며, 끝나면 결과 링크를 보여 줍니다.
+    """
+    job = get_object_or_404(Job, pk=pk, user=request.user)
+    response = render(request, "jobs/job_detail.html", {"job": job, "poll_seconds": POLL_SECONDS})
+    if not job.is_finished:
+        response["Refresh"] = str(POLL_SECONDS)
+    return response
+
+
+@require_GET
+@api_login_required
+def api_job_detail(request, pk):
+    """작업 상태 API (폴링용)"""
+    job = Job.objects.filter(pk=pk, user=request.user).first()
+    if job is None:
+        return JsonResponse({"error": "작업을 찾을 수 없습니다."}, status=404)
+    response = JsonResponse(serialize_job(job))
+    if not job.is_finished:
+        response["Retry-After"] = str(POLL_SECONDS)
+    return response
@@ -0,0 +1,162 @@
+"""
+작업 큐 워커
+
+부모 프로세스가 큐에서 작업을 가져오고(claim) 결과를 기록하며, 작업 함수는
+프로세스 풀의 자식 프로세스에서 실행합니다. 작업이 CPU를 오래 쓰거나 메모리를 많이
+쓰더라도 부모의 큐 관리와 다른 작업에 영향을 주지 않고, 자식 프로세스가 비정상
+종료하면 풀을 새로 만들어 계속 진행합니다.
+"""
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from . import queue
+from .process import execute_in_process, init_process
+from .registry import run_task
+
+
+def create_process_pool(concurrency):
+    """작업을 실행할 프로세스 풀
+
+    부모가 연 DB 연결과 스레드를 물려받지 않도록 fork 대신 spawn으로 시작한다.
+    """
+    return ProcessPoolExecutor(
+        max_workers=concurrency,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_process,
+    )
+
+
+def format_error(exc):
+    """실패한 작업에 기록할 오류 메시지 (자식 프로세스의 트레이스백 포함)"""
+    return "".join(traceback.format_exception(exc))
+
+
+class Worker:
+    """큐에서 작업을 가져와 실행하고 결과를 기록하는 워커
+
+    concurrency가 0이면 프로세스 풀 없이 현재 프로세스에서 한 건씩 실행한다(디버깅/테스트용).
+    """
+
+    def __init__(self, concurrency=None, poll_interval=None, visibility_timeout=None,
+                 pool_factory=create_process_pool, log=None):
+        if concurrency is None:
+            concurrency = getattr(settings, "MEMO_JOB_CONCURRENCY", 2)
+        self.concurrency = concurrency
+        self.poll_interval = (
+            poll_interval if poll_interval is not None else getattr(settings, "MEMO_JOB_POLL_INTERVAL", 1.0)
+        )
+        self.visibility_timeout = visibility_timeout or queue.get_visibility_timeout()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._pool_factory = pool_factory
+        self._pool = None
+        self._inflight = {}
+        self._last_heartbeat = time.monotonic()
+        self._stopping = False
+        self._log = log or (lambda message: None)
+        self.stats = {"succeeded": 0, "retried": 0, "failed": 0}
+
+    @property
+    def capacity(self):
+        return max(self.concurrency, 1)
+
+    def stop(self, *args):
+        """새 작업을 더 가져가지 않고, 실행 중인 작업이 끝나면 run()을 마칩니다."""
+        self._stopping = True
+
+    def run(self, burst=False):
+        """워커 루프를 실행합니다. burst면 지금 실행할 수 있는 작업이 없을 때 끝냅니다."""
+        try:
+            while not self._stopping:
+                claimed = self.run_once()
+                if burst and not claimed and not self._inflight:
+                    break
+                if not claimed:
+                    self._wait(self.poll_interval)
+            while self._inflight:
+                self._wait(self.poll_interval)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+        return self.stats
+
+    def run_once(self):
+        """끝난 작업을 기록하고 빈 자리만큼 새 작업을 가져와 실행을 시작합니다."""
+        self._collect()
+        self._heartbeat()
+        free = self.capacity - len(self._inflight)
+        if free <= 0 or self._stopping:
+            return []
+        queue.reap()
+        claimed = queue.claim(self.worker_id, free, self.visibility_timeout)
+        for job in claimed:
+            self._log(f"시작: {job!r}")
+            self._inflight[self._submit(job)] = job
+        self._collect()
+        return claimed
+
+    def _submit(self, job):
+        if self.concurrency == 0:
+            future = Future()
+            try:
+                future.set_result(run_task(job.task, job.payload))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        if self._pool is None:
+            self._pool = self._pool_factory(self.concurrency)
+        return self._pool.submit(execute_in_process, job.task, job.payload)
+
+    def _wait(self, timeout):
+        """실행 중인 작업 하나가 끝나거나 timeout초가 지날 때까지 기다립니다."""
+        if self._inflight:
+            wait(list(self._inflight), timeout=timeout, return_when=FIRST_COMPLETED)
+            self._collect()
+        else:
+            time.sleep(timeout)
+
+    def _collect(self):
+        """끝난 작업의 결과를 기록합니다."""
+        broken = False
+        for future in [future for future in self._inflight if future.done()]:
+            job = self._inflight.pop(future)
+            try:
+                result = future.result()
+            except BrokenProcessPool as exc:
+                broken = True
+                self._record_failure(job, exc)
+            except Exception as exc:
+                self._record_failure(job, exc)
+            else:
+                if queue.complete(job, self.worker_id, result):
+                    self.stats["succeeded"] += 1
+                    self._log(f"완료: {job!r}")
+                else:
+                    self._log(f"결과 무시(다른 워커가 다시 가져감): {job!r}")
+        if broken and self._pool is not None:
+            # 자식 프로세스가 비정상 종료하면 풀 전체를 쓸 수 없으므로 다음 제출 때 새로 만든다
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _record_failure(self, job, exc):
+        retried = queue.fail(job, self.worker_id, format_error(exc))
+        if retried is True:
+            self.stats["retried"] += 1
+            self._log(f"재시도 예정: {job!r}: {exc!r}")
+        elif retried is False:
+            self.stats["failed"] += 1
+            self._log(f"실패: {job!r}: {exc!r}")
+
+    def _heartbeat(self):
+        """실행 중인 작업의 가시성 제한 시간을 제한 시간의 1/3마다 연장합니다."""
+        now = time.monotonic()
+        if not self._inflight or now - self._last_heartbeat < self.visibility_timeout / 3:
+            return
+        self._last_heartbeat = now
+        queue.heartbeat(self.worker_id, [job.id for job in self._inflight.values()], self.visibility_timeout)
@@ -1,4 +1,140 @@
 from django.contrib import admin
-from .models import Memo
+from django.contrib import messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.auth import get_user_model
+from .models import Memo, MemoStats
+from .pagination import InvalidCursor, approximate_count, paginate_keyset
+from .search import TRIGRAM_MIN_LENGTH, filter_matching, split_terms
 
-admin.site.register(Memo)
+# 변경 목록의 키셋 커서를 담는 쿼리 매개변수 (메모 목록 페이지와 같은 이름)
+CURSOR_VAR = "after"
+
+
+class KeysetChangeList(ChangeList):
+    """OFFSET과 COUNT(*) 없이 (created_at, id) 키셋으로 페이지를 나누는 변경 목록
+
+    페이지 번호 대신 "다음 페이지" 커서로 이동하므로 몇 번째 페이지든 같은 비용으로 읽고,
+    전체 개수는 approximate_count()로 limit건까지만 세거나 테이블 통계에서 추정한다.
+    """
+
+    def get_filters_params(self, params=None):
+        params = super().get_filters_params(params)
+        params.pop(CURSOR_VAR, None)
+        return params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # 필터, 날짜, 검색을 바꾸는 링크는 첫 페이지부터 다시 본다
+        return super().get_query_string(new_params, [*(remove or []), CURSOR_VAR])
+
+    def get_results(self, request):
+        # 검색 폼이 커서를 숨은 필드로 넘기지 않도록 뺀다
+        self.params.pop(CURSOR_VAR, None)
+        try:
+            page = paginate_keyset(self.queryset, request.GET.get(CURSOR_VAR), self.list_per_page)
+        except InvalidCursor as exc:
+            raise IncorrectLookupParameters(exc) from exc
+        self.page = page
+        self.result_list = page.items
+        self.result_count = approximate_count(self.queryset)
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = page.has_next or not page.is_first
+        self.paginator = None
+        self.first_page_url = self.get_query_string()
+        self.next_page_url = self.get_query_string({CURSOR_VAR: page.next_cursor}) if page.has_next else None
+
+
+class DeletedListFilter(admin.SimpleListFilter):
+    """휴지통(삭제 표시) 여부 필터"""
+    title = "상태"
+    parameter_name = "deleted"
+
+    def lookups(self, request, model_admin):
+        return [("0", "사용 중"), ("1", "휴지통")]
+
+    def queryset(self, request, queryset):
+        if self.value() in ("0", "1"):
+            return queryset.filter(deleted_at__isnull=self.value() == "0")
+        return queryset
+
+
+@admin.register(Memo)
+class MemoAdmin(admin.ModelAdmin):
+    """메모 관리자
+
+    수백만 건의 memos 테이블에서도 목록이 인덱스만 타도록 작성자는 list_select_related로
+    함께 읽고, 정렬은 memos_created_id_idx 순서 하나로 고정해 키셋으로 페이지를 나눈다.
+    날짜 계층은 선택지를 만들 때 모든 행의 날짜를 잘라 보므로 두지 않고, 일괄 작업은 선택한
+    메모 전체에 대한 UPDATE다.
+    """
+    list_display = ["title", "user", "created_at", "updated_at", "deleted_at"]
+    list_select_related = ["user"]
+    list_filter = [DeletedListFilter]
+    ordering = ["-created_at", "-id"]
+    sortable_by = []
+    change_list_template = "admin/keyset_change_list.html"
+    search_fields = ["title"]
+    search_help_text = f"메모 id, @사용자 이름, 또는 제목/본문의 {TRIGRAM_MIN_LENGTH}글자 이상 검색어로 찾습니다."
+    show_full_result_count = False
+    raw_id_fields = ["user"]
+    readonly_fields = ["created_at", "updated_at", "deleted_at", "version", "change_seq"]
+    actions = ["trash_memos", "restore_memos"]
+
+    def get_queryset(self, request):
+        # 휴지통 메모도 보여 주고 되살릴 수 있도록 삭제 표시된 메모까지 읽는다.
+        # 목록에 쓰지 않는 본문(압축된 BLOB)은 읽지 않는다
+        return Memo.all_objects.defer("content")
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_actions(self, request):
+        # 기본 삭제 작업은 확인 화면에서 메모마다 관련 객체를 모으므로 휴지통 작업으로 대신한다
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    def get_search_results(self, request, queryset, search_term):
+        """검색어를 인덱스를 타는 조회 하나로 보냅니다.
+
+        숫자만 있으면 기본 키, @로 시작하면 작성자 사용자 이름(unique 인덱스),
+        그 밖에는 제목/본문 검색 인덱스로 찾는다.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if term.isdigit():
+            return queryset.filter(pk=int(term)), False
+        if term.startswith("@"):
+            users = get_user_model().objects.filter(username=term[1:]).values("pk")
+            return queryset.filter(user__in=users), False
+        if any(len(word) < TRIGRAM_MIN_LENGTH for word in split_terms(term)):
+            self.message_user(
+                request, f"{TRIGRAM_MIN_LENGTH}글자 미만의 검색어는 빼고 찾았습니다.", messages.WARNING
+            )
+        return filter_matching(queryset, term), False
+
+    @admin.action(description="선택한 메모를 휴지통으로 옮기기", permissions=["delete"])
+    def trash_memos(self, request, queryset):
+        count, _ = queryset.delete()
+        self.message_user(request, f"메모 {count}개를 휴지통으로 옮겼습니다.", messages.SUCCESS)
+
+    @admin.action(description="선택한 메모를 휴지통에서 되살리기", permissions=["change"])
+    def restore_memos(self, request, queryset):
+        count = queryset.restore()
+        self.message_user(request, f"메모 {count}개를 되살렸습니다.", messages.SUCCESS)
+
+
+@admin.register(MemoStats)
+class MemoStatsAdmin(admin.ModelAdmin):
+    """사용자별 메모 통계 (메모를 쓸 때 함께 갱신되므로 읽기 전용)"""
+    list_display = ["user", "memo_count", "total_bytes", "last_created_at", "last_updated_at"]
+    list_select_related = ["user"]
+    search_fields = ["user__username"]
+    readonly_fields = list_display
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,272 @@
+import json
+from functools import wraps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from . import changes
+from . import compression
+from . import revisions
+from . import search_index
+from .models import Memo, add_memo_stats, next_change_seq, update_memo_stats
+from .pagination import InvalidCursor, paginate_keyset
+from ...forms import MemoForm
+
+
+def api_login_required(view_func):
+    """로그인하지 않은 API 요청에 리다이렉트 대신 401 JSON 응답을 반환합니다."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({"error": "로그인이 필요합니다."}, status=401)
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def json_body_required(view_func):
+    """요청 본문이 application/json인 경우에만 뷰를 실행합니다.
+
+    일반 HTML 폼은 application/json 본문을 보낼 수 없으므로, 이 검사로
+    세션 인증을 쓰는 JSON API를 교차 사이트 폼 요청으로부터 보호한다.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.content_type != "application/json":
+            return JsonResponse({"error": "Content-Type은 application/json이어야 합니다."}, status=415)
+        try:
+            request.json = json.loads(request.body or b"null")
+        except (UnicodeDecodeError, ValueError):
+            return JsonResponse({"error": "잘못된 JSON 본문입니다."}, status=400)
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def serialize_memo(memo):
+    """메모를 JSON으로 직렬화할 수 있는 딕셔너리로 변환합니다."""
+    return {
+        "id": memo.pk,
+        "title": memo.title,
+        "content": memo.content,
+        "created_at": memo.created_at.isoformat(),
+        "updated_at": memo.updated_at.isoformat(),
+        "version": memo.version,
+    }
+
+
+@require_GET
+@api_login_required
+def memo_list(request):
+    """메모 목록 API (after 커서 기반 페이지네이션)"""
+    try:
+        page = paginate_keyset(
+            Memo.objects.filter(user=request.user),
+            after=request.GET.get("after") or None,
+            page_size=request.GET.get("size"),
+        )
+    except InvalidCursor:
+        return JsonResponse({"error": "잘못된 페이지 커서입니다."}, status=400)
+    return JsonResponse({
+        "results": [serialize_memo(memo) for memo in page],
+        "next": page.next_cursor,
+    })
+
+
+@require_GET
+@api_login_required
+def memo_retrieve(request, pk):
+    """메모 단건 조회 API"""
+    memo = Memo.objects.filter(pk=pk, user=request.user).first()
+    if memo is None:
+        return JsonResponse({"error": "메모를 찾을 수 없습니다."}, status=404)
+    return JsonResponse(serialize_memo(memo))
+
+
+def change_feed_response(page):
+    """변경 피드 한 페이지의 JSON 응답"""
+    return JsonResponse({
+        "changes": [changes.serialize_change(memo) for memo in page],
+        "cursor": page.cursor,
+        "has_more": page.has_more,
+    })
+
+
+def reset_required_response(exc):
+    """이어 받을 수 없는 커서에 대한 410 응답 (클라이언트는 since 없이 처음부터 다시 받는다)"""
+    return JsonResponse({"error": str(exc), "reset": True}, status=410)
+
+
+@require_GET
+@api_login_required
+def memo_changes(request):
+    """메모 변경 피드 API
+
+    `?since=` 커서 다음에 작성/수정/삭제/복원된 메모를 변경 순서로 `?size=`건씩 돌려줍니다.
+    응답의 cursor를 다음 요청의 since로 쓰고 has_more가 false가 될 때까지 이어 받습니다.
+    변경을 기다리는 long-poll(`?wait=`)과 SSE는 ASGI 앱의 비동기 버전에서만 지원합니다.
+    """
+    try:
+        page = changes.get_changes(request.user, request.GET.get("since") or None, request.GET.get("size"))
+    except changes.InvalidCursor as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    except changes.ResetRequired as exc:
+        return reset_required_response(exc)
+    return change_feed_response(page)
+
+
+def _parse_id(value):
+    """배치 항목의 id를 정수로 변환합니다. 잘못된 값이면 None을 반환합니다."""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _batch_create(user, items):
+    """생성 항목을 검증한 뒤 한 번의 bulk_create로 저장합니다."""
+    results = []
+    memos = []
+    for index, item in enumerate(items):
+        form = MemoForm(data=item if isinstance(item, dict) else {})
+        if not form.is_valid():
+            results.append({"index": index, "status": "error", "errors": form.errors.get_json_data()})
+            continue
+        memo = form.save(commit=False)
+        memo.user = user
+        memo.update_summary()
+        memos.append(memo)
+        results.append({"index": index, "status": "created", "memo": memo})
+
+    if memos:
+        # 한 배치의 메모는 같은 변경 번호를 받는다 (변경 피드는 (변경 번호, id) 순서로 읽음)
+        change_seq = next_change_seq(user.pk)
+        for memo in memos:
+            memo.change_seq = change_seq
+    Memo.objects.bulk_create(memos)
+    # bulk_create는 save()를 거치지 않으므로 작성자 통계와 검색 인덱스도 직접 갱신한다
+    add_memo_stats(memos)
+    search_index.index_memos(memos)
+    for result in results:
+        memo = result.pop("memo", None)
+        if memo is not None:
+            result["id"] = memo.pk
+    return results
+
+
+def _batch_update(user, items):
+    """수정 항목의 소유권을 한 번에 확인하고 bulk_update로 저장합니다.
+
+    항목에 version이 있으면 저장된 버전과 같을 때만 수정하고, 다르면 그 항목은 저장하지 않고
+    현재 버전과 함께 conflict로 응답한다 (수정 화면의 버전 확인과 같음).
+    """
+    ids = [_parse_id(item.get("id")) if isinstance(item, dict) else None for item in items]
+    # 확인한 버전이 저장할 때까지 바뀌지 않도록 트랜잭션이 끝날 때까지 행을 잠근다
+    owned = (
+        Memo.objects.select_for_update()
+        .filter(pk__in=[pk for pk in ids if pk is not None], user=user)
+        .in_bulk()
+    )
+
+    results = []
+    changed = {}
+    indexed = {}
+    now = timezone.now()
+    for index, (item, pk) in enumerate(zip(items, ids)):
+        memo = owned.get(pk)
+        if memo is None:
+            results.append({"index": index, "id": pk, "status": "not_found"})
+            continue
+        if "version" in item and _parse_id(item["version"]) != memo.version:
+            results.append({"index": index, "id": pk, "status": "conflict", "version": memo.version})
+            continue
+        # 폼이 인스턴스를 고치기 전에 색인했던 값을 둔다
+        indexed[pk] = (pk, memo.title, memo.content)
+        data = {
+            "title": item.get("title", memo.title),
+            "content": item.get("content", memo.content),
+        }
+        form = MemoForm(data=data, instance=memo)
+        if not form.is_valid():
+            results.append({"index": index, "id": pk, "status": "error", "errors": form.errors.get_json_data()})
+            continue
+        # bulk_update는 auto_now를 적용하지 않으므로 수정일시를 직접 기록한다
+        memo.updated_at = now
+        # 수정 화면의 버전 확인이 이 변경과도 충돌하도록 버전을 올린다
+        # 행을 잠갔으므로 저장될 버전은 읽은 버전 + 1이다
+        version = memo.version + 1
+        memo.version = F("version") + 1
+        memo.update_summary()
+        changed[pk] = memo
+        results.append({"index": index, "id": pk, "status": "updated", "version": version})
+
+    # bulk_update는 시그널을 보내지 않으므로 수정 이력과 검색 인덱스도 직접 고친다
+    revisions.ensure_baselines(changed)
+    search_index.unindex_rows(indexed[pk] for pk in changed)
+    if changed:
+        change_seq = next_change_seq(user.pk)
+        for memo in changed.values():
+            memo.change_seq = change_seq
+        # 덮어쓰기 전의 저장 용량을 빼야 하므로 메모 행보다 먼저 쓴다
+        update_memo_stats(
+            user.pk,
+            size=sum(compression.stored_size(memo.content) for memo in changed.values()),
+            updated_at=now,
+            replaced=Memo.objects.filter(pk__in=changed),
+        )
+    Memo.objects.bulk_update(
+        changed.values(), ["title", "content", "updated_at", "version", "change_seq", *Memo.SUMMARY_FIELDS]
+    )
+    revisions.record_revisions(changed.values())
+    search_index.index_memos(changed.values())
+    return results
+
+
+def _batch_delete(user, items):
+    """삭제 항목의 소유권을 한 번에 확인하고 하나의 쿼리셋으로 휴지통에 옮깁니다."""
+    ids = [_parse_id(item) for item in items]
+    queryset = Memo.objects.filter(pk__in=[pk for pk in ids if pk is not None], user=user)
+    owned = set(queryset.values_list("id", flat=True))
+    queryset.delete()
+    return [
+        {"index": index, "id": pk, "status": "deleted" if pk in owned else "not_found"}
+        for index, pk in enumerate(ids)
+    ]
+
+
+@csrf_exempt
+@require_POST
+@api_login_required
+@json_body_required
+def memo_batch(request):
+    """메모 일괄 생성/수정/삭제 API
+
+    본문 형식: {"create": [{...}], "update": [{"id": ..., "version": ..., ...}], "delete": [id, ...]}
+    모든 변경은 하나의 트랜잭션에서 실행되며, 항목별 처리 결과를 반환합니다.
+    수정 항목의 version이 저장된 버전과 다르면 그 항목은 "conflict"로 응답합니다.
+    """
+    body = request.json
+    if not isinstance(body, dict):
+        return JsonResponse({"error": "본문은 JSON 객체여야 합니다."}, status=400)
+    sections = {}
+    for name in ("create", "update", "delete"):
+        items = body.get(name, [])
+        if not isinstance(items, list):
+            return JsonResponse({"error": f"{name}는 배열이어야 합니다."}, status=400)
+        sections[name] = items
+
+    limit = getattr(settings, "MEMO_API_BATCH_LIMIT", 100)
+    total = sum(len(items) for items in sections.values())
+    if total > limit:
+        return JsonResponse({"error": f"한 번에 최대 {limit}개의 항목만 처리할 수 있습니다."}, status=400)
+
+    with transaction.atomic():
+        results = {
+            "create": _batch_create(request.user, sections["create"]),
+            "update": _batch_update(request.user, sections["update"]),
+            "delete": _batch_delete(request.user, sections["delete"]),
+        }
+    return JsonResponse(results)
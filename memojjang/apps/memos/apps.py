@@ -5,3 +5,11 @@ class MemosConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "memojjang.apps.memos"
     verbose_name = "메모"
+
+    def ready(self):
+        """메모 관련 시그널 핸들러와 vendor 파일 배포 점검을 등록합니다."""
+        from django.core import checks
+        from memojjang.staticfiles import check_vendor_assets
+        from . import signals  # noqa: F401
+
+        checks.register(check_vendor_assets, checks.Tags.staticfiles, deploy=True)
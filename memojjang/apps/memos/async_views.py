@@ -0,0 +1,229 @@
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect, aget_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth import alogin, alogout
+from django.contrib import messages
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.views.decorators.http import require_GET
+from . import cache as memo_cache
+from . import changes
+from . import export
+from . import stats as memo_stats
+from . import tags as memo_tags
+from .api import change_feed_response, reset_required_response
+from .conditional import list_conditional, memo_conditional, memo_form_conditional
+from .models import Memo, VersionConflict
+from .pagination import InvalidCursor, apaginate_keyset, decode_cursor, get_page_size
+from ..users.hashing import aauthenticate
+from ...forms import MemoForm, UserRegistrationForm
+
+
+# ASGI 서버에서 스레드 브리지 없이 동작하는 views.py의 비동기 버전입니다.
+
+
+async def _aresolve_user(request):
+    """현재 사용자를 비동기로 조회해 request.user에 고정합니다.
+
+    템플릿 컨텍스트 프로세서가 지연 객체인 request.user를 평가하면서
+    비동기 컨텍스트에서 동기 DB 조회가 일어나지 않도록 미리 채워 둔다.
+    """
+    user = await request.auser()
+    request.user = user
+    return user
+
+
+async def home(request):
+    """홈페이지 뷰"""
+    await _aresolve_user(request)
+    return render(request, "home.html")
+
+
+@login_required
+@list_conditional
+async def memo_list(request):
+    """메모 목록 뷰"""
+    user = await _aresolve_user(request)
+    after = request.GET.get("after") or None
+    size = get_page_size(request.GET.get("size"))
+    tag = request.GET.get("tag") or None
+    if after:
+        try:
+            decode_cursor(after)
+        except InvalidCursor:
+            return HttpResponseBadRequest("잘못된 페이지 요청입니다.")
+
+    async def render_cards():
+        if tag:
+            page = await memo_tags.apaginate_tagged(user, tag, after, size)
+        else:
+            memos = Memo.objects.filter(user=user).defer("content").prefetch_related(memo_tags.prefetch_tags())
+            page = await apaginate_keyset(memos, after, size)
+        return render_to_string("memos/_memo_cards.html", {
+            "page": page,
+            "size": size,
+            "tag": tag,
+            "tags": [item async for item in memo_tags.user_tags(user)],
+            "stats": await memo_stats.aget_memo_stats(user),
+        })
+
+    cards_html = await memo_cache.aget_or_render(user.pk, "list", (after, size, tag), render_cards)
+    return render(request, "memos/memo_list.html", {"cards_html": mark_safe(cards_html)})
+
+
+@login_required
+async def memo_export(request):
+    """메모 내보내기 뷰
+
+    ASGI에서 동기 이터레이터는 응답 전에 모두 소비되므로 비동기 이터레이터로 스트리밍한다.
+    """
+    user = await _aresolve_user(request)
+    export_format = export.get_format(request.GET.get("format", "ndjson"))
+    if export_format is None:
+        return HttpResponseBadRequest("지원하지 않는 내보내기 형식입니다.")
+    response = StreamingHttpResponse(
+        export.astream(export_format, export.aexport_rows(user)),
+        content_type=export_format.content_type,
+    )
+    response["Content-Disposition"] = f'attachment; filename="memos.{export_format.extension}"'
+    return response
+
+
+@login_required
+async def memo_create(request):
+    """메모 생성 뷰"""
+    user = await _aresolve_user(request)
+    if request.method == "POST":
+        form = MemoForm(request.POST)
+        if form.is_valid():
+            await form.asave_for(user)
+            return redirect("memo_list")
+    else:
+        form = MemoForm()
+    return render(request, "memos/memo_form.html", {"form": form})
+
+
+@login_required
+@memo_conditional
+async def memo_detail(request, pk):
+    """메모 상세 뷰"""
+    user = await _aresolve_user(request)
+
+    async def render_detail():
+        memo = await aget_object_or_404(Memo, pk=pk, user=user)
+        return render_to_string("memos/_memo_detail_card.html", {"memo": memo})
+
+    detail_html = await memo_cache.aget_or_render(user.pk, "detail", pk, render_detail)
+    return render(request, "memos/memo_detail.html", {"detail_html": mark_safe(detail_html)})
+
+
+@login_required
+@memo_form_conditional
+async def memo_edit(request, pk):
+    """메모 수정 뷰"""
+    user = await _aresolve_user(request)
+    # 폼이 태그 입력란을 채울 때 비동기 컨텍스트에서 조회하지 않도록 태그를 미리 읽는다
+    memos = Memo.objects.prefetch_related("tags")
+    memo = await aget_object_or_404(memos, pk=pk, user=user)
+    if request.method == "POST":
+        form = MemoForm(request.POST, instance=memo)
+        if form.is_valid():
+            try:
+                await form.asave_changes()
+            except VersionConflict:
+                latest = await aget_object_or_404(memos, pk=pk, user=user)
+                return render(
+                    request, "memos/memo_form.html", {"form": form.with_version(latest)}, status=409
+                )
+            return redirect("memo_detail", pk=pk)
+    else:
+        form = MemoForm(instance=memo)
+    return render(request, "memos/memo_form.html", {"form": form})
+
+
+@login_required
+@memo_form_conditional
+async def memo_delete(request, pk):
+    """메모 삭제 뷰"""
+    user = await _aresolve_user(request)
+    memo = await aget_object_or_404(Memo, pk=pk, user=user)
+    if request.method == "POST":
+        await memo.adelete()
+        return redirect("memo_list")
+    return render(request, "memos/memo_confirm_delete.html", {"memo": memo})
+
+
+@require_GET
+async def memo_changes(request):
+    """메모 변경 피드 API
+
+    api.memo_changes에 변경을 기다리는 두 방식을 더한다. `?wait=초`(long-poll)는 변경이
+    생길 때까지 최대 그 시간 동안 기다렸다가 응답하고, `Accept: text/event-stream`이면
+    연결을 유지한 채 변경이 생길 때마다 SSE 이벤트로 보낸다. 기다리는 동안 워커 스레드를
+    잡지 않으므로 ASGI 앱에서만 제공한다.
+    """
+    user = await _aresolve_user(request)
+    if not user.is_authenticated:
+        return JsonResponse({"error": "로그인이 필요합니다."}, status=401)
+    cursor = request.GET.get("since") or request.headers.get("Last-Event-ID") or None
+    size = request.GET.get("size")
+    try:
+        changes.decode_cursor(cursor)
+    except changes.InvalidCursor as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    try:
+        wait = float(request.GET.get("wait") or 0)
+    except ValueError:
+        return JsonResponse({"error": "wait는 초 단위 숫자여야 합니다."}, status=400)
+
+    if "text/event-stream" in request.headers.get("Accept", ""):
+        response = StreamingHttpResponse(
+            changes.astream_changes(user, cursor, size), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # 프록시가 이벤트를 모아 두지 않게 한다
+        response["X-Accel-Buffering"] = "no"
+        return response
+    try:
+        page = await changes.await_changes(user, cursor, size, wait)
+    except changes.ResetRequired as exc:
+        return reset_required_response(exc)
+    return change_feed_response(page)
+
+
+async def login_view(request):
+    """로그인 뷰"""
+    await _aresolve_user(request)
+    if request.method == "POST":
+        username = request.POST["username"]
+        password = request.POST["password"]
+        user = await aauthenticate(request, username=username, password=password)
+        if user is not None:
+            await alogin(request, user)
+            return redirect("memo_list")
+        else:
+            messages.error(request, "로그인에 실패했습니다.")
+    return render(request, "users/login.html")
+
+
+@login_required
+async def logout_view(request):
+    """로그아웃 뷰"""
+    await alogout(request)
+    return redirect("home")
+
+
+async def register(request):
+    """회원가입 뷰"""
+    await _aresolve_user(request)
+    if request.method == "POST":
+        form = UserRegistrationForm(request.POST)
+        # 사용자 이름 중복 검사는 동기 ORM이므로 스레드에서, 비밀번호 해싱은 해싱 풀에서 실행한다
+        if await sync_to_async(form.is_valid)():
+            user = await form.asave()
+            await alogin(request, user)
+            return redirect("memo_list")
+    else:
+        form = UserRegistrationForm()
+    return render(request, "users/register.html", {"form": form})
@@ -0,0 +1,122 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+
+
+HITS_KEY = "memo_cache:hits"
+MISSES_KEY = "memo_cache:misses"
+
+
+def get_cache():
+    """메모 렌더링 캐시로 설정된 Django 캐시를 반환합니다."""
+    return caches[getattr(settings, "MEMO_CACHE_ALIAS", "default")]
+
+
+def generation_key(user_id):
+    """사용자별 메모 세대(generation) 카운터의 캐시 키"""
+    return f"memo_gen:{user_id}"
+
+
+def bump_generation(user_id):
+    """사용자의 메모 세대를 갱신해 이전에 렌더링된 조각을 모두 무효화합니다.
+
+    캐시가 비워진 뒤에도 이전 세대 값과 겹치지 않도록 증가 값 대신 현재 시각을 사용한다.
+    """
+    generation = time.time_ns()
+    get_cache().set(generation_key(user_id), generation, None)
+    return generation
+
+
+def get_generation(user_id):
+    """사용자의 현재 메모 세대를 반환합니다."""
+    cache = get_cache()
+    key = generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+async def aget_generation(user_id):
+    """get_generation의 비동기 버전"""
+    cache = get_cache()
+    key = generation_key(user_id)
+    generation = await cache.aget(key)
+    if generation is None:
+        await cache.aadd(key, time.time_ns(), None)
+        generation = await cache.aget(key)
+    return generation
+
+
+def fragment_key(user_id, generation, name, params):
+    """렌더링된 조각의 캐시 키"""
+    digest = hashlib.md5(repr(params).encode("utf-8"), usedforsecurity=False).hexdigest()
+    return f"memo_frag:{user_id}:{generation}:{name}:{digest}"
+
+
+def _count(key):
+    """히트/미스 카운터를 1 증가시킵니다."""
+    cache = get_cache()
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+async def _acount(key):
+    """_count의 비동기 버전"""
+    cache = get_cache()
+    await cache.aadd(key, 0, None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, 1, None)
+
+
+def get_or_render(user_id, name, params, render_fn):
+    """현재 세대의 렌더링 조각을 캐시에서 가져오고, 없으면 렌더링 후 저장합니다."""
+    cache = get_cache()
+    key = fragment_key(user_id, get_generation(user_id), name, params)
+    html = cache.get(key)
+    if html is not None:
+        _count(HITS_KEY)
+        return html
+    _count(MISSES_KEY)
+    html = render_fn()
+    cache.set(key, html, getattr(settings, "MEMO_CACHE_TIMEOUT", 300))
+    return html
+
+
+async def aget_or_render(user_id, name, params, render_fn):
+    """get_or_render의 비동기 버전. render_fn은 코루틴 함수입니다."""
+    cache = get_cache()
+    key = fragment_key(user_id, await aget_generation(user_id), name, params)
+    html = await cache.aget(key)
+    if html is not None:
+        await _acount(HITS_KEY)
+        return html
+    await _acount(MISSES_KEY)
+    html = await render_fn()
+    await cache.aset(key, html, getattr(settings, "MEMO_CACHE_TIMEOUT", 300))
+    return html
+
+
+def get_stats():
+    """캐시 히트/미스 통계를 반환합니다."""
+    cache = get_cache()
+    hits = cache.get(HITS_KEY) or 0
+    misses = cache.get(MISSES_KEY) or 0
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+def reset_stats():
+    """캐시 히트/미스 통계를 초기화합니다."""
+    get_cache().delete_many([HITS_KEY, MISSES_KEY])
@@ -0,0 +1,210 @@
+"""
+동기화 클라이언트용 메모 변경 피드
+
+메모를 작성/수정/삭제/복원할 때마다 작성자별로 증가하는 변경 번호(Memo.change_seq)를 받고,
+피드는 클라이언트가 가진 커서(마지막으로 받은 변경의 (change_seq, id)) 다음의 변경만
+memos (user_id, change_seq, id) 인덱스 순서로 한 페이지씩 돌려줍니다. 한 메모가 여러 번
+바뀌어도 최신 상태 한 번만 나오고, 휴지통으로 옮긴 메모는 내용 없이 삭제 표시로 나옵니다.
+
+휴지통 메모가 영구 삭제되면 삭제 표시도 사라지므로, 그 메모의 변경 번호(MemoStats.purged_seq)
+보다 오래된 커서는 이어 받을 수 없고 처음부터 다시 동기화해야 합니다(ResetRequired).
+변경을 기다리는 클라이언트(long-poll/SSE)는 통계 행의 change_seq만 주기적으로 확인합니다.
+"""
+import asyncio
+import base64
+import binascii
+import json
+import time
+from django.conf import settings
+from django.db.models import Q
+from .models import Memo, MemoStats
+from .stats import aget_memo_stats, get_memo_stats
+from .tags import prefetch_tags, tag_names
+
+
+class InvalidCursor(ValueError):
+    """잘못된 동기화 커서"""
+
+
+class ResetRequired(Exception):
+    """커서 이후에 영구 삭제된 메모가 있어 처음부터 다시 동기화해야 함"""
+
+
+def encode_cursor(change_seq, pk):
+    """(변경 번호, 메모 id)를 불투명한 커서 토큰으로 인코딩합니다."""
+    raw = f"{change_seq}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """커서 토큰을 (변경 번호, 메모 id)로 디코딩합니다. 빈 토큰은 처음부터"""
+    if not token:
+        return 0, 0
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        change_seq, pk = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii").split("|")
+        return int(change_seq), int(pk)
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursor("잘못된 동기화 커서입니다.") from exc
+
+
+def get_page_size(value=None):
+    """요청된 변경 피드 페이지 크기를 설정된 범위 안으로 맞춰 반환합니다."""
+    default = getattr(settings, "MEMO_SYNC_PAGE_SIZE", 200)
+    maximum = getattr(settings, "MEMO_SYNC_PAGE_SIZE_MAX", 1000)
+    try:
+        size = int(value) if value else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+
+def get_wait_max():
+    """long-poll 요청이 변경을 기다리는 최대 시간(초)"""
+    return getattr(settings, "MEMO_SYNC_WAIT_MAX", 30)
+
+
+def get_stream_timeout():
+    """SSE 연결 하나를 유지하는 최대 시간(초). 지나면 닫고 클라이언트가 다시 연결한다"""
+    return getattr(settings, "MEMO_SYNC_STREAM_TIMEOUT", 300)
+
+
+def get_heartbeat_interval():
+    """SSE 연결에서 변경이 없을 때 keepalive 주석을 보내는 간격(초)"""
+    return getattr(settings, "MEMO_SYNC_HEARTBEAT_INTERVAL", 15)
+
+
+def get_poll_interval():
+    """기다리는 동안 통계 행의 변경 번호를 확인하는 간격(초)"""
+    return getattr(settings, "MEMO_SYNC_POLL_INTERVAL", 1.0)
+
+
+class ChangePage:
+    """변경 피드 한 페이지"""
+
+    def __init__(self, items, cursor, has_more):
+        self.items = items
+        self.cursor = cursor
+        self.has_more = has_more
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def serialize_change(memo):
+    """변경 한 건을 JSON으로 직렬화할 수 있는 딕셔너리로 변환합니다."""
+    if memo.deleted_at is not None:
+        return {"id": memo.pk, "deleted": True, "deleted_at": memo.deleted_at.isoformat()}
+    return {
+        "id": memo.pk,
+        "deleted": False,
+        "title": memo.title,
+        "content": memo.content,
+        "tags": tag_names(memo),
+        "created_at": memo.created_at.isoformat(),
+        "updated_at": memo.updated_at.isoformat(),
+        "version": memo.version,
+    }
+
+
+def _changes_queryset(user, position, size):
+    change_seq, pk = position
+    return (
+        Memo.all_objects.filter(user=user)
+        .filter(Q(change_seq__gt=change_seq) | Q(change_seq=change_seq, id__gt=pk))
+        .order_by("change_seq", "id")
+        .prefetch_related(prefetch_tags())[:size + 1]
+    )
+
+
+def _check_position(stats, position):
+    if position != (0, 0) and position[0] < stats.purged_seq:
+        raise ResetRequired("커서 이후에 영구 삭제된 메모가 있어 처음부터 다시 동기화해야 합니다.")
+
+
+def _make_page(items, size, position):
+    has_more = len(items) > size
+    items = items[:size]
+    if items:
+        position = (items[-1].change_seq, items[-1].pk)
+    return ChangePage(items, encode_cursor(*position), has_more)
+
+
+def get_changes(user, cursor=None, page_size=None):
+    """커서 다음의 변경 한 페이지를 가져옵니다.
+
+    InvalidCursor, ResetRequired를 던질 수 있다. 반환한 페이지의 cursor를 다음 요청에 쓰며,
+    변경이 없어도 같은 커서를 돌려준다.
+    """
+    position = decode_cursor(cursor)
+    size = get_page_size(page_size)
+    _check_position(get_memo_stats(user), position)
+    return _make_page(list(_changes_queryset(user, position, size)), size, position)
+
+
+async def aget_changes(user, cursor=None, page_size=None):
+    """get_changes의 비동기 버전"""
+    position = decode_cursor(cursor)
+    size = get_page_size(page_size)
+    _check_position(await aget_memo_stats(user), position)
+    return _make_page([memo async for memo in _changes_queryset(user, position, size)], size, position)
+
+
+async def _alast_change_seq(user):
+    return await MemoStats.objects.filter(user=user).values_list("change_seq", flat=True).afirst()
+
+
+async def await_changes(user, cursor=None, page_size=None, timeout=0):
+    """변경이 생기거나 timeout(초)이 지날 때까지 기다렸다가 변경 한 페이지를 가져옵니다.
+
+    기다리는 동안에는 사용자 통계 행의 change_seq만 기본 키로 읽고, 값이 바뀌었을 때만
+    변경 피드를 조회한다. 버전 충돌 등으로 건너뛴 변경 번호처럼 읽을 변경이 없으면 계속 기다린다.
+    """
+    deadline = time.monotonic() + max(0, min(timeout, get_wait_max()))
+    while True:
+        page = await aget_changes(user, cursor, page_size)
+        if page.items or time.monotonic() >= deadline:
+            return page
+        seen = await _alast_change_seq(user)
+        while time.monotonic() < deadline:
+            await asyncio.sleep(min(get_poll_interval(), max(0, deadline - time.monotonic())))
+            if await _alast_change_seq(user) != seen:
+                break
+
+
+def sse_event(event, data, event_id=None):
+    """Server-Sent Events 메시지 한 건"""
+    lines = [f"id: {event_id}"] if event_id else []
+    lines += [f"event: {event}", f"data: {json.dumps(data, ensure_ascii=False)}"]
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+async def astream_changes(user, cursor=None, page_size=None):
+    """변경을 SSE 메시지로 보내는 비동기 이터레이터
+
+    변경 페이지마다 changes 이벤트(id는 다음 커서라서 다시 연결할 때 Last-Event-ID로 이어 받음)를,
+    변경이 없으면 heartbeat 간격마다 keepalive 주석을 보낸다. 이어 받을 수 없는 커서면 reset
+    이벤트를 보내고, 스트림 최대 시간이 지나면 끝낸다.
+    """
+    deadline = time.monotonic() + get_stream_timeout()
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            page = await await_changes(user, cursor, page_size, min(get_heartbeat_interval(), remaining))
+        except ResetRequired as exc:
+            yield sse_event("reset", {"error": str(exc), "reset": True})
+            return
+        if page.items:
+            cursor = page.cursor
+            yield sse_event("changes", {
+                "changes": [serialize_change(memo) for memo in page],
+                "cursor": page.cursor,
+                "has_more": page.has_more,
+            }, event_id=page.cursor)
+        else:
+            yield b": keepalive\n\n"
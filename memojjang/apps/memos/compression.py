@@ -0,0 +1,148 @@
+"""
+메모 본문 압축 코덱
+
+임계값보다 짧은 본문은 원문 문자열 그대로 저장하고, 긴 본문은 코덱으로 압축해
+맨 앞 1바이트에 코덱 식별자(tag)를 붙인 바이트로 저장합니다. 읽을 때는 tag로
+코덱을 찾으므로 설정의 코덱을 바꿔도 이미 저장된 본문은 그대로 읽을 수 있습니다.
+"""
+import bz2
+import lzma
+import zlib
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Codec:
+    """본문 압축 코덱의 기본 클래스
+
+    새 코덱은 name과 한 번 정하면 바꾸지 않을 tag(1~255)를 지정하고
+    compress/decompress를 구현한 뒤 register_codec()으로 등록합니다.
+    """
+
+    name = None
+    tag = None
+
+    def compress(self, data):
+        raise NotImplementedError
+
+    def decompress(self, data):
+        raise NotImplementedError
+
+
+class ZlibCodec(Codec):
+    """zlib(deflate) 코덱"""
+
+    name = "zlib"
+    tag = 1
+
+    def __init__(self, level=6):
+        self.level = level
+
+    def compress(self, data):
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data):
+        return zlib.decompress(data)
+
+
+class LzmaCodec(Codec):
+    """압축률이 높지만 느린 lzma(xz) 코덱"""
+
+    name = "lzma"
+    tag = 2
+
+    def compress(self, data):
+        return lzma.compress(data)
+
+    def decompress(self, data):
+        return lzma.decompress(data)
+
+
+class Bz2Codec(Codec):
+    """bzip2 코덱"""
+
+    name = "bz2"
+    tag = 3
+
+    def compress(self, data):
+        return bz2.compress(data)
+
+    def decompress(self, data):
+        return bz2.decompress(data)
+
+
+CODECS = {}
+_CODECS_BY_TAG = {}
+
+
+def register_codec(codec):
+    """코덱을 이름과 tag로 등록합니다."""
+    if not 0 < codec.tag < 256:
+        raise ValueError("코덱 tag는 1에서 255 사이여야 합니다.")
+    registered = _CODECS_BY_TAG.get(codec.tag)
+    if registered is not None and registered.name != codec.name:
+        raise ValueError(f"코덱 tag {codec.tag}는 이미 {registered.name} 코덱이 사용합니다.")
+    CODECS[codec.name] = codec
+    _CODECS_BY_TAG[codec.tag] = codec
+    return codec
+
+
+for _codec in (ZlibCodec(), LzmaCodec(), Bz2Codec()):
+    register_codec(_codec)
+
+
+def get_codec():
+    """새로 저장할 본문에 사용할 코덱
+
+    MEMO_CONTENT_CODEC에는 등록된 코덱 이름이나 Codec 클래스의 경로를 지정합니다.
+    """
+    name = getattr(settings, "MEMO_CONTENT_CODEC", "zlib")
+    codec = CODECS.get(name)
+    if codec is None:
+        codec = register_codec(import_string(name)())
+        CODECS[name] = codec
+    return codec
+
+
+def get_threshold():
+    """이 크기(UTF-8 바이트) 이상인 본문만 압축합니다."""
+    return getattr(settings, "MEMO_CONTENT_COMPRESS_THRESHOLD", 1024)
+
+
+def encode(text):
+    """본문을 저장 형식(원문 문자열 또는 tag가 붙은 압축 바이트)으로 변환합니다."""
+    data = text.encode("utf-8")
+    if len(data) < get_threshold():
+        return text
+    codec = get_codec()
+    compressed = codec.compress(data)
+    # 압축해도 줄지 않는 본문(이미 압축된 데이터 등)은 원문으로 둔다
+    if len(compressed) + 1 >= len(data):
+        return text
+    return bytes([codec.tag]) + compressed
+
+
+def decode(value):
+    """저장 형식의 값을 본문 문자열로 되돌립니다."""
+    if value is None or isinstance(value, str):
+        return value
+    value = bytes(value)
+    if not value:
+        return ""
+    codec = _CODECS_BY_TAG.get(value[0])
+    if codec is None:
+        raise ValueError(f"알 수 없는 본문 압축 코덱 tag입니다: {value[0]}")
+    return codec.decompress(value[1:]).decode("utf-8")
+
+
+def stored_size(text):
+    """본문을 저장했을 때 컬럼에 들어가는 바이트 수 (압축되면 압축된 크기)"""
+    value = encode(text)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(value)
+
+
+def is_compressed(value):
+    """저장 형식의 값이 압축된 바이트인지 확인합니다."""
+    return isinstance(value, (bytes, bytearray, memoryview))
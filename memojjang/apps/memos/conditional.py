@@ -0,0 +1,143 @@
+"""
+메모 페이지의 조건부 요청(ETag / Last-Modified / 304, If-Match / 412) 처리
+
+목록의 검증자는 사용자별 메모 통계 행의 메모 수와 마지막 수정일시(삭제/복원 포함)로,
+메모 한 건은 그 메모의 버전과 수정일시로 만들고 각각 한 번의 인덱스 조회로 읽는다. 브라우저가 가진 검증자가 그대로면 목록 조회와 템플릿 렌더링 없이
+304를 보내고, 수정/삭제 POST의 If-Match가 현재 ETag와 다르면 412로 거절한다.
+
+CSRF 토큰이 든 폼을 담은 페이지는 304로 브라우저 캐시의 폼을 다시 쓰게 하면 로그인을 다시 한
+뒤(토큰이 바뀐 뒤) 그 폼의 POST가 403이 된다. 그래서 목록(내보내기 폼)의 ETag에는 CSRF 비밀값의
+해시를 넣고, 수정/삭제 폼 페이지에는 304를 보내지 않고 POST의 If-Match만 확인한다.
+
+django.views.decorators.http.condition은 검증자 함수를 동기로만 부르므로 비동기 뷰에서도
+DB를 조회할 수 있도록 동기/비동기 검증자를 따로 받는다.
+"""
+import datetime
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.middleware.csrf import get_token
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from . import stats as memo_stats
+from .models import Memo
+
+
+def make_etag(*parts):
+    """검증자 구성 요소를 이어 붙인 ETag (따옴표 포함)"""
+    return quote_etag("-".join(str(part) for part in parts))
+
+
+def _timestamp(value):
+    return int(value.timestamp() * 1_000_000)
+
+
+def csrf_version(request):
+    """폼이 든 페이지의 ETag에 넣는 CSRF 비밀값의 해시
+
+    비밀값이 없으면 get_token()이 만들어 응답 쿠키로 보내므로 첫 응답의 ETag부터 쿠키와 맞는다.
+    로그인하면 비밀값이 바뀌어 ETag도 바뀐다.
+    """
+    get_token(request)
+    return salted_hmac("memos.conditional.csrf", request.META["CSRF_COOKIE"]).hexdigest()[:16]
+
+
+def _list_validators(user_id, stats, csrf):
+    last_modified = stats.last_updated_at
+    if last_modified is None:
+        return make_etag("list", user_id, 0, csrf), None
+    return make_etag("list", user_id, stats.memo_count, _timestamp(last_modified), csrf), last_modified
+
+
+def list_validators(request):
+    """사용자 메모 목록의 (ETag, Last-Modified)"""
+    return _list_validators(request.user.pk, memo_stats.get_memo_stats(request.user), csrf_version(request))
+
+
+async def alist_validators(request):
+    """list_validators의 비동기 버전"""
+    user = await request.auser()
+    return _list_validators(user.pk, await memo_stats.aget_memo_stats(user), csrf_version(request))
+
+
+def _memo_validators(pk, state):
+    if state is None:
+        # 없는 메모는 검증자 없이 뷰로 넘겨 404를 돌려준다
+        return None, None
+    version, updated_at = state
+    return make_etag("memo", pk, version), updated_at
+
+
+def memo_validators(request, pk):
+    """메모 한 건의 (ETag, Last-Modified)"""
+    state = Memo.objects.filter(pk=pk, user=request.user).values_list("version", "updated_at").first()
+    return _memo_validators(pk, state)
+
+
+async def amemo_validators(request, pk):
+    """memo_validators의 비동기 버전"""
+    user = await request.auser()
+    state = await Memo.objects.filter(pk=pk, user=user).values_list("version", "updated_at").afirst()
+    return _memo_validators(pk, state)
+
+
+def _precondition_response(request, etag, last_modified):
+    """조건이 맞으면 304/412 응답을, 아니면 None을 반환합니다."""
+    if last_modified is not None:
+        if not timezone.is_aware(last_modified):
+            last_modified = timezone.make_aware(last_modified, datetime.timezone.utc)
+        last_modified = int(last_modified.timestamp())
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def _set_validators(request, response, etag, last_modified):
+    """안전한 메서드의 응답에 검증자 헤더를 붙입니다."""
+    if request.method in ("GET", "HEAD") and response.status_code in (200, 304):
+        if etag:
+            response.headers.setdefault("ETag", etag)
+        if last_modified is not None and not response.has_header("Last-Modified"):
+            response.headers["Last-Modified"] = http_date(last_modified.timestamp())
+        # 브라우저가 저장해 두되 매번 검증자로 다시 확인하게 한다
+        response.headers.setdefault("Cache-Control", "private, no-cache")
+    return response
+
+
+def conditional(validators, avalidators, not_modified=True):
+    """뷰에 조건부 요청 처리를 붙이는 데코레이터를 만듭니다.
+
+    validators(request, *args, **kwargs)는 (ETag, Last-Modified)를 반환하며,
+    비동기 뷰에는 같은 값을 반환하는 코루틴 함수 avalidators를 쓴다.
+    not_modified가 거짓이면 GET/HEAD에는 304를 보내지 않고 POST의 412만 처리한다.
+    """
+    def check(request, etag, last_modified):
+        if not not_modified and request.method in ("GET", "HEAD"):
+            return None
+        return _precondition_response(request, etag, last_modified)
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def inner(request, *args, **kwargs):
+                etag, last_modified = await avalidators(request, *args, **kwargs)
+                response = check(request, etag, last_modified)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _set_validators(request, response, etag, last_modified)
+        else:
+            @wraps(view)
+            def inner(request, *args, **kwargs):
+                etag, last_modified = validators(request, *args, **kwargs)
+                response = check(request, etag, last_modified)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                return _set_validators(request, response, etag, last_modified)
+        return inner
+    return decorator
+
+
+# 목록과 메모 상세는 If-None-Match/If-Modified-Since로 304를, 수정/삭제 폼은 GET에 304 없이
+# POST의 If-Match/If-Unmodified-Since로 412만 처리한다
+list_conditional = conditional(list_validators, alist_validators)
+memo_conditional = conditional(memo_validators, amemo_validators)
+memo_form_conditional = conditional(memo_validators, amemo_validators, not_modified=False)
@@ -0,0 +1,247 @@
+import csv
+import json
+import pickle
+import re
+import tempfile
+import zipfile
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from .models import Memo
+
+
+EXPORT_FIELDS = ("id", "title", "content", "created_at", "updated_at")
+
+
+def export_queryset(user):
+    """내보낼 메모를 모델 인스턴스 대신 튜플로 조회하는 쿼리셋"""
+    return Memo.objects.filter(user=user).order_by("id").values_list(*EXPORT_FIELDS)
+
+
+def get_chunk_size():
+    """한 번에 데이터베이스에서 가져올 행 수"""
+    return getattr(settings, "MEMO_EXPORT_CHUNK_SIZE", 2000)
+
+
+def export_rows(user):
+    """사용자의 메모를 chunk 단위로 읽어 한 행씩 반환합니다."""
+    return export_queryset(user).iterator(chunk_size=get_chunk_size())
+
+
+async def aexport_rows(user):
+    """export_rows의 비동기 버전
+
+    values_list 쿼리셋의 aiterator()는 비동기 컨텍스트에서 곧바로 쿼리를 실행해
+    실패하므로, id 키셋으로 chunk를 나눠 한 chunk씩 스레드에서 조회한다.
+    """
+    chunk_size = get_chunk_size()
+    last_id = 0
+    while True:
+        rows = await sync_to_async(list)(export_queryset(user).filter(id__gt=last_id)[:chunk_size])
+        for row in rows:
+            yield row
+        if len(rows) < chunk_size:
+            break
+        last_id = rows[-1][0]
+
+
+class _Echo:
+    """csv.writer가 쓴 값을 그대로 돌려주는 의사(pseudo) 버퍼"""
+
+    def write(self, value):
+        return value
+
+
+class _StreamBuffer:
+    """zipfile이 쓴 바이트를 모아 두었다가 꺼내 가는 쓰기 전용 버퍼
+
+    seek/tell을 제공하지 않으므로 zipfile은 데이터 디스크립터 방식으로 기록한다.
+    close() 시 한꺼번에 기록되는 중앙 디렉터리처럼 큰 출력은 임시 파일로 넘겨
+    메모리에 쌓이지 않게 한다.
+    """
+
+    def __init__(self, spill_size=1024 * 1024):
+        self._chunks = []
+        self._size = 0
+        self._spill_size = spill_size
+        self._spill = None
+
+    def write(self, data):
+        if self._spill is not None:
+            self._spill.write(data)
+        else:
+            self._chunks.append(bytes(data))
+            self._size += len(data)
+            if self._size > self._spill_size:
+                self._spill = tempfile.TemporaryFile()
+                self._spill.writelines(self._chunks)
+                self._chunks = []
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """지금까지 쓰인 바이트를 조각 단위로 꺼내고 버퍼를 비웁니다."""
+        if self._spill is not None:
+            spill, self._spill = self._spill, None
+            spill.seek(0)
+            with spill:
+                while chunk := spill.read(self._spill_size):
+                    yield chunk
+        elif self._chunks:
+            yield b"".join(self._chunks)
+        self._chunks = []
+        self._size = 0
+
+
+class _SpooledInfoList:
+    """ZipInfo를 메모리 대신 임시 파일에 쌓아 두는 리스트 대용 객체
+
+    zipfile은 close() 시 filelist를 한 번 순회하며 중앙 디렉터리를 기록하므로,
+    append/len/iter만 제공하면 파일 수와 무관하게 일정한 메모리로 동작한다.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._count = 0
+
+    def append(self, info):
+        pickle.dump(info, self._file, pickle.HIGHEST_PROTOCOL)
+        self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        self._file.seek(0)
+        for _ in range(self._count):
+            yield pickle.load(self._file)
+
+    def close(self):
+        self._file.close()
+
+
+class _DiscardingNameIndex(dict):
+    """ZipInfo를 보관하지 않는 zipfile 이름 색인
+
+    파일 이름에 메모 id가 들어가 항상 유일하므로 중복 이름 검사용 색인이 필요 없다.
+    """
+
+    def __setitem__(self, key, value):
+        pass
+
+
+class NdjsonFormat:
+    """한 줄에 메모 하나를 JSON 객체로 기록하는 형식"""
+
+    content_type = "application/x-ndjson; charset=utf-8"
+    extension = "ndjson"
+
+    def begin(self):
+        return []
+
+    def row(self, row):
+        record = dict(zip(EXPORT_FIELDS, row))
+        record["created_at"] = record["created_at"].isoformat()
+        record["updated_at"] = record["updated_at"].isoformat()
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def end(self):
+        return []
+
+
+class CsvFormat:
+    """헤더가 있는 CSV 형식 (엑셀 호환을 위해 UTF-8 BOM 포함)"""
+
+    content_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def __init__(self):
+        self._writer = csv.writer(_Echo())
+
+    def begin(self):
+        return ["\ufeff".encode("utf-8") + self._writer.writerow(EXPORT_FIELDS).encode("utf-8")]
+
+    def row(self, row):
+        return self._writer.writerow(
+            [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+        ).encode("utf-8")
+
+    def end(self):
+        return []
+
+
+class ZipFormat:
+    """메모 하나를 텍스트 파일 하나로 담는 ZIP 형식
+
+    파일 본문은 쓰는 즉시 내보내고, 마지막에 기록하는 중앙 디렉터리용
+    메타데이터(ZipInfo)는 임시 파일에 쌓아 두어 메모리 사용량을 일정하게 유지한다.
+    """
+
+    content_type = "application/zip"
+    extension = "zip"
+
+    def __init__(self):
+        self._buffer = _StreamBuffer()
+        self._zip = None
+
+    def begin(self):
+        self._zip = zipfile.ZipFile(self._buffer, "w", compression=zipfile.ZIP_DEFLATED)
+        self._zip.filelist = _SpooledInfoList()
+        self._zip.NameToInfo = _DiscardingNameIndex()
+        return self._buffer.drain()
+
+    def row(self, row):
+        record = dict(zip(EXPORT_FIELDS, row))
+        text = f"{record['title']}\n\n{record['content']}\n"
+        self._zip.writestr(self.filename(record), text.encode("utf-8"))
+        return b"".join(self._buffer.drain())
+
+    def end(self):
+        self._zip.close()
+        self._zip.filelist.close()
+        return self._buffer.drain()
+
+    @staticmethod
+    def filename(record):
+        """메모 id와 제목으로 안전한 파일 이름을 만듭니다."""
+        title = re.sub(r"[\\/:*?\"<>|\s]+", "_", record["title"]).strip("._")[:50]
+        return f"{record['id']:08d}_{title or 'memo'}.txt"
+
+
+EXPORT_FORMATS = {
+    "ndjson": NdjsonFormat,
+    "csv": CsvFormat,
+    "zip": ZipFormat,
+}
+
+
+def get_format(name):
+    """이름에 해당하는 내보내기 형식 객체를 만듭니다. 없으면 None을 반환합니다."""
+    format_class = EXPORT_FORMATS.get(name)
+    return format_class() if format_class else None
+
+
+def stream(export_format, rows):
+    """행 이터레이터를 내보내기 형식의 바이트 조각 스트림으로 변환합니다.
+
+    형식 객체의 begin()/end()는 바이트 조각의 이터러블을, row()는 바이트를 반환합니다.
+    """
+    yield from export_format.begin()
+    for row in rows:
+        chunk = export_format.row(row)
+        if chunk:
+            yield chunk
+    yield from export_format.end()
+
+
+async def astream(export_format, rows):
+    """stream의 비동기 버전"""
+    for chunk in export_format.begin():
+        yield chunk
+    async for row in rows:
+        chunk = export_format.row(row)
+        if chunk:
+            yield chunk
+    for chunk in export_format.end():
+        yield chunk
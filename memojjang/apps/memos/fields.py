@@ -0,0 +1,46 @@
+from django.db import models
+from . import compression
+
+
+class CompressedTextField(models.TextField):
+    """긴 본문을 압축해 저장하는 텍스트 필드
+
+    파이썬 쪽에서는 TextField와 똑같이 문자열로 다루므로 폼, 관리자, 템플릿은
+    그대로 동작합니다. 컬럼은 BLOB 타입이며, SQLite의 동적 타입 덕분에
+    임계값보다 짧은 본문은 TEXT 값으로, 압축한 본문은 BLOB 값으로 저장됩니다.
+    SQL 안에서 본문이 필요하면 장고 연결에 등록된 memo_plain(content) 함수로 복원하고,
+    검색은 원문을 색인하는 검색 인덱스(search_index)를 씁니다.
+    """
+
+    description = "압축 저장 텍스트"
+
+    def get_internal_type(self):
+        return "BinaryField"
+
+    def from_db_value(self, value, expression, connection):
+        return compression.decode(value)
+
+    def to_python(self, value):
+        if compression.is_compressed(value):
+            return compression.decode(value)
+        return super().to_python(value)
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None:
+            return None
+        return compression.encode(value)
+
+
+class CompositeKeyForeignKey(models.ForeignKey):
+    """복합 기본 키의 첫 번째 열로 쓰는 외래 키
+
+    Django 5.1은 복합 기본 키를 지원하지 않으므로, 다대다 연결 모델은 실제 테이블의
+    PRIMARY KEY (a_id, b_id) 중 첫 열을 ORM의 기본 키로 선언합니다. 이 열만으로는
+    행이 유일하지 않으므로 인스턴스의 pk로 행을 수정/삭제하지 말고 항상 두 열로
+    거른 쿼리셋을 사용해야 합니다.
+    """
+
+    def _check_unique(self, **kwargs):
+        # primary_key=True라서 unique로 보이지만 실제 유일성은 복합 기본 키가 보장한다
+        return []
@@ -0,0 +1,129 @@
+"""
+메모 관련 백그라운드 작업
+
+요청 안에서 끝내기에는 오래 걸리는 내보내기, 가져오기, 검색 인덱스 재구성, 휴지통 비우기,
+수정 이력 정리, 사용자별 통계 점검을 run_workers 명령의 워커 프로세스에서 실행합니다.
+"""
+import os
+import time
+import uuid
+from io import StringIO
+from pathlib import Path
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from ..jobs.registry import register
+from . import export
+
+
+def get_files_dir():
+    """작업 결과 파일을 저장하는 디렉터리"""
+    return Path(settings.MEMO_JOB_FILES_DIR)
+
+
+def export_path(job):
+    """내보내기 작업이 만든 파일의 경로"""
+    return get_files_dir() / job.result["file"]
+
+
+def purge_export_files(retention_hours=None):
+    """보존 기간이 지난 내보내기 파일을 지우고 지운 파일 수를 반환합니다.
+
+    작업 행과 관계없이 파일의 수정 시각으로 판단하므로, 실패하다 남은 .part 파일이나
+    사용자가 탈퇴해 작업 행이 지워진 파일도 함께 정리한다.
+    """
+    if retention_hours is None:
+        retention_hours = getattr(settings, "MEMO_EXPORT_RETENTION_HOURS", 24)
+    directory = get_files_dir() / "exports"
+    if not directory.is_dir():
+        return 0
+    cutoff = time.time() - retention_hours * 3600
+    removed = 0
+    for path in directory.iterdir():
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            # 다른 워커가 먼저 지웠다
+            continue
+    return removed
+
+
+@register("memos.export", result_url=lambda job: reverse("memo_export_download", args=[job.pk]))
+def export_memos(payload):
+    """사용자의 메모를 파일로 내보냅니다. payload: user_id, format"""
+    user = get_user_model().objects.get(pk=payload["user_id"])
+    export_format = export.get_format(payload.get("format", "ndjson"))
+    if export_format is None:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {payload.get('format')}")
+    name = f"exports/{uuid.uuid4().hex}.{export_format.extension}"
+    target = get_files_dir() / name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(target.name + ".part")
+    try:
+        with open(partial, "wb") as file:
+            for chunk in export.stream(export_format, export.export_rows(user)):
+                file.write(chunk)
+        # 다 쓴 뒤에 이름을 바꿔 내려받는 쪽이 쓰는 중인 파일을 보지 않게 한다
+        os.replace(partial, target)
+    finally:
+        if partial.exists():
+            partial.unlink()
+    # 따로 주기적으로 실행하지 않아도 파일이 쌓이지 않도록 내보낼 때마다 지난 파일을 지운다
+    purge_export_files()
+    return {"file": name, "format": payload.get("format", "ndjson"), "size": target.stat().st_size}
+
+
+def _run_command(name, *args, **options):
+    """관리 명령을 실행하고 마지막 출력 줄을 결과로 반환합니다."""
+    out = StringIO()
+    call_command(name, *args, stdout=out, **options)
+    lines = out.getvalue().strip().splitlines()
+    return {"output": lines[-1] if lines else ""}
+
+
+@register("memos.import")
+def import_memos(payload):
+    """워커가 읽을 수 있는 파일에서 메모를 가져옵니다. payload: path, format(선택)
+
+    체크포인트 파일을 쓰므로 실패 후 재시도하면 이미 가져온 행을 건너뛰고 이어서 진행한다.
+    """
+    options = {"checkpoint": payload.get("checkpoint") or f"{payload['path']}.checkpoint"}
+    if payload.get("format"):
+        options["format"] = payload["format"]
+    return _run_command("import_memos", payload["path"], **options)
+
+
+@register("memos.rebuild_search")
+def rebuild_search(payload):
+    """검색 인덱스를 재구성합니다. payload: optimize(선택)"""
+    return _run_command("rebuild_memo_search", optimize=bool(payload.get("optimize")))
+
+
+@register("memos.purge")
+def purge(payload):
+    """휴지통과 탈퇴한 사용자를 정리합니다. payload: max_batches(선택)"""
+    return _run_command("purge_memos", max_batches=int(payload.get("max_batches", 0)))
+
+
+@register("memos.purge_exports")
+def purge_exports(payload):
+    """보존 기간이 지난 내보내기 파일을 지웁니다. payload: retention_hours(선택)"""
+    options = {}
+    if payload.get("retention_hours") is not None:
+        options["retention_hours"] = float(payload["retention_hours"])
+    return _run_command("purge_memo_exports", **options)
+
+
+@register("memos.compact_revisions")
+def compact_revisions(payload):
+    """오래된 수정 이력을 정리합니다. payload: max_memos(선택)"""
+    return _run_command("compact_memo_revisions", max_memos=int(payload.get("max_memos", 0)))
+
+
+@register("memos.reconcile_stats")
+def reconcile_stats(payload):
+    """사용자별 메모 통계를 실제 메모와 맞춥니다. payload: max_batches(선택)"""
+    return _run_command("reconcile_memo_stats", max_batches=int(payload.get("max_batches", 0)))
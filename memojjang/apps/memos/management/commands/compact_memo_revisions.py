@@ -0,0 +1,41 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ... import revisions
+
+
+class Command(BaseCommand):
+    """보존 기간이 지난 메모 수정 이력을 줄이는 명령
+
+    메모마다 짧은 트랜잭션 하나로 오래된 이력을 하루에 하나씩만 남기고, 지운 스냅숏에
+    기대던 델타는 새 스냅숏 기준으로 다시 만든다. 크론 등으로 주기적으로 실행한다.
+    """
+
+    help = "보존 기간이 지난 메모 수정 이력을 하루에 하나만 남기고 메모당 최대 이력 수로 줄입니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=getattr(settings, "MEMO_PURGE_BATCH_DELAY", 0.05),
+            help="메모 사이에 쉬는 시간(초)",
+        )
+        parser.add_argument(
+            "--max-memos",
+            type=int,
+            default=0,
+            help="이번 실행에서 처리할 최대 메모 수 (0이면 제한 없음)",
+        )
+
+    def handle(self, *args, **options):
+        if options["delay"] < 0 or options["max_memos"] < 0:
+            raise CommandError("--delay와 --max-memos는 0 이상이어야 합니다.")
+        memo_ids = list(revisions.compaction_candidates())
+        if options["max_memos"]:
+            memo_ids = memo_ids[:options["max_memos"]]
+        removed = 0
+        for memo_id in memo_ids:
+            removed += revisions.compact(memo_id)
+            if options["delay"]:
+                time.sleep(options["delay"])
+        self.stdout.write(self.style.SUCCESS(f"정리 완료: 메모 {len(memo_ids)}건, 이력 {removed}건 삭제"))
@@ -0,0 +1,228 @@
+import csv
+import io
+import json
+import sys
+import time
+from itertools import islice
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from ... import cache as memo_cache
+from ... import search_index
+from ...models import ImportCheckpoint, Memo, add_memo_stats, next_change_seq
+
+
+class UserIdCache:
+    """사용자 이름을 id로 바꾸는 조회 캐시
+
+    처음 보는 이름만 모아 한 번의 쿼리로 조회하고, 너무 커지면 비운다.
+    """
+
+    def __init__(self, max_size=100000):
+        self._ids = {}
+        self._max_size = max_size
+
+    def resolve(self, usernames):
+        """사용자 이름 목록을 조회해 {이름: id} 딕셔너리를 반환합니다."""
+        missing = {name for name in usernames if name not in self._ids}
+        if missing:
+            if len(self._ids) + len(missing) > self._max_size:
+                self._ids.clear()
+            found = dict(
+                get_user_model().objects.filter(username__in=missing).values_list("username", "id")
+            )
+            for name in missing:
+                self._ids[name] = found.get(name)
+        return {name: self._ids.get(name) for name in usernames}
+
+
+class Command(BaseCommand):
+    """NDJSON/CSV 스트림에서 메모를 대량으로 가져오는 명령"""
+
+    help = "NDJSON 또는 CSV(username, title, content)에서 메모를 대량으로 가져옵니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="입력 파일 경로 ('-'이면 표준 입력)")
+        parser.add_argument(
+            "--format",
+            choices=["ndjson", "csv"],
+            help="입력 형식 (생략하면 파일 확장자로 판단하고, 표준 입력은 ndjson)",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="bulk_create 한 번에 넣을 행 수")
+        parser.add_argument("--chunk-size", type=int, default=20000, help="트랜잭션 하나에 넣을 행 수")
+        parser.add_argument(
+            "--checkpoint",
+            help="진행 상황을 기록하고 재개할 체크포인트 이름 (메모와 같은 트랜잭션에서 DB에 기록)",
+        )
+        parser.add_argument(
+            "--drop-indexes",
+            action="store_true",
+            help="가져오는 동안 보조 인덱스를 제거하고 검색 인덱스를 갱신하지 않았다가 끝난 뒤 다시 만듭니다.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("--batch-size와 --chunk-size는 1 이상이어야 합니다.")
+        source = options["source"]
+        input_format = options["format"] or self.guess_format(source)
+        checkpoint = options["checkpoint"]
+        skip = self.load_checkpoint(checkpoint, source)
+
+        stream = self.open_source(source)
+        try:
+            rows = self.read_rows(stream, input_format)
+            if skip:
+                self.stdout.write(f"체크포인트에서 재개합니다: {skip}행 건너뜀")
+                rows = islice(rows, skip, None)
+            if options["drop_indexes"]:
+                self.drop_indexes()
+            try:
+                stats = self.import_rows(
+                    rows, options["batch_size"], options["chunk_size"], checkpoint, source, skip,
+                    index_search=not options["drop_indexes"],
+                )
+            finally:
+                if options["drop_indexes"]:
+                    self.restore_indexes()
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for user_id in stats["user_ids"]:
+            memo_cache.bump_generation(user_id)
+        self.stdout.write(self.style.SUCCESS(
+            f"가져오기 완료: {stats['imported']}건 저장, {stats['skipped']}건 건너뜀 "
+            f"({stats['rate']:.0f} rows/s)"
+        ))
+
+    @staticmethod
+    def guess_format(source):
+        """파일 확장자로 입력 형식을 판단합니다."""
+        return "csv" if source.lower().endswith(".csv") else "ndjson"
+
+    @staticmethod
+    def open_source(source):
+        """입력 파일 또는 표준 입력을 UTF-8 텍스트 스트림으로 엽니다."""
+        if source == "-":
+            return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+        try:
+            return open(source, encoding="utf-8-sig", newline="")
+        except OSError as exc:
+            raise CommandError(f"입력 파일을 열 수 없습니다: {exc}") from exc
+
+    @staticmethod
+    def read_rows(stream, input_format):
+        """입력 스트림을 한 행씩 딕셔너리로 읽습니다. 잘못된 행은 None을 반환합니다."""
+        if input_format == "csv":
+            yield from csv.DictReader(stream)
+            return
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield row if isinstance(row, dict) else None
+
+    @staticmethod
+    def load_checkpoint(name, source):
+        """체크포인트에서 이미 처리한 행 수를 읽습니다."""
+        if not name:
+            return 0
+        checkpoint = ImportCheckpoint.objects.filter(name=name).first()
+        if checkpoint is None:
+            return 0
+        if checkpoint.source != source:
+            raise CommandError("체크포인트가 다른 입력에서 만들어졌습니다.")
+        return checkpoint.rows
+
+    @staticmethod
+    def save_checkpoint(name, source, rows):
+        """처리한 행 수를 체크포인트에 기록합니다. chunk를 저장하는 트랜잭션 안에서 호출한다."""
+        if not name:
+            return
+        ImportCheckpoint.objects.update_or_create(name=name, defaults={"source": source, "rows": rows})
+
+    @staticmethod
+    def existing_indexes():
+        """memos 테이블에 현재 존재하는 인덱스 이름 집합"""
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Memo._meta.db_table)
+        return {name for name, info in constraints.items() if info["index"]}
+
+    def drop_indexes(self):
+        """보조 인덱스를 제거합니다."""
+        existing = self.existing_indexes()
+        with connection.cursor() as cursor:
+            for index in Memo._meta.indexes:
+                if index.name in existing:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+        self.stdout.write("보조 인덱스를 제거했습니다.")
+
+    def restore_indexes(self):
+        """보조 인덱스를 다시 만들고 검색 인덱스를 재구성합니다."""
+        started = time.perf_counter()
+        existing = self.existing_indexes()
+        # 인덱스 DDL만 실행하므로 스키마 편집기 컨텍스트(테이블 재작성 준비) 없이 SQL만 얻어 쓴다
+        schema_editor = connection.schema_editor()
+        with transaction.atomic(), connection.cursor() as cursor:
+            for index in Memo._meta.indexes:
+                if index.name not in existing:
+                    cursor.execute(str(index.create_sql(Memo, schema_editor)))
+            if search_index.is_supported():
+                search_index.rebuild_index(cursor)
+        self.stdout.write(f"보조 인덱스를 다시 만들었습니다 ({time.perf_counter() - started:.1f}s).")
+
+    def import_rows(self, rows, batch_size, chunk_size, checkpoint, source, done, index_search=True):
+        """행 스트림을 chunk 단위 트랜잭션으로 나눠 bulk_create로 저장합니다.
+
+        index_search가 참이면 저장한 메모를 같은 트랜잭션에서 검색 인덱스에 넣는다
+        (--drop-indexes로 가져오면 끝난 뒤 한 번에 재구성한다). 체크포인트도 같은 트랜잭션에서
+        고치므로 중단된 chunk는 메모와 진행 상황이 함께 롤백되어 재개할 때 처음부터 다시 넣는다.
+        """
+        user_ids = UserIdCache()
+        touched = set()
+        imported = skipped = 0
+        started = time.perf_counter()
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            usernames = {row.get("username") for row in chunk if row}
+            resolved = user_ids.resolve(usernames)
+            memos = []
+            for row in chunk:
+                user_id = resolved.get(row.get("username")) if row else None
+                if user_id is None or not row.get("title") or not row.get("content"):
+                    skipped += 1
+                    continue
+                memo = Memo(user_id=user_id, title=row["title"], content=row["content"])
+                memo.update_summary()
+                memos.append(memo)
+                touched.add(user_id)
+            with transaction.atomic():
+                change_seqs = {user_id: next_change_seq(user_id) for user_id in {memo.user_id for memo in memos}}
+                for memo in memos:
+                    memo.change_seq = change_seqs[memo.user_id]
+                Memo.objects.bulk_create(memos, batch_size=batch_size)
+                add_memo_stats(memos)
+                if index_search:
+                    search_index.index_memos(memos)
+                self.save_checkpoint(checkpoint, source, done + len(chunk))
+            imported += len(memos)
+            done += len(chunk)
+
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{done}행 처리 ({imported}건 저장, {skipped}건 건너뜀) "
+                f"{(imported + skipped) / elapsed if elapsed else 0:.0f} rows/s"
+            )
+        elapsed = time.perf_counter() - started
+        return {
+            "imported": imported,
+            "skipped": skipped,
+            "user_ids": touched,
+            "rate": (imported + skipped) / elapsed if elapsed else 0,
+        }
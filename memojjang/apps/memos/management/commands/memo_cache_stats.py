@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from ... import cache
+
+
+class Command(BaseCommand):
+    """메모 렌더링 캐시의 히트/미스 통계를 출력하는 명령"""
+
+    help = "메모 렌더링 캐시의 히트/미스 통계를 출력합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="출력 후 통계를 초기화합니다.",
+        )
+
+    def handle(self, *args, **options):
+        stats = cache.get_stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} "
+            f"hit_ratio={stats['hit_ratio']:.2%}"
+        )
+        if options["reset"]:
+            cache.reset_stats()
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ... import jobs
+
+
+class Command(BaseCommand):
+    """보존 기간이 지난 백그라운드 내보내기 파일을 지우는 명령
+
+    내보내기 작업도 끝날 때마다 같은 정리를 하므로, 내보내기가 드문 서버에서 크론 등으로
+    주기적으로 실행해 디스크를 비운다.
+    """
+
+    help = "MEMO_JOB_FILES_DIR에서 보존 기간이 지난 내보내기 파일을 지웁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-hours",
+            type=float,
+            default=getattr(settings, "MEMO_EXPORT_RETENTION_HOURS", 24),
+            help="이 시간보다 오래된 파일을 지웁니다",
+        )
+
+    def handle(self, *args, **options):
+        if options["retention_hours"] < 0:
+            raise CommandError("--retention-hours는 0 이상이어야 합니다.")
+        removed = jobs.purge_export_files(options["retention_hours"])
+        self.stdout.write(self.style.SUCCESS(f"정리 완료: 내보내기 파일 {removed}개 삭제"))
@@ -0,0 +1,106 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from ...models import Memo
+
+
+class Command(BaseCommand):
+    """휴지통의 메모와 탈퇴한 사용자를 작은 배치로 나눠 실제로 삭제하는 명령
+
+    배치마다 짧은 트랜잭션으로 삭제하고 배치 사이에 잠시 쉬어, 한 번에 많은 행을 지우는
+    동안 SQLite 쓰기 잠금이 길게 잡혀 다른 요청이 밀리지 않도록 한다. 크론 등으로 주기적으로
+    실행하며, --max-batches로 한 번 실행의 작업량을 제한할 수 있다.
+    """
+
+    help = "보관 기간이 지난 휴지통 메모와 탈퇴한 사용자의 메모/계정을 작은 배치로 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=getattr(settings, "MEMO_TRASH_RETENTION_DAYS", 30),
+            help="휴지통에서 이 기간(일)이 지난 메모만 삭제합니다.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "MEMO_PURGE_BATCH_SIZE", 500),
+            help="트랜잭션 하나에서 삭제할 행 수",
+        )
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=getattr(settings, "MEMO_PURGE_BATCH_DELAY", 0.05),
+            help="배치 사이에 쉬는 시간(초)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=0,
+            help="이번 실행에서 처리할 최대 배치 수 (0이면 제한 없음)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="삭제하지 않고 삭제 대상 수만 출력합니다.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1 or options["retention_days"] < 0 or options["delay"] < 0:
+            raise CommandError("--batch-size는 1 이상, --retention-days와 --delay는 0 이상이어야 합니다.")
+        self.batch_size = options["batch_size"]
+        self.delay = options["delay"]
+        self.batches_left = options["max_batches"] or None
+
+        cutoff = timezone.now() - timedelta(days=options["retention_days"])
+        expired = Memo.all_objects.filter(deleted_at__lt=cutoff)
+        deleted_users = get_user_model().objects.filter(deleted_at__isnull=False).order_by("deleted_at")
+
+        if options["dry_run"]:
+            user_ids = list(deleted_users.values_list("pk", flat=True))
+            user_memos = Memo.all_objects.filter(user_id__in=user_ids).count()
+            self.stdout.write(
+                f"삭제 대상: 휴지통 메모 {expired.count()}건, "
+                f"탈퇴 사용자 {len(user_ids)}명(메모 {user_memos}건)"
+            )
+            return
+
+        purged_memos = self.purge(expired)
+        purged_users = 0
+        for user_id in deleted_users.values_list("pk", flat=True):
+            purged_memos += self.purge(Memo.all_objects.filter(user_id=user_id))
+            if self.exhausted():
+                break
+            # 메모를 모두 지운 뒤라 사용자 행의 CASCADE는 가볍다
+            with transaction.atomic():
+                get_user_model().objects.filter(pk=user_id).hard_delete()
+            purged_users += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"삭제 완료: 메모 {purged_memos}건, 사용자 {purged_users}명"
+            + (" (배치 한도에 도달해 중단)" if self.exhausted() else "")
+        ))
+
+    def exhausted(self):
+        """--max-batches 한도를 모두 썼는지 여부"""
+        return self.batches_left is not None and self.batches_left <= 0
+
+    def purge(self, queryset):
+        """queryset의 메모를 id 순서로 batch_size개씩 나눠 삭제하고 삭제한 수를 반환합니다."""
+        purged = 0
+        while not self.exhausted():
+            ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:self.batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                Memo.all_objects.filter(pk__in=ids).hard_delete()
+            purged += len(ids)
+            if self.batches_left is not None:
+                self.batches_left -= 1
+            if self.delay:
+                time.sleep(self.delay)
+        return purged
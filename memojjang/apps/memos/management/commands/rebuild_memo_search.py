@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from ... import search_index
+
+
+class Command(BaseCommand):
+    """메모 전문 검색(FTS5) 인덱스를 일괄 재구성하는 명령"""
+
+    help = "memos 테이블 전체로부터 전문 검색 인덱스를 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--optimize",
+            action="store_true",
+            help="재구성 후 인덱스 세그먼트를 병합합니다.",
+        )
+
+    def handle(self, *args, **options):
+        if not search_index.is_supported():
+            raise CommandError("현재 데이터베이스는 FTS5 검색 인덱스를 지원하지 않습니다.")
+        with transaction.atomic(), connection.cursor() as cursor:
+            search_index.create_index(cursor)
+            search_index.rebuild_index(cursor)
+            if options["optimize"]:
+                search_index.optimize_index(cursor)
+        self.stdout.write(self.style.SUCCESS("메모 검색 인덱스를 재구성했습니다."))
@@ -0,0 +1,66 @@
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from ... import stats as memo_stats
+
+
+class Command(BaseCommand):
+    """사용자별 메모 통계를 실제 메모와 비교해 어긋난 행을 고치는 명령
+
+    사용자 id 순서로 batch_size명씩 짧은 트랜잭션 하나에서 비교하고 고치므로, 실행 중에도
+    메모 쓰기가 오래 막히지 않는다. 통계는 메모를 쓸 때 함께 증감하므로 평소에는 고칠 것이
+    없어야 하며, 크론 등으로 주기적으로 실행해 어긋남을 찾아낸다.
+    """
+
+    help = "사용자별 메모 통계(메모 수, 저장 용량, 마지막 작성/수정일시)의 어긋남을 찾아 배치로 고칩니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "MEMO_STATS_RECONCILE_BATCH_SIZE", 200),
+            help="트랜잭션 하나에서 비교할 사용자 수",
+        )
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=getattr(settings, "MEMO_PURGE_BATCH_DELAY", 0.05),
+            help="배치 사이에 쉬는 시간(초)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=0,
+            help="이번 실행에서 처리할 최대 배치 수 (0이면 제한 없음)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="고치지 않고 어긋난 사용자만 출력합니다.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1 or options["delay"] < 0 or options["max_batches"] < 0:
+            raise CommandError("--batch-size는 1 이상, --delay와 --max-batches는 0 이상이어야 합니다.")
+        users = get_user_model().objects.order_by("pk").values_list("pk", flat=True)
+        checked = drifted = batches = 0
+        last_id = 0
+        while not options["max_batches"] or batches < options["max_batches"]:
+            user_ids = list(users.filter(pk__gt=last_id)[:options["batch_size"]])
+            if not user_ids:
+                break
+            with transaction.atomic():
+                result = memo_stats.reconcile(user_ids, dry_run=options["dry_run"])
+            for user_id, fields in result.items():
+                self.stdout.write(f"사용자 {user_id}: {', '.join(fields)}")
+            checked += len(user_ids)
+            drifted += len(result)
+            batches += 1
+            last_id = user_ids[-1]
+            if options["delay"]:
+                time.sleep(options["delay"])
+
+        action = "찾음" if options["dry_run"] else "고침"
+        self.stdout.write(self.style.SUCCESS(f"점검 완료: 사용자 {checked}명, 어긋난 통계 {drifted}건 {action}"))
@@ -0,0 +1,56 @@
+import base64
+import hashlib
+import urllib.request
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from memojjang.staticfiles import VENDOR_ASSETS
+
+
+def integrity_of(data):
+    """SRI 형식(sha384-<base64>)의 해시"""
+    return "sha384-" + base64.b64encode(hashlib.sha384(data).digest()).decode("ascii")
+
+
+class Command(BaseCommand):
+    """외부 CDN 에셋을 STATICFILES_DIRS에 내려받아 고정하는 명령
+
+    배포 환경은 외부망에 접근할 수 없고 파일은 저장소에 들어 있지 않으므로, 배포 전에
+    인터넷이 되는 곳에서 실행해 결과 파일을 함께 배포한다. 내려받은 파일은 SRI 해시로 검증한다.
+    """
+
+    help = "base.html이 사용하는 Bootstrap 파일을 memojjang/static/vendor/에 내려받습니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="내려받지 않고 이미 있는 파일의 해시만 검증합니다.",
+        )
+
+    def handle(self, *args, **options):
+        static_dir = Path(settings.STATICFILES_DIRS[0])
+        failures = []
+        for asset in VENDOR_ASSETS:
+            target = static_dir / asset["path"]
+            if options["check"]:
+                if not target.is_file():
+                    failures.append(f"{asset['path']}: 파일이 없습니다.")
+                elif integrity_of(target.read_bytes()) != asset["integrity"]:
+                    failures.append(f"{asset['path']}: 해시가 일치하지 않습니다.")
+                continue
+
+            try:
+                with urllib.request.urlopen(asset["url"], timeout=30) as response:
+                    data = response.read()
+            except OSError as exc:
+                raise CommandError(f"{asset['url']}을(를) 내려받지 못했습니다: {exc}")
+            if integrity_of(data) != asset["integrity"]:
+                raise CommandError(f"{asset['url']}의 해시가 고정된 값과 다릅니다.")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+            self.stdout.write(f"{asset['path']} ({len(data)} bytes)")
+
+        if failures:
+            raise CommandError("\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("정적 에셋이 준비되었습니다."))
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='memo',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': '메모', 'verbose_name_plural': '메모들'},
+        ),
+        migrations.AddIndex(
+            model_name='memo',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='memos_user_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+from django.db import migrations
+
+
+CREATE_FTS_TABLE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS memos_fts USING fts5("
+    "title, content, content='memos', content_rowid='id', tokenize='trigram')"
+)
+
+CREATE_TRIGGER_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS memos_fts_ai AFTER INSERT ON memos BEGIN
+        INSERT INTO memos_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS memos_fts_ad AFTER DELETE ON memos BEGIN
+        INSERT INTO memos_fts(memos_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS memos_fts_au AFTER UPDATE OF title, content ON memos BEGIN
+        INSERT INTO memos_fts(memos_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO memos_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS memos_fts_ai",
+    "DROP TRIGGER IF EXISTS memos_fts_ad",
+    "DROP TRIGGER IF EXISTS memos_fts_au",
+    "DROP TABLE IF EXISTS memos_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    """FTS5 검색 인덱스와 동기화 트리거를 생성하고 기존 메모를 색인합니다."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(CREATE_FTS_TABLE_SQL)
+    for sql in CREATE_TRIGGER_SQL:
+        schema_editor.execute(sql)
+    schema_editor.execute("INSERT INTO memos_fts(memos_fts) VALUES ('rebuild')")
+
+
+def drop_search_index(apps, schema_editor):
+    """FTS5 검색 인덱스와 트리거를 제거합니다."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memos", "0002_memos_user_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
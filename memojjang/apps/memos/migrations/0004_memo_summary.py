@@ -0,0 +1,87 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:01
+
+from django.db import migrations, models
+from memojjang.apps.memos.models import summarize
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+# 0003 마이그레이션의 검색 트리거
+SEARCH_TRIGGER_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS memos_fts_ai AFTER INSERT ON memos BEGIN
+        INSERT INTO memos_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS memos_fts_ad AFTER DELETE ON memos BEGIN
+        INSERT INTO memos_fts(memos_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS memos_fts_au AFTER UPDATE OF title, content ON memos BEGIN
+        INSERT INTO memos_fts(memos_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO memos_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+
+def backfill_summary(apps, schema_editor):
+    """기존 메모의 요약 필드를 id 순서로 나눠 채웁니다."""
+    Memo = apps.get_model("memos", "Memo")
+    db_alias = schema_editor.connection.alias
+    last_id = 0
+    while True:
+        memos = list(
+            Memo.objects.using(db_alias)
+            .filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "content")[:BACKFILL_BATCH_SIZE]
+        )
+        if not memos:
+            break
+        for memo in memos:
+            for name, value in summarize(memo.content).items():
+                setattr(memo, name, value)
+        Memo.objects.using(db_alias).bulk_update(memos, ["excerpt", "char_count", "word_count"])
+        last_id = memos[-1].id
+
+
+def restore_search_triggers(apps, schema_editor):
+    """SQLite의 AddField는 테이블을 다시 만들면서 트리거를 지우므로 검색 트리거를 복구합니다."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in SEARCH_TRIGGER_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0003_memos_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='memo',
+            name='char_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='글자 수'),
+        ),
+        migrations.AddField(
+            model_name='memo',
+            name='excerpt',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='요약'),
+        ),
+        migrations.AddField(
+            model_name='memo',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='단어 수'),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+        migrations.RunPython(backfill_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,137 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:05
+
+import memojjang.apps.memos.fields
+from django.db import migrations
+from memojjang.apps.memos import compression, search_index
+
+
+COMPRESS_BATCH_SIZE = 500
+
+# 0003 마이그레이션의 압축 이전 검색 인덱스 (되돌릴 때 사용)
+RAW_FTS_TABLE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS memos_fts USING fts5("
+    "title, content, content='memos', content_rowid='id', tokenize='trigram')"
+)
+
+RAW_TRIGGER_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS memos_fts_ai AFTER INSERT ON memos BEGIN
+        INSERT INTO memos_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS memos_fts_ad AFTER DELETE ON memos BEGIN
+        INSERT INTO memos_fts(memos_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS memos_fts_au AFTER UPDATE OF title, content ON memos BEGIN
+        INSERT INTO memos_fts(memos_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO memos_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+RAW_DROP_SQL = [
+    "DROP TRIGGER IF EXISTS memos_fts_ai",
+    "DROP TRIGGER IF EXISTS memos_fts_ad",
+    "DROP TRIGGER IF EXISTS memos_fts_au",
+    "DROP TABLE IF EXISTS memos_fts",
+]
+
+
+def compress_contents(apps, schema_editor):
+    """기존 메모 본문 중 임계값을 넘는 것을 id 순서로 나눠 압축합니다."""
+    Memo = apps.get_model("memos", "Memo")
+    db_alias = schema_editor.connection.alias
+    last_id = 0
+    while True:
+        rows = list(
+            Memo.objects.using(db_alias)
+            .filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "content")[:COMPRESS_BATCH_SIZE]
+        )
+        if not rows:
+            break
+        updates = []
+        for pk, content in rows:
+            value = compression.encode(content)
+            if compression.is_compressed(value):
+                updates.append((value, pk))
+        if updates:
+            with schema_editor.connection.cursor() as cursor:
+                cursor.executemany("UPDATE memos SET content = %s WHERE id = %s", updates)
+        last_id = rows[-1][0]
+
+
+def decompress_contents(apps, schema_editor):
+    """압축된 본문을 모두 원문으로 되돌립니다."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "UPDATE memos SET content = memo_plain(content) WHERE typeof(content) = 'blob'"
+    )
+
+
+def drop_raw_search(apps, schema_editor):
+    """본문을 그대로 색인하는 검색 트리거와 인덱스를 제거합니다."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in RAW_DROP_SQL:
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    """복원한 본문을 담는 검색 인덱스를 만들고 기존 메모를 색인합니다.
+
+    트리거는 SQL에서 본문을 읽으므로 압축된 본문을 색인할 수 없어, 메모를 쓰는 파이썬 코드가
+    갱신하는 인덱스(search_index)로 바꾼다.
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        search_index.create_index(cursor)
+        search_index.rebuild_index(cursor)
+
+
+def drop_search_index(apps, schema_editor):
+    """복원한 본문을 담는 검색 인덱스를 제거합니다."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        search_index.drop_index(cursor)
+
+
+def restore_raw_search(apps, schema_editor):
+    """압축 이전 방식의 검색 인덱스와 트리거를 다시 만듭니다."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(RAW_FTS_TABLE_SQL)
+    for sql in RAW_TRIGGER_SQL:
+        schema_editor.execute(sql)
+    schema_editor.execute("INSERT INTO memos_fts(memos_fts) VALUES ('rebuild')")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0004_memo_summary'),
+    ]
+
+    operations = [
+        # 압축하는 동안 트리거가 압축된 본문을 색인하지 않도록 먼저 지운다
+        # (되돌릴 때는 마지막에 실행되어 압축 이전 방식의 인덱스를 복구한다)
+        migrations.RunPython(drop_raw_search, restore_raw_search),
+        migrations.AlterField(
+            model_name='memo',
+            name='content',
+            field=memojjang.apps.memos.fields.CompressedTextField(verbose_name='내용'),
+        ),
+        migrations.RunPython(compress_contents, decompress_contents),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
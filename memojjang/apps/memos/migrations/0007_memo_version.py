@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0006_memos_user_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='memo',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='버전'),
+        ),
+    ]
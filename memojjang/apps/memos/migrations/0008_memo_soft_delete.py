@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0007_memo_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='memo',
+            name='memos_user_created_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='memo',
+            name='memos_user_updated_idx',
+        ),
+        migrations.AddField(
+            model_name='memo',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='삭제일시'),
+        ),
+        migrations.AddIndex(
+            model_name='memo',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['user', '-created_at', '-id'], name='memos_user_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='memo',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['user', 'updated_at'], name='memos_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='memo',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['user', '-deleted_at'], name='memos_user_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:50
+
+import django.db.models.deletion
+import django.utils.timezone
+import memojjang.apps.memos.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0008_memo_soft_delete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemoRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(verbose_name='이력 번호')),
+                ('title', models.TextField(verbose_name='제목')),
+                ('kind', models.TextField(choices=[('snapshot', '스냅숏'), ('delta', '델타')], verbose_name='저장 방식')),
+                ('base_number', models.PositiveIntegerField(blank=True, null=True, verbose_name='기준 스냅숏')),
+                ('depth', models.PositiveIntegerField(default=0, verbose_name='스냅숏 이후 델타 수')),
+                ('data', memojjang.apps.memos.fields.CompressedTextField(verbose_name='내용')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='수정일시')),
+                ('memo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='memos.memo')),
+            ],
+            options={
+                'verbose_name': '메모 이력',
+                'verbose_name_plural': '메모 이력들',
+                'db_table': 'memo_revisions',
+                'ordering': ['-number'],
+                'constraints': [models.UniqueConstraint(fields=('memo', 'number'), name='memo_revisions_memo_number_uniq')],
+            },
+        ),
+    ]
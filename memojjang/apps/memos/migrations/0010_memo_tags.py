@@ -0,0 +1,92 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:59
+
+import django.db.models.deletion
+import memojjang.apps.memos.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_memo_tags(apps, schema_editor):
+    """memo_tags 테이블을 (memo_id, tag_id) 복합 기본 키로 만듭니다.
+
+    Django 5.1의 create_model()은 단일 열 기본 키만 만들 수 있으므로 직접 만든다.
+    SQLite에서는 WITHOUT ROWID 테이블이라 행이 기본 키 순서로 저장되고, 보조 인덱스에
+    기본 키 열이 포함되어 태그별 목록이 인덱스만으로 처리된다.
+    """
+    MemoTag = apps.get_model("memos", "MemoTag")
+    connection = schema_editor.connection
+    quote = schema_editor.quote_name
+    memo = MemoTag._meta.get_field("memo")
+    tag = MemoTag._meta.get_field("tag")
+    created_at = MemoTag._meta.get_field("created_at")
+    suffix = " WITHOUT ROWID" if connection.vendor == "sqlite" else ""
+    schema_editor.execute(
+        f"CREATE TABLE {quote(MemoTag._meta.db_table)} ("
+        f"{quote(memo.column)} {memo.db_type(connection)} NOT NULL"
+        f" REFERENCES {quote('memos')} ({quote('id')}) DEFERRABLE INITIALLY DEFERRED, "
+        f"{quote(tag.column)} {tag.db_type(connection)} NOT NULL"
+        f" REFERENCES {quote('tags')} ({quote('id')}) DEFERRABLE INITIALLY DEFERRED, "
+        f"{quote(created_at.column)} {created_at.db_type(connection)} NOT NULL, "
+        f"PRIMARY KEY ({quote(memo.column)}, {quote(tag.column)})){suffix}"
+    )
+    for index in MemoTag._meta.indexes:
+        schema_editor.add_index(MemoTag, index)
+
+
+def drop_memo_tags(apps, schema_editor):
+    """memo_tags 테이블을 삭제합니다."""
+    schema_editor.execute(f"DROP TABLE {schema_editor.quote_name('memo_tags')}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0009_memo_revisions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.TextField(verbose_name='이름')),
+                ('memo_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='메모 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일시')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '태그',
+                'verbose_name_plural': '태그들',
+                'db_table': 'tags',
+                'ordering': ['name'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'name'), name='tags_user_name_uniq')],
+            },
+        ),
+        # memos에 다대다 필드를 추가하면 SQLite가 memos 테이블 전체를 다시 만들므로,
+        # 모델과 필드는 마이그레이션 상태에만 추가하고 연결 테이블은 직접 만든다
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='MemoTag',
+                    fields=[
+                        ('memo', memojjang.apps.memos.fields.CompositeKeyForeignKey(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='memo_tags', serialize=False, to='memos.memo')),
+                        ('created_at', models.DateTimeField(verbose_name='작성일시')),
+                        ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memo_tags', to='memos.tag')),
+                    ],
+                    options={
+                        'verbose_name': '메모 태그',
+                        'verbose_name_plural': '메모 태그들',
+                        'db_table': 'memo_tags',
+                        'indexes': [models.Index(fields=['tag', '-created_at', '-memo'], name='memo_tags_tag_created_idx')],
+                    },
+                ),
+                migrations.AddField(
+                    model_name='memo',
+                    name='tags',
+                    field=models.ManyToManyField(blank=True, related_name='memos', through='memos.MemoTag', to='memos.tag', verbose_name='태그'),
+                ),
+            ],
+        ),
+        migrations.RunPython(create_memo_tags, drop_memo_tags),
+    ]
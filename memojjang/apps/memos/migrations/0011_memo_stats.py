@@ -0,0 +1,75 @@
+# Generated by Django 5.1.7 on 2026-10-18 10:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import Coalesce
+from memojjang.apps.memos.models import StoredSize
+
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def backfill_memo_stats(apps, schema_editor):
+    """기존 사용자의 통계 행을 사용자 id 순서로 나눠 메모에서 계산해 채웁니다."""
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    Memo = apps.get_model("memos", "Memo")
+    MemoStats = apps.get_model("memos", "MemoStats")
+    db_alias = schema_editor.connection.alias
+    live = Q(deleted_at__isnull=True)
+    last_id = 0
+    while True:
+        user_ids = list(
+            User.objects.using(db_alias)
+            .filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BACKFILL_BATCH_SIZE]
+        )
+        if not user_ids:
+            break
+        rows = {
+            row.pop("user"): row
+            for row in Memo.objects.using(db_alias)
+            .filter(user_id__in=user_ids)
+            .order_by()
+            .values("user")
+            .annotate(
+                memo_count=Count("pk", filter=live),
+                total_bytes=Coalesce(Sum(StoredSize("content"), filter=live), 0),
+                last_created_at=Max("created_at"),
+                last_updated_at=Max("updated_at"),
+            )
+        }
+        MemoStats.objects.using(db_alias).bulk_create(
+            [MemoStats(user_id=user_id, **rows.get(user_id, {})) for user_id in user_ids]
+        )
+        last_id = user_ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0010_memo_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemoStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('memo_count', models.PositiveIntegerField(default=0, verbose_name='메모 수')),
+                ('total_bytes', models.PositiveBigIntegerField(default=0, verbose_name='저장 용량(바이트)')),
+                ('last_created_at', models.DateTimeField(blank=True, null=True, verbose_name='마지막 작성일시')),
+                ('last_updated_at', models.DateTimeField(blank=True, null=True, verbose_name='마지막 수정일시')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='memo_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '메모 통계',
+                'verbose_name_plural': '메모 통계들',
+                'db_table': 'memo_stats',
+            },
+        ),
+        migrations.RunPython(backfill_memo_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.1.7 on 2026-10-18 10:18
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_memo_change_seq(apps, schema_editor):
+    """기존 메모의 변경 번호를 id로 채웁니다 (id 범위로 나눠 UPDATE)."""
+    Memo = apps.get_model("memos", "Memo")
+    db_alias = schema_editor.connection.alias
+    last_id = Memo.objects.using(db_alias).aggregate(last_id=Max("id"))["last_id"] or 0
+    for start in range(0, last_id, BACKFILL_BATCH_SIZE):
+        Memo.objects.using(db_alias).filter(id__gt=start, id__lte=start + BACKFILL_BATCH_SIZE).update(
+            change_seq=F("id")
+        )
+
+
+def backfill_stats_change_seq(apps, schema_editor):
+    """사용자별 통계의 마지막 변경 번호를 그 사용자 메모의 가장 큰 변경 번호로 채웁니다."""
+    Memo = apps.get_model("memos", "Memo")
+    MemoStats = apps.get_model("memos", "MemoStats")
+    db_alias = schema_editor.connection.alias
+    last_seq = (
+        Memo.objects.using(db_alias)
+        .filter(user=OuterRef("user"))
+        .order_by()
+        .values("user")
+        .annotate(seq=Max("change_seq"))
+        .values("seq")
+    )
+    MemoStats.objects.using(db_alias).update(change_seq=Coalesce(Subquery(last_seq), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0011_memo_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='memo',
+            name='change_seq',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='변경 번호'),
+        ),
+        migrations.RunPython(backfill_memo_change_seq, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='memostats',
+            name='change_seq',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='마지막 변경 번호'),
+        ),
+        migrations.AddField(
+            model_name='memostats',
+            name='purged_seq',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='영구 삭제 기준 변경 번호'),
+        ),
+        migrations.RunPython(backfill_stats_change_seq, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='memo',
+            index=models.Index(fields=['user', 'change_seq', 'id'], name='memos_user_change_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:02
+
+from django.db import migrations
+from django.db.models.functions import Length
+from django.utils.text import Truncator
+from memojjang.apps.memos.models import EXCERPT_CHARS
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def truncate_long_excerpts(apps, schema_editor):
+    """글자 수 상한보다 긴 기존 요약을 id 순서로 나눠 줄입니다.
+
+    요약은 본문을 단어 수로 자른 결과이므로 요약만 다시 자르면 summarize()와 같은 값이 되고,
+    압축된 본문은 읽지 않는다.
+    """
+    Memo = apps.get_model("memos", "Memo")
+    db_alias = schema_editor.connection.alias
+    last_id = 0
+    while True:
+        memos = list(
+            Memo.objects.using(db_alias)
+            .annotate(excerpt_length=Length("excerpt"))
+            .filter(id__gt=last_id, excerpt_length__gt=EXCERPT_CHARS)
+            .order_by("id")
+            .only("id", "excerpt")[:BACKFILL_BATCH_SIZE]
+        )
+        if not memos:
+            break
+        for memo in memos:
+            memo.excerpt = Truncator(memo.excerpt).chars(EXCERPT_CHARS)
+        Memo.objects.using(db_alias).bulk_update(memos, ["excerpt"])
+        last_id = memos[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0013_memos_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(truncate_long_excerpts, migrations.RunPython.noop),
+    ]
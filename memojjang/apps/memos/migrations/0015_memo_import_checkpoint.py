@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0014_memo_excerpt_chars'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.TextField(verbose_name='이름')),
+                ('source', models.TextField(verbose_name='입력')),
+                ('rows', models.PositiveBigIntegerField(default=0, verbose_name='처리한 행 수')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+            ],
+            options={
+                'verbose_name': '가져오기 체크포인트',
+                'verbose_name_plural': '가져오기 체크포인트들',
+                'db_table': 'memo_import_checkpoints',
+                'constraints': [models.UniqueConstraint(fields=('name',), name='memo_import_checkpoints_name_uniq')],
+            },
+        ),
+    ]
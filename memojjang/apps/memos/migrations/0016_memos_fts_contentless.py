@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:48
+
+from django.db import migrations
+from memojjang.apps.memos import search_index
+
+
+# 이 마이그레이션 이전의 검색 인덱스. 원문 제목과 본문의 사본을 함께 담는다 (되돌릴 때 사용)
+STORED_FTS_TABLE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS memos_fts USING fts5("
+    "title, content, tokenize='trigram')"
+)
+
+
+def make_contentless(apps, schema_editor):
+    """검색 인덱스를 원문 사본 없는 contentless FTS5 테이블로 다시 만듭니다."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        search_index.rebuild_index(cursor)
+
+
+def restore_stored(apps, schema_editor):
+    """원문 사본을 담는 이전 형식의 검색 인덱스로 되돌립니다."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        search_index.drop_index(cursor)
+        cursor.execute(STORED_FTS_TABLE_SQL)
+        search_index.fill_index(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('memos', '0015_memo_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.RunPython(make_contentless, restore_stored),
+    ]
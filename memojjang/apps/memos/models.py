@@ -1,5 +1,96 @@
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.db import connection, models, transaction
+from django.db.models import Count, Exists, F, Func, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_save, pre_save
 from django.conf import settings
+from django.utils import timezone
+from django.utils.text import Truncator
+from . import cache as memo_cache
+from . import compression
+from . import search_index
+from .fields import CompositeKeyForeignKey, CompressedTextField
+
+
+# 목록 카드에 보여 줄 요약의 단어 수 (기존 truncatewords:30 필터와 같은 결과)
+EXCERPT_WORDS = 30
+# 띄어쓰기 없이 긴 단어(URL, 붙여 넣은 로그 등)로도 요약이 길어지지 않도록 두는 글자 수 상한
+EXCERPT_CHARS = 300
+
+
+def summarize(content):
+    """본문에서 목록용 요약, 글자 수, 단어 수를 계산합니다."""
+    excerpt = Truncator(content).words(EXCERPT_WORDS, truncate=" …")
+    return {
+        "excerpt": Truncator(excerpt).chars(EXCERPT_CHARS),
+        "char_count": len(content),
+        "word_count": len(content.split()),
+    }
+
+
+class VersionConflict(Exception):
+    """읽어 온 뒤 다른 곳에서 먼저 수정된 메모를 저장하려고 함"""
+
+
+class MemoQuerySet(models.QuerySet):
+    """휴지통(삭제 표시)을 아는 메모 쿼리셋"""
+
+    def delete(self):
+        """메모를 바로 지우지 않고 삭제 시각을 기록합니다.
+
+        실제 행 삭제는 보관 기간이 지난 뒤 purge_memos 명령이 작은 배치로 나눠 실행한다.
+        """
+        now = timezone.now()
+        live = self.filter(deleted_at__isnull=True)
+        with transaction.atomic():
+            invalidate_memo_cache(live)
+            adjust_tag_counts(live, -1)
+            adjust_memo_stats(live, -1, now)
+            count = live.update(
+                deleted_at=now, updated_at=now, version=F("version") + 1, change_seq=_stats_change_seq()
+            )
+        return count, {self.model._meta.label: count}
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def hard_delete(self):
+        """행을 실제로 삭제합니다."""
+        live = self.filter(deleted_at__isnull=True)
+        with transaction.atomic():
+            adjust_tag_counts(live, -1)
+            adjust_memo_stats(live, -1, timezone.now(), purge=True)
+            record_memo_purge(self)
+            search_index.unindex_memos(self)
+            return super().delete()
+
+    hard_delete.alters_data = True
+    hard_delete.queryset_only = True
+
+    def restore(self):
+        """삭제 표시된 메모를 되살립니다."""
+        now = timezone.now()
+        trashed = self.filter(deleted_at__isnull=False)
+        with transaction.atomic():
+            invalidate_memo_cache(trashed)
+            adjust_tag_counts(trashed, 1)
+            adjust_memo_stats(trashed, 1, now)
+            return trashed.update(
+                deleted_at=None, updated_at=now, version=F("version") + 1, change_seq=_stats_change_seq()
+            )
+
+    restore.alters_data = True
+
+    def deleted(self):
+        """삭제 표시된 메모만"""
+        return self.filter(deleted_at__isnull=False)
+
+
+class MemoManager(models.Manager.from_queryset(MemoQuerySet)):
+    """삭제 표시된 메모를 제외하는 기본 매니저"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class Memo(models.Model):
@@ -15,7 +106,7 @@ class Memo(models.Model):
     title = models.TextField(
         verbose_name="제목"
     )
-    content = models.TextField(
+    content = CompressedTextField(
         verbose_name="내용"
     )
     created_at = models.DateTimeField(
@@ -26,14 +117,652 @@ class Memo(models.Model):
         verbose_name="수정일시",
         auto_now=True
     )
+    # 목록 페이지가 본문 전체를 읽지 않도록 저장 시점에 미리 계산해 두는 값
+    excerpt = models.TextField(
+        verbose_name="요약",
+        blank=True,
+        default="",
+        editable=False
+    )
+    char_count = models.PositiveIntegerField(
+        verbose_name="글자 수",
+        default=0,
+        editable=False
+    )
+    word_count = models.PositiveIntegerField(
+        verbose_name="단어 수",
+        default=0,
+        editable=False
+    )
+    # 낙관적 동시성 제어용 버전. 수정할 때마다 1씩 증가한다
+    version = models.PositiveIntegerField(
+        verbose_name="버전",
+        default=1,
+        editable=False
+    )
+    # 삭제 표시(휴지통) 시각. 값이 있으면 기본 매니저에서 보이지 않는다
+    deleted_at = models.DateTimeField(
+        verbose_name="삭제일시",
+        null=True,
+        blank=True,
+        editable=False
+    )
+
+    # 동기화 변경 피드용 변경 번호. 작성/수정/삭제/복원할 때마다 작성자별로 증가하는 값을 받는다
+    change_seq = models.PositiveBigIntegerField(
+        verbose_name="변경 번호",
+        default=0,
+        editable=False
+    )
+
+    # 연결은 memo_tags 테이블(MemoTag)에 있다. 태그 변경은 tags.set_memo_tags()로 한다
+    tags = models.ManyToManyField(
+        "Tag",
+        through="MemoTag",
+        related_name="memos",
+        blank=True,
+        verbose_name="태그"
+    )
+
+    # 기본 매니저는 삭제 표시된 메모를 제외한다. 휴지통과 purge에는 all_objects를 쓴다
+    objects = MemoManager()
+    all_objects = MemoQuerySet.as_manager()
+
+    SUMMARY_FIELDS = ("excerpt", "char_count", "word_count")
 
     class Meta:
         """메모 모델 메타 클래스"""
         db_table = "memos"
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            # 사용자별 키셋 페이지네이션을 위한 복합 인덱스 (삭제 표시되지 않은 메모만)
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="memos_user_created_id_idx",
+                condition=Q(deleted_at__isnull=True)
+            ),
+            # 조건부 요청의 목록 검증자(사용자별 최대 수정일시와 개수)를 인덱스만으로 계산
+            models.Index(
+                fields=["user", "updated_at"],
+                name="memos_user_updated_idx",
+                condition=Q(deleted_at__isnull=True)
+            ),
+            # 관리자 변경 목록의 키셋 페이지와 날짜 계층(작성일시 범위)을 모든 사용자에 걸쳐 읽는 인덱스
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="memos_created_id_idx"
+            ),
+            # 변경 피드가 커서 다음의 변경(삭제 표시 포함)을 변경 번호 순서로 읽는 인덱스
+            models.Index(
+                fields=["user", "change_seq", "id"],
+                name="memos_user_change_idx"
+            ),
+            # 휴지통 목록과 purge가 삭제 표시된 메모만 찾는 인덱스
+            models.Index(
+                fields=["user", "-deleted_at"],
+                name="memos_user_deleted_idx",
+                condition=Q(deleted_at__isnull=False)
+            ),
+        ]
         verbose_name = "메모"
         verbose_name_plural = "메모들"
 
     def __str__(self):
         """메모 제목을 문자열로 반환"""
         return self.title
+
+    def update_summary(self):
+        """본문으로부터 요약, 글자 수, 단어 수를 다시 계산합니다.
+
+        bulk_create/bulk_update는 save()를 거치지 않으므로 호출하는 쪽에서 직접 실행해야 합니다.
+        """
+        for name, value in summarize(self.content).items():
+            setattr(self, name, value)
+
+    def save(self, *args, **kwargs):
+        """저장 전에 요약 필드를 본문과 맞추고, 같은 트랜잭션에서 작성자 통계를 고칩니다."""
+        # 본문을 읽지 않은(defer) 인스턴스는 본문이 바뀌지 않았으므로 다시 계산하지 않는다
+        content_loaded = "content" not in self.get_deferred_fields()
+        if content_loaded:
+            self.update_summary()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "content" in update_fields:
+            kwargs["update_fields"] = {*update_fields, *self.SUMMARY_FIELDS}
+        if update_fields is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "change_seq"}
+        adding = self._state.adding
+        # 삭제/복원처럼 제목과 본문을 쓰지 않는 저장은 그 메서드가 통계를 고친다
+        edited = not adding and (update_fields is None or not {"title", "content"}.isdisjoint(update_fields))
+        if edited:
+            # 제목/본문을 쓰면 save_versioned()를 거치지 않아도 버전(메모 ETag, 수정 충돌 확인)을 올린다.
+            # 읽어 온 뒤 다른 곳에서 올렸을 수 있으므로 저장된 값에 더한다
+            self.version = F("version") + 1
+            if update_fields is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            self.change_seq = next_change_seq(self.user_id)
+            if edited and content_loaded and (update_fields is None or "content" in update_fields):
+                # 덮어쓰기 전의 저장 용량을 빼야 하므로 메모 행보다 먼저 쓴다
+                update_memo_stats(
+                    self.user_id, size=compression.stored_size(self.content),
+                    replaced=Memo.objects.filter(pk=self.pk),
+                )
+            super().save(*args, **kwargs)
+            if adding:
+                add_memo_stats([self])
+            elif edited:
+                self.refresh_from_db(fields=["version"])
+                update_memo_stats(self.user_id, updated_at=self.updated_at)
+
+    def delete(self, using=None, keep_parents=False):
+        """메모를 휴지통으로 옮깁니다(삭제 시각 기록). 실제 삭제는 hard_delete()입니다."""
+        with transaction.atomic():
+            live = self.deleted_at is None
+            if live:
+                adjust_tag_counts(Memo.all_objects.filter(pk=self.pk), -1)
+            self.deleted_at = timezone.now()
+            # 오래된 인스턴스라도 버전이 줄지 않도록 저장된 값에 더한다
+            self.version = F("version") + 1
+            self.save(using=using, update_fields=["deleted_at", "updated_at", "version"])
+            self.refresh_from_db(fields=["version"])
+            # 마지막 수정일시가 저장된 updated_at과 같도록 저장한 뒤에 반영한다
+            if live:
+                adjust_memo_stats(Memo.all_objects.filter(pk=self.pk), -1, self.updated_at)
+        return 1, {self._meta.label: 1}
+
+    def hard_delete(self, using=None, keep_parents=False):
+        """행을 실제로 삭제합니다."""
+        with transaction.atomic():
+            if self.deleted_at is None:
+                adjust_tag_counts(Memo.all_objects.filter(pk=self.pk), -1)
+                adjust_memo_stats(Memo.all_objects.filter(pk=self.pk), -1, timezone.now(), purge=True)
+            record_memo_purge(Memo.all_objects.filter(pk=self.pk))
+            search_index.unindex_memos(Memo.all_objects.filter(pk=self.pk))
+            return super().delete(using=using, keep_parents=keep_parents)
+
+    def restore(self):
+        """휴지통의 메모를 되살립니다."""
+        with transaction.atomic():
+            trashed = self.deleted_at is not None
+            if trashed:
+                adjust_tag_counts(Memo.all_objects.filter(pk=self.pk), 1)
+            self.deleted_at = None
+            # 오래된 인스턴스라도 버전이 줄지 않도록 저장된 값에 더한다
+            self.version = F("version") + 1
+            self.save(update_fields=["deleted_at", "updated_at", "version"])
+            self.refresh_from_db(fields=["version"])
+            if trashed:
+                adjust_memo_stats(Memo.all_objects.filter(pk=self.pk), 1, self.updated_at)
+
+    def save_versioned(self, update_fields):
+        """읽어 온 version이 그대로일 때만 바뀐 필드를 저장하고 version을 올립니다.
+
+        UPDATE ... WHERE id = ? AND version = ? 한 번으로 확인과 저장을 함께 하므로,
+        그 사이 다른 요청이 먼저 저장했다면 아무것도 쓰지 않고 VersionConflict를 던진다.
+        update_fields에 없는 컬럼은 다시 쓰지 않는다. 시그널이 남기는 수정 이력과 작성자
+        통계도 같은 트랜잭션에서 쓰므로, 그중 하나라도 실패하면 메모 수정도 함께 취소된다.
+        """
+        fields = set(update_fields)
+        if "content" in fields:
+            self.update_summary()
+            fields.update(self.SUMMARY_FIELDS)
+        self.updated_at = timezone.now()
+        fields.update(("updated_at", "change_seq"))
+        with transaction.atomic(using=self._state.db):
+            pre_save.send(
+                sender=type(self), instance=self, raw=False, using=self._state.db,
+                update_fields=frozenset(fields),
+            )
+            self.change_seq = next_change_seq(self.user_id)
+            values = {name: getattr(self, name) for name in fields}
+            # 버전이 맞을 때만 통계를 고치므로 충돌하면 둘 다 쓰지 않는다
+            update_memo_stats(
+                self.user_id,
+                size=compression.stored_size(self.content) if "content" in fields else None,
+                updated_at=self.updated_at,
+                replaced=Memo.objects.filter(pk=self.pk, version=self.version),
+            )
+            updated = type(self)._base_manager.filter(pk=self.pk, version=self.version).update(
+                version=F("version") + 1, **values
+            )
+            if not updated:
+                # 받은 변경 번호와 첫 이력도 함께 되돌린다
+                raise VersionConflict(f"메모 {self.pk}이(가) 버전 {self.version} 이후에 수정되었습니다.")
+            self.version += 1
+            fields.add("version")
+            # queryset.update()는 시그널을 보내지 않으므로 save(update_fields=...)와 같이 알린다
+            post_save.send(
+                sender=type(self), instance=self, created=False,
+                update_fields=frozenset(fields), raw=False, using=self._state.db,
+            )
+
+    async def asave_versioned(self, update_fields):
+        """save_versioned()의 비동기 버전"""
+        return await sync_to_async(self.save_versioned)(update_fields)
+
+
+class MemoRevision(models.Model):
+    """메모 수정 이력
+
+    일정 간격마다 본문 전체(스냅숏)를 저장하고, 그 사이의 이력은 직전 스냅숏에서
+    바뀐 줄만 담은 델타로 저장합니다. 어느 이력이든 스냅숏 하나와 델타 하나만 읽어
+    복원하므로, 이력이 아무리 쌓여도 복원 시간은 일정합니다. (revisions 모듈 참고)
+    """
+
+    class Kind(models.TextChoices):
+        SNAPSHOT = "snapshot", "스냅숏"
+        DELTA = "delta", "델타"
+
+    memo = models.ForeignKey(
+        Memo,
+        on_delete=models.CASCADE,
+        related_name="revisions"
+    )
+    # 메모마다 1부터 증가하는 이력 번호
+    number = models.PositiveIntegerField(
+        verbose_name="이력 번호"
+    )
+    title = models.TextField(
+        verbose_name="제목"
+    )
+    kind = models.TextField(
+        verbose_name="저장 방식",
+        choices=Kind.choices
+    )
+    # 델타가 기준으로 삼는 스냅숏의 이력 번호와, 그 스냅숏 이후 몇 번째 델타인지
+    base_number = models.PositiveIntegerField(
+        verbose_name="기준 스냅숏",
+        null=True,
+        blank=True
+    )
+    depth = models.PositiveIntegerField(
+        verbose_name="스냅숏 이후 델타 수",
+        default=0
+    )
+    # 스냅숏이면 본문 전체, 델타면 기준 스냅숏에서 이 이력을 만드는 변경분(JSON)
+    data = CompressedTextField(
+        verbose_name="내용"
+    )
+    created_at = models.DateTimeField(
+        verbose_name="수정일시",
+        default=timezone.now
+    )
+
+    class Meta:
+        """메모 수정 이력 모델 메타 클래스"""
+        db_table = "memo_revisions"
+        ordering = ["-number"]
+        constraints = [
+            # 메모별 이력 목록과 번호로 찾는 조회가 이 인덱스를 쓴다
+            models.UniqueConstraint(
+                fields=["memo", "number"],
+                name="memo_revisions_memo_number_uniq"
+            ),
+        ]
+        verbose_name = "메모 이력"
+        verbose_name_plural = "메모 이력들"
+
+    def __str__(self):
+        return f"{self.memo_id}#{self.number}"
+
+    @property
+    def is_snapshot(self):
+        return self.kind == self.Kind.SNAPSHOT
+
+
+class Tag(models.Model):
+    """사용자별 태그
+
+    memo_count는 이 태그가 붙은 휴지통에 있지 않은 메모 수로, 연결을 바꾸거나 메모를
+    삭제/복원하는 쿼리와 같은 트랜잭션에서 증감한다. 목록에서 태그별 개수를 세지 않는다.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="tags"
+    )
+    name = models.TextField(
+        verbose_name="이름"
+    )
+    memo_count = models.PositiveIntegerField(
+        verbose_name="메모 수",
+        default=0,
+        editable=False
+    )
+    created_at = models.DateTimeField(
+        verbose_name="생성일시",
+        auto_now_add=True
+    )
+
+    class Meta:
+        """태그 모델 메타 클래스"""
+        db_table = "tags"
+        ordering = ["name"]
+        constraints = [
+            # 사용자별 태그 목록(이름순)과 이름으로 찾는 조회가 이 인덱스를 쓴다
+            models.UniqueConstraint(
+                fields=["user", "name"],
+                name="tags_user_name_uniq"
+            ),
+        ]
+        verbose_name = "태그"
+        verbose_name_plural = "태그들"
+
+    def __str__(self):
+        return self.name
+
+
+class MemoTag(models.Model):
+    """메모와 태그의 연결
+
+    테이블의 기본 키는 (memo_id, tag_id) 복합 키이고 WITHOUT ROWID 테이블이다
+    (마이그레이션 0010 참고). 연결 행을 인스턴스 pk로 지우면 그 메모의 모든 연결이
+    지워지므로, 삭제 시그널을 연결하지 말고 항상 두 열로 거른 쿼리셋으로 지운다.
+    """
+    memo = CompositeKeyForeignKey(
+        Memo,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="memo_tags"
+    )
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name="memo_tags"
+    )
+    # 메모의 작성일시(바뀌지 않음)를 복사해 태그별 목록을 이 테이블의 인덱스만으로 정렬한다
+    created_at = models.DateTimeField(
+        verbose_name="작성일시"
+    )
+
+    class Meta:
+        """메모-태그 연결 모델 메타 클래스"""
+        db_table = "memo_tags"
+        indexes = [
+            # "사용자의 태그 X가 붙은 메모를 작성일시 역순으로" 조회를 인덱스 탐색만으로 처리
+            models.Index(
+                fields=["tag", "-created_at", "-memo"],
+                name="memo_tags_tag_created_idx"
+            ),
+        ]
+        verbose_name = "메모 태그"
+        verbose_name_plural = "메모 태그들"
+
+    def __str__(self):
+        return f"{self.memo_id}:{self.tag_id}"
+
+
+class MemoStatsManager(models.Manager):
+    """메모에서 통계를 직접 계산하는 매니저"""
+
+    def actual(self, user_ids):
+        """user_ids 사용자들의 통계를 메모에서 직접 계산합니다. {user_id: {필드: 값}}"""
+        live = Q(deleted_at__isnull=True)
+        rows = (
+            Memo.all_objects.filter(user_id__in=user_ids)
+            .order_by()
+            .values("user")
+            .annotate(
+                memo_count=Count("pk", filter=live),
+                total_bytes=Coalesce(Sum(StoredSize("content"), filter=live), 0),
+                last_created_at=Max("created_at"),
+                last_updated_at=Max("updated_at"),
+                change_seq=Max("change_seq"),
+            )
+        )
+        empty = {
+            "memo_count": 0, "total_bytes": 0, "last_created_at": None, "last_updated_at": None, "change_seq": 0,
+        }
+        result = {user_id: dict(empty) for user_id in user_ids}
+        for row in rows:
+            result[row.pop("user")] = row
+        return result
+
+    def rebuild(self, user_id):
+        """user_id의 통계 행이 없으면 메모에서 계산해 만듭니다.
+
+        그동안 영구 삭제된 메모를 알 수 없으므로 지금까지의 모든 변경 번호를 영구 삭제
+        기준으로 삼아, 이전 커서로 동기화하던 클라이언트가 처음부터 다시 받게 한다.
+        """
+        values = self.actual([user_id])[user_id]
+        values["purged_seq"] = values["change_seq"]
+        return self.get_or_create(user_id=user_id, defaults=values)[0]
+
+
+class MemoStats(models.Model):
+    """사용자별 메모 통계
+
+    휴지통에 있지 않은 메모 수와 그 본문의 저장 용량(압축된 본문은 압축된 크기),
+    마지막으로 메모를 작성/수정(삭제, 복원 포함)한 시각을 한 행에 둔다. 메모를 쓰는 쿼리와
+    같은 트랜잭션에서 F 식으로 증감하므로 목록 머리글과 관리자는 메모를 세지 않는다.
+    행이 없는 사용자는 처음 읽을 때 메모에서 계산해 만든다 (stats 모듈 참고).
+
+    change_seq는 이 사용자의 메모에 마지막으로 할당한 변경 번호이고, purged_seq는 영구 삭제된
+    메모의 가장 큰 변경 번호다. 이보다 오래된 커서로는 변경 피드를 이어 받을 수 없다 (changes 모듈 참고).
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="memo_stats"
+    )
+    memo_count = models.PositiveIntegerField(
+        verbose_name="메모 수",
+        default=0
+    )
+    total_bytes = models.PositiveBigIntegerField(
+        verbose_name="저장 용량(바이트)",
+        default=0
+    )
+    last_created_at = models.DateTimeField(
+        verbose_name="마지막 작성일시",
+        null=True,
+        blank=True
+    )
+    last_updated_at = models.DateTimeField(
+        verbose_name="마지막 수정일시",
+        null=True,
+        blank=True
+    )
+    change_seq = models.PositiveBigIntegerField(
+        verbose_name="마지막 변경 번호",
+        default=0
+    )
+    purged_seq = models.PositiveBigIntegerField(
+        verbose_name="영구 삭제 기준 변경 번호",
+        default=0
+    )
+
+    objects = MemoStatsManager()
+
+    class Meta:
+        """사용자별 메모 통계 모델 메타 클래스"""
+        db_table = "memo_stats"
+        verbose_name = "메모 통계"
+        verbose_name_plural = "메모 통계들"
+
+    def __str__(self):
+        return f"{self.user_id}: {self.memo_count}"
+
+
+class ImportCheckpoint(models.Model):
+    """import_memos 명령의 재개 지점
+
+    가져온 chunk를 저장하는 트랜잭션 안에서 처리한 행 수를 함께 고치므로, 도중에 중단되어도
+    커밋된 메모와 기록된 행 수가 어긋나지 않아 재개할 때 같은 행을 두 번 넣지 않는다.
+    """
+    name = models.TextField(
+        verbose_name="이름"
+    )
+    source = models.TextField(
+        verbose_name="입력"
+    )
+    rows = models.PositiveBigIntegerField(
+        verbose_name="처리한 행 수",
+        default=0
+    )
+    updated_at = models.DateTimeField(
+        verbose_name="수정일시",
+        auto_now=True
+    )
+
+    class Meta:
+        """가져오기 체크포인트 모델 메타 클래스"""
+        db_table = "memo_import_checkpoints"
+        verbose_name = "가져오기 체크포인트"
+        verbose_name_plural = "가져오기 체크포인트들"
+        constraints = [
+            # 이름으로 재개 지점을 찾는 조회가 이 인덱스를 쓴다
+            models.UniqueConstraint(
+                fields=["name"],
+                name="memo_import_checkpoints_name_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name}: {self.rows}"
+
+
+def invalidate_memo_cache(memos):
+    """memos 쿼리셋 작성자들의 렌더링 캐시를 트랜잭션이 커밋되면 무효화합니다.
+
+    queryset.update()와 bulk_create/bulk_update는 post_save를 보내지 않으므로 그런 쓰기에서
+    호출한다. 커밋 전에 무효화하면 그 사이의 요청이 이전 내용으로 캐시를 다시 채울 수 있다.
+    """
+    user_ids = list(memos.order_by().values_list("user_id", flat=True).distinct())
+    transaction.on_commit(lambda: [memo_cache.bump_generation(user_id) for user_id in user_ids])
+
+
+def adjust_tag_counts(memos, delta):
+    """memos 쿼리셋의 메모에 붙은 태그들의 memo_count를 메모마다 delta씩 바꿉니다.
+
+    UPDATE 한 번으로 처리하며, 메모를 삭제/복원하는 쿼리와 같은 트랜잭션에서 호출한다.
+    """
+    links = MemoTag.objects.filter(memo__in=memos.values("pk"))
+    per_tag = (
+        links.filter(tag=OuterRef("pk"))
+        .values("tag")
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Tag.objects.filter(pk__in=links.values("tag")).update(
+        memo_count=F("memo_count") + Subquery(per_tag, output_field=IntegerField()) * delta
+    )
+
+
+class StoredSize(Func):
+    """컬럼에 저장된 값의 바이트 수 (압축된 본문은 압축된 크기)"""
+
+    function = "OCTET_LENGTH"
+    output_field = models.BigIntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template="LENGTH(CAST(%(expressions)s AS BLOB))", **extra_context
+        )
+
+
+def _latest(name, value):
+    """통계의 name 시각과 value 중 늦은 쪽 (name이 비어 있으면 value)"""
+    value = Value(value, output_field=models.DateTimeField())
+    return Greatest(Coalesce(name, value), value)
+
+
+def update_memo_stats(user_id, count=0, size=None, created_at=None, updated_at=None, replaced=None):
+    """user_id의 메모 통계 행을 F 식 UPDATE 한 번으로 고칩니다.
+
+    메모 수에 count를, 저장 용량에 size를 더하고, created_at/updated_at이 더 늦으면 마지막
+    작성/수정일시로 삼는다. replaced(곧 덮어쓸 메모 쿼리셋)를 주면 그 메모들의 지금 저장
+    용량을 빼므로 메모 행을 쓰기 전에 호출해야 하고, 해당하는 메모가 없으면(버전 충돌 등)
+    아무것도 바꾸지 않는다. 통계 행이 아직 없으면 바꾸지 않는다(처음 읽을 때 계산한다).
+    """
+    values = {}
+    if count:
+        values["memo_count"] = F("memo_count") + count
+    if size is not None:
+        values["total_bytes"] = F("total_bytes") + size
+        if replaced is not None:
+            old_size = replaced.order_by().values("user").annotate(size=Sum(StoredSize("content"))).values("size")
+            values["total_bytes"] -= Subquery(old_size)
+    if created_at is not None:
+        values["last_created_at"] = _latest("last_created_at", created_at)
+    if updated_at is not None:
+        values["last_updated_at"] = _latest("last_updated_at", updated_at)
+    if not values:
+        return 0
+    stats = MemoStats.objects.filter(user_id=user_id)
+    if replaced is not None:
+        stats = stats.filter(Exists(replaced))
+    return stats.update(**values)
+
+
+def add_memo_stats(memos):
+    """새로 저장한 메모 인스턴스들을 작성자별 통계에 더합니다."""
+    per_user = {}
+    for memo in memos:
+        count, size, created_at, updated_at = per_user.get(memo.user_id, (0, 0, memo.created_at, memo.updated_at))
+        per_user[memo.user_id] = (
+            count + 1,
+            size + compression.stored_size(memo.content),
+            max(created_at, memo.created_at),
+            max(updated_at, memo.updated_at),
+        )
+    for user_id, (count, size, created_at, updated_at) in per_user.items():
+        update_memo_stats(user_id, count, size, created_at, updated_at)
+
+
+def adjust_memo_stats(memos, delta, now, purge=False):
+    """memos 쿼리셋의 메모 수와 저장 용량을 작성자별 통계에 메모마다 delta씩 반영합니다.
+
+    삭제(-1)/복원(+1)하는 쿼리와 같은 트랜잭션에서 UPDATE 한 번으로 처리하고, 마지막
+    수정일시를 now로 옮기며 변경 번호를 하나 할당한다(메모 행에는 _stats_change_seq()로 쓴다).
+    purge=True는 휴지통을 거치지 않은 영구 삭제로, 어떤 커서도 이어 받을 수 없게 한다.
+    """
+    per_user = (
+        memos.filter(user=OuterRef("user"))
+        .order_by()
+        .values("user")
+        .annotate(count=Count("*"), size=Sum(StoredSize("content")))
+    )
+    return MemoStats.objects.filter(user__in=memos.values("user")).update(
+        memo_count=F("memo_count") + Subquery(per_user.values("count"), output_field=IntegerField()) * delta,
+        total_bytes=F("total_bytes") + Subquery(per_user.values("size")) * delta,
+        last_updated_at=_latest("last_updated_at", now),
+        change_seq=F("change_seq") + 1,
+        **({"purged_seq": F("change_seq") + 1} if purge else {}),
+    )
+
+
+# 작성자의 변경 번호를 하나 올리고 올린 값을 돌려준다 (SQLite 3.35+의 RETURNING)
+NEXT_CHANGE_SEQ_SQL = "UPDATE memo_stats SET change_seq = change_seq + 1 WHERE user_id = %s RETURNING change_seq"
+
+
+def next_change_seq(user_id):
+    """user_id의 메모에 쓸 다음 변경 번호를 할당합니다.
+
+    통계 행의 UPDATE가 커밋될 때까지 같은 사용자의 다른 쓰기를 기다리게 하므로, 변경 번호는
+    커밋 순서대로 증가하고 변경 피드는 먼저 커밋된 변경을 건너뛰지 않는다.
+    메모를 쓰는 트랜잭션 안에서 호출해야 하며, 커밋되면 작성자의 렌더링 캐시를 무효화하므로
+    시그널을 보내지 않는 bulk_create/bulk_update 쓰기도 따로 무효화하지 않아도 된다.
+    """
+    transaction.on_commit(lambda: memo_cache.bump_generation(user_id))
+    with connection.cursor() as cursor:
+        cursor.execute(NEXT_CHANGE_SEQ_SQL, [user_id])
+        row = cursor.fetchone()
+    if row is None:
+        MemoStats.objects.rebuild(user_id)
+        return next_change_seq(user_id)
+    return row[0]
+
+
+def _stats_change_seq():
+    """메모 행 UPDATE에서 작성자 통계 행의 현재 변경 번호를 읽는 식 (adjust_memo_stats 다음에 쓴다)"""
+    current = MemoStats.objects.filter(user=OuterRef("user")).values("change_seq")
+    return Coalesce(Subquery(current), F("change_seq"))
+
+
+def record_memo_purge(memos):
+    """영구 삭제하기 직전의 memos 쿼리셋에서 작성자별 가장 큰 변경 번호를 영구 삭제 기준으로 남깁니다."""
+    per_user = memos.filter(user=OuterRef("user")).order_by().values("user").annotate(seq=Max("change_seq"))
+    return MemoStats.objects.filter(user__in=memos.values("user")).update(
+        purged_seq=Greatest(F("purged_seq"), Subquery(per_user.values("seq")))
+    )
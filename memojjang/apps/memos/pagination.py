@@ -0,0 +1,165 @@
+import base64
+import binascii
+from datetime import datetime
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import Q
+
+
+# 커서의 id로 받을 수 있는 범위 (SQLite INTEGER, bigint)
+MIN_PK = -(2 ** 63)
+MAX_PK = 2 ** 63 - 1
+
+
+class InvalidCursor(ValueError):
+    """잘못된 페이지 커서(after 토큰)일 때 발생하는 예외"""
+
+
+def encode_cursor(memo):
+    """메모의 (created_at, id)를 불투명한 커서 토큰으로 인코딩합니다."""
+    raw = f"{memo.created_at.isoformat()}|{memo.pk}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """커서 토큰을 (created_at, id) 튜플로 디코딩합니다.
+
+    id가 부호 있는 64비트 정수 범위를 벗어나면 DB 드라이버에 넘길 때 OverflowError가 날 수 있으므로
+    잘못된 커서로 처리한다.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, pk = raw.split("|")
+        created_at, pk = datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursor("잘못된 페이지 커서입니다.") from exc
+    if not MIN_PK <= pk <= MAX_PK:
+        raise InvalidCursor("잘못된 페이지 커서입니다.")
+    return created_at, pk
+
+
+def get_page_size(value=None):
+    """요청된 페이지 크기를 설정된 범위 안으로 맞춰 반환합니다."""
+    default = getattr(settings, "MEMO_PAGE_SIZE", 20)
+    maximum = getattr(settings, "MEMO_PAGE_SIZE_MAX", 100)
+    try:
+        size = int(value) if value else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+
+class KeysetPage:
+    """키셋 페이지네이션 결과 한 페이지"""
+
+    def __init__(self, items, next_cursor, cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.cursor = cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def has_next(self):
+        """다음 페이지가 있는지 여부"""
+        return self.next_cursor is not None
+
+    @property
+    def is_first(self):
+        """첫 페이지인지 여부"""
+        return self.cursor is None
+
+
+# 기본 키셋: 메모의 (created_at, id)
+DEFAULT_KEYS = ("created_at", "id")
+
+
+def _keyset_queryset(queryset, after, size, keys):
+    """after 커서 다음 위치부터 size + 1건을 조회하는 쿼리셋을 만듭니다."""
+    time_key, id_key = keys
+    queryset = queryset.order_by(f"-{time_key}", f"-{id_key}")
+    if after:
+        created_at, pk = decode_cursor(after)
+        queryset = queryset.filter(
+            Q(**{f"{time_key}__lt": created_at}) | Q(**{time_key: created_at, f"{id_key}__lt": pk})
+        )
+    # 다음 페이지 존재 여부를 COUNT 없이 알기 위해 한 건을 더 가져온다
+    return queryset[:size + 1]
+
+
+def _make_page(items, size, after):
+    """size + 1건의 조회 결과로 페이지를 만듭니다."""
+    next_cursor = None
+    if len(items) > size:
+        items = items[:size]
+        next_cursor = encode_cursor(items[-1])
+    return KeysetPage(items, next_cursor, after)
+
+
+def paginate_keyset(queryset, after=None, page_size=None, keys=DEFAULT_KEYS):
+    """(created_at, id) 내림차순 키셋으로 한 페이지를 가져옵니다.
+
+    OFFSET을 사용하지 않고 마지막으로 본 메모의 (created_at, id) 다음 위치부터
+    인덱스를 탐색하므로, 페이지 깊이와 무관하게 같은 비용으로 조회됩니다.
+    keys로 같은 값을 가진 다른 열(예: 연결 테이블의 열)을 키셋으로 쓸 수 있습니다.
+    """
+    size = get_page_size(page_size)
+    items = list(_keyset_queryset(queryset, after, size, keys))
+    return _make_page(items, size, after)
+
+
+async def apaginate_keyset(queryset, after=None, page_size=None, keys=DEFAULT_KEYS):
+    """paginate_keyset의 비동기 버전"""
+    size = get_page_size(page_size)
+    items = [item async for item in _keyset_queryset(queryset, after, size, keys)]
+    return _make_page(items, size, after)
+
+
+def estimate_row_count(model, using="default"):
+    """데이터베이스 통계에서 테이블의 대략적인 행 수를 읽습니다. 통계가 없으면 None
+
+    SQLite는 ANALYZE가 남긴 sqlite_stat1, PostgreSQL은 pg_class.reltuples를 읽으므로
+    테이블 크기와 관계없이 한 번의 조회로 끝난다.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == "sqlite":
+        # stat의 첫 숫자는 인덱스의 행 수다. 부분 인덱스는 더 적으므로 가장 큰 값을 쓴다
+        sql = "SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 WHERE tbl = %s"
+    elif connection.vendor == "postgresql":
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)"
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        # ANALYZE를 한 번도 실행하지 않은 SQLite에는 sqlite_stat1 테이블이 없다
+        return None
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def approximate_count(queryset, limit=None):
+    """쿼리셋의 행 수를 limit건까지만 정확히 세고, 넘으면 추정치를 반환합니다.
+
+    조건이 없는 쿼리셋은 테이블 통계의 추정치를, 조건이 있으면 limit을 반환하므로
+    수백만 건의 테이블에서도 COUNT(*)가 limit + 1건 이상을 훑지 않는다.
+    """
+    limit = limit or getattr(settings, "ADMIN_EXACT_COUNT_LIMIT", 10000)
+    count = queryset.order_by()[:limit + 1].count()
+    if count <= limit:
+        return count
+    if not queryset.query.where:
+        estimate = estimate_row_count(queryset.model, queryset.db)
+        if estimate:
+            return max(estimate, count)
+    return limit
+
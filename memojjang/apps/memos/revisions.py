@@ -0,0 +1,281 @@
+"""
+메모 수정 이력 저장과 복원
+
+저장할 때마다 본문 전체를 복사하면 크고 자주 고치는 메모의 이력이 빠르게 커지므로,
+이력은 다음 두 가지 형태로 저장합니다.
+
+- 스냅숏: 본문 전체. 메모 본문과 같은 방식으로 압축된다.
+- 델타: 가장 최근 스냅숏을 기준으로 바뀐 줄만 담은 변경분. 기준 스냅숏의 줄 범위를
+  가리키는 [시작, 끝] 쌍과 새로 들어간 문자열의 JSON 목록이다.
+
+델타는 직전 이력이 아니라 스냅숏을 기준으로 하므로 어떤 이력이든 스냅숏 하나와 델타
+하나로 복원한다. MEMO_REVISION_SNAPSHOT_INTERVAL번째 이력마다, 또는 델타가 본문 길이의
+MEMO_REVISION_DELTA_MAX_RATIO배보다 커지면 새 스냅숏을 저장한다. 줄 비교는 반복되는 줄이
+많으면 줄 수의 제곱에 비례해 느려지고 메모를 저장하는 트랜잭션 안에서 실행되므로, 기준이나
+새 본문이 MEMO_REVISION_DELTA_MAX_LINES줄을 넘으면 비교하지 않고 스냅숏을 저장한다.
+
+compact()는 보존 기간(MEMO_REVISION_KEEP_DAYS)이 지난 이력을 하루에 하나(그날의 마지막
+이력)만 남기고 메모당 최대 MEMO_REVISION_MAX_COUNT개로 줄인다. 지운 스냅숏에 기대는
+이력이 남으면 그 이력을 새 스냅숏으로 바꾸고 나머지를 그 스냅숏 기준 델타로 다시 만든다.
+"""
+import difflib
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Min, OuterRef, Q, Subquery
+from django.utils import timezone
+from .models import MemoRevision
+
+# 이력에 영향을 주는 메모 필드
+TRACKED_FIELDS = frozenset({"title", "content"})
+
+# 이력이 없는 메모의 현재 상태를 첫 스냅숏으로 복사한다. 본문은 저장 형식(압축) 그대로 옮긴다
+BASELINE_SQL = (
+    "INSERT INTO memo_revisions (memo_id, number, title, kind, base_number, depth, data, created_at)"
+    " SELECT m.id, 1, m.title, 'snapshot', NULL, 0, m.content, m.updated_at FROM memos m"
+    " WHERE m.id IN ({ids})"
+    " AND NOT EXISTS (SELECT 1 FROM memo_revisions r WHERE r.memo_id = m.id)"
+)
+
+
+def get_snapshot_interval():
+    return getattr(settings, "MEMO_REVISION_SNAPSHOT_INTERVAL", 20)
+
+
+def get_delta_max_ratio():
+    return getattr(settings, "MEMO_REVISION_DELTA_MAX_RATIO", 0.5)
+
+
+def get_delta_max_lines():
+    return getattr(settings, "MEMO_REVISION_DELTA_MAX_LINES", 1000)
+
+
+def make_delta(base, target):
+    """base 본문을 target으로 바꾸는 줄 단위 델타(JSON 문자열)를 만듭니다."""
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j1 < j2:
+            ops.append("".join(target_lines[j1:j2]))
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+
+
+def apply_delta(base, delta):
+    """make_delta()로 만든 델타를 base 본문에 적용합니다."""
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(delta):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
+def _encode(memo_id, number, title, content, snapshot, created_at):
+    """본문을 snapshot 기준 델타 또는 새 스냅숏으로 인코딩한 이력을 만듭니다.
+
+    snapshot은 기준 스냅숏(본문을 복원한 상태) 또는 None이다.
+    """
+    max_lines = get_delta_max_lines()
+    if (
+        snapshot is not None
+        and snapshot.depth_after + 1 < get_snapshot_interval()
+        and snapshot.content.count("\n") < max_lines
+        and content.count("\n") < max_lines
+    ):
+        delta = make_delta(snapshot.content, content)
+        if len(delta) <= len(content) * get_delta_max_ratio():
+            return MemoRevision(
+                memo_id=memo_id, number=number, title=title, kind=MemoRevision.Kind.DELTA,
+                base_number=snapshot.number, depth=snapshot.depth_after + 1, data=delta,
+                created_at=created_at,
+            )
+    return MemoRevision(
+        memo_id=memo_id, number=number, title=title, kind=MemoRevision.Kind.SNAPSHOT,
+        data=content, created_at=created_at,
+    )
+
+
+def ensure_baselines(memo_ids):
+    """이력이 없는 메모는 바뀌기 전 현재 상태를 첫 스냅숏으로 남깁니다.
+
+    이력 기능보다 먼저 만들어졌거나 bulk_create로 만든 메모도 처음 수정될 때
+    이전 내용을 잃지 않도록, 수정하기 전에 호출한다.
+    """
+    memo_ids = [int(pk) for pk in memo_ids]
+    if not memo_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(BASELINE_SQL.format(ids=", ".join(["%s"] * len(memo_ids))), memo_ids)
+
+
+def _latest_revisions(memo_ids):
+    """메모별 가장 최근 이력 {메모 id: MemoRevision}"""
+    latest_number = MemoRevision.objects.filter(memo=OuterRef("memo")).order_by("-number").values("number")[:1]
+    return {
+        revision.memo_id: revision
+        for revision in MemoRevision.objects.filter(memo_id__in=memo_ids, number=Subquery(latest_number))
+    }
+
+
+def _snapshots(keys):
+    """(메모 id, 이력 번호) 목록에 해당하는 스냅숏 {(메모 id, 번호): MemoRevision}"""
+    if not keys:
+        return {}
+    condition = Q()
+    for memo_id, number in keys:
+        condition |= Q(memo_id=memo_id, number=number)
+    return {
+        (revision.memo_id, revision.number): revision
+        for revision in MemoRevision.objects.filter(condition, kind=MemoRevision.Kind.SNAPSHOT)
+    }
+
+
+def record_revisions(memos):
+    """저장된 메모들의 현재 제목과 본문을 새 이력으로 기록합니다.
+
+    가장 최근 이력과 같으면 기록하지 않는다. 메모 수와 관계없이 조회 두 번과
+    bulk_create 한 번으로 처리한다.
+    """
+    memos = [memo for memo in memos if memo.pk is not None]
+    if not memos:
+        return []
+    latest = _latest_revisions([memo.pk for memo in memos])
+    snapshots = _snapshots({
+        (revision.memo_id, revision.base_number)
+        for revision in latest.values()
+        if not revision.is_snapshot
+    })
+    created = []
+    for memo in memos:
+        previous = latest.get(memo.pk)
+        snapshot = None
+        if previous is not None:
+            if previous.is_snapshot:
+                snapshot = previous
+                snapshot.content = previous.data
+                snapshot.depth_after = 0
+            else:
+                snapshot = snapshots[(memo.pk, previous.base_number)]
+                snapshot.content = snapshot.data
+                snapshot.depth_after = previous.depth
+            previous_content = (
+                snapshot.content if previous.is_snapshot else apply_delta(snapshot.content, previous.data)
+            )
+            if previous.title == memo.title and previous_content == memo.content:
+                continue
+        number = previous.number + 1 if previous is not None else 1
+        created.append(_encode(memo.pk, number, memo.title, memo.content, snapshot, memo.updated_at))
+    return MemoRevision.objects.bulk_create(created)
+
+
+def rebuild(revision):
+    """이력 하나의 본문을 복원합니다 (스냅숏 하나와 델타 하나만 읽음)."""
+    if revision.is_snapshot:
+        return revision.data
+    snapshot = MemoRevision.objects.get(
+        memo_id=revision.memo_id, number=revision.base_number, kind=MemoRevision.Kind.SNAPSHOT
+    )
+    return apply_delta(snapshot.data, revision.data)
+
+
+def restore_revision(memo, revision):
+    """메모를 이력의 제목과 본문으로 되돌립니다 (되돌린 상태도 새 이력으로 남음).
+
+    memo의 버전 조건으로 저장하므로 그 사이 다른 곳에서 수정했으면 VersionConflict를 던진다.
+    """
+    memo.title = revision.title
+    memo.content = rebuild(revision)
+    memo.save_versioned(["title", "content"])
+
+
+def _kept_numbers(revisions, now):
+    """보존 정책에 따라 남길 이력 번호 집합을 계산합니다."""
+    keep_days = getattr(settings, "MEMO_REVISION_KEEP_DAYS", 30)
+    max_count = getattr(settings, "MEMO_REVISION_MAX_COUNT", 200)
+    cutoff = now - timedelta(days=keep_days)
+    kept = set()
+    last_of_day = {}
+    for revision in revisions:
+        if revision.created_at >= cutoff:
+            kept.add(revision.number)
+        else:
+            # 번호 순서로 돌므로 같은 날의 마지막 이력이 남는다
+            last_of_day[timezone.localdate(revision.created_at)] = revision.number
+    kept.update(last_of_day.values())
+    kept.add(revisions[-1].number)
+    return set(sorted(kept)[-max_count:])
+
+
+def compact(memo_id, now=None):
+    """메모 하나의 이력을 보존 정책에 맞게 줄이고 지운 이력 수를 반환합니다."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        revisions = list(MemoRevision.objects.filter(memo_id=memo_id).order_by("number"))
+        if len(revisions) < 2:
+            return 0
+        kept = _kept_numbers(revisions, now)
+        removed = [revision.number for revision in revisions if revision.number not in kept]
+        if not removed:
+            return 0
+
+        by_number = {revision.number: revision for revision in revisions}
+        rewritten = []
+        # 지울 스냅숏에 기대는 남는 이력은 첫 번째를 스냅숏으로 바꾸고 나머지를 그 기준으로 다시 만든다
+        orphans = {}
+        for revision in revisions:
+            if revision.number in kept and not revision.is_snapshot and revision.base_number not in kept:
+                orphans.setdefault(revision.base_number, []).append(revision)
+        for base_number, dependents in orphans.items():
+            base_content = by_number[base_number].data
+            snapshot = None
+            for revision in dependents:
+                content = apply_delta(base_content, revision.data)
+                encoded = _encode(memo_id, revision.number, revision.title, content, snapshot, revision.created_at)
+                encoded.pk = revision.pk
+                rewritten.append(encoded)
+                if encoded.is_snapshot:
+                    snapshot = encoded
+                    snapshot.content = content
+                    snapshot.depth_after = 0
+                else:
+                    snapshot.depth_after = encoded.depth
+        if rewritten:
+            MemoRevision.objects.bulk_update(rewritten, ["kind", "base_number", "depth", "data"])
+        MemoRevision.objects.filter(memo_id=memo_id, number__in=removed).delete()
+        return len(removed)
+
+
+def compaction_candidates(now=None):
+    """보존 정책으로 줄일 이력이 있을 수 있는 메모 id 쿼리셋"""
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=getattr(settings, "MEMO_REVISION_KEEP_DAYS", 30))
+    max_count = getattr(settings, "MEMO_REVISION_MAX_COUNT", 200)
+    return (
+        MemoRevision.objects.values("memo_id")
+        .annotate(count=Count("id"), oldest=Min("created_at"))
+        .filter(count__gt=1)
+        .filter(Q(oldest__lt=cutoff) | Q(count__gt=max_count))
+        .order_by("memo_id")
+        .values_list("memo_id", flat=True)
+    )
+
+
+def storage_bytes(memo_ids):
+    """메모들의 이력이 차지하는 저장 크기(바이트). 압축된 값은 압축된 크기로 센다."""
+    memo_ids = [int(pk) for pk in memo_ids]
+    if not memo_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COALESCE(SUM(length(CAST(data AS BLOB))), 0) FROM memo_revisions"
+            f" WHERE memo_id IN ({', '.join(['%s'] * len(memo_ids))})",
+            memo_ids,
+        )
+        return cursor.fetchone()[0]
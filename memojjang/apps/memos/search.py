@@ -0,0 +1,167 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from . import compression
+from .models import Memo
+from .search_index import FTS_TABLE, is_supported
+
+
+# trigram 토크나이저는 3글자 미만의 검색어를 MATCH로 찾을 수 없다
+TRIGRAM_MIN_LENGTH = 3
+
+# 검색 결과를 제공하는 마지막 페이지. OFFSET이 SQLite 정수 범위를 넘지 않고
+# 깊은 페이지의 OFFSET 비용이 끝없이 커지지 않도록 제한한다
+MAX_PAGE = 1000
+
+# 짧은 검색어를 파이썬에서 비교할 때 한 번에 읽는 후보 행 수
+SHORT_TERM_BATCH_SIZE = 200
+
+
+def split_terms(query):
+    """검색어를 공백 기준으로 나누고 중복을 제거합니다."""
+    terms = []
+    for term in query.split():
+        if term not in terms:
+            terms.append(term)
+    return terms
+
+
+def quote_term(term):
+    """FTS5 MATCH 구문에서 안전하게 쓸 수 있도록 검색어를 큰따옴표로 감쌉니다."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def escape_like(term):
+    """LIKE 패턴의 특수 문자를 이스케이프합니다."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SearchPage:
+    """검색 결과 한 페이지"""
+
+    def __init__(self, items, number, has_next):
+        self.items = items
+        self.number = number
+        self.has_next = has_next
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def has_previous(self):
+        """이전 페이지가 있는지 여부"""
+        return self.number > 1
+
+    @property
+    def next_page_number(self):
+        """다음 페이지 번호"""
+        return self.number + 1
+
+    @property
+    def previous_page_number(self):
+        """이전 페이지 번호"""
+        return self.number - 1
+
+
+def _search_ids_sqlite(user_id, terms, limit, offset):
+    """FTS5 인덱스로 관련도(bm25) 순 메모 id 목록을 조회합니다."""
+    long_terms = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+    short_terms = [term for term in terms if len(term) < TRIGRAM_MIN_LENGTH]
+    # 짧은 검색어는 제목과 본문을 읽어 비교한다
+    columns = "m.id, m.title, m.content" if short_terms else "m.id"
+    if long_terms:
+        match = " AND ".join(quote_term(term) for term in long_terms)
+        sql = (
+            f"SELECT {columns} FROM memos_fts"
+            " JOIN memos m ON m.id = memos_fts.rowid"
+            " WHERE memos_fts MATCH %s AND m.user_id = %s AND m.deleted_at IS NULL"
+            " ORDER BY bm25(memos_fts), m.id DESC"
+        )
+        params = [match, user_id]
+    else:
+        # 짧은 검색어만 있으면 사용자 파티션 안에서만 찾고 최신순으로 정렬한다
+        sql = (
+            f"SELECT {columns} FROM memos m"
+            " WHERE m.user_id = %s AND m.deleted_at IS NULL"
+            " ORDER BY m.created_at DESC, m.id DESC"
+        )
+        params = [user_id]
+
+    with connection.cursor() as cursor:
+        if not short_terms:
+            cursor.execute(f"{sql} LIMIT %s OFFSET %s", params + [limit, offset])
+            return [row[0] for row in cursor.fetchall()]
+        # 검색 인덱스는 원문을 담지 않고 본문은 압축되어 있을 수 있으므로, 짧은 검색어는
+        # 후보를 차례로 읽어 파이썬에서 복원한 원문과 비교한다 (LIKE처럼 대소문자 무시)
+        cursor.execute(sql, params)
+        ids = []
+        skipped = 0
+        while len(ids) < limit:
+            rows = cursor.fetchmany(SHORT_TERM_BATCH_SIZE)
+            if not rows:
+                break
+            for pk, title, content in rows:
+                text = f"{title}\n{compression.decode(content)}".casefold()
+                if not all(term.casefold() in text for term in short_terms):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                ids.append(pk)
+                if len(ids) == limit:
+                    break
+        return ids
+
+
+def _search_ids_fallback(user_id, terms, limit, offset):
+    """FTS5를 지원하지 않는 데이터베이스에서 사용하는 대체 검색"""
+    queryset = Memo.objects.filter(user_id=user_id)
+    # 압축해 저장한 긴 본문은 데이터베이스에서 비교할 수 없으므로 원문으로 저장된 본문만 찾는다
+    for term in terms:
+        queryset = queryset.filter(Q(title__icontains=term) | Q(content__icontains=term))
+    return list(queryset.values_list("id", flat=True)[offset:offset + limit])
+
+
+def search_memos(user, query, page=1, page_size=None):
+    """사용자의 메모를 검색해 관련도 순으로 한 페이지를 반환합니다."""
+    page_size = page_size or getattr(settings, "MEMO_SEARCH_PAGE_SIZE", 20)
+    page = min(max(1, page), MAX_PAGE)
+    terms = split_terms(query)
+    if not terms:
+        return SearchPage([], page, False)
+
+    offset = (page - 1) * page_size
+    # 다음 페이지 존재 여부를 COUNT 없이 알기 위해 한 건을 더 가져온다
+    if is_supported():
+        ids = _search_ids_sqlite(user.pk, terms, page_size + 1, offset)
+    else:
+        ids = _search_ids_fallback(user.pk, terms, page_size + 1, offset)
+    has_next = len(ids) > page_size
+    ids = ids[:page_size]
+
+    memos = Memo.objects.filter(user=user).in_bulk(ids)
+    items = [memos[pk] for pk in ids if pk in memos]
+    return SearchPage(items, page, has_next)
+
+
+def filter_matching(queryset, query):
+    """제목/본문에 query의 검색어를 모두 포함한 메모로 쿼리셋을 좁힙니다 (관리자 검색용).
+
+    사용자를 가리지 않고 검색 인덱스에서 rowid를 찾는 서브쿼리 하나로 거른다. trigram으로
+    찾을 수 없는 3글자 미만의 검색어는 빼고 찾으며, 모두 짧으면 결과가 없다.
+    FTS5를 지원하지 않는 데이터베이스에서는 search_memos와 같은 대체 검색을 쓴다.
+    """
+    terms = split_terms(query)
+    if not is_supported():
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(content__icontains=term))
+        return queryset
+    long_terms = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+    if not long_terms:
+        return queryset.none()
+    match = " AND ".join(quote_term(term) for term in long_terms)
+    return queryset.filter(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
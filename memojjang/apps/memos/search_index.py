@@ -0,0 +1,130 @@
+"""
+메모 전문 검색 인덱스 관리
+
+SQLite FTS5 테이블 memos_fts에 메모의 원문 제목과 본문을 색인합니다. 본문은 압축되어
+저장되므로 트리거(SQL에서 본문을 복원해야 함) 대신 메모를 쓰는 파이썬 코드가 같은
+트랜잭션에서 갱신하고, memos 테이블에는 인덱스와 연결된 뷰나 트리거가 없으므로
+memos를 다시 만드는 마이그레이션도 검색 인덱스를 신경 쓰지 않습니다.
+
+memos_fts는 원문 사본을 두지 않는 contentless 테이블(content='')이라 압축으로 줄인 본문이
+검색 인덱스에서 다시 늘어나지 않는다. 대신 색인을 지울 때 색인했던 제목과 본문을 그대로
+넘겨야 하므로, 메모의 제목이나 본문을 바꾸거나 행을 지우기 전에 unindex_memos()를 부른다.
+"""
+from django.db import connection
+from . import compression
+
+
+FTS_TABLE = "memos_fts"
+
+CREATE_FTS_TABLE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS memos_fts USING fts5("
+    "title, content, content='', tokenize='trigram')"
+)
+
+DROP_FTS_TABLE_SQL = "DROP TABLE IF EXISTS memos_fts"
+
+# rebuild_index가 memos 테이블을 읽어 색인하는 배치 크기
+INDEX_BATCH_SIZE = 500
+
+
+def is_supported(using=None):
+    """현재 데이터베이스가 FTS5 검색 인덱스를 지원하는지 확인합니다."""
+    return (using or connection).vendor == "sqlite"
+
+
+def create_index(cursor):
+    """검색 인덱스 FTS5 테이블을 생성합니다."""
+    cursor.execute(CREATE_FTS_TABLE_SQL)
+
+
+def drop_index(cursor):
+    """검색 인덱스 FTS5 테이블을 제거합니다."""
+    cursor.execute(DROP_FTS_TABLE_SQL)
+
+
+def write_rows(cursor, rows):
+    """(id, 제목, 원문 본문) 행들을 검색 인덱스에 넣습니다."""
+    rows = list(rows)
+    if rows:
+        cursor.executemany(f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (%s, %s, %s)", rows)
+
+
+def delete_rows(cursor, rows):
+    """색인할 때 넣은 (id, 제목, 원문 본문) 행들을 검색 인덱스에서 지웁니다."""
+    rows = list(rows)
+    if rows:
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', %s, %s, %s)", rows
+        )
+
+
+def index_rows(rows):
+    """(id, 제목, 원문 본문) 행들을 검색 인덱스에 넣습니다."""
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        write_rows(cursor, rows)
+
+
+def unindex_rows(rows):
+    """색인할 때 넣은 (id, 제목, 원문 본문) 행들을 검색 인덱스에서 지웁니다."""
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        delete_rows(cursor, rows)
+
+
+def index_memos(memos):
+    """저장한 메모 인스턴스들의 제목과 본문을 검색 인덱스에 넣습니다.
+
+    save()는 post_save 시그널로 호출하고, 시그널을 보내지 않는 bulk_create/bulk_update는
+    호출하는 쪽에서 메모를 쓰는 트랜잭션 안에서 직접 실행해야 합니다. 이미 색인된 메모는
+    바꾸기 전에 unindex_memos()나 unindex_rows()로 이전 색인을 지워 두어야 한다.
+    """
+    index_rows([(memo.pk, memo.title, memo.content) for memo in memos])
+
+
+def unindex_memos(memos):
+    """memos 쿼리셋의 메모를 검색 인덱스에서 지웁니다.
+
+    저장된 제목과 본문을 읽어 지우므로 제목/본문을 바꾸거나 행을 삭제하기 전에 같은
+    트랜잭션에서 호출한다. 사용자 삭제의 CASCADE처럼 여기를 거치지 않고 지워진 메모의 색인은
+    검색 결과가 memos와 조인하므로 보이지 않고, rebuild_memo_search 명령이 정리한다.
+    반환값은 지운 (id, 제목, 원문 본문) 행 목록이다.
+    """
+    if not is_supported():
+        return []
+    rows = list(memos.values_list("pk", "title", "content"))
+    unindex_rows(rows)
+    return rows
+
+
+def rebuild_index(cursor):
+    """memos 테이블 전체로부터 검색 인덱스를 다시 만듭니다.
+
+    테이블을 새로 만드므로 이전 형식(원문 사본을 두던 FTS5 테이블)의 인덱스도 바뀐다.
+    압축된 본문은 파이썬에서 복원하므로 INDEX_BATCH_SIZE개씩 나눠 읽는다.
+    """
+    drop_index(cursor)
+    create_index(cursor)
+    fill_index(cursor)
+
+
+def fill_index(cursor):
+    """빈 검색 인덱스에 memos 테이블의 모든 메모를 id 순서로 나눠 넣습니다."""
+    last_id = 0
+    while True:
+        cursor.execute(
+            "SELECT id, title, content FROM memos WHERE id > %s ORDER BY id LIMIT %s",
+            [last_id, INDEX_BATCH_SIZE],
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        write_rows(cursor, [(pk, title, compression.decode(content)) for pk, title, content in rows])
+        last_id = rows[-1][0]
+
+
+def optimize_index(cursor):
+    """검색 인덱스의 세그먼트를 병합합니다."""
+    cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
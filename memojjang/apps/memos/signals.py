@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from . import cache, compression, revisions, search_index
+from .models import Memo, MemoStats
+
+
+@receiver(post_save, sender=Memo)
+@receiver(post_delete, sender=Memo)
+def invalidate_memo_cache(sender, instance, **kwargs):
+    """메모가 저장되거나 삭제되면 트랜잭션이 커밋된 뒤 작성자의 렌더링 캐시 세대를 갱신합니다.
+
+    커밋 전에 갱신하면 그 사이의 요청이 이전 내용을 새 세대로 다시 캐시할 수 있다.
+    """
+    user_id = instance.user_id
+    transaction.on_commit(lambda: cache.bump_generation(user_id), using=kwargs.get("using"))
+
+
+def _touches_revision(update_fields):
+    return update_fields is None or not revisions.TRACKED_FIELDS.isdisjoint(update_fields)
+
+
+@receiver(pre_save, sender=Memo)
+def keep_revision_baseline(sender, instance, raw, update_fields, **kwargs):
+    """이력이 없는 메모를 수정하기 전에 수정 전 상태를 첫 이력으로 남깁니다."""
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if _touches_revision(update_fields):
+        revisions.ensure_baselines([instance.pk])
+
+
+@receiver(post_save, sender=Memo)
+def record_memo_revision(sender, instance, created, raw, update_fields, **kwargs):
+    """제목이나 본문이 저장되면 수정 이력을 남깁니다."""
+    if raw:
+        return
+    if created or _touches_revision(update_fields):
+        revisions.record_revisions([instance])
+
+
+@receiver(pre_save, sender=Memo)
+def remove_from_search_index(sender, instance, raw, update_fields, **kwargs):
+    """제목이나 본문을 저장하기 전에 저장된 값의 색인을 지웁니다 (저장한 뒤 다시 색인)."""
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if _touches_revision(update_fields):
+        rows = search_index.unindex_memos(Memo.all_objects.filter(pk=instance.pk))
+        instance._search_index_row = rows[0] if rows else None
+
+
+@receiver(post_save, sender=Memo)
+def update_search_index(sender, instance, created, raw, update_fields, **kwargs):
+    """제목이나 본문이 저장되면 검색 인덱스를 갱신합니다.
+
+    update_fields에 없는 필드는 인스턴스가 오래되었을 수 있으므로 저장 전에 읽은 값을 색인한다.
+    """
+    if raw:
+        return
+    previous = instance.__dict__.pop("_search_index_row", None)
+    if not (created or _touches_revision(update_fields)):
+        return
+    if previous is None or update_fields is None:
+        search_index.index_memos([instance])
+        return
+    _, title, content = previous
+    search_index.index_rows([(
+        instance.pk,
+        instance.title if "title" in update_fields else title,
+        instance.content if "content" in update_fields else content,
+    )])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def init_memo_cache(sender, instance, created, **kwargs):
+    """새 사용자는 이전에 같은 id로 남아 있던 캐시를 쓰지 않도록 새 세대로 시작합니다."""
+    if created:
+        cache.bump_generation(instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_memo_stats(sender, instance, created, raw, **kwargs):
+    """새 사용자의 메모 통계 행을 만들어 두어 목록이 처음 열릴 때 메모를 세지 않게 합니다."""
+    if created and not raw:
+        MemoStats.objects.create(user=instance)
+
+
+@receiver(connection_created)
+def register_sqlite_functions(sender, connection, **kwargs):
+    """SQLite 연결에 압축된 본문을 복원하는 memo_plain() SQL 함수를 등록합니다.
+
+    이 연결에서만 쓸 수 있으므로 마이그레이션이나 관리 작업의 SQL에서만 사용하고,
+    트리거나 뷰처럼 다른 연결(sqlite3 셸 등)의 쓰기에서도 실행되는 곳에는 쓰지 않습니다.
+    """
+    if connection.vendor == "sqlite":
+        connection.connection.create_function(
+            "memo_plain", 1, compression.decode, deterministic=True
+        )
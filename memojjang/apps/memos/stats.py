@@ -0,0 +1,74 @@
+"""
+사용자별 메모 통계
+
+메모 수, 저장 용량, 마지막 작성/수정일시를 memo_stats 테이블에 사용자마다 한 행으로 두고,
+메모를 만들거나 고치거나 지우는 쿼리와 같은 트랜잭션에서 F 식으로 증감합니다
+(models.update_memo_stats, add_memo_stats, adjust_memo_stats). 목록 머리글, 목록의
+조건부 요청 검증자, 관리자는 이 행 하나만 읽습니다.
+
+행이 없는 사용자(통계 기능 이전에 가입한 사용자 등)는 처음 읽을 때 메모에서 계산해 만들고,
+reconcile_memo_stats 명령이 실제 메모와 비교해 어긋난 행을 배치로 고칩니다.
+마지막 작성/수정일시와 변경 번호는 휴지통 메모를 영구 삭제해도 되돌리지 않으므로,
+실제 메모의 최댓값보다 작거나 비어 있을 때만 어긋난 것으로 봅니다.
+"""
+from asgiref.sync import sync_to_async
+from .models import MemoStats
+
+COUNTER_FIELDS = ("memo_count", "total_bytes")
+# 줄어들지 않는 값. 실제 메모의 최댓값보다 작을 때만 어긋난 것으로 본다
+MONOTONIC_FIELDS = ("last_created_at", "last_updated_at", "change_seq")
+
+
+def drift(stats, actual):
+    """통계 행과 실제 값이 어긋난 필드 이름 목록"""
+    fields = [name for name in COUNTER_FIELDS if getattr(stats, name) != actual[name]]
+    for name in MONOTONIC_FIELDS:
+        stored = getattr(stats, name)
+        if actual[name] is not None and (stored is None or stored < actual[name]):
+            fields.append(name)
+    return fields
+
+
+def get_memo_stats(user):
+    """사용자의 메모 통계 행 (없으면 메모에서 계산해 만든다)"""
+    stats = MemoStats.objects.filter(user=user).first()
+    if stats is None:
+        stats = MemoStats.objects.rebuild(user.pk)
+    return stats
+
+
+async def aget_memo_stats(user):
+    """get_memo_stats()의 비동기 버전"""
+    stats = await MemoStats.objects.filter(user=user).afirst()
+    if stats is None:
+        stats = await sync_to_async(MemoStats.objects.rebuild)(user.pk)
+    return stats
+
+
+def reconcile(user_ids, dry_run=False):
+    """user_ids 사용자들의 통계를 실제 메모와 비교해 어긋난 행을 고칩니다.
+
+    행이 없으면 만들고, 어긋난 필드만 실제 값으로 바꾼다. 호출하는 쪽의 트랜잭션 안에서
+    실행해야 비교와 수정 사이에 메모가 바뀌지 않는다. {user_id: 어긋난 필드 목록}을 반환한다.
+    """
+    actual = MemoStats.objects.actual(user_ids)
+    stored = MemoStats.objects.in_bulk(user_ids, field_name="user_id")
+    drifted = {}
+    missing = []
+    changed = []
+    for user_id in user_ids:
+        stats = stored.get(user_id)
+        if stats is None:
+            drifted[user_id] = ["missing"]
+            missing.append(MemoStats(user_id=user_id, purged_seq=actual[user_id]["change_seq"], **actual[user_id]))
+            continue
+        fields = drift(stats, actual[user_id])
+        if fields:
+            drifted[user_id] = fields
+            for name in fields:
+                setattr(stats, name, actual[user_id][name])
+            changed.append(stats)
+    if not dry_run:
+        MemoStats.objects.bulk_create(missing)
+        MemoStats.objects.bulk_update(changed, [*COUNTER_FIELDS, *MONOTONIC_FIELDS])
+    return drifted
@@ -0,0 +1,121 @@
+"""
+메모 태그
+
+태그는 사용자별로 이름이 유일하고, 메모와는 memo_tags 연결 테이블(복합 기본 키
+(memo_id, tag_id))로 이어집니다. 태그별 메모 목록은 memo_tags의 (tag_id, created_at,
+memo_id) 인덱스를 작성일시 역순으로 탐색하고, 페이지에 들어갈 메모만 기본 키로 읽습니다.
+태그별 메모 수(Tag.memo_count)는 연결을 바꿀 때 증감하므로 목록에서 세지 않습니다.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Prefetch
+from . import cache as memo_cache
+from .models import MemoTag, Tag
+from .pagination import KeysetPage, apaginate_keyset, paginate_keyset
+
+# 태그별 목록의 키셋. memo_tags.created_at과 memo_id는 메모의 (created_at, id)와 같다
+LINK_KEYS = ("created_at", "memo_id")
+
+
+class InvalidTags(ValueError):
+    """태그 입력이 개수나 길이 제한을 넘음"""
+
+
+def get_max_tags():
+    return getattr(settings, "MEMO_TAGS_MAX", 20)
+
+
+def get_max_length():
+    return getattr(settings, "MEMO_TAG_MAX_LENGTH", 50)
+
+
+def parse_tags(value):
+    """쉼표로 구분한 태그 입력을 중복 없는 이름 목록으로 바꿉니다 (앞의 #은 무시)."""
+    names = []
+    for part in (value or "").split(","):
+        name = part.strip().lstrip("#").strip()
+        if name and name not in names:
+            names.append(name)
+    if len(names) > get_max_tags():
+        raise InvalidTags(f"태그는 메모당 {get_max_tags()}개까지 붙일 수 있습니다.")
+    if any(len(name) > get_max_length() for name in names):
+        raise InvalidTags(f"태그 이름은 {get_max_length()}자까지 쓸 수 있습니다.")
+    return names
+
+
+def tag_names(memo):
+    """메모에 붙은 태그 이름 목록 (이름순). 저장되지 않은 메모는 빈 목록"""
+    if memo.pk is None:
+        return []
+    return [tag.name for tag in memo.tags.all()]
+
+
+def prefetch_tags(lookup="tags"):
+    """카드에 보여 줄 태그를 한 번에 읽는 Prefetch (id와 이름만)"""
+    return Prefetch(lookup, queryset=Tag.objects.only("id", "name"))
+
+
+def user_tags(user):
+    """메모가 하나 이상 붙은 사용자 태그 목록 (이름순, memo_count 포함)"""
+    return Tag.objects.filter(user=user, memo_count__gt=0)
+
+
+def set_memo_tags(memo, names):
+    """메모의 태그를 names로 바꿉니다.
+
+    없는 태그는 만들고, 바뀐 연결만 추가/삭제하며, 추가/삭제된 태그의 memo_count만
+    증감한다. 모두 한 트랜잭션에서 처리한다.
+    """
+    with transaction.atomic():
+        wanted = set()
+        if names:
+            Tag.objects.bulk_create(
+                [Tag(user_id=memo.user_id, name=name) for name in names], ignore_conflicts=True
+            )
+            wanted = set(
+                Tag.objects.filter(user_id=memo.user_id, name__in=names).values_list("id", flat=True)
+            )
+        current = set(memo.memo_tags.values_list("tag_id", flat=True))
+        added, removed = wanted - current, current - wanted
+        if added:
+            memo.tags.add(*added, through_defaults={"created_at": memo.created_at})
+        if removed:
+            # 연결 행을 (memo_id, tag_id) 조건 DELETE 한 번으로 지운다
+            memo.tags.remove(*removed)
+        # 휴지통의 메모는 개수에 넣지 않는다
+        if memo.deleted_at is None:
+            if added:
+                Tag.objects.filter(pk__in=added).update(memo_count=F("memo_count") + 1)
+            if removed:
+                Tag.objects.filter(pk__in=removed).update(memo_count=F("memo_count") - 1)
+        if added or removed:
+            # 커밋 전에 갱신하면 그 사이의 요청이 이전 태그를 새 세대로 다시 캐시할 수 있다
+            transaction.on_commit(lambda: memo_cache.bump_generation(memo.user_id))
+    return added or removed
+
+
+def tagged_links(user, name):
+    """사용자의 name 태그가 붙은 메모 연결 쿼리셋 (메모와 메모의 태그를 함께 읽음)
+
+    memo_tags 인덱스 순서로 읽으므로 태그로 걸러 낸 뒤 정렬하지 않는다.
+    """
+    return (
+        MemoTag.objects.filter(tag__user=user, tag__name=name, memo__deleted_at__isnull=True)
+        .select_related("memo")
+        .defer("memo__content")
+        .prefetch_related(prefetch_tags("memo__tags"))
+    )
+
+
+def _memo_page(page):
+    return KeysetPage([link.memo for link in page], page.next_cursor, page.cursor)
+
+
+def paginate_tagged(user, name, after=None, page_size=None):
+    """태그가 붙은 메모 한 페이지 (메모 목록과 같은 커서를 씀)"""
+    return _memo_page(paginate_keyset(tagged_links(user, name), after, page_size, keys=LINK_KEYS))
+
+
+async def apaginate_tagged(user, name, after=None, page_size=None):
+    """paginate_tagged의 비동기 버전"""
+    return _memo_page(await apaginate_keyset(tagged_links(user, name), after, page_size, keys=LINK_KEYS))
@@ -1,7 +1,34 @@
-from django.test import TestCase, Client
-from django.urls import reverse
+import base64
+import asyncio
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import time
+import zipfile
+from datetime import timedelta
+from io import StringIO
+from asgiref.sync import sync_to_async
+from django.core.management import CommandError, call_command
+from django.test import TestCase, Client, override_settings
+from django.urls import resolve, reverse
 from django.contrib.auth import get_user_model
-from .models import Memo
+from django.db import IntegrityError, connection
+from django.db.models.signals import post_save
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from . import cache as memo_cache
+from . import changes
+from . import compression
+from . import revisions
+from . import search_index
+from . import stats as memo_stats
+from . import tags as memo_tags
+from .models import EXCERPT_CHARS, ImportCheckpoint, Memo, MemoRevision, MemoStats, MemoTag, Tag, VersionConflict
+from .pagination import approximate_count, encode_cursor, paginate_keyset
+from .search import MAX_PAGE, search_memos
 
 User = get_user_model()
 
@@ -32,6 +59,26 @@ class MemoModelTest(TestCase):
         """메모 문자열 표현 테스트"""
         self.assertEqual(str(self.memo), "테스트 메모")
 
+    def test_summary_maintained_on_save(self):
+        """저장할 때 요약, 글자 수, 단어 수가 본문과 맞춰짐"""
+        self.assertEqual(self.memo.excerpt, "테스트 내용입니다.")
+        self.assertEqual(self.memo.char_count, 10)
+        self.assertEqual(self.memo.word_count, 2)
+
+        self.memo.content = " ".join(f"단어{i}" for i in range(40))
+        self.memo.save(update_fields=["content"])
+        self.memo.refresh_from_db()
+        self.assertEqual(self.memo.word_count, 40)
+        self.assertEqual(self.memo.excerpt, " ".join(f"단어{i}" for i in range(30)) + " …")
+
+        # 띄어쓰기 없는 긴 본문도 요약은 글자 수 상한까지만 저장한다
+        self.memo.content = "가" * 100000
+        self.memo.save(update_fields=["content"])
+        self.memo.refresh_from_db()
+        self.assertEqual(self.memo.word_count, 1)
+        self.assertEqual(len(self.memo.excerpt), EXCERPT_CHARS)
+        self.assertTrue(self.memo.excerpt.endswith("…"))
+
 
 class MemoViewTest(TestCase):
     """메모 뷰 테스트"""
@@ -150,3 +197,1651 @@ class MemoViewTest(TestCase):
             self.assertEqual(response.status_code, 302)  # 리다이렉션 확인
             # 로그인 페이지로 리다이렉트되는지 확인
             self.assertTrue(reverse("login") in response.url)
+
+
+class MemoVersionTest(TestCase):
+    """메모 버전(낙관적 동시성 제어)과 바뀐 필드만 저장 테스트"""
+
+    def setUp(self):
+        """로그인한 사용자와 메모 준비"""
+        self.user = User.objects.create_user(
+            username="versionuser",
+            email="version@example.com",
+            password="testpassword123"
+        )
+        self.client.force_login(self.user)
+        self.memo = Memo.objects.create(user=self.user, title="버전 메모", content="버전 내용")
+        self.memo_edit_url = reverse("memo_edit", args=[self.memo.pk])
+
+    def test_save_versioned_writes_changed_fields(self):
+        """바뀐 필드만 쓰고 버전을 올림"""
+        self.memo.title = "새 제목"
+        with CaptureQueriesContext(connection) as queries:
+            self.memo.save_versioned(["title"])
+        # 작성자 통계 UPDATE는 따로 나가므로 memos의 UPDATE만 본다
+        updates = [query["sql"] for query in queries.captured_queries if query["sql"].startswith('UPDATE "memos"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"version"', updates[0])
+        self.assertNotIn('"content"', updates[0])
+        self.assertEqual(self.memo.version, 2)
+        self.memo.refresh_from_db()
+        self.assertEqual((self.memo.title, self.memo.version), ("새 제목", 2))
+
+    def test_save_versioned_conflict(self):
+        """읽은 뒤 다른 곳에서 먼저 저장했으면 쓰지 않고 VersionConflict"""
+        stale = Memo.objects.get(pk=self.memo.pk)
+        self.memo.title = "먼저 저장"
+        self.memo.save_versioned(["title"])
+        stale.title = "늦게 저장"
+        with self.assertRaises(VersionConflict):
+            stale.save_versioned(["title"])
+        self.memo.refresh_from_db()
+        self.assertEqual(self.memo.title, "먼저 저장")
+
+    def test_edit_conflict_returns_409(self):
+        """두 탭에서 같은 버전으로 수정하면 나중 저장은 409와 입력을 유지한 폼"""
+        version = self.client.get(self.memo_edit_url).context["form"]["version"].value()
+        response = self.client.post(
+            self.memo_edit_url, {"title": "첫 번째 탭", "content": "버전 내용", "version": version}
+        )
+        self.assertEqual(response.status_code, 302)
+
+        response = self.client.post(
+            self.memo_edit_url, {"title": "두 번째 탭", "content": "버전 내용", "version": version}
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertContains(response, "두 번째 탭", status_code=409)
+        self.assertEqual(response.context["form"]["version"].value(), version + 1)
+        self.memo.refresh_from_db()
+        self.assertEqual(self.memo.title, "첫 번째 탭")
+
+        # 최신 버전으로 다시 저장하면 덮어씀
+        response = self.client.post(
+            self.memo_edit_url, {"title": "두 번째 탭", "content": "버전 내용", "version": version + 1}
+        )
+        self.assertEqual(response.status_code, 302)
+
+    def test_plain_save_bumps_version(self):
+        """save()로 제목/본문을 써도 버전이 올라 ETag가 바뀌고 열려 있던 수정 폼은 409"""
+        detail_url = reverse("memo_detail", args=[self.memo.pk])
+        etag = self.client.get(detail_url)["ETag"]
+        version = self.client.get(self.memo_edit_url).context["form"]["version"].value()
+        stale = Memo.objects.get(pk=self.memo.pk)
+        stale.version = 0
+        self.memo.title = "관리자가 고친 제목"
+        self.memo.save()
+        self.assertEqual(self.memo.version, version + 1)
+        self.memo.deleted_at = None
+        self.memo.save(update_fields=["deleted_at"])
+        self.assertEqual(self.memo.version, version + 1)
+        # 오래된 인스턴스로 저장해도 버전이 줄지 않는다
+        stale.content = "오래된 인스턴스"
+        stale.save(update_fields=["content"])
+        self.assertEqual(stale.version, version + 2)
+
+        response = self.client.get(detail_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            self.memo_edit_url, {"title": "폼에서 고친 제목", "content": "버전 내용", "version": version}
+        )
+        self.assertEqual(response.status_code, 409)
+
+    def test_unchanged_edit_does_not_write(self):
+        """바뀐 내용이 없으면 UPDATE를 실행하지 않음"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.memo_edit_url, {"title": "버전 메모", "content": "버전 내용", "version": 1}
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(any(query["sql"].startswith('UPDATE "memos"') for query in queries.captured_queries))
+        self.memo.refresh_from_db()
+        self.assertEqual(self.memo.version, 1)
+
+
+class MemoSoftDeleteTest(TestCase):
+    """휴지통(소프트 삭제)과 purge_memos 명령 테스트"""
+
+    def setUp(self):
+        """로그인한 사용자와 메모 준비"""
+        self.user = User.objects.create_user(
+            username="trashuser",
+            email="trash@example.com",
+            password="testpassword123"
+        )
+        self.client.force_login(self.user)
+        self.memo = Memo.objects.create(user=self.user, title="휴지통 메모", content="버릴 회의록 내용")
+
+    def test_delete_view_moves_to_trash(self):
+        """삭제하면 기본 매니저에서 숨겨지고 휴지통에 보임"""
+        response = self.client.post(reverse("memo_delete", args=[self.memo.pk]))
+        self.assertRedirects(response, reverse("memo_list"))
+        self.assertFalse(Memo.objects.filter(pk=self.memo.pk).exists())
+        tombstone = Memo.all_objects.get(pk=self.memo.pk)
+        self.assertIsNotNone(tombstone.deleted_at)
+        self.assertEqual(tombstone.version, 2)
+        self.assertEqual(self.client.get(reverse("memo_detail", args=[self.memo.pk])).status_code, 404)
+        response = self.client.get(reverse("memo_trash"))
+        self.assertTemplateUsed(response, "memos/memo_trash.html")
+        self.assertContains(response, "휴지통 메모")
+
+    def test_stale_instance_delete_and_restore_bump_stored_version(self):
+        """오래된 인스턴스로 삭제하고 되살려도 저장된 버전에서 올라가 ETag가 되돌아가지 않음"""
+        stale = Memo.objects.get(pk=self.memo.pk)
+        self.memo.title = "다른 곳에서 고친 제목"
+        self.memo.save()
+        self.assertEqual(self.memo.version, 2)
+        stale.delete()
+        self.assertEqual(stale.version, 3)
+        stale.version = 1
+        stale.restore()
+        self.assertEqual(stale.version, 4)
+        self.assertEqual(Memo.objects.get(pk=self.memo.pk).version, 4)
+
+    def test_restore_view(self):
+        """휴지통의 메모를 POST로 되살림"""
+        self.memo.delete()
+        restore_url = reverse("memo_restore", args=[self.memo.pk])
+        self.assertEqual(self.client.get(restore_url).status_code, 405)
+        response = self.client.post(restore_url)
+        self.assertRedirects(response, reverse("memo_detail", args=[self.memo.pk]))
+        self.assertIsNone(Memo.objects.get(pk=self.memo.pk).deleted_at)
+        # 삭제되지 않은 메모나 다른 사용자의 메모는 되살릴 수 없음
+        self.assertEqual(self.client.post(restore_url).status_code, 404)
+
+    def test_queryset_delete_is_soft(self):
+        """쿼리셋 delete()도 행을 지우지 않고 삭제 표시만 함"""
+        Memo.objects.create(user=self.user, title="두 번째", content="내용")
+        count, _ = Memo.objects.filter(user=self.user).delete()
+        self.assertEqual(count, 2)
+        self.assertEqual(Memo.objects.count(), 0)
+        self.assertEqual(Memo.all_objects.deleted().count(), 2)
+        self.assertEqual(Memo.all_objects.filter(user=self.user).restore(), 2)
+        self.assertEqual(Memo.objects.count(), 2)
+
+    def test_search_excludes_trash(self):
+        """삭제 표시된 메모는 검색되지 않음"""
+        self.assertEqual(len(search_memos(self.user, "회의록")), 1)
+        self.memo.delete()
+        self.assertEqual(len(search_memos(self.user, "회의록")), 0)
+        self.memo.restore()
+        self.assertEqual(len(search_memos(self.user, "회의록")), 1)
+
+    def test_purge_removes_expired_tombstones_in_batches(self):
+        """보관 기간이 지난 메모만 배치로 나눠 실제 삭제"""
+        old = timezone.now() - timedelta(days=31)
+        expired = [Memo.objects.create(user=self.user, title=f"오래된 {i}", content="내용") for i in range(5)]
+        Memo.all_objects.filter(pk__in=[memo.pk for memo in expired]).update(deleted_at=old)
+        self.memo.delete()
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command("purge_memos", "--batch-size=2", "--delay=0", stdout=out)
+        self.assertIn("메모 5건", out.getvalue())
+        self.assertEqual(
+            sum(1 for query in queries if query["sql"].startswith('DELETE FROM "memos"')), 3
+        )
+        self.assertFalse(Memo.all_objects.filter(pk__in=[memo.pk for memo in expired]).exists())
+        # 보관 기간이 남은 메모는 그대로 휴지통에 있음
+        self.assertTrue(Memo.all_objects.deleted().filter(pk=self.memo.pk).exists())
+
+    def test_purge_max_batches_and_dry_run(self):
+        """--dry-run은 아무것도 지우지 않고 --max-batches는 작업량을 제한"""
+        Memo.all_objects.update(deleted_at=timezone.now() - timedelta(days=31))
+        Memo.objects.create(user=self.user, title="하나 더", content="내용")
+        Memo.all_objects.update(deleted_at=timezone.now() - timedelta(days=31))
+        call_command("purge_memos", "--dry-run", stdout=StringIO())
+        self.assertEqual(Memo.all_objects.count(), 2)
+        call_command("purge_memos", "--batch-size=1", "--max-batches=1", "--delay=0", stdout=StringIO())
+        self.assertEqual(Memo.all_objects.count(), 1)
+
+    def test_deleted_user_purged_after_memos(self):
+        """탈퇴한 사용자는 메모를 배치로 지운 뒤 계정 행을 삭제"""
+        Memo.objects.create(user=self.user, title="두 번째", content="내용")
+        self.user.delete()
+        self.assertEqual(Memo.all_objects.filter(user=self.user).count(), 2)
+        out = StringIO()
+        call_command("purge_memos", "--batch-size=1", "--delay=0", stdout=out)
+        self.assertIn("사용자 1명", out.getvalue())
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Memo.all_objects.filter(user_id=self.user.pk).exists())
+
+
+@override_settings(MEMO_REVISION_SNAPSHOT_INTERVAL=4)
+class MemoRevisionTest(TestCase):
+    """스냅숏/델타 수정 이력과 이력 보기, 되돌리기, 정리 테스트"""
+
+    def setUp(self):
+        """로그인한 사용자와 여러 줄짜리 메모 준비"""
+        self.user = User.objects.create_user(
+            username="revisionuser",
+            email="revision@example.com",
+            password="testpassword123"
+        )
+        self.client.force_login(self.user)
+        self.lines = [f"{i}번째 줄의 회의 내용입니다.\n" for i in range(40)]
+        self.memo = Memo.objects.create(user=self.user, title="이력 메모", content="".join(self.lines))
+
+    def edit(self, index, text="고친 줄\n"):
+        """메모의 한 줄을 고쳐 저장하고 저장한 본문을 반환합니다."""
+        self.lines[index] = text
+        self.memo.content = "".join(self.lines)
+        self.memo.save_versioned(["content"])
+        return self.memo.content
+
+    def test_failed_revision_rolls_back_edit(self):
+        """수정 이력을 남기지 못하면 save_versioned의 메모 수정도 커밋되지 않음"""
+        def fail(sender, **kwargs):
+            raise IntegrityError("이력 번호가 겹칩니다.")
+
+        post_save.connect(fail, sender=Memo)
+        self.addCleanup(post_save.disconnect, fail, sender=Memo)
+        self.memo.title = "고친 제목"
+        with self.assertRaises(IntegrityError):
+            self.memo.save_versioned(["title"])
+        saved = Memo.objects.get(pk=self.memo.pk)
+        self.assertEqual((saved.title, saved.version), ("이력 메모", 1))
+        self.assertEqual(saved.revisions.count(), 1)
+
+    def test_delta_round_trip(self):
+        """델타를 적용하면 대상 본문이 그대로 복원됨"""
+        base = "첫 줄\n둘째 줄\n셋째 줄"
+        for target in ["첫 줄\n바뀐 줄\n셋째 줄", "", "새 줄\n" + base + "\n끝", "셋째 줄"]:
+            self.assertEqual(revisions.apply_delta(base, revisions.make_delta(base, target)), target)
+
+    def test_edits_store_deltas_and_periodic_snapshots(self):
+        """수정은 스냅숏 기준 델타로 저장되고, 간격마다 스냅숏이 생기며 모든 이력이 복원됨"""
+        contents = [self.memo.content] + [self.edit(i) for i in range(1, 9)]
+        history = list(MemoRevision.objects.filter(memo=self.memo).order_by("number"))
+        self.assertEqual([revision.number for revision in history], list(range(1, 10)))
+        self.assertEqual(
+            [revision.kind for revision in history],
+            ["snapshot", "delta", "delta", "delta", "snapshot", "delta", "delta", "delta", "snapshot"],
+        )
+        self.assertEqual(history[3].base_number, 1)
+        self.assertLess(len(history[3].data), len(contents[3]) // 4)
+        for revision, content in zip(history, contents):
+            with self.assertNumQueries(0 if revision.is_snapshot else 1):
+                self.assertEqual(revisions.rebuild(revision), content)
+
+    def test_large_repetitive_edit_stores_snapshot(self):
+        """줄 수 상한을 넘는 반복 많은 본문은 줄 비교 없이 스냅숏으로 저장해 저장 시간이 늘지 않음"""
+        log = ["INFO 요청 처리 완료\n" if i % 3 else "DEBUG 캐시 적중\n" for i in range(8000)]
+        self.memo.content = "".join(log)
+        self.memo.save()
+        log[4000] = "ERROR 연결 끊김\n"
+        self.memo.content = "".join(log)
+        started = time.perf_counter()
+        self.memo.save()
+        self.assertLess(time.perf_counter() - started, 1)
+        latest = self.memo.revisions.order_by("-number").first()
+        self.assertTrue(latest.is_snapshot)
+        self.assertEqual(revisions.rebuild(latest), self.memo.content)
+
+    def test_unchanged_save_skipped(self):
+        """제목과 본문이 그대로면 이력을 남기지 않음"""
+        self.memo.save()
+        self.memo.save_versioned(["title"])
+        self.assertEqual(self.memo.revisions.count(), 1)
+
+    def test_baseline_for_memo_without_history(self):
+        """이력 없이 만들어진 메모도 첫 수정 전 상태가 이력으로 남음"""
+        original = "bulk_create로 만든 메모"
+        (memo,) = Memo.objects.bulk_create([Memo(user=self.user, title="대량", content=original)])
+        memo = Memo.objects.get(pk=memo.pk)
+        memo.content = "수정한 내용"
+        memo.save()
+        history = list(memo.revisions.order_by("number"))
+        self.assertEqual([revisions.rebuild(revision) for revision in history], [original, "수정한 내용"])
+
+    def test_history_and_restore_views(self):
+        """이력 목록과 이력 보기, 되돌리기는 작성자만 할 수 있음"""
+        original = self.memo.content
+        self.edit(0)
+        response = self.client.get(reverse("memo_history", args=[self.memo.pk]))
+        self.assertTemplateUsed(response, "memos/memo_history.html")
+        self.assertContains(response, reverse("memo_revision", args=[self.memo.pk, 2]))
+        response = self.client.get(reverse("memo_revision", args=[self.memo.pk, 1]))
+        self.assertContains(response, "0번째 줄의 회의 내용입니다.")
+
+        restore_url = reverse("memo_revision_restore", args=[self.memo.pk, 1])
+        self.assertEqual(self.client.get(restore_url).status_code, 405)
+        # 이력을 연 뒤 다른 곳에서 수정했다면 되돌리지 않음
+        response = self.client.post(restore_url, {"version": self.memo.version - 1})
+        self.assertEqual(response.status_code, 409)
+        response = self.client.post(restore_url, {"version": self.memo.version})
+        self.assertRedirects(response, reverse("memo_detail", args=[self.memo.pk]))
+        self.assertEqual(Memo.objects.get(pk=self.memo.pk).content, original)
+        self.assertEqual(self.memo.revisions.count(), 3)
+
+        other = User.objects.create_user(username="otherrevision", password="testpassword123")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(reverse("memo_history", args=[self.memo.pk])).status_code, 404)
+        self.assertEqual(self.client.post(restore_url).status_code, 404)
+
+    def test_compact_keeps_rebuildable_history(self):
+        """보존 기간이 지난 이력은 하루에 하나만 남고, 남은 이력은 그대로 복원됨"""
+        contents = [self.memo.content] + [self.edit(i) for i in range(1, 7)]
+        old = timezone.now() - timedelta(days=60)
+        # 1~3번은 같은 날, 4~5번은 다음 날의 오래된 이력이고 6~7번은 최근 이력
+        for number, created_at in {1: old, 2: old, 3: old, 4: old + timedelta(days=1),
+                                   5: old + timedelta(days=1)}.items():
+            MemoRevision.objects.filter(memo=self.memo, number=number).update(created_at=created_at)
+        out = StringIO()
+        call_command("compact_memo_revisions", "--delay=0", stdout=out)
+        self.assertIn("이력 3건 삭제", out.getvalue())
+        history = list(MemoRevision.objects.filter(memo=self.memo).order_by("number"))
+        self.assertEqual([revision.number for revision in history], [3, 5, 6, 7])
+        self.assertTrue(history[0].is_snapshot)
+        for revision in history:
+            self.assertEqual(revisions.rebuild(revision), contents[revision.number - 1])
+        # 정리 후에도 새 수정이 이력으로 이어짐
+        content = self.edit(10)
+        latest = self.memo.revisions.first()
+        self.assertEqual((latest.number, revisions.rebuild(latest)), (8, content))
+        self.assertEqual(list(revisions.compaction_candidates()), [self.memo.pk])
+        self.assertEqual(revisions.compact(self.memo.pk), 0)
+
+
+class MemoTagTest(TestCase):
+    """메모 태그(연결 테이블, 태그별 개수, 태그 필터 목록) 테스트"""
+
+    def setUp(self):
+        """로그인한 사용자 준비"""
+        self.user = User.objects.create_user(
+            username="taguser",
+            email="tag@example.com",
+            password="testpassword123"
+        )
+        self.client.force_login(self.user)
+
+    def counts(self):
+        return dict(Tag.objects.filter(user=self.user).values_list("name", "memo_count"))
+
+    def test_create_and_edit_tags(self):
+        """작성/수정 폼의 태그가 연결되고, 태그만 바꿔도 버전이 오름"""
+        self.client.post(reverse("memo_create"), {
+            "title": "회의록", "content": "내용", "tags": "회의, #할 일, 회의",
+        })
+        memo = Memo.objects.get(user=self.user)
+        self.assertEqual(memo_tags.tag_names(memo), ["할 일", "회의"])
+        self.assertEqual(self.counts(), {"할 일": 1, "회의": 1})
+
+        response = self.client.get(reverse("memo_edit", args=[memo.pk]))
+        self.assertContains(response, 'value="할 일, 회의"')
+        self.client.post(reverse("memo_edit", args=[memo.pk]), {
+            "title": "회의록", "content": "내용", "tags": "회의, 주간", "version": memo.version,
+        })
+        memo.refresh_from_db()
+        self.assertEqual(memo.version, 2)
+        self.assertEqual(memo_tags.tag_names(memo), ["주간", "회의"])
+        self.assertEqual(self.counts(), {"할 일": 0, "주간": 1, "회의": 1})
+
+    def test_invalid_tags(self):
+        """태그 개수와 길이 제한을 넘으면 폼 오류"""
+        with override_settings(MEMO_TAGS_MAX=2):
+            response = self.client.post(reverse("memo_create"), {"title": "t", "content": "c", "tags": "a, b, c"})
+        self.assertFormError(response.context["form"], "tags", "태그는 메모당 2개까지 붙일 수 있습니다.")
+        self.assertFalse(Memo.objects.exists())
+
+    def test_counts_follow_trash_and_purge(self):
+        """휴지통 이동, 복원, 실제 삭제에 따라 태그별 메모 수가 바뀜"""
+        first = Memo.objects.create(user=self.user, title="첫째", content="내용")
+        second = Memo.objects.create(user=self.user, title="둘째", content="내용")
+        memo_tags.set_memo_tags(first, ["공통", "첫째"])
+        memo_tags.set_memo_tags(second, ["공통"])
+        Memo.objects.filter(pk__in=[first.pk, second.pk]).delete()
+        self.assertEqual(self.counts(), {"공통": 0, "첫째": 0})
+        Memo.all_objects.filter(pk=first.pk).restore()
+        self.assertEqual(self.counts(), {"공통": 1, "첫째": 1})
+        # 휴지통의 메모를 지워도 다시 줄지 않고, 연결은 함께 삭제됨
+        Memo.all_objects.filter(pk=second.pk).hard_delete()
+        first.refresh_from_db()
+        first.hard_delete()
+        self.assertEqual(self.counts(), {"공통": 0, "첫째": 0})
+        self.assertFalse(MemoTag.objects.exists())
+
+    def test_tag_filtered_list(self):
+        """태그로 거른 목록은 연결 테이블 순서로 페이지를 넘기고 태그를 한 번에 읽음"""
+        other = User.objects.create_user(username="othertag", password="testpassword123")
+        other_memo = Memo.objects.create(user=other, title="남의 메모", content="내용")
+        memo_tags.set_memo_tags(other_memo, ["회의"])
+        memos = [Memo.objects.create(user=self.user, title=f"메모 {i}", content="내용") for i in range(5)]
+        for memo in memos:
+            memo_tags.set_memo_tags(memo, ["회의", f"개별{memo.pk}"])
+        memo_tags.set_memo_tags(memos[0], [])
+        memos[1].delete()
+
+        seen = []
+        after = None
+        while True:
+            # 연결/메모 조회 1회와 카드의 태그 prefetch 1회 (페이지 크기와 무관)
+            with self.assertNumQueries(2):
+                page = memo_tags.paginate_tagged(self.user, "회의", after, 2)
+                tag_lists = [[tag.name for tag in memo.tags.all()] for memo in page]
+            seen.extend(memo.pk for memo in page)
+            self.assertTrue(all("회의" in names for names in tag_lists))
+            if not page.has_next:
+                break
+            after = page.next_cursor
+        self.assertEqual(seen, [memos[4].pk, memos[3].pk, memos[2].pk])
+
+        response = self.client.get(reverse("memo_list"), {"tag": "회의"})
+        self.assertContains(response, "메모 4")
+        self.assertNotContains(response, "메모 0")
+        self.assertNotContains(response, "남의 메모")
+        self.assertContains(response, "#회의")
+
+    def test_tag_query_uses_link_index(self):
+        """태그별 목록은 memo_tags 인덱스만으로 찾고 정렬함"""
+        memo = Memo.objects.create(user=self.user, title="메모", content="내용")
+        memo_tags.set_memo_tags(memo, ["회의"])
+        plan = memo_tags.tagged_links(self.user, "회의").order_by("-created_at", "-memo_id").explain()
+        self.assertIn("COVERING INDEX memo_tags_tag_created_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+class MemoStatsTest(TestCase):
+    """사용자별 메모 통계(같은 트랜잭션에서 증감, 점검 명령, 목록 머리글) 테스트"""
+
+    def setUp(self):
+        """로그인한 사용자 준비"""
+        self.user = User.objects.create_user(
+            username="statsuser",
+            email="stats@example.com",
+            password="testpassword123"
+        )
+        self.client.force_login(self.user)
+
+    def stats(self):
+        return MemoStats.objects.get(user=self.user)
+
+    def assertInSync(self):
+        stats = self.stats()
+        self.assertEqual(memo_stats.drift(stats, MemoStats.objects.actual([self.user.pk])[self.user.pk]), [])
+        return stats
+
+    def test_create_edit_delete_restore(self):
+        """작성, 수정, 삭제, 복원, 영구 삭제마다 통계가 실제 메모와 같음"""
+        self.assertEqual((self.stats().memo_count, self.stats().total_bytes), (0, 0))
+        memo = Memo.objects.create(user=self.user, title="통계", content="가나다")
+        long_memo = Memo.objects.create(user=self.user, title="긴 메모", content="반복되는 본문 " * 500)
+        stats = self.assertInSync()
+        self.assertEqual(stats.memo_count, 2)
+        # 압축된 본문은 압축된 크기로 센다
+        self.assertEqual(stats.total_bytes, 9 + compression.stored_size(long_memo.content))
+        self.assertLess(stats.total_bytes, len(long_memo.content.encode("utf-8")))
+        self.assertEqual(stats.last_created_at, long_memo.created_at)
+
+        memo.content = "가나다라마바사"
+        memo.save_versioned(["content"])
+        self.assertEqual(self.assertInSync().last_updated_at, memo.updated_at)
+        memo.title = "제목만"
+        memo.save()
+        self.assertInSync()
+
+        memo.delete()
+        self.assertEqual(self.assertInSync().memo_count, 1)
+        memo.restore()
+        self.assertEqual(self.assertInSync().memo_count, 2)
+        Memo.objects.filter(pk=memo.pk).delete()
+        Memo.all_objects.filter(pk=memo.pk).restore()
+        long_memo.hard_delete()
+        stats = self.assertInSync()
+        self.assertEqual((stats.memo_count, stats.total_bytes), (1, 21))
+
+    def test_version_conflict_keeps_stats(self):
+        """버전 충돌로 저장하지 못하면 통계도 바꾸지 않음"""
+        memo = Memo.objects.create(user=self.user, title="t", content="처음")
+        stale = Memo.objects.get(pk=memo.pk)
+        memo.content = "먼저 저장"
+        memo.save_versioned(["content"])
+        before = self.stats()
+        stale.content = "나중에 저장한 아주 긴 본문"
+        with self.assertRaises(VersionConflict):
+            stale.save_versioned(["content"])
+        self.assertEqual(self.stats().total_bytes, before.total_bytes)
+        self.assertInSync()
+
+    def test_batch_api(self):
+        """일괄 API의 bulk_create/bulk_update/삭제도 통계에 반영"""
+        memo = Memo.objects.create(user=self.user, title="t", content="지울 메모")
+        edited = Memo.objects.create(user=self.user, title="t", content="고칠 메모")
+        self.client.post(
+            reverse("api_memo_batch"),
+            data=json.dumps({
+                "create": [{"title": "새 메모", "content": "새 본문"}],
+                "update": [{"id": edited.pk, "content": "더 길게 고친 메모"}],
+                "delete": [memo.pk],
+            }),
+            content_type="application/json",
+        )
+        self.assertEqual(self.assertInSync().memo_count, 2)
+
+    def test_reconcile_command(self):
+        """점검 명령이 어긋난 통계와 없는 행을 찾아 고치고, --dry-run은 고치지 않음"""
+        Memo.objects.create(user=self.user, title="t", content="본문")
+        MemoStats.objects.filter(user=self.user).update(memo_count=5, total_bytes=0)
+        other = User.objects.create_user(username="other", email="other@example.com", password="testpassword123")
+        Memo.objects.create(user=other, title="t", content="다른 사용자")
+        MemoStats.objects.filter(user=other).delete()
+
+        out = StringIO()
+        call_command("reconcile_memo_stats", dry_run=True, delay=0, stdout=out)
+        self.assertIn(f"사용자 {self.user.pk}: memo_count, total_bytes", out.getvalue())
+        self.assertIn(f"사용자 {other.pk}: missing", out.getvalue())
+        self.assertEqual(self.stats().memo_count, 5)
+
+        out = StringIO()
+        call_command("reconcile_memo_stats", batch_size=1, delay=0, stdout=out)
+        self.assertIn("어긋난 통계 2건 고침", out.getvalue())
+        self.assertInSync()
+        self.assertEqual(MemoStats.objects.get(user=other).memo_count, 1)
+        out = StringIO()
+        call_command("reconcile_memo_stats", delay=0, stdout=out)
+        self.assertIn("어긋난 통계 0건 고침", out.getvalue())
+
+    def test_list_header_reads_stats(self):
+        """목록 머리글은 메모를 세지 않고 통계 행에서 읽음"""
+        Memo.objects.create(user=self.user, title="t", content="본문")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("memo_list"))
+        self.assertContains(response, "메모 1개")
+        sql = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertIn('"memo_stats"', sql)
+        self.assertNotIn("COUNT(", sql)
+
+        # 통계 행이 없는 사용자는 처음 읽을 때 만든다
+        MemoStats.objects.filter(user=self.user).delete()
+        memo_cache.bump_generation(self.user.pk)
+        self.assertContains(self.client.get(reverse("memo_list")), "메모 1개")
+        self.assertInSync()
+
+
+class MemoListPaginationTest(TestCase):
+    """메모 목록 키셋 페이지네이션 테스트"""
+
+    def setUp(self):
+        """테스트에 사용할 사용자와 여러 개의 메모 생성"""
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="pageuser",
+            email="page@example.com",
+            password="testpassword123"
+        )
+        self.client.login(username="pageuser", password="testpassword123")
+        self.memos = [
+            Memo.objects.create(user=self.user, title=f"메모 {i}", content="내용")
+            for i in range(5)
+        ]
+        self.memo_list_url = reverse("memo_list")
+
+    def test_pages_follow_cursor_without_overlap(self):
+        """after 커서를 따라가면 모든 메모를 중복 없이 최신순으로 조회"""
+        seen = []
+        after = None
+        while True:
+            params = {"size": 2}
+            if after:
+                params["after"] = after
+            response = self.client.get(self.memo_list_url, params)
+            self.assertEqual(response.status_code, 200)
+            page = response.context["page"]
+            self.assertLessEqual(len(page), 2)
+            seen.extend(memo.pk for memo in page)
+            if not page.has_next:
+                break
+            after = page.next_cursor
+        expected = [memo.pk for memo in reversed(self.memos)]
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor(self):
+        """잘못된 커서는 400 응답"""
+        response = self.client.get(self.memo_list_url, {"after": "!!잘못된-커서"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_pk_out_of_range(self):
+        """64비트 정수 범위를 벗어난 id의 커서는 500 대신 400 응답"""
+        created_at = self.memos[2].created_at.isoformat()
+        for pk in (2 ** 63, -(2 ** 63) - 1, 10 ** 30):
+            raw = f"{created_at}|{pk}".encode("utf-8")
+            after = base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+            self.assertEqual(self.client.get(self.memo_list_url, {"after": after}).status_code, 400)
+            self.assertEqual(self.client.get(reverse("api_memo_list"), {"after": after}).status_code, 400)
+        raw = f"{created_at}|{2 ** 63 - 1}".encode("utf-8")
+        after = base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+        self.assertEqual(self.client.get(self.memo_list_url, {"after": after}).status_code, 200)
+
+    def test_page_query_uses_composite_index(self):
+        """페이지 조회가 (user_id, created_at, id) 복합 인덱스를 사용"""
+        page = paginate_keyset(
+            Memo.objects.filter(user=self.user),
+            after=encode_cursor(self.memos[2]),
+            page_size=2,
+        )
+        self.assertEqual([memo.pk for memo in page], [self.memos[1].pk, self.memos[0].pk])
+        queryset = Memo.objects.filter(user=self.user).order_by("-created_at", "-id")
+        sql, params = queryset[:3].query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("memos_user_created_id_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_list_does_not_read_content(self):
+        """목록 페이지는 본문 컬럼 대신 미리 계산한 요약만 읽음"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.memo_list_url)
+        self.assertContains(response, "내용")
+        memo_queries = [query["sql"] for query in queries if 'FROM "memos"' in query["sql"]]
+        self.assertTrue(memo_queries)
+        for sql in memo_queries:
+            self.assertNotIn('"memos"."content"', sql)
+
+
+class MemoSearchTest(TestCase):
+    """메모 전문 검색 테스트"""
+
+    def setUp(self):
+        """테스트에 사용할 사용자와 한글 메모 생성"""
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="searchuser",
+            email="search@example.com",
+            password="testpassword123"
+        )
+        self.other = User.objects.create_user(
+            username="otheruser",
+            email="other@example.com",
+            password="testpassword123"
+        )
+        self.client.login(username="searchuser", password="testpassword123")
+        self.meeting = Memo.objects.create(
+            user=self.user,
+            title="주간 회의록",
+            content="이번 주 회의록을 정리했습니다. 회의록 공유 필요."
+        )
+        self.shopping = Memo.objects.create(
+            user=self.user,
+            title="장보기 목록",
+            content="우유, 계란, 회의실 간식"
+        )
+        Memo.objects.create(
+            user=self.other,
+            title="다른 사람의 회의록",
+            content="보이면 안 되는 메모"
+        )
+
+    def test_search_korean_trigram(self):
+        """3글자 이상 한글 검색어는 FTS5 인덱스로 검색"""
+        page = search_memos(self.user, "회의록")
+        self.assertEqual([memo.pk for memo in page], [self.meeting.pk])
+
+    def test_search_short_korean_term(self):
+        """2글자 한글 검색어도 사용자 메모에서 검색"""
+        page = search_memos(self.user, "회의")
+        self.assertEqual(
+            sorted(memo.pk for memo in page),
+            sorted([self.meeting.pk, self.shopping.pk])
+        )
+
+    def test_search_scoped_to_user(self):
+        """다른 사용자의 메모는 검색되지 않음"""
+        page = search_memos(self.other, "장보기")
+        self.assertEqual(len(page), 0)
+
+    def test_index_follows_update_and_delete(self):
+        """메모 수정과 삭제가 검색 인덱스에 바로 반영"""
+        self.shopping.content = "프로젝트 회고 메모"
+        self.shopping.save()
+        self.assertEqual([memo.pk for memo in search_memos(self.user, "프로젝트")], [self.shopping.pk])
+        self.shopping.delete()
+        self.assertEqual(len(search_memos(self.user, "프로젝트")), 0)
+
+    def test_stale_instance_save_indexes_stored_values(self):
+        """update_fields로 본문만 저장한 오래된 인스턴스도 저장된 제목으로 색인"""
+        stale = Memo.objects.get(pk=self.shopping.pk)
+        self.shopping.title = "프로젝트 준비물"
+        self.shopping.save()
+        stale.content = "회고 자료 정리"
+        stale.save(update_fields=["content"])
+        self.assertEqual([memo.pk for memo in search_memos(self.user, "프로젝트")], [self.shopping.pk])
+        self.assertEqual([memo.pk for memo in search_memos(self.user, "장보기")], [])
+        # 색인한 값과 같은 값으로 지워야 인덱스가 깨지지 않는다
+        self.shopping.refresh_from_db()
+        self.shopping.hard_delete()
+        self.assertEqual([memo.pk for memo in search_memos(self.user, "프로젝트")], [])
+        self.assertEqual([memo.pk for memo in search_memos(self.user, "회의록")], [self.meeting.pk])
+
+    def test_hard_delete_removes_index_rows(self):
+        """영구 삭제한 메모의 색인도 함께 지움"""
+        self.shopping.hard_delete()
+        Memo.all_objects.filter(pk=self.meeting.pk).hard_delete()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT rowid FROM memos_fts WHERE rowid IN (%s, %s)", [self.shopping.pk, self.meeting.pk])
+            self.assertEqual(cursor.fetchall(), [])
+
+    def test_schema_does_not_need_sql_function(self):
+        """트리거나 뷰가 memo_plain()을 쓰지 않아 이 함수가 없는 연결(sqlite3 셸 등)에서도 memos를 쓸 수 있음"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT type, name FROM sqlite_master WHERE type IN ('trigger', 'view') OR sql LIKE %s",
+                ["%memo_plain%"],
+            )
+            self.assertEqual(cursor.fetchall(), [])
+
+    def test_search_pagination(self):
+        """검색 결과가 페이지 단위로 나뉨"""
+        for i in range(3):
+            Memo.objects.create(user=self.user, title=f"회의록 {i}", content="내용")
+        first = search_memos(self.user, "회의록", page=1, page_size=2)
+        second = search_memos(self.user, "회의록", page=2, page_size=2)
+        self.assertTrue(first.has_next)
+        self.assertFalse(second.has_next)
+        self.assertEqual(len(first) + len(second), 4)
+        self.assertFalse({memo.pk for memo in first} & {memo.pk for memo in second})
+
+    def test_search_page_out_of_range(self):
+        """정수 범위를 넘는 페이지 번호는 500 대신 400, 직접 호출하면 마지막 페이지로 제한"""
+        response = self.client.get(reverse("memo_search"), {"q": "회의록", "page": "99999999999999999999"})
+        self.assertEqual(response.status_code, 400)
+        page = search_memos(self.user, "회의록", page=10 ** 20)
+        self.assertEqual(page.number, MAX_PAGE)
+        self.assertEqual(len(page), 0)
+
+    def test_search_view(self):
+        """검색 뷰가 결과를 렌더링"""
+        response = self.client.get(reverse("memo_search"), {"q": "회의록"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "memos/memo_search.html")
+        self.assertContains(response, "주간 회의록")
+        self.assertNotContains(response, "다른 사람의 회의록")
+
+    def test_rebuild_command(self):
+        """검색 인덱스 재구성 명령 실행 후에도 검색 가능"""
+        call_command("rebuild_memo_search", "--optimize", stdout=StringIO())
+        self.assertEqual([memo.pk for memo in search_memos(self.user, "회의록")], [self.meeting.pk])
+
+
+class MemoCompressedContentTest(TestCase):
+    """메모 본문 압축 저장 테스트"""
+
+    def setUp(self):
+        """테스트에 사용할 사용자와 긴 본문 준비"""
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="zipuser",
+            email="zip@example.com",
+            password="testpassword123"
+        )
+        self.client.login(username="zipuser", password="testpassword123")
+        self.long_content = "서버 로그 한 줄입니다. 배포 완료.\n" * 500
+
+    def stored_type(self, memo):
+        """데이터베이스에 저장된 본문 값의 SQLite 타입"""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT typeof(content) FROM memos WHERE id = %s", [memo.pk])
+            return cursor.fetchone()[0]
+
+    def test_long_content_compressed_short_content_raw(self):
+        """임계값 이상의 본문만 압축해 저장하고 읽을 때는 원문으로 복원"""
+        long_memo = Memo.objects.create(user=self.user, title="긴 메모", content=self.long_content)
+        short_memo = Memo.objects.create(user=self.user, title="짧은 메모", content="짧은 내용")
+        self.assertEqual(self.stored_type(long_memo), "blob")
+        self.assertEqual(self.stored_type(short_memo), "text")
+        self.assertEqual(Memo.objects.get(pk=long_memo.pk).content, self.long_content)
+        self.assertEqual(Memo.objects.get(pk=short_memo.pk).content, "짧은 내용")
+
+    def test_codec_is_pluggable(self):
+        """다른 코덱으로 저장한 본문도 코덱 설정과 무관하게 읽힘"""
+        with override_settings(MEMO_CONTENT_CODEC="lzma"):
+            memo = Memo.objects.create(user=self.user, title="lzma 메모", content=self.long_content)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT substr(content, 1, 1) FROM memos WHERE id = %s", [memo.pk])
+            self.assertEqual(cursor.fetchone()[0], bytes([compression.CODECS["lzma"].tag]))
+        self.assertEqual(Memo.objects.get(pk=memo.pk).content, self.long_content)
+
+    def test_form_round_trip(self):
+        """폼으로 저장한 긴 본문이 상세 화면과 수정 폼에 그대로 표시"""
+        self.client.post(reverse("memo_create"), {"title": "폼 메모", "content": self.long_content})
+        memo = Memo.objects.get(title="폼 메모")
+        self.assertEqual(self.stored_type(memo), "blob")
+        self.assertContains(self.client.get(reverse("memo_detail", args=[memo.pk])), "배포 완료.")
+        response = self.client.get(reverse("memo_edit", args=[memo.pk]))
+        self.assertEqual(response.context["form"].initial["content"], self.long_content.strip())
+
+    def test_admin_round_trip(self):
+        """관리자 변경 화면에 압축된 본문이 원문으로 표시"""
+        admin = User.objects.create_superuser("zipadmin", "admin@example.com", "testpassword123")
+        memo = Memo.objects.create(user=admin, title="관리자 메모", content=self.long_content)
+        self.client.force_login(admin)
+        response = self.client.get(reverse("admin:memos_memo_change", args=[memo.pk]))
+        self.assertContains(response, "서버 로그 한 줄입니다.")
+
+    def test_compressed_content_searchable(self):
+        """압축된 본문도 전문 검색과 짧은 검색어로 찾을 수 있음"""
+        memo = Memo.objects.create(
+            user=self.user, title="로그", content=self.long_content + "장애 원인 분석"
+        )
+        self.assertEqual([found.pk for found in search_memos(self.user, "원인 분석")], [memo.pk])
+        self.assertEqual([found.pk for found in search_memos(self.user, "장애")], [memo.pk])
+
+
+    def test_search_index_keeps_no_content_copy(self):
+        """검색 인덱스는 원문 사본을 두지 않아 압축한 본문이 인덱스에서 다시 늘어나지 않음"""
+        Memo.objects.create(user=self.user, title="로그", content=self.long_content)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name = 'memos_fts_content'")
+            self.assertEqual(cursor.fetchall(), [])
+            cursor.execute("SELECT content FROM memos_fts")
+            self.assertEqual(cursor.fetchall(), [(None,)])
+
+
+class MemoFragmentCacheTest(TestCase):
+    """사용자별 메모 렌더링 캐시 테스트"""
+
+    def setUp(self):
+        """테스트에 사용할 사용자와 메모 생성"""
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="cacheuser",
+            email="cache@example.com",
+            password="testpassword123"
+        )
+        self.client.login(username="cacheuser", password="testpassword123")
+        self.memo = Memo.objects.create(user=self.user, title="캐시 메모", content="캐시 내용")
+        self.memo_list_url = reverse("memo_list")
+        self.memo_detail_url = reverse("memo_detail", args=[self.memo.pk])
+
+    def test_list_served_from_cache(self):
+        """두 번째 목록 요청은 메모를 다시 조회하지 않고 캐시 히트"""
+        self.client.get(self.memo_list_url)
+        before = memo_cache.get_stats()
+        # 세션과 사용자도 캐시에서 읽으므로 조건부 요청 검증자 조회만 발생
+        with self.assertNumQueries(1):
+            response = self.client.get(self.memo_list_url)
+        self.assertContains(response, "캐시 메모")
+        self.assertEqual(memo_cache.get_stats()["hits"], before["hits"] + 1)
+
+    def test_detail_served_from_cache(self):
+        """두 번째 상세 요청은 캐시 히트"""
+        self.client.get(self.memo_detail_url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.memo_detail_url)
+        self.assertContains(response, "캐시 내용")
+
+    def test_detail_single_query_with_warm_session(self):
+        """조각 캐시가 비어 있어도 세션과 사용자가 캐시되어 있으면 검증자와 메모 조회로 응답"""
+        self.client.get(self.memo_detail_url)
+        memo_cache.bump_generation(self.user.pk)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.memo_detail_url)
+        self.assertContains(response, "캐시 내용")
+
+    def test_save_invalidates_cache(self):
+        """메모 수정 시 세대가 바뀌어 새 내용이 렌더링"""
+        self.client.get(self.memo_detail_url)
+        generation = memo_cache.get_generation(self.user.pk)
+        self.memo.content = "바뀐 내용"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.memo.save()
+            # 커밋 전에 세대를 바꾸면 그 사이의 요청이 이전 내용을 새 세대로 캐시할 수 있다
+            self.assertEqual(memo_cache.get_generation(self.user.pk), generation)
+        self.assertNotEqual(memo_cache.get_generation(self.user.pk), generation)
+        response = self.client.get(self.memo_detail_url)
+        self.assertContains(response, "바뀐 내용")
+
+    def test_delete_invalidates_cache(self):
+        """메모 삭제 시 목록과 상세 캐시가 무효화"""
+        self.client.get(self.memo_list_url)
+        self.client.get(self.memo_detail_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.memo.delete()
+        self.assertNotContains(self.client.get(self.memo_list_url), "캐시 메모")
+        self.assertEqual(self.client.get(self.memo_detail_url).status_code, 404)
+
+    def test_queryset_trash_and_restore_invalidate_cache(self):
+        """쿼리셋으로 휴지통에 옮기거나 되살려도 커밋되면 목록 캐시가 무효화"""
+        self.client.get(self.memo_list_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Memo.objects.filter(pk=self.memo.pk).delete()
+        self.assertNotContains(self.client.get(self.memo_list_url), "캐시 메모")
+        with self.captureOnCommitCallbacks(execute=True):
+            Memo.all_objects.filter(pk=self.memo.pk).restore()
+        self.assertContains(self.client.get(self.memo_list_url), "캐시 메모")
+
+    def test_tag_change_invalidates_cache_on_commit(self):
+        """태그를 바꾸면 트랜잭션이 커밋된 뒤에 캐시 세대가 바뀜"""
+        generation = memo_cache.get_generation(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            memo_tags.set_memo_tags(self.memo, ["회의"])
+            self.assertEqual(memo_cache.get_generation(self.user.pk), generation)
+        self.assertNotEqual(memo_cache.get_generation(self.user.pk), generation)
+
+    def test_cache_scoped_to_user(self):
+        """다른 사용자는 캐시된 상세 조각을 볼 수 없음"""
+        self.client.get(self.memo_detail_url)
+        User.objects.create_user(
+            username="intruder",
+            email="intruder@example.com",
+            password="testpassword123"
+        )
+        self.client.login(username="intruder", password="testpassword123")
+        self.assertEqual(self.client.get(self.memo_detail_url).status_code, 404)
+
+
+class MemoConditionalRequestTest(TestCase):
+    """메모 페이지 조건부 요청(ETag/Last-Modified/304, If-Match/412) 테스트"""
+
+    def setUp(self):
+        """로그인한 사용자와 메모 준비"""
+        self.user = User.objects.create_user(
+            username="etaguser",
+            email="etag@example.com",
+            password="testpassword123"
+        )
+        self.client.force_login(self.user)
+        self.memo = Memo.objects.create(user=self.user, title="검증자 메모", content="검증자 내용")
+        self.other = Memo.objects.create(user=self.user, title="다른 메모", content="다른 내용")
+        self.memo_list_url = reverse("memo_list")
+        self.memo_detail_url = reverse("memo_detail", args=[self.memo.pk])
+
+    def test_detail_not_modified(self):
+        """같은 ETag로 다시 요청하면 렌더링 없이 304"""
+        response = self.client.get(self.memo_detail_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response)
+        etag = response["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.memo_detail_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_list_validator_changes_on_edit_and_delete(self):
+        """메모를 수정하거나 삭제하면 목록 ETag가 바뀜"""
+        etag = self.client.get(self.memo_list_url)["ETag"]
+        response = self.client.get(self.memo_list_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        self.memo.title = "수정한 메모"
+        self.memo.save()
+        response = self.client.get(self.memo_list_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        self.other.delete()
+        response = self.client.get(self.memo_list_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_edit_if_match(self):
+        """수정 POST는 If-Match가 현재 ETag와 다르면 412로 거절"""
+        etag = self.client.get(self.memo_detail_url)["ETag"]
+        data = {"title": "먼저 저장", "content": "내용"}
+        response = self.client.post(
+            reverse("memo_edit", args=[self.memo.pk]), data, headers={"if-match": etag}
+        )
+        self.assertRedirects(response, self.memo_detail_url, fetch_redirect_response=False)
+
+        data = {"title": "늦게 저장", "content": "내용"}
+        response = self.client.post(
+            reverse("memo_edit", args=[self.memo.pk]), data, headers={"if-match": etag}
+        )
+        self.assertEqual(response.status_code, 412)
+        self.memo.refresh_from_db()
+        self.assertEqual(self.memo.title, "먼저 저장")
+
+    def test_delete_if_match(self):
+        """삭제 POST도 이전 ETag로는 412"""
+        response = self.client.post(
+            reverse("memo_delete", args=[self.memo.pk]), headers={"if-match": '"stale"'}
+        )
+        self.assertEqual(response.status_code, 412)
+        self.assertTrue(Memo.objects.filter(pk=self.memo.pk).exists())
+
+    def test_form_pages_not_reused_after_login(self):
+        """CSRF 폼이 든 페이지는 다시 로그인한 뒤 예전 ETag로 304를 받지 않음"""
+        credentials = {"username": "etaguser", "password": "testpassword123"}
+        edit_url = reverse("memo_edit", args=[self.memo.pk])
+        self.client.logout()
+        self.client.post(reverse("login"), credentials)
+        edit_etag = self.client.get(edit_url)["ETag"]
+        list_etag = self.client.get(self.memo_list_url)["ETag"]
+        response = self.client.get(self.memo_list_url, headers={"if-none-match": list_etag})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(edit_url, headers={"if-none-match": edit_etag})
+        self.assertEqual(response.status_code, 200)
+
+        self.client.get(reverse("logout"))
+        self.client.post(reverse("login"), credentials)
+        response = self.client.get(self.memo_list_url, headers={"if-none-match": list_etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], list_etag)
+
+    def test_other_users_memo_still_404(self):
+        """다른 사용자의 메모는 검증자 없이 404"""
+        other_user = User.objects.create_user(username="etagother", password="testpassword123")
+        self.client.force_login(other_user)
+        response = self.client.get(self.memo_detail_url)
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
+
+
+@override_settings(ROOT_URLCONF="memojjang.async_urls")
+class AsyncMemoViewTest(TestCase):
+    """ASGI용 비동기 메모 뷰 테스트"""
+
+    def setUp(self):
+        """테스트에 사용할 사용자와 메모 생성"""
+        self.user = User.objects.create_user(
+            username="asyncuser",
+            email="async@example.com",
+            password="testpassword123"
+        )
+        self.memo = Memo.objects.create(user=self.user, title="비동기 메모", content="비동기 내용")
+
+    async def test_views_are_coroutines(self):
+        """메모 CRUD URL이 비동기 뷰로 연결"""
+        for name, args in [("memo_list", []), ("memo_detail", [self.memo.pk]), ("login", [])]:
+            match = resolve(reverse(name, args=args))
+            self.assertTrue(asyncio.iscoroutinefunction(match.func))
+
+    async def test_memo_crud_flow(self):
+        """비동기 뷰로 메모 목록/생성/수정/삭제"""
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse("memo_list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "비동기 메모")
+
+        response = await self.async_client.post(
+            reverse("memo_create"), {"title": "새 비동기 메모", "content": "내용"}
+        )
+        self.assertRedirects(response, reverse("memo_list"), fetch_redirect_response=False)
+        self.assertTrue(await Memo.objects.filter(title="새 비동기 메모").aexists())
+
+        response = await self.async_client.get(reverse("memo_detail", args=[self.memo.pk]))
+        self.assertContains(response, "비동기 내용")
+
+        response = await self.async_client.post(
+            reverse("memo_edit", args=[self.memo.pk]), {"title": "수정됨", "content": "수정 내용"}
+        )
+        self.assertRedirects(
+            response, reverse("memo_detail", args=[self.memo.pk]), fetch_redirect_response=False
+        )
+        memo = await Memo.objects.aget(pk=self.memo.pk)
+        self.assertEqual(memo.title, "수정됨")
+
+        response = await self.async_client.post(reverse("memo_delete", args=[self.memo.pk]))
+        self.assertRedirects(response, reverse("memo_list"), fetch_redirect_response=False)
+        self.assertFalse(await Memo.objects.filter(pk=self.memo.pk).aexists())
+
+    async def test_login_required(self):
+        """로그인하지 않으면 로그인 페이지로 리다이렉트"""
+        response = await self.async_client.get(reverse("memo_list"))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(reverse("login") in response.url)
+
+    async def test_login_and_register(self):
+        """비동기 로그인과 회원가입"""
+        response = await self.async_client.post(
+            reverse("login"), {"username": "asyncuser", "password": "wrongpassword"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        response = await self.async_client.post(
+            reverse("login"), {"username": "asyncuser", "password": "testpassword123"}
+        )
+        self.assertRedirects(response, reverse("memo_list"), fetch_redirect_response=False)
+
+        response = await self.async_client.get(reverse("logout"))
+        self.assertRedirects(response, reverse("home"), fetch_redirect_response=False)
+
+        response = await self.async_client.post(reverse("register"), {
+            "username": "newasyncuser",
+            "email": "newasync@example.com",
+            "password1": "complex-password123",
+            "password2": "complex-password123"
+        })
+        self.assertRedirects(response, reverse("memo_list"), fetch_redirect_response=False)
+        self.assertTrue(await User.objects.filter(username="newasyncuser").aexists())
+
+    async def test_conditional_get(self):
+        """비동기 상세/목록 뷰도 같은 ETag면 304"""
+        await self.async_client.aforce_login(self.user)
+        for url in [reverse("memo_detail", args=[self.memo.pk]), reverse("memo_list")]:
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 200)
+            response = await self.async_client.get(url, headers={"if-none-match": response["ETag"]})
+            self.assertEqual(response.status_code, 304)
+
+
+class MemoApiTest(TestCase):
+    """메모 JSON API 테스트"""
+
+    def setUp(self):
+        """테스트에 사용할 사용자와 메모 생성"""
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="apiuser",
+            email="api@example.com",
+            password="testpassword123"
+        )
+        self.other = User.objects.create_user(
+            username="apiother",
+            email="apiother@example.com",
+            password="testpassword123"
+        )
+        self.client.login(username="apiuser", password="testpassword123")
+        self.memos = [
+            Memo.objects.create(user=self.user, title=f"API 메모 {i}", content="내용")
+            for i in range(3)
+        ]
+        self.other_memo = Memo.objects.create(user=self.other, title="남의 메모", content="내용")
+        self.batch_url = reverse("api_memo_batch")
+
+    def post_batch(self, body):
+        """배치 API에 JSON 본문을 전송"""
+        return self.client.post(self.batch_url, json.dumps(body), content_type="application/json")
+
+    def test_list_with_cursor(self):
+        """목록 API가 커서로 페이지를 이어서 반환"""
+        response = self.client.get(reverse("api_memo_list"), {"size": 2})
+        data = response.json()
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIsNotNone(data["next"])
+        response = self.client.get(reverse("api_memo_list"), {"size": 2, "after": data["next"]})
+        data = response.json()
+        self.assertEqual([item["id"] for item in data["results"]], [self.memos[0].pk])
+        self.assertIsNone(data["next"])
+
+    def test_retrieve_scoped_to_user(self):
+        """다른 사용자의 메모는 404"""
+        response = self.client.get(reverse("api_memo_retrieve", args=[self.memos[0].pk]))
+        self.assertEqual(response.json()["title"], "API 메모 0")
+        response = self.client.get(reverse("api_memo_retrieve", args=[self.other_memo.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_requires_login(self):
+        """로그인하지 않으면 401"""
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("api_memo_list")).status_code, 401)
+
+    def test_batch_requires_json(self):
+        """JSON이 아닌 본문은 415"""
+        response = self.client.post(self.batch_url, {"create": "x"})
+        self.assertEqual(response.status_code, 415)
+
+    def test_batch_create_update_delete(self):
+        """배치 요청이 항목별 결과와 함께 처리"""
+        # 로그인 직후 첫 요청이므로 캐시되지 않은 사용자 조회 1회 포함.
+        # 삭제는 휴지통으로 옮기는 UPDATE와 태그 개수를 줄이는 UPDATE를 한 세이브포인트에서 한다.
+        # 수정 이력은 항목 수와 관계없이 첫 이력 INSERT ... SELECT, 최근 이력 조회, bulk_create로 남긴다.
+        # 작성자 통계는 생성/수정/삭제마다 UPDATE 한 번씩 고치고, 생성/수정은 변경 번호를 하나씩 받는다.
+        # 삭제는 커밋 뒤 렌더링 캐시를 무효화할 작성자 id를 한 번 더 읽는다.
+        # 검색 인덱스는 생성은 넣기, 수정은 이전 색인 지우기와 넣기를 각각 executemany 한 번으로 한다
+        with self.assertNumQueries(23):
+            response = self.post_batch({
+                "create": [{"title": "새 메모", "content": "새 내용"}, {"title": "", "content": ""}],
+                "update": [
+                    {"id": self.memos[0].pk, "title": "수정된 제목"},
+                    {"id": self.other_memo.pk, "title": "탈취 시도"},
+                ],
+                "delete": [self.memos[1].pk, self.other_memo.pk],
+            })
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([item["status"] for item in data["create"]], ["created", "error"])
+        created = Memo.objects.get(pk=data["create"][0]["id"], user=self.user)
+        self.assertEqual((created.excerpt, created.word_count), ("새 내용", 2))
+        self.assertEqual([item["status"] for item in data["update"]], ["updated", "not_found"])
+        self.assertEqual([item["status"] for item in data["delete"]], ["deleted", "not_found"])
+
+        self.memos[0].refresh_from_db()
+        self.assertEqual(self.memos[0].title, "수정된 제목")
+        self.assertEqual(self.memos[0].content, "내용")
+        self.assertFalse(Memo.objects.filter(pk=self.memos[1].pk).exists())
+        self.other_memo.refresh_from_db()
+        self.assertEqual(self.other_memo.title, "남의 메모")
+
+    def test_batch_update_checks_version(self):
+        """수정 항목의 version이 저장된 버전과 다르면 그 항목만 저장하지 않고 conflict로 응답"""
+        memo = self.memos[0]
+        Memo.objects.get(pk=memo.pk).save_versioned(["title"])
+        response = self.post_batch({"update": [
+            {"id": memo.pk, "version": 1, "title": "오래된 자동 저장"},
+            {"id": self.memos[1].pk, "version": 1, "title": "최신 자동 저장"},
+            {"id": self.memos[2].pk, "version": "잘못된 값", "title": "버전 오류"},
+        ]})
+        self.assertEqual(response.json()["update"], [
+            {"index": 0, "id": memo.pk, "status": "conflict", "version": 2},
+            {"index": 1, "id": self.memos[1].pk, "status": "updated", "version": 2},
+            {"index": 2, "id": self.memos[2].pk, "status": "conflict", "version": 1},
+        ])
+        memo.refresh_from_db()
+        self.assertEqual((memo.title, memo.version), ("API 메모 0", 2))
+        self.memos[1].refresh_from_db()
+        self.assertEqual((self.memos[1].title, self.memos[1].version), ("최신 자동 저장", 2))
+
+    def test_batch_limit(self):
+        """최대 항목 수를 넘으면 400"""
+        with self.settings(MEMO_API_BATCH_LIMIT=2):
+            response = self.post_batch({"delete": [1, 2, 3]})
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_invalidates_cache_on_commit(self):
+        """bulk_create/bulk_update로 쓴 배치도 커밋되면 렌더링 캐시를 무효화"""
+        generation = memo_cache.get_generation(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post_batch({"create": [{"title": "캐시 무효화", "content": "내용"}]})
+        self.assertNotEqual(memo_cache.get_generation(self.user.pk), generation)
+
+
+class MemoChangeFeedTest(TestCase):
+    """동기화 변경 피드(변경 번호 커서, 삭제 표시, 다시 동기화, long-poll/SSE) 테스트"""
+
+    def setUp(self):
+        """로그인한 사용자와 메모 준비"""
+        self.user = User.objects.create_user(
+            username="syncuser",
+            email="sync@example.com",
+            password="testpassword123"
+        )
+        self.client.force_login(self.user)
+        self.memos = [Memo.objects.create(user=self.user, title=f"메모 {i}", content="내용") for i in range(3)]
+        self.url = reverse("api_memo_changes")
+
+    def feed(self, since=None, **params):
+        if since:
+            params["since"] = since
+        return self.client.get(self.url, params)
+
+    def sync_all(self, since=None, size=2):
+        """has_more가 false가 될 때까지 이어 받은 (변경 목록, 마지막 커서)"""
+        received = []
+        while True:
+            body = self.feed(since, size=size).json()
+            received += body["changes"]
+            since = body["cursor"]
+            if not body["has_more"]:
+                return received, since
+
+    def test_pages_and_incremental_changes(self):
+        """처음에는 모든 메모를, 그 뒤에는 커서 이후의 변경만 변경 순서로 받음"""
+        received, cursor = self.sync_all()
+        self.assertEqual([item["id"] for item in received], [memo.pk for memo in self.memos])
+
+        body = self.feed(cursor).json()
+        self.assertEqual((body["changes"], body["cursor"], body["has_more"]), ([], cursor, False))
+
+        edited, deleted = self.memos[0], self.memos[1]
+        edited.content = "고친 내용"
+        edited.save_versioned(["content"])
+        deleted.delete()
+        created = Memo.objects.create(user=self.user, title="새 메모", content="내용")
+        Memo.objects.create(user=User.objects.create_user(username="other", password="testpassword123"), title="t", content="c")
+        received, cursor = self.sync_all(cursor)
+        self.assertEqual([item["id"] for item in received], [edited.pk, deleted.pk, created.pk])
+        self.assertEqual(received[0]["content"], "고친 내용")
+        self.assertEqual(set(received[1]), {"id", "deleted", "deleted_at"})
+        self.assertTrue(received[1]["deleted"])
+
+        self.assertEqual(self.feed("잘못된커서").status_code, 400)
+        self.client.logout()
+        self.assertEqual(self.feed().status_code, 401)
+
+    def test_uses_change_index(self):
+        """커서 다음의 변경을 인덱스 순서로 읽고 페이지 크기와 관계없이 쿼리 수가 같음"""
+        sql, params = changes._changes_queryset(self.user, (1, 1), 10).query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("memos_user_change_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+        # 통계 행, 변경 페이지, 태그 prefetch
+        with self.assertNumQueries(3):
+            changes.get_changes(self.user, page_size=100)
+
+    def test_purge_requires_reset(self):
+        """영구 삭제된 메모 이전의 커서는 410으로 다시 동기화를 요구함"""
+        trashed = self.memos[0]
+        trashed.delete()
+        before_tombstone = self.feed(size=1).json()["cursor"]
+        _, synced = self.sync_all()
+        Memo.all_objects.filter(pk=trashed.pk).hard_delete()
+        response = self.feed(before_tombstone)
+        self.assertEqual(response.status_code, 410)
+        self.assertTrue(response.json()["reset"])
+        # 삭제 표시를 이미 받은 커서는 그대로 이어 받는다
+        self.assertEqual(self.feed(synced).status_code, 200)
+
+        # 휴지통을 거치지 않은 영구 삭제는 모든 커서를 다시 동기화하게 한다
+        self.memos[1].hard_delete()
+        self.assertEqual(self.feed(synced).status_code, 410)
+        received, _ = self.sync_all()
+        self.assertEqual([item["id"] for item in received], [self.memos[2].pk])
+
+    @override_settings(ROOT_URLCONF="memojjang.async_urls", MEMO_SYNC_POLL_INTERVAL=0.01)
+    async def test_long_poll_waits_for_changes(self):
+        """ASGI의 long-poll은 변경이 생길 때까지 기다렸다가 응답함"""
+        await self.async_client.aforce_login(self.user)
+        _, cursor = await sync_to_async(self.sync_all)()
+        request = asyncio.ensure_future(
+            self.async_client.get(self.url, {"since": cursor, "wait": 5})
+        )
+        await asyncio.sleep(0.05)
+        self.assertFalse(request.done())
+        memo = await Memo.objects.acreate(user=self.user, title="기다리던 메모", content="내용")
+        body = (await request).json()
+        self.assertEqual([item["id"] for item in body["changes"]], [memo.pk])
+
+        body = (await self.async_client.get(self.url, {"since": body["cursor"], "wait": 0.05})).json()
+        self.assertEqual(body["changes"], [])
+
+    @override_settings(
+        ROOT_URLCONF="memojjang.async_urls", MEMO_SYNC_POLL_INTERVAL=0.01,
+        MEMO_SYNC_STREAM_TIMEOUT=0.2, MEMO_SYNC_HEARTBEAT_INTERVAL=0.05,
+    )
+    async def test_server_sent_events(self):
+        """SSE 모드는 변경을 changes 이벤트로, 변경이 없으면 keepalive를 보냄"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.url, {"size": 2}, headers={"accept": "text/event-stream"})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode("utf-8")
+        events = [block for block in body.split("\n\n") if block.startswith("id: ")]
+        self.assertEqual(len(events), 2)
+        last = json.loads(events[-1].split("data: ", 1)[1])
+        self.assertEqual(last["changes"][-1]["id"], self.memos[-1].pk)
+        self.assertIn(f"id: {last['cursor']}", events[-1])
+        self.assertIn(": keepalive", body)
+
+
+class MemoAdminTest(TestCase):
+    """큰 테이블을 위한 메모 관리자(키셋 변경 목록, 인덱스 검색, 일괄 작업) 테스트"""
+
+    def setUp(self):
+        """관리자와 여러 사용자의 메모 준비"""
+        self.admin = User.objects.create_superuser("memoadmin", "admin@example.com", "testpassword123")
+        self.client.force_login(self.admin)
+        self.writer = User.objects.create_user(username="writer", password="testpassword123")
+        self.memos = [
+            Memo.objects.create(user=self.writer, title=f"배포 체크리스트 {i}", content="내용")
+            for i in range(4)
+        ]
+        self.memos.append(Memo.objects.create(user=self.admin, title="장애 보고", content="데이터베이스 잠금"))
+        self.url = reverse("admin:memos_memo_changelist")
+
+    def changelist(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.last_response = response
+        return response.context["cl"]
+
+    @override_settings(MEMO_PAGE_SIZE_MAX=2)
+    def test_keyset_pages(self):
+        """changelist가 COUNT(*)와 OFFSET 없이 after 커서로 최신순 페이지를 나눔"""
+        seen = []
+        params = {}
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                cl = self.changelist(**params)
+            seen += [memo.pk for memo in cl.result_list]
+            for query in queries:
+                self.assertNotIn("OFFSET", query["sql"])
+                if "COUNT(*)" in query["sql"] and '"memos"' in query["sql"]:
+                    self.assertIn("LIMIT", query["sql"])
+            if not cl.page.has_next:
+                break
+            self.assertContains(self.last_response, f'href="?after={cl.page.next_cursor}"')
+            params = {"after": cl.page.next_cursor}
+        self.assertEqual(seen, [memo.pk for memo in reversed(self.memos)])
+        self.assertEqual(cl.result_count, 5)
+        self.assertEqual(self.client.get(self.url, {"after": "!!잘못된-커서"}).status_code, 302)
+
+        # 작성자는 같은 쿼리에서 함께 읽어 메모 수와 관계없이 쿼리 수가 같다
+        with CaptureQueriesContext(connection) as queries:
+            self.changelist()
+        Memo.objects.create(user=User.objects.create_user(username="another", password="testpassword123"), title="t", content="c")
+        with self.assertNumQueries(len(queries)):
+            self.changelist()
+
+    def test_changelist_uses_created_index(self):
+        """변경 목록이 실행하는 모든 메모 쿼리가 인덱스로 범위를 정해 읽고 본문은 읽지 않음"""
+        year = self.memos[0].created_at.year
+        for params in ({}, {"created_at__year": year}):
+            with CaptureQueriesContext(connection) as queries:
+                self.changelist(**params)
+            memo_queries = [query["sql"] for query in queries if 'FROM "memos"' in query["sql"]]
+            self.assertTrue(memo_queries)
+            for sql in memo_queries:
+                self.assertNotIn('"memos"."content"', sql)
+                self.assertNotIn("DISTINCT", sql)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                    plan = " ".join(str(row) for row in cursor.fetchall())
+                # 목록은 인덱스 순서로, 개수는 LIMIT까지만 인덱스로 읽고 테이블 전체를 훑지 않는다
+                self.assertIn("LIMIT", sql)
+                self.assertIsNone(re.search(r"SCAN memos(?! USING)", plan))
+                self.assertNotIn("TEMP B-TREE", plan)
+                if "ORDER BY" in sql:
+                    self.assertIn("memos_created_id_idx", plan)
+        self.assertEqual(len(self.changelist(created_at__year=year + 1).result_list), 0)
+
+    def test_search_routes_to_indexed_lookup(self):
+        """숫자는 id, @는 작성자 이름, 그 밖에는 검색 인덱스로 찾음"""
+        def found(query):
+            return {memo.pk for memo in self.changelist(q=query).result_list}
+
+        self.assertEqual(found(str(self.memos[1].pk)), {self.memos[1].pk})
+        self.assertEqual(found("@writer"), {memo.pk for memo in self.memos[:4]})
+        self.assertEqual(found("@nobody"), set())
+        self.assertEqual(found("데이터베이스"), {self.memos[4].pk})
+        self.assertEqual(found("체크리스트"), {memo.pk for memo in self.memos[:4]})
+        response = self.client.get(self.url, {"q": "장애"}, follow=True)
+        self.assertContains(response, "글자 미만의 검색어는 빼고 찾았습니다.")
+
+    def test_bulk_actions_are_set_based(self):
+        """휴지통 이동과 복원이 선택한 메모 전체에 대한 쿼리로 실행되고 기본 삭제 작업은 없음"""
+        choices = dict(self.client.get(self.url).context["action_form"].fields["action"].choices)
+        self.assertNotIn("delete_selected", choices)
+        self.assertIn("trash_memos", choices)
+        selected = [memo.pk for memo in self.memos[:3]]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, {"action": "trash_memos", "_selected_action": selected})
+        self.assertEqual(Memo.objects.count(), 2)
+        updates = [query["sql"] for query in queries if query["sql"].startswith('UPDATE "memos"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(MemoStats.objects.get(user=self.writer).memo_count, 1)
+
+        self.client.post(self.url, {"action": "restore_memos", "select_across": "1", "deleted": "1", "_selected_action": selected[:1]})
+        self.assertEqual(Memo.objects.count(), 5)
+        self.assertEqual(self.changelist(deleted="1").result_count, 0)
+
+    def test_approximate_count(self):
+        """limit을 넘으면 조건 없는 쿼리셋은 테이블 통계로 추정하고 조건이 있으면 limit"""
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        self.assertEqual(approximate_count(Memo.all_objects.all(), limit=10), 5)
+        self.assertEqual(approximate_count(Memo.all_objects.all(), limit=2), 5)
+        self.assertEqual(approximate_count(Memo.all_objects.filter(user=self.writer), limit=2), 2)
+
+
+class MemoExportTest(TestCase):
+    """메모 스트리밍 내보내기 테스트"""
+
+    def setUp(self):
+        """테스트에 사용할 사용자와 메모 생성"""
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="exportuser",
+            email="export@example.com",
+            password="testpassword123"
+        )
+        self.client.login(username="exportuser", password="testpassword123")
+        self.memos = [
+            Memo.objects.create(user=self.user, title=f"내보내기/메모 {i}", content=f"내용 {i}\n둘째 줄")
+            for i in range(3)
+        ]
+        other = User.objects.create_user(
+            username="exportother",
+            email="exportother@example.com",
+            password="testpassword123"
+        )
+        Memo.objects.create(user=other, title="남의 메모", content="내용")
+        self.export_url = reverse("memo_export")
+
+    def download(self, export_format):
+        """내보내기 응답 본문을 모두 읽어 반환"""
+        response = self.client.get(self.export_url, {"format": export_format})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_export_ndjson(self):
+        """NDJSON 내보내기"""
+        lines = self.download("ndjson").decode("utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([record["id"] for record in records], [memo.pk for memo in self.memos])
+        self.assertEqual(records[0]["content"], "내용 0\n둘째 줄")
+
+    def test_export_csv(self):
+        """CSV 내보내기"""
+        text = self.download("csv").decode("utf-8-sig")
+        rows = list(csv.reader(io.StringIO(text)))
+        self.assertEqual(rows[0], ["id", "title", "content", "created_at", "updated_at"])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][1], "내보내기/메모 0")
+
+    def test_export_zip(self):
+        """ZIP 내보내기는 메모마다 텍스트 파일 하나"""
+        archive = zipfile.ZipFile(io.BytesIO(self.download("zip")))
+        names = archive.namelist()
+        self.assertEqual(len(names), 3)
+        self.assertTrue(all("/" not in name for name in names))
+        self.assertIn("내용 0", archive.read(names[0]).decode("utf-8"))
+
+    def test_export_invalid_format(self):
+        """지원하지 않는 형식은 400"""
+        response = self.client.get(self.export_url, {"format": "xml"})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(ROOT_URLCONF="memojjang.async_urls")
+    async def test_async_export(self):
+        """ASGI에서는 비동기 이터레이터로 스트리밍"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.export_url, {"format": "ndjson"})
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.decode("utf-8").splitlines()), 3)
+
+
+class ImportMemosCommandTest(TestCase):
+    """메모 대량 가져오기 명령 테스트"""
+
+    def setUp(self):
+        """테스트에 사용할 사용자와 임시 디렉터리 생성"""
+        self.user = User.objects.create_user(
+            username="importuser",
+            email="import@example.com",
+            password="testpassword123"
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write_ndjson(self, rows):
+        """NDJSON 입력 파일을 만든다"""
+        path = os.path.join(self.tmp.name, "memos.ndjson")
+        with open(path, "w", encoding="utf-8") as file:
+            for row in rows:
+                file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return path
+
+    def test_import_ndjson(self):
+        """NDJSON을 가져오고 알 수 없는 사용자 행은 건너뜀"""
+        path = self.write_ndjson([
+            {"username": "importuser", "title": f"가져온 메모 {i}", "content": "내용"}
+            for i in range(5)
+        ] + [{"username": "nobody", "title": "무시", "content": "내용"}])
+        out = StringIO()
+        call_command("import_memos", path, "--batch-size", "2", "--chunk-size", "3", stdout=out)
+        self.assertEqual(Memo.objects.filter(user=self.user).count(), 5)
+        self.assertFalse(Memo.objects.filter(user=self.user, excerpt="").exists())
+        self.assertIn("rows/s", out.getvalue())
+        self.assertIn("1건 건너뜀", out.getvalue())
+
+    def test_import_csv(self):
+        """CSV를 가져옴"""
+        path = os.path.join(self.tmp.name, "memos.csv")
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["username", "title", "content"])
+            writer.writerow(["importuser", "CSV 메모", "여러 줄\n내용"])
+        call_command("import_memos", path, stdout=StringIO())
+        memo = Memo.objects.get(title="CSV 메모")
+        self.assertEqual(memo.content, "여러 줄\n내용")
+
+    def test_resume_from_checkpoint(self):
+        """체크포인트에 기록된 행 이후부터 재개"""
+        path = self.write_ndjson([
+            {"username": "importuser", "title": f"메모 {i}", "content": "내용"}
+            for i in range(4)
+        ])
+        ImportCheckpoint.objects.create(name="nightly", source=path, rows=3)
+        call_command("import_memos", path, "--checkpoint", "nightly", stdout=StringIO())
+        self.assertEqual(list(Memo.objects.values_list("title", flat=True)), ["메모 3"])
+        self.assertEqual(ImportCheckpoint.objects.get(name="nightly").rows, 4)
+
+        with self.assertRaises(CommandError):
+            call_command("import_memos", os.path.join(self.tmp.name, "other.ndjson"), "--checkpoint", "nightly")
+
+    def test_checkpoint_name_is_text_column(self):
+        """체크포인트 이름은 varchar가 아닌 text 열에 유일 제약으로 저장"""
+        with connection.cursor() as cursor:
+            columns = connection.introspection.get_table_description(cursor, "memo_import_checkpoints")
+            constraints = connection.introspection.get_constraints(cursor, "memo_import_checkpoints")
+        self.assertEqual({column.name: column.type_code for column in columns}["name"].lower(), "text")
+        self.assertTrue(constraints["memo_import_checkpoints_name_uniq"]["unique"])
+        ImportCheckpoint.objects.create(name="nightly", source="a.ndjson")
+        with self.assertRaises(IntegrityError):
+            ImportCheckpoint.objects.create(name="nightly", source="b.ndjson")
+
+    def test_interrupted_chunk_not_duplicated(self):
+        """chunk 도중에 중단되면 메모와 체크포인트가 함께 롤백되어 재개해도 중복되지 않음"""
+        path = self.write_ndjson([
+            {"username": "importuser", "title": f"메모 {i}", "content": "내용"}
+            for i in range(5)
+        ])
+        index_memos = search_index.index_memos
+        calls = []
+
+        def fail_second_chunk(memos):
+            calls.append(len(memos))
+            if len(calls) == 2:
+                raise RuntimeError("중단")
+            index_memos(memos)
+
+        search_index.index_memos = fail_second_chunk
+        self.addCleanup(setattr, search_index, "index_memos", index_memos)
+        with self.assertRaises(RuntimeError):
+            call_command(
+                "import_memos", path, "--chunk-size", "2", "--checkpoint", "nightly", stdout=StringIO()
+            )
+        self.assertEqual(Memo.objects.count(), 2)
+        self.assertEqual(ImportCheckpoint.objects.get(name="nightly").rows, 2)
+
+        search_index.index_memos = index_memos
+        call_command("import_memos", path, "--chunk-size", "2", "--checkpoint", "nightly", stdout=StringIO())
+        self.assertEqual(
+            sorted(Memo.objects.values_list("title", flat=True)), [f"메모 {i}" for i in range(5)]
+        )
+        self.assertEqual(ImportCheckpoint.objects.get(name="nightly").rows, 5)
+
+    def test_drop_and_restore_indexes(self):
+        """인덱스를 제거했다가 다시 만들고 검색 인덱스도 재구성"""
+        path = self.write_ndjson([
+            {"username": "importuser", "title": "대량 회의록", "content": "내용"}
+        ])
+        call_command("import_memos", path, "--drop-indexes", stdout=StringIO())
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, "memos")
+        self.assertIn("memos_user_created_id_idx", constraints)
+        self.assertEqual(len(search_memos(self.user, "회의록")), 1)
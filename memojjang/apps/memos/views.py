@@ -1,9 +1,25 @@
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, logout, authenticate
 from django.contrib import messages
+from django.http import FileResponse, Http404, HttpResponseBadRequest, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.views.decorators.http import require_POST
+from ..jobs.models import Job
+from ..jobs.queue import enqueue
 from ..users.models import User
-from .models import Memo
+from .models import Memo, MemoRevision, VersionConflict
+from . import cache as memo_cache
+from . import export
+from . import jobs as memo_jobs
+from . import revisions
+from . import stats as memo_stats
+from . import tags as memo_tags
+from .conditional import list_conditional, memo_conditional, memo_form_conditional
+from .pagination import InvalidCursor, decode_cursor, get_page_size, paginate_keyset
+from .search import MAX_PAGE, search_memos
 from ...forms import MemoForm, UserRegistrationForm
 
 
@@ -13,10 +29,116 @@ def home(request):
 
 
 @login_required
+@list_conditional
 def memo_list(request):
-    """메모 목록 뷰"""
-    memos = Memo.objects.filter(user=request.user)
-    return render(request, "memos/memo_list.html", {"memos": memos})
+    """메모 목록 뷰
+
+    `?after=` 커서와 `?size=` 페이지 크기로 키셋 페이지네이션을 수행하고,
+    `?tag=`가 있으면 그 태그가 붙은 메모만 보여 줍니다. 머리글의 메모 수와 저장 용량은
+    메모를 세지 않고 사용자별 통계 행에서 읽습니다.
+    렌더링된 카드 목록은 사용자의 메모 세대가 바뀔 때까지 캐시에서 제공합니다.
+    """
+    after = request.GET.get("after") or None
+    size = get_page_size(request.GET.get("size"))
+    tag = request.GET.get("tag") or None
+    if after:
+        try:
+            decode_cursor(after)
+        except InvalidCursor:
+            return HttpResponseBadRequest("잘못된 페이지 요청입니다.")
+
+    def render_cards():
+        if tag:
+            page = memo_tags.paginate_tagged(request.user, tag, after, size)
+        else:
+            # 카드에는 미리 계산한 요약만 쓰므로 본문 컬럼은 읽지 않는다
+            memos = (
+                Memo.objects.filter(user=request.user)
+                .defer("content")
+                .prefetch_related(memo_tags.prefetch_tags())
+            )
+            page = paginate_keyset(memos, after, size)
+        return render_to_string("memos/_memo_cards.html", {
+            "page": page,
+            "size": size,
+            "tag": tag,
+            "tags": list(memo_tags.user_tags(request.user)),
+            "stats": memo_stats.get_memo_stats(request.user),
+        })
+
+    cards_html = memo_cache.get_or_render(request.user.pk, "list", (after, size, tag), render_cards)
+    return render(request, "memos/memo_list.html", {"cards_html": mark_safe(cards_html)})
+
+
+@login_required
+def memo_search(request):
+    """메모 검색 뷰
+
+    `?q=` 검색어로 로그인한 사용자의 메모만 관련도 순으로 검색합니다.
+    """
+    query = request.GET.get("q", "").strip()
+    try:
+        page_number = int(request.GET.get("page", 1))
+    except ValueError:
+        page_number = 1
+    if page_number > MAX_PAGE:
+        return HttpResponseBadRequest("잘못된 페이지 요청입니다.")
+    page = search_memos(request.user, query, page=page_number)
+    return render(request, "memos/memo_search.html", {"query": query, "page": page})
+
+
+@login_required
+def memo_export(request):
+    """메모 내보내기 뷰
+
+    `?format=ndjson|csv|zip` 형식으로 사용자의 모든 메모를 일정한 메모리로 스트리밍합니다.
+    """
+    export_format = export.get_format(request.GET.get("format", "ndjson"))
+    if export_format is None:
+        return HttpResponseBadRequest("지원하지 않는 내보내기 형식입니다.")
+    response = StreamingHttpResponse(
+        export.stream(export_format, export.export_rows(request.user)),
+        content_type=export_format.content_type,
+    )
+    response["Content-Disposition"] = f'attachment; filename="memos.{export_format.extension}"'
+    return response
+
+
+@login_required
+@require_POST
+def memo_export_job(request):
+    """백그라운드 내보내기 요청 뷰
+
+    내보내기 작업을 큐에 넣고 작업 상태 페이지로 보냅니다. 파일은 워커가 만듭니다.
+    아직 끝나지 않은 내보내기 작업이 있으면 새로 넣지 않고 그 작업으로 보내
+    같은 사용자가 반복해서 요청해도 대기 중인 내보내기가 하나를 넘지 않게 합니다.
+    """
+    export_format = request.POST.get("format", "ndjson")
+    if export.get_format(export_format) is None:
+        return HttpResponseBadRequest("지원하지 않는 내보내기 형식입니다.")
+    pending = (
+        Job.objects.filter(user=request.user, task="memos.export", status__in=Job.ACTIVE_STATUSES)
+        .only("pk")
+        .first()
+    )
+    if pending is not None:
+        return redirect("job_detail", pk=pending.pk)
+    job = enqueue("memos.export", {"user_id": request.user.pk, "format": export_format}, user=request.user)
+    return redirect("job_detail", pk=job.pk)
+
+
+@login_required
+def memo_export_download(request, pk):
+    """백그라운드 내보내기 결과 파일 내려받기 뷰"""
+    job = get_object_or_404(
+        Job, pk=pk, user=request.user, task="memos.export", status=Job.Status.SUCCEEDED
+    )
+    path = memo_jobs.export_path(job)
+    if not path.is_file():
+        raise Http404("내보내기 파일이 없습니다.")
+    return FileResponse(
+        open(path, "rb"), as_attachment=True, filename=f"memos.{path.suffix.lstrip('.')}"
+    )
 
 
 @login_required
@@ -25,9 +147,7 @@ def memo_create(request):
     if request.method == "POST":
         form = MemoForm(request.POST)
         if form.is_valid():
-            memo = form.save(commit=False)
-            memo.user = request.user
-            memo.save()
+            form.save_for(request.user)
             return redirect("memo_list")
     else:
         form = MemoForm()
@@ -35,20 +155,40 @@ def memo_create(request):
 
 
 @login_required
+@memo_conditional
 def memo_detail(request, pk):
-    """메모 상세 뷰"""
-    memo = get_object_or_404(Memo, pk=pk, user=request.user)
-    return render(request, "memos/memo_detail.html", {"memo": memo})
+    """메모 상세 뷰
+
+    렌더링된 상세 카드는 사용자의 메모 세대가 바뀔 때까지 캐시에서 제공합니다.
+    """
+    def render_detail():
+        memo = get_object_or_404(Memo, pk=pk, user=request.user)
+        return render_to_string("memos/_memo_detail_card.html", {"memo": memo})
+
+    detail_html = memo_cache.get_or_render(request.user.pk, "detail", pk, render_detail)
+    return render(request, "memos/memo_detail.html", {"detail_html": mark_safe(detail_html)})
 
 
 @login_required
+@memo_form_conditional
 def memo_edit(request, pk):
-    """메모 수정 뷰"""
-    memo = get_object_or_404(Memo, pk=pk, user=request.user)
+    """메모 수정 뷰
+
+    바뀐 필드만 폼을 연 시점의 버전 조건으로 저장하고, 그 사이 다른 곳에서
+    먼저 수정했다면 입력을 유지한 폼을 409로 다시 보여 줍니다.
+    """
+    memos = Memo.objects.prefetch_related("tags")
+    memo = get_object_or_404(memos, pk=pk, user=request.user)
     if request.method == "POST":
         form = MemoForm(request.POST, instance=memo)
         if form.is_valid():
-            form.save()
+            try:
+                form.save_changes()
+            except VersionConflict:
+                latest = get_object_or_404(memos, pk=pk, user=request.user)
+                return render(
+                    request, "memos/memo_form.html", {"form": form.with_version(latest)}, status=409
+                )
             return redirect("memo_detail", pk=pk)
     else:
         form = MemoForm(instance=memo)
@@ -56,6 +196,7 @@ def memo_edit(request, pk):
 
 
 @login_required
+@memo_form_conditional
 def memo_delete(request, pk):
     """메모 삭제 뷰"""
     memo = get_object_or_404(Memo, pk=pk, user=request.user)
@@ -65,6 +206,84 @@ def memo_delete(request, pk):
     return render(request, "memos/memo_confirm_delete.html", {"memo": memo})
 
 
+@login_required
+def memo_trash(request):
+    """휴지통 뷰
+
+    삭제 표시된 메모를 최근에 삭제한 순서로 보여 줍니다. 보관 기간이 지나면
+    purge_memos 명령이 실제로 삭제합니다.
+    """
+    memos = (
+        Memo.all_objects.deleted()
+        .filter(user=request.user)
+        .defer("content")
+        .order_by("-deleted_at")[:get_page_size(request.GET.get("size"))]
+    )
+    return render(request, "memos/memo_trash.html", {
+        "memos": memos,
+        "retention_days": settings.MEMO_TRASH_RETENTION_DAYS,
+    })
+
+
+@login_required
+@require_POST
+def memo_restore(request, pk):
+    """휴지통의 메모를 되살리는 뷰"""
+    memo = get_object_or_404(Memo.all_objects.deleted(), pk=pk, user=request.user)
+    memo.restore()
+    return redirect("memo_detail", pk=pk)
+
+
+@login_required
+def memo_history(request, pk):
+    """메모 수정 이력 뷰
+
+    이력 목록에는 본문이 필요 없으므로 저장된 스냅숏/델타는 읽지 않습니다.
+    """
+    memo = get_object_or_404(Memo, pk=pk, user=request.user)
+    history = memo.revisions.defer("data")[:settings.MEMO_REVISION_MAX_COUNT]
+    return render(request, "memos/memo_history.html", {"memo": memo, "revisions": history})
+
+
+def _render_revision(request, memo, revision, status=200, conflict=False):
+    return render(request, "memos/memo_revision.html", {
+        "memo": memo,
+        "revision": revision,
+        "content": revisions.rebuild(revision),
+        "conflict": conflict,
+    }, status=status)
+
+
+@login_required
+def memo_revision(request, pk, number):
+    """수정 이력 하나의 제목과 본문을 보여 주는 뷰"""
+    memo = get_object_or_404(Memo, pk=pk, user=request.user)
+    revision = get_object_or_404(MemoRevision, memo=memo, number=number)
+    return _render_revision(request, memo, revision)
+
+
+@login_required
+@require_POST
+def memo_revision_restore(request, pk, number):
+    """메모를 수정 이력의 제목과 본문으로 되돌리는 뷰
+
+    이력을 본 시점의 메모 버전 조건으로 저장하므로, 그 사이 다른 곳에서 수정했다면
+    되돌리지 않고 409로 다시 보여 줍니다.
+    """
+    memo = get_object_or_404(Memo, pk=pk, user=request.user)
+    revision = get_object_or_404(MemoRevision, memo=memo, number=number)
+    try:
+        memo.version = int(request.POST.get("version", memo.version))
+    except ValueError:
+        return HttpResponseBadRequest("버전이 올바르지 않습니다.")
+    try:
+        revisions.restore_revision(memo, revision)
+    except VersionConflict:
+        latest = get_object_or_404(Memo, pk=pk, user=request.user)
+        return _render_revision(request, latest, revision, status=409, conflict=True)
+    return redirect("memo_detail", pk=pk)
+
+
 def login_view(request):
     """로그인 뷰"""
     if request.method == "POST":
@@ -1,14 +1,59 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Q
+from django.template.defaultfilters import filesizeformat
+from ..memos.admin import KeysetChangeList
 from .models import User
 
+# 앞부분 검색의 범위 상한. 어떤 문자보다 뒤에 정렬되는 문자를 붙인다
+PREFIX_RANGE_END = "\U0010ffff"
+
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
     """사용자 모델의 Admin 페이지를 설정합니다."""
-    list_display = ["username", "email", "created_at"]
+    list_display = ["username", "email", "memo_count", "memo_bytes", "created_at"]
     list_filter = ["is_staff", "is_superuser", "created_at"]
+    # 메모 수와 저장 용량은 메모를 세지 않고 사용자별 통계 행을 함께 읽는다
+    list_select_related = ["memo_stats"]
     search_fields = ["username", "email"]
-    ordering = ["-created_at"]
-    
+    search_help_text = "사용자 이름이나 이메일의 앞부분(대소문자 구분)으로 찾습니다."
+    # users_created_id_idx 순서 하나로 고정해 OFFSET 없이 키셋으로 페이지를 나누고,
+    # 전체 개수는 정확히 세지 않고 일정 건수를 넘으면 테이블 통계로 추정한다
+    ordering = ["-created_at", "-id"]
+    sortable_by = []
+    change_list_template = "admin/keyset_change_list.html"
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        """사용자 이름과 이메일의 앞부분을 인덱스 범위 조회로 찾습니다.
+
+        기본 검색의 icontains는 인덱스를 쓸 수 없어 사용자 테이블 전체를 훑는다.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        end = term + PREFIX_RANGE_END
+        return queryset.filter(
+            Q(username__gte=term, username__lt=end) | Q(email__gte=term, email__lt=end)
+        ), False
+
+    def _memo_stats(self, obj):
+        try:
+            return obj.memo_stats
+        except ObjectDoesNotExist:
+            return None
+
+    @admin.display(description="메모 수")
+    def memo_count(self, obj):
+        stats = self._memo_stats(obj)
+        return stats.memo_count if stats else None
 
+    @admin.display(description="저장 용량")
+    def memo_bytes(self, obj):
+        stats = self._memo_stats(obj)
+        return filesizeformat(stats.total_bytes) if stats else None
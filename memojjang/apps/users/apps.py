@@ -5,3 +5,7 @@ class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "memojjang.apps.users"
     verbose_name = "사용자"
+
+    def ready(self):
+        """사용자 캐시 무효화 시그널 핸들러를 등록합니다."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+
+
+def get_user_cache():
+    """인증 사용자 캐시에 사용할 캐시 백엔드"""
+    return caches[getattr(settings, "MEMO_USER_CACHE_ALIAS", "sessions")]
+
+
+def user_cache_key(user_id):
+    """사용자 id에 해당하는 캐시 키"""
+    return f"users:auth:{user_id}"
+
+
+def invalidate_user(user_id):
+    """캐시된 사용자를 지웁니다."""
+    get_user_cache().delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """세션의 사용자 id로 사용자를 조회할 때 짧게 캐시해 두는 인증 백엔드
+
+    사용자 행이 저장/삭제되거나 로그아웃하면 시그널로 캐시를 지우고,
+    시그널을 거치지 않는 변경(queryset.update 등)은 MEMO_USER_CACHE_TIMEOUT이 지나면 반영된다.
+    """
+
+    def get_user(self, user_id):
+        cache = get_user_cache()
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, getattr(settings, "MEMO_USER_CACHE_TIMEOUT", 60))
+        return user
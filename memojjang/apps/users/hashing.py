@@ -0,0 +1,208 @@
+"""
+비밀번호 해싱 전용 작업 풀
+
+PBKDF2 해싱은 요청 하나에 수백 ms의 CPU를 쓰므로, 로그인이 몰리면 요청 처리 스레드가
+모두 해싱에 묶여 메모 조회 같은 가벼운 요청까지 밀린다. 해싱과 검증을 크기가 정해진
+스레드 풀에서만 실행하고, 실행 중인 작업과 대기 중인 작업의 합이 한도를 넘으면
+기다리지 않고 HashingPoolFull을 던져 503으로 바로 거절한다.
+
+hashlib의 PBKDF2는 계산하는 동안 GIL을 놓으므로 스레드만으로도 코어 수만큼 병렬로
+실행된다. 풀 크기는 MEMO_HASHING_WORKERS, 대기열 한도는 MEMO_HASHING_QUEUE_LIMIT 설정으로 정한다.
+"""
+import asyncio
+import inspect
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import _clean_credentials, get_user_model, load_backend
+from django.contrib.auth import hashers
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.signals import user_login_failed
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+
+class HashingPoolFull(Exception):
+    """해싱 풀의 실행/대기 자리가 모두 차서 작업을 받을 수 없음"""
+
+
+_worker_state = threading.local()
+
+
+def _mark_worker():
+    _worker_state.in_pool = True
+
+
+class HashingPool:
+    """작업자 수와 대기열 길이가 제한된 해싱 스레드 풀"""
+
+    def __init__(self, workers, queue_limit):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="password-hashing",
+            initializer=_mark_worker,
+        )
+
+    def submit(self, func, *args, **kwargs):
+        """작업을 풀에 넣고 Future를 반환합니다. 자리가 없으면 HashingPoolFull을 던집니다."""
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolFull(
+                f"비밀번호 해싱 풀이 가득 찼습니다 (작업자 {self.workers}, 대기 {self.queue_limit})"
+            )
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, func, *args, **kwargs):
+        """작업을 풀에서 실행하고 끝날 때까지 기다립니다.
+
+        이미 풀 스레드 안이면(검증 중에 해셔가 다시 encode를 부르는 경우) 바로 실행한다.
+        """
+        if getattr(_worker_state, "in_pool", False):
+            return func(*args, **kwargs)
+        return self.submit(func, *args, **kwargs).result()
+
+    async def arun(self, func, *args, **kwargs):
+        """run()의 비동기 버전: 이벤트 루프를 막지 않고 풀의 결과를 기다립니다."""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+_pool = None
+_pool_key = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """현재 설정에 맞는 해싱 풀을 반환합니다.
+
+    fork로 만든 작업 프로세스는 부모의 스레드를 물려받지 못하므로 pid가 바뀌면,
+    설정이 바뀌면(테스트의 override_settings 등) 풀을 새로 만든다.
+    """
+    global _pool, _pool_key
+    key = (
+        os.getpid(),
+        getattr(settings, "MEMO_HASHING_WORKERS", os.cpu_count() or 1),
+        getattr(settings, "MEMO_HASHING_QUEUE_LIMIT", 16),
+    )
+    if _pool_key != key:
+        with _pool_lock:
+            if _pool_key != key:
+                if _pool is not None and _pool_key[0] == key[0]:
+                    _pool.shutdown()
+                _pool = HashingPool(workers=key[1], queue_limit=key[2])
+                _pool_key = key
+    return _pool
+
+
+def reset_pool():
+    """풀을 버리고 다음 호출 때 새로 만들게 합니다."""
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _pool_key = None
+
+
+class PooledPBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2 계산을 해싱 풀에서 실행하는 해셔
+
+    알고리즘 이름과 저장 형식은 장고 기본 해셔와 같아서 기존 비밀번호 해시와 그대로 호환된다.
+    verify()도 내부에서 encode()를 부르므로 해싱과 검증이 모두 풀을 거친다.
+    """
+
+    def encode(self, password, salt, iterations=None):
+        return get_pool().run(super().encode, password, salt, iterations)
+
+
+async def amake_password(password):
+    """make_password()를 해싱 풀에서 실행합니다."""
+    return await get_pool().arun(hashers.make_password, password)
+
+
+async def acheck_password(password, encoded):
+    """비밀번호를 해싱 풀에서 검증하고 (일치 여부, 재해싱 필요 여부)를 반환합니다."""
+    return await get_pool().arun(hashers.verify_password, password, encoded)
+
+
+async def _aauthenticate_model(backend, request, username=None, password=None, **kwargs):
+    """ModelBackend.authenticate()와 같은 검사를 하되 해싱은 풀에서 기다립니다."""
+    user_model = get_user_model()
+    if username is None:
+        username = kwargs.get(user_model.USERNAME_FIELD)
+    if username is None or password is None:
+        return None
+    try:
+        user = await user_model._default_manager.aget(**{user_model.USERNAME_FIELD: username})
+    except user_model.DoesNotExist:
+        # 없는 사용자도 해싱을 한 번 해서 응답 시간 차이를 줄인다
+        await amake_password(password)
+        return None
+    is_correct, must_update = await acheck_password(password, user.password)
+    if not is_correct or not backend.user_can_authenticate(user):
+        return None
+    if must_update:
+        user.password = await amake_password(password)
+        await user.asave(update_fields=["password"])
+    return user
+
+
+async def aauthenticate(request=None, **credentials):
+    """django.contrib.auth.aauthenticate()의 해싱 풀 버전
+
+    장고의 aauthenticate()는 인증 전체를 하나뿐인 thread_sensitive 스레드에서 실행해
+    동시 로그인이 한 줄로 서게 된다. authenticate()를 재정의하지 않은 ModelBackend는 DB 조회를
+    비동기로, 해싱을 풀에서 실행하고, 다른 백엔드는 기존처럼 스레드에서 실행한다.
+    """
+    for backend_path in settings.AUTHENTICATION_BACKENDS:
+        backend = load_backend(backend_path)
+        try:
+            inspect.signature(backend.authenticate).bind(request, **credentials)
+        except TypeError:
+            # 이 백엔드가 받지 않는 인증 정보
+            continue
+        try:
+            # 하위 클래스가 authenticate()를 재정의했으면 그 동작을 건너뛰지 않는다
+            if type(backend).authenticate is ModelBackend.authenticate:
+                user = await _aauthenticate_model(backend, request, **credentials)
+            else:
+                user = await sync_to_async(backend.authenticate)(request, **credentials)
+        except PermissionDenied:
+            break
+        if user is None:
+            continue
+        user.backend = backend_path
+        return user
+
+    await user_login_failed.asend(
+        sender=__name__, credentials=_clean_credentials(credentials), request=request
+    )
+    return None
+
+
+class HashingPoolMiddleware(MiddlewareMixin):
+    """해싱 풀이 포화되면 요청을 기다리게 하지 않고 503으로 바로 거절합니다."""
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, HashingPoolFull):
+            response = HttpResponse(
+                "로그인 요청이 많아 잠시 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+                status=503,
+                content_type="text/plain; charset=utf-8",
+            )
+            response["Retry-After"] = "1"
+            return response
+        return None
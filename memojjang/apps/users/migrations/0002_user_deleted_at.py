@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:38
+
+import memojjang.apps.users.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', memojjang.apps.users.models.CustomUserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='탈퇴 처리된 일시입니다. 메모와 계정은 purge_memos 명령이 나중에 삭제합니다.', null=True, verbose_name='탈퇴일시'),
+        ),
+    ]
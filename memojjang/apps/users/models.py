@@ -1,5 +1,46 @@
-from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.db import models, transaction
+from django.utils import timezone
+
+
+class UserQuerySet(models.QuerySet):
+    """탈퇴 처리를 아는 사용자 쿼리셋"""
+
+    def delete(self):
+        """사용자를 바로 지우지 않고 비활성화한 뒤 탈퇴 시각을 기록합니다.
+
+        사용자 행을 지우면 CASCADE로 모든 메모를 한 트랜잭션에서 지우느라 DB가 오래 잠기므로,
+        메모와 사용자 행은 purge_memos 명령이 작은 배치로 나눠 삭제한다.
+        update()는 post_save를 보내지 않으므로 캐시된 인증 사용자는 커밋되면 직접 지운다.
+        """
+        # backends는 ModelBackend를 통해 auth 모델을 불러오므로 모델 모듈을 읽을 때 가져올 수 없다
+        from .backends import invalidate_user
+
+        now = timezone.now()
+        live = self.filter(deleted_at__isnull=True)
+        with transaction.atomic(using=self.db):
+            user_ids = list(live.order_by().values_list("pk", flat=True))
+            transaction.on_commit(
+                lambda: [invalidate_user(user_id) for user_id in user_ids], using=self.db
+            )
+            count = live.filter(pk__in=user_ids).update(
+                is_active=False, deleted_at=now, updated_at=now
+            )
+        return count, {self.model._meta.label: count}
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def hard_delete(self):
+        """행을 실제로 삭제합니다 (연결된 메모도 CASCADE로 삭제됨)."""
+        return super().delete()
+
+    hard_delete.alters_data = True
+    hard_delete.queryset_only = True
+
+
+class CustomUserManager(UserManager.from_queryset(UserQuerySet)):
+    """탈퇴 처리를 아는 사용자 매니저"""
 
 
 class User(AbstractUser):
@@ -21,13 +62,40 @@ class User(AbstractUser):
         help_text="사용자 정보가 마지막으로 수정된 일시입니다."
     )
 
+    deleted_at = models.DateTimeField(
+        verbose_name="탈퇴일시",
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="탈퇴 처리된 일시입니다. 메모와 계정은 purge_memos 명령이 나중에 삭제합니다."
+    )
+
+    objects = CustomUserManager()
+
     class Meta:
         """사용자 모델의 메타데이터를 정의합니다."""
         db_table = "users"  # 테이블 이름
         verbose_name = "사용자"  # Admin 페이지에서 보여질 단수 이름
         verbose_name_plural = "사용자들"  # Admin 페이지에서 보여질 복수 이름
         ordering = ["-created_at"]  # 생성일시 기준 내림차순 정렬
+        indexes = [
+            # 관리자 사용자 목록의 기본 정렬(가입일시 내림차순)과 가입일시 필터
+            models.Index(fields=["-created_at", "-id"], name="users_created_id_idx"),
+            # 관리자 검색의 이메일 앞부분 범위 조회 (사용자 이름은 unique 인덱스를 쓴다)
+            models.Index(fields=["email"], name="users_email_idx"),
+        ]
 
     def __str__(self):
         """사용자의 문자열 표현을 반환합니다."""
-        return f"{self.username}" 
+        return f"{self.username}"
+
+    def delete(self, using=None, keep_parents=False):
+        """계정을 비활성화하고 탈퇴 시각을 기록합니다. 실제 삭제는 hard_delete()입니다."""
+        self.is_active = False
+        self.deleted_at = timezone.now()
+        self.save(using=using, update_fields=["is_active", "deleted_at", "updated_at"])
+        return 1, {self._meta.label: 1}
+
+    def hard_delete(self, using=None, keep_parents=False):
+        """행을 실제로 삭제합니다 (연결된 메모도 CASCADE로 삭제됨)."""
+        return super().delete(using=using, keep_parents=keep_parents)
@@ -1,8 +1,28 @@
-from django.test import TestCase, Client
+import threading
+from asgiref.sync import async_to_sync
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.signals import user_login_failed
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from . import hashing
+from .backends import get_user_cache, user_cache_key
 from .models import User
 
 
+class EmailBackend(ModelBackend):
+    """사용자 이름 대신 이메일로 인증하는 테스트용 백엔드"""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = User.objects.filter(email=username).first()
+        if user and user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+
 class UserModelTest(TestCase):
     """사용자 모델 테스트"""
     
@@ -24,6 +44,16 @@ class UserModelTest(TestCase):
         """사용자 문자열 표현 테스트"""
         self.assertEqual(str(self.user), "testuser")
 
+    def test_delete_deactivates_user(self):
+        """사용자 삭제는 계정을 비활성화하고 탈퇴 시각만 기록"""
+        self.user.delete()
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertIsNotNone(self.user.deleted_at)
+        self.assertFalse(self.client.login(username="testuser", password="testpassword123"))
+        self.user.hard_delete()
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+
 
 class UserViewTest(TestCase):
     """사용자 뷰 테스트"""
@@ -97,3 +127,199 @@ class UserViewTest(TestCase):
         response = self.client.get(self.logout_url)
         # 로그아웃 후 홈페이지로 리다이렉트
         self.assertRedirects(response, reverse("home"))
+
+
+class CachedAuthTest(TestCase):
+    """세션과 인증 사용자 캐시 테스트"""
+
+    def setUp(self):
+        """로그인한 클라이언트와 사용자 준비"""
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="cacheduser",
+            email="cached@example.com",
+            password="testpassword123"
+        )
+        self.client.login(username="cacheduser", password="testpassword123")
+        self.memo_list_url = reverse("memo_list")
+
+    def test_session_written_through_to_db(self):
+        """캐시에 둔 세션도 데이터베이스에 기록"""
+        session_key = self.client.session.session_key
+        self.assertTrue(Session.objects.filter(session_key=session_key).exists())
+
+    def test_user_cached_after_first_request(self):
+        """첫 요청 이후 인증 사용자는 캐시에서 읽음"""
+        self.client.get(self.memo_list_url)
+        self.assertEqual(get_user_cache().get(user_cache_key(self.user.pk)), self.user)
+
+    def test_user_change_invalidates_cache(self):
+        """사용자 행이 바뀌면 캐시가 지워져 변경이 바로 반영"""
+        self.client.get(self.memo_list_url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(get_user_cache().get(user_cache_key(self.user.pk)))
+        response = self.client.get(self.memo_list_url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_queryset_delete_invalidates_cache_on_commit(self):
+        """쿼리셋 탈퇴 처리(update)도 커밋되면 캐시가 지워져 더 이상 인증되지 않음"""
+        self.client.get(self.memo_list_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).delete()
+        self.assertIsNone(get_user_cache().get(user_cache_key(self.user.pk)))
+        response = self.client.get(self.memo_list_url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_logout_invalidates_cache(self):
+        """로그아웃하면 캐시된 사용자와 세션이 지워짐"""
+        self.client.get(self.memo_list_url)
+        session_key = self.client.session.session_key
+        self.client.get(reverse("logout"))
+        self.assertIsNone(get_user_cache().get(user_cache_key(self.user.pk)))
+        self.assertFalse(Session.objects.filter(session_key=session_key).exists())
+
+
+@override_settings(MEMO_HASHING_WORKERS=1, MEMO_HASHING_QUEUE_LIMIT=0)
+class PasswordHashingPoolTest(TestCase):
+    """비밀번호 해싱 전용 풀 테스트"""
+
+    def setUp(self):
+        """풀을 비우고 자리를 막을 이벤트 준비"""
+        hashing.reset_pool()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.addCleanup(hashing.reset_pool)
+
+    def occupy_pool(self):
+        """풀의 유일한 자리를 끝나지 않는 작업으로 채움"""
+        return hashing.get_pool().submit(self.release.wait)
+
+    def test_pooled_hasher_compatible(self):
+        """풀 해셔의 해시는 기존 pbkdf2_sha256 형식이고 검증됨"""
+        encoded = make_password("testpassword123")
+        self.assertTrue(encoded.startswith("pbkdf2_sha256$"))
+        self.assertTrue(check_password("testpassword123", encoded))
+        self.assertFalse(check_password("wrongpassword", encoded))
+
+    def test_rejects_when_saturated(self):
+        """실행/대기 자리가 모두 차면 기다리지 않고 거절"""
+        blocker = self.occupy_pool()
+        with self.assertRaises(hashing.HashingPoolFull):
+            make_password("testpassword123")
+        self.release.set()
+        blocker.result()
+        self.assertTrue(make_password("testpassword123").startswith("pbkdf2_sha256$"))
+
+    def test_login_returns_503_when_saturated(self):
+        """포화 상태의 로그인 요청은 503과 Retry-After로 응답"""
+        User.objects.create_user(username="pooluser", password="testpassword123")
+        self.occupy_pool()
+        response = self.client.post(
+            reverse("login"), {"username": "pooluser", "password": "testpassword123"}
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_async_authenticate(self):
+        """비동기 인증이 해싱 풀에서 비밀번호를 검증"""
+        user = User.objects.create_user(username="pooluser", password="testpassword123")
+        authenticated = async_to_sync(hashing.aauthenticate)(
+            username="pooluser", password="testpassword123"
+        )
+        self.assertEqual(authenticated, user)
+        self.assertTrue(authenticated.backend)
+        self.assertIsNone(async_to_sync(hashing.aauthenticate)(
+            username="pooluser", password="wrongpassword"
+        ))
+        self.occupy_pool()
+        with self.assertRaises(hashing.HashingPoolFull):
+            async_to_sync(hashing.aauthenticate)(username="pooluser", password="testpassword123")
+
+    @override_settings(AUTHENTICATION_BACKENDS=["memojjang.apps.users.tests.EmailBackend"])
+    def test_async_authenticate_uses_overridden_backend(self):
+        """authenticate()를 재정의한 ModelBackend 하위 클래스는 그 메서드로 인증"""
+        user = User.objects.create_user(
+            username="pooluser", email="pool@example.com", password="testpassword123"
+        )
+        authenticated = async_to_sync(hashing.aauthenticate)(
+            username="pool@example.com", password="testpassword123"
+        )
+        self.assertEqual(authenticated, user)
+        self.assertIsNone(async_to_sync(hashing.aauthenticate)(
+            username="pooluser", password="testpassword123"
+        ))
+
+    def test_async_login_failed_masks_credentials(self):
+        """실패 시그널에는 비밀번호뿐 아니라 토큰 같은 민감한 인증 정보도 가려서 보냄"""
+        received = []
+
+        def receiver(sender, credentials, **kwargs):
+            received.append(credentials)
+
+        user_login_failed.connect(receiver)
+        self.addCleanup(user_login_failed.disconnect, receiver)
+        async_to_sync(hashing.aauthenticate)(
+            username="nobody", password="testpassword123", api_token="secret-token"
+        )
+        self.assertEqual(received, [{
+            "username": "nobody", "password": "********************", "api_token": "********************",
+        }])
+
+
+class CustomUserAdminTest(TestCase):
+    """사용자 관리자 목록 테스트"""
+
+    def setUp(self):
+        """관리자와 검색할 사용자 준비"""
+        self.admin = User.objects.create_superuser("useradmin", "admin@example.com", "testpassword123")
+        self.client.force_login(self.admin)
+        User.objects.create_user(username="alice", email="alice@example.com", password="testpassword123")
+        User.objects.create_user(username="bob", email="bob@sample.org", password="testpassword123")
+        self.url = reverse("admin:users_user_changelist")
+
+    def found(self, query):
+        response = self.client.get(self.url, {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return sorted(user.username for user in response.context["cl"].result_list)
+
+    def test_prefix_search(self):
+        """사용자 이름이나 이메일의 앞부분으로 찾음"""
+        self.assertEqual(self.found("ali"), ["alice"])
+        self.assertEqual(self.found("bob@"), ["bob"])
+        self.assertEqual(self.found("example"), [])
+
+    def test_counts_without_full_scan(self):
+        """전체 개수를 다시 세지 않고 목록의 개수는 LIMIT을 둔 COUNT로 셈"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        counts = [query["sql"] for query in queries if "COUNT(" in query["sql"] and '"users"' in query["sql"]]
+        self.assertTrue(counts)
+        for sql in counts:
+            self.assertIn("LIMIT", sql)
+        self.assertEqual(response.context["cl"].result_count, 3)
+        self.assertIsNone(response.context["cl"].full_result_count)
+
+    @override_settings(MEMO_PAGE_SIZE_MAX=2)
+    def test_keyset_pages(self):
+        """OFFSET 없이 after 커서로 가입 최신순 페이지를 나누고 통계 열로는 정렬하지 않음"""
+        seen = []
+        params = {}
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 200)
+            cl = response.context["cl"]
+            seen += [user.username for user in cl.result_list]
+            for query in queries:
+                self.assertNotIn("OFFSET", query["sql"])
+                self.assertNotIn("ORDER BY \"memos_memostats\"", query["sql"])
+            if not cl.page.has_next:
+                break
+            self.assertContains(response, f'href="?after={cl.page.next_cursor}"')
+            params = {"after": cl.page.next_cursor}
+        self.assertEqual(seen, ["bob", "alice", "useradmin"])
+        self.assertEqual(cl.sortable_by, [])
+        # 통계 열의 정렬 매개변수는 무시하고 키셋 순서를 유지한다
+        cl = self.client.get(self.url, {"o": "3"}).context["cl"]
+        self.assertEqual([user.username for user in cl.result_list], ["bob", "alice"])
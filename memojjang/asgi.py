@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'memojjang.settings')
+# ASGI 서버에서는 비동기 뷰 URL 설정을 사용한다
+os.environ.setdefault('MEMOJJANG_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,31 @@
+"""
+ASGI용 URL 설정
+
+memojjang.asgi로 실행할 때 사용되며, 메모 CRUD와 로그인/회원가입, 변경을 기다리는
+변경 피드 API를 비동기 뷰로 연결합니다.
+비동기 버전이 없는 나머지 URL은 memojjang.urls의 동기 뷰를 그대로 사용합니다.
+"""
+from django.urls import path
+from .apps.memos import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+async_urlpatterns = [
+    path("", async_views.home, name="home"),
+    path("memos/", async_views.memo_list, name="memo_list"),
+    path("memos/create/", async_views.memo_create, name="memo_create"),
+    path("memos/export/", async_views.memo_export, name="memo_export"),
+    path("memos/<int:pk>/", async_views.memo_detail, name="memo_detail"),
+    path("memos/<int:pk>/edit/", async_views.memo_edit, name="memo_edit"),
+    path("memos/<int:pk>/delete/", async_views.memo_delete, name="memo_delete"),
+    path("api/memos/changes/", async_views.memo_changes, name="api_memo_changes"),
+    path("login/", async_views.login_view, name="login"),
+    path("logout/", async_views.logout_view, name="logout"),
+    path("register/", async_views.register, name="register"),
+]
+
+_async_names = {pattern.name for pattern in async_urlpatterns}
+
+urlpatterns = async_urlpatterns + [
+    pattern for pattern in sync_urlpatterns
+    if getattr(pattern, "name", None) not in _async_names
+]
@@ -1,11 +1,25 @@
+from asgiref.sync import sync_to_async
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
+from django.db import transaction
+from .apps.users import hashing
 from .apps.users.models import User
+from .apps.memos import tags as memo_tags
 from .apps.memos.models import Memo
 
 
 class MemoForm(forms.ModelForm):
     """메모 작성 및 수정을 위한 폼"""
+
+    # 수정 폼을 연 시점의 메모 버전. 저장할 때 이 버전과 같을 때만 쓴다
+    version = forms.IntegerField(widget=forms.HiddenInput, required=False, min_value=1)
+    # 모델 필드가 아니라 쉼표로 구분한 이름을 받아 save_tags()/save_changes()에서 연결한다
+    tags = forms.CharField(
+        label="태그",
+        required=False,
+        help_text="쉼표로 구분해 입력합니다. 예: 회의, 할 일",
+        widget=forms.TextInput(attrs={"class": "form-control"}),
+    )
     
     class Meta:
         model = Memo
@@ -15,6 +29,80 @@ class MemoForm(forms.ModelForm):
             "content": forms.Textarea(attrs={"class": "form-control", "rows": 5}),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields["version"].initial = self.instance.version
+            # 폼을 그리거나 변경 여부를 볼 때만 읽는다 (prefetch_related("tags")로 미리 읽어 둘 수 있음)
+            self.fields["tags"].initial = lambda: ", ".join(memo_tags.tag_names(self.instance))
+
+    def clean_tags(self):
+        try:
+            return memo_tags.parse_tags(self.cleaned_data["tags"])
+        except memo_tags.InvalidTags as exc:
+            raise forms.ValidationError(str(exc))
+
+    def has_tag_changes(self):
+        """입력한 태그가 메모에 붙은 태그와 다른지 여부"""
+        return "tags" in self.changed_data and (
+            set(self.cleaned_data["tags"]) != set(memo_tags.tag_names(self.instance))
+        )
+
+    def save_tags(self):
+        """저장된 메모에 입력한 태그를 연결합니다."""
+        if self.has_tag_changes():
+            memo_tags.set_memo_tags(self.instance, self.cleaned_data["tags"])
+
+    def save_for(self, user):
+        """새 메모를 user의 메모로 저장하고 입력한 태그를 같은 트랜잭션에서 연결합니다."""
+        memo = self.save(commit=False)
+        memo.user = user
+        with transaction.atomic():
+            memo.save()
+            self.save_tags()
+        return memo
+
+    async def asave_for(self, user):
+        """save_for()의 비동기 버전"""
+        return await sync_to_async(self.save_for)(user)
+
+    def _prepare_versioned(self):
+        """폼을 연 시점의 버전을 메모에 넣고 실제로 바뀐 모델 필드 목록을 반환합니다."""
+        if self.cleaned_data.get("version"):
+            self.instance.version = self.cleaned_data["version"]
+        return [name for name in self.changed_data if name in self._meta.fields]
+
+    def save_changes(self):
+        """바뀐 필드만 폼을 연 시점의 버전 조건으로 저장합니다.
+
+        그 사이 다른 곳에서 먼저 수정했다면 VersionConflict를 던지고, 바뀐 필드가 없으면 쓰지 않는다.
+        태그만 바뀌어도 목록 검증자가 바뀌도록 버전과 수정일시를 올린다.
+        """
+        changed = self._prepare_versioned()
+        tags_changed = self.has_tag_changes()
+        if changed or tags_changed:
+            with transaction.atomic():
+                self.instance.save_versioned(changed)
+                if tags_changed:
+                    memo_tags.set_memo_tags(self.instance, self.cleaned_data["tags"])
+        return self.instance
+
+    async def asave_changes(self):
+        """save_changes()의 비동기 버전"""
+        return await sync_to_async(self.save_changes)()
+
+    def with_version(self, memo):
+        """버전 충돌 후 사용자의 입력은 유지하고 최신 버전 기준으로 다시 만든 폼"""
+        data = self.data.copy()
+        data["version"] = memo.version
+        form = type(self)(data, instance=memo)
+        form.is_valid()
+        form.add_error(
+            None,
+            "다른 곳에서 이 메모를 먼저 수정했습니다. 최신 내용을 확인한 뒤 다시 저장하면 덮어씁니다.",
+        )
+        return form
+
 
 class UserRegistrationForm(UserCreationForm):
     """사용자 회원가입을 위한 폼"""
@@ -31,4 +119,11 @@ class UserRegistrationForm(UserCreationForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         for field in self.fields.values():
-            field.widget.attrs["class"] = "form-control"
\ No newline at end of file
+            field.widget.attrs["class"] = "form-control"
+
+    async def asave(self):
+        """save()의 비동기 버전: 비밀번호 해싱은 해싱 풀에서 기다립니다."""
+        user = self.instance
+        user.password = await hashing.amake_password(self.cleaned_data["password1"])
+        await user.asave()
+        return user
\ No newline at end of file
@@ -0,0 +1,412 @@
+"""
+요청 성능 계측
+
+PerformanceMiddleware가 요청마다 SQL 쿼리 수와 시간(모든 연결에 등록한 execute_wrapper),
+템플릿 렌더링 시간, 전체 처리 시간, 응답 크기를 측정해 Server-Timing 헤더로 내보내고
+뷰별 히스토그램에 누적합니다. 누적값은 /metrics에서 Prometheus 텍스트 형식으로 제공합니다.
+
+MEMO_METRICS_DIR을 지정하면 프로세스마다 누적값을 그 디렉터리의 파일로 내려 두고,
+/metrics는 모든 파일을 합쳐 보여 주므로 여러 gunicorn 워커의 값을 함께 볼 수 있습니다.
+/metrics는 설정한 토큰이나 주소의 수집기, 스태프 사용자만 볼 수 있습니다(metrics_allowed).
+"""
+import hmac
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from django.template.backends.django import DjangoTemplates, Template
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Histogram:
+    """라벨별 누적 히스토그램"""
+
+    def __init__(self, name, help_text, buckets, labels=("view",)):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        # 라벨 값 튜플 -> [버킷별 개수..., 합계, 전체 개수]
+        self.values = {}
+
+    def observe(self, label_values, value):
+        counts = self.values.get(label_values)
+        if counts is None:
+            counts = self.values[label_values] = [0] * len(self.buckets) + [0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+
+class Counter:
+    """라벨별 누적 카운터"""
+
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, label_values, amount=1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+
+class Registry:
+    """프로세스 하나의 계측값 모음"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = Counter(
+            "memojjang_requests_total", "처리한 요청 수", ("view", "method", "status")
+        )
+        self.metrics = [
+            self.requests,
+            Histogram("memojjang_request_duration_seconds", "요청 전체 처리 시간", DURATION_BUCKETS),
+            Histogram("memojjang_db_queries_per_request", "요청당 SQL 쿼리 수", QUERY_COUNT_BUCKETS),
+            Histogram("memojjang_db_query_duration_seconds", "요청당 SQL 쿼리 시간 합계", DURATION_BUCKETS),
+            Histogram("memojjang_template_render_seconds", "요청당 템플릿 렌더링 시간", DURATION_BUCKETS),
+            Histogram("memojjang_response_size_bytes", "응답 본문 크기", SIZE_BUCKETS),
+        ]
+        self.histograms = {metric.name: metric for metric in self.metrics[1:]}
+        self.last_flush = 0.0
+
+    def observe(self, name, label_values, value):
+        with self.lock:
+            self.histograms[name].observe(label_values, value)
+
+    def record(self, timings, view, method, status):
+        """요청 하나의 측정값을 누적합니다."""
+        labels = (view,)
+        with self.lock:
+            self.requests.inc((view, method, str(status)))
+            self.histograms["memojjang_request_duration_seconds"].observe(labels, timings.total)
+            self.histograms["memojjang_db_queries_per_request"].observe(labels, timings.queries)
+            self.histograms["memojjang_db_query_duration_seconds"].observe(labels, timings.db_time)
+            self.histograms["memojjang_template_render_seconds"].observe(labels, timings.template_time)
+            if timings.size is not None:
+                self.histograms["memojjang_response_size_bytes"].observe(labels, timings.size)
+        self.maybe_flush()
+
+    def snapshot(self):
+        """파일에 저장하거나 합칠 수 있는 형태의 누적값"""
+        with self.lock:
+            return {
+                metric.name: [[list(labels), value] for labels, value in metric.values.items()]
+                for metric in self.metrics
+            }
+
+    def maybe_flush(self, force=False):
+        """MEMO_METRICS_DIR이 설정되어 있으면 일정 간격으로 누적값을 파일에 내려 둡니다."""
+        directory = getattr(settings, "MEMO_METRICS_DIR", None)
+        if not directory:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_flush < getattr(settings, "MEMO_METRICS_FLUSH_INTERVAL", 1.0):
+            return
+        self.last_flush = now
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"metrics_{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file)
+        os.replace(tmp_path, path)
+
+    def collect(self):
+        """이 프로세스와 다른 워커 프로세스의 누적값을 합칩니다.
+
+        종료된 워커의 파일도 합쳐서 카운터가 줄어들지 않게 한다.
+        """
+        directory = getattr(settings, "MEMO_METRICS_DIR", None)
+        if not directory:
+            return self.snapshot()
+        self.maybe_flush(force=True)
+        snapshots = []
+        for name in os.listdir(directory):
+            if name.startswith("metrics_") and name.endswith(".json"):
+                try:
+                    with open(os.path.join(directory, name), encoding="utf-8") as file:
+                        snapshots.append(json.load(file))
+                except (OSError, ValueError):
+                    continue
+        return merge_snapshots(snapshots)
+
+    def reset(self):
+        with self.lock:
+            for metric in self.metrics:
+                metric.values.clear()
+
+
+def merge_snapshots(snapshots):
+    """여러 프로세스의 누적값을 라벨별로 더합니다."""
+    merged = {}
+    for snapshot in snapshots:
+        for name, entries in snapshot.items():
+            values = merged.setdefault(name, {})
+            for labels, value in entries:
+                key = tuple(labels)
+                if isinstance(value, list):
+                    current = values.get(key)
+                    values[key] = value if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    values[key] = values.get(key, 0) + value
+    return {name: [[list(labels), value] for labels, value in values.items()] for name, values in merged.items()}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render_prometheus(snapshot, registry):
+    """누적값을 Prometheus 텍스트 노출 형식으로 변환합니다."""
+    lines = []
+    for metric in registry.metrics:
+        entries = snapshot.get(metric.name, [])
+        kind = "histogram" if isinstance(metric, Histogram) else "counter"
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {kind}")
+        for labels, value in sorted(entries):
+            if kind == "counter":
+                lines.append(f"{metric.name}{_label_text(metric.labels, labels)} {value}")
+                continue
+            for bound, count in zip(metric.buckets, value):
+                le = f'le="{bound}"'
+                lines.append(f"{metric.name}_bucket{_label_text(metric.labels, labels, le)} {count}")
+            le = 'le="+Inf"'
+            lines.append(f"{metric.name}_bucket{_label_text(metric.labels, labels, le)} {value[-1]}")
+            lines.append(f"{metric.name}_sum{_label_text(metric.labels, labels)} {value[-2]}")
+            lines.append(f"{metric.name}_count{_label_text(metric.labels, labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class RequestTimings:
+    """요청 하나의 측정값"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.size = None
+
+    def record_query(self, execute, sql, params, many, context):
+        """쿼리 하나를 실행하며 쿼리 수와 시간을 잽니다."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def finish(self, response):
+        self.total = time.perf_counter() - self.started
+        if not response.streaming:
+            self.size = len(response.content)
+
+    def server_timing(self):
+        """Server-Timing 헤더 값"""
+        entries = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f"tpl;dur={self.template_time * 1000:.1f}",
+            f"total;dur={self.total * 1000:.1f}",
+        ]
+        if self.size is not None:
+            entries.append(f'size;desc="{self.size} bytes"')
+        return ", ".join(entries)
+
+
+_current = ContextVar("request_timings", default=None)
+# 템플릿을 렌더링하는 중인지 여부 (렌더링 안에서 다시 렌더링한 시간을 두 번 더하지 않기 위함)
+_rendering = ContextVar("template_rendering", default=False)
+
+
+def record_query(execute, sql, params, many, context):
+    """모든 연결에 등록해 두는 쿼리 래퍼. 요청을 처리하는 중이면 그 요청의 측정값에 더합니다.
+
+    측정값은 컨텍스트 변수로 찾으므로 sync_to_async로 다른 스레드에서 실행되는
+    비동기 뷰의 쿼리도 그 요청에 더해진다.
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.record_query(execute, sql, params, many, context)
+
+
+def install_query_wrapper(connection, **kwargs):
+    """연결에 쿼리 래퍼를 한 번만 등록합니다.
+
+    다른 코드가 connection.execute_wrapper()로 넣고 빼는 래퍼와 섞이지 않도록 맨 앞에 둔다.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+# 어느 스레드에서든 새로 여는 연결에는 연결할 때 등록한다
+connection_created.connect(install_query_wrapper)
+
+
+class TimedTemplate(Template):
+    """렌더링 시간을 현재 요청의 측정값에 더하는 템플릿
+
+    렌더링 도중에 다른 템플릿을 렌더링하면(템플릿 태그나 필터 안의 render_to_string 등)
+    바깥 렌더링 시간에 이미 들어 있으므로 가장 바깥 렌더링만 잰다.
+    """
+
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None or _rendering.get():
+            return super().render(context, request)
+        token = _rendering.set(True)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_time += time.perf_counter() - started
+            _rendering.reset(token)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """렌더링 시간을 측정하는 장고 템플릿 백엔드
+
+    render()/render_to_string()처럼 백엔드를 거치는 렌더링만 측정하므로
+    include 등으로 중첩된 템플릿 시간이 두 번 더해지지 않는다.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+
+def view_name(request):
+    """라벨로 쓸 뷰 이름. 라벨 수가 무한히 늘지 않도록 매칭되지 않은 요청은 하나로 묶습니다."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or match._func_path
+
+
+class PerformanceMiddleware:
+    """요청 성능을 측정해 Server-Timing 헤더로 내보내고 누적하는 미들웨어
+
+    전체 처리 시간을 재기 위해 MIDDLEWARE의 맨 앞에 둡니다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            self.wrap_connections()
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            self.wrap_connections()
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    @staticmethod
+    def wrap_connections():
+        """계측을 켜기 전에 이미 열려 있던 연결에도 쿼리 래퍼를 등록합니다."""
+        for alias in connections:
+            install_query_wrapper(connections[alias])
+
+    def finish(self, request, response, timings):
+        timings.finish(response)
+        response["Server-Timing"] = timings.server_timing()
+        view = view_name(request)
+        registry.record(timings, view, request.method, response.status_code)
+        if response.streaming:
+            self.count_stream(response, view)
+        return response
+
+    @staticmethod
+    def count_stream(response, view):
+        """스트리밍 응답은 끝까지 전송된 뒤 크기를 기록합니다."""
+        content = response.streaming_content
+
+        def observe(size):
+            registry.observe("memojjang_response_size_bytes", (view,), size)
+
+        if response.is_async:
+            async def counted():
+                size = 0
+                async for chunk in content:
+                    size += len(chunk)
+                    yield chunk
+                observe(size)
+        else:
+            def counted():
+                size = 0
+                for chunk in content:
+                    size += len(chunk)
+                    yield chunk
+                observe(size)
+        response.streaming_content = counted()
+
+
+def metrics_allowed(request):
+    """/metrics를 볼 수 있는 요청인지 확인합니다.
+
+    MEMO_METRICS_TOKEN과 같은 Bearer 토큰을 보냈거나, 클라이언트 주소가 MEMO_METRICS_ALLOWED_IPS에
+    있거나, 로그인한 스태프이면 허용한다.
+    """
+    token = getattr(settings, "MEMO_METRICS_TOKEN", "")
+    if token:
+        scheme, _, value = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(value.strip().encode(), token.encode()):
+            return True
+    if request.META.get("REMOTE_ADDR") in getattr(settings, "MEMO_METRICS_ALLOWED_IPS", ()):
+        return True
+    user = getattr(request, "user", None)
+    return user is not None and user.is_active and user.is_staff
+
+
+def metrics_view(request):
+    """Prometheus 텍스트 형식의 계측값 엔드포인트 (metrics_allowed가 허용한 요청만)"""
+    if not metrics_allowed(request):
+        return HttpResponseForbidden("Forbidden\n", content_type="text/plain; charset=utf-8")
+    return HttpResponse(
+        render_prometheus(registry.collect(), registry),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,140 @@
+"""
+읽기/쓰기 데이터베이스 라우터
+
+읽기 전용 요청의 메모 조회는 복제본(settings.DATABASE_REPLICAS)으로 보내고,
+쓰기와 쓰기 직후의 읽기(read-after-write)는 기본(primary) 데이터베이스에 고정합니다.
+"""
+import random
+import time
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+PRIMARY = "default"
+
+# 세션에 기록하는 "이 시각까지 primary에서 읽기" 타임스탬프 키
+STICKY_SESSION_KEY = "_db_primary_until"
+# 세션별로 sticky 시간을 바꾸고 싶을 때 사용하는 세션 키
+STICKY_SECONDS_SESSION_KEY = "db_sticky_seconds"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS", "TRACE"}
+
+
+class RoutingState:
+    """요청 하나의 라우팅 상태"""
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+_state = ContextVar("db_routing_state", default=None)
+
+
+def get_replicas():
+    """설정된 복제본 별칭 목록"""
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def pin_to_primary():
+    """현재 요청의 남은 읽기를 모두 primary에서 수행하도록 고정합니다."""
+    state = _state.get()
+    if state is not None:
+        state.pinned = True
+
+
+class PrimaryReplicaRouter:
+    """메모 읽기는 복제본으로, 쓰기와 쓰기 이후 읽기는 primary로 보내는 라우터"""
+
+    def _routed(self, model):
+        """복제본으로 보낼 수 있는 앱의 모델인지 확인합니다."""
+        return model._meta.app_label in getattr(settings, "DATABASE_REPLICA_APPS", ["memos"])
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        replicas = get_replicas()
+        if not replicas or not self._routed(model):
+            return None
+        state = _state.get()
+        # 요청 밖(관리 명령, 셸 등)이거나 primary에 고정된 요청은 primary에서 읽는다
+        if state is None or state.pinned:
+            return PRIMARY
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and self._routed(model):
+            state.wrote = True
+            state.pinned = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 primary와 같은 데이터를 가지므로 관계를 허용한다
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # 복제본 스키마는 primary 복제로 맞춘다
+        return db not in get_replicas()
+
+
+class ReplicaRoutingMiddleware:
+    """요청마다 라우팅 상태를 만들고 쓰기 후 sticky 기간을 세션에 기록하는 미들웨어
+
+    SessionMiddleware 다음에 두어야 합니다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not get_replicas():
+            return self.get_response(request)
+        sticky_until = request.session.get(STICKY_SESSION_KEY, 0)
+        token = _state.set(RoutingState(self.should_pin(request, sticky_until)))
+        try:
+            response = self.get_response(request)
+            state = _state.get()
+            if state.wrote:
+                request.session[STICKY_SESSION_KEY] = self.sticky_until(
+                    request.session.get(STICKY_SECONDS_SESSION_KEY)
+                )
+            return response
+        finally:
+            _state.reset(token)
+
+    async def __acall__(self, request):
+        if not get_replicas():
+            return await self.get_response(request)
+        sticky_until = await request.session.aget(STICKY_SESSION_KEY, 0)
+        token = _state.set(RoutingState(self.should_pin(request, sticky_until)))
+        try:
+            response = await self.get_response(request)
+            state = _state.get()
+            if state.wrote:
+                await request.session.aset(STICKY_SESSION_KEY, self.sticky_until(
+                    await request.session.aget(STICKY_SECONDS_SESSION_KEY)
+                ))
+            return response
+        finally:
+            _state.reset(token)
+
+    @staticmethod
+    def should_pin(request, sticky_until):
+        """쓰기 요청이거나 최근 쓰기의 sticky 기간 안이면 primary에 고정합니다."""
+        return request.method not in SAFE_METHODS or sticky_until > time.time()
+
+    @staticmethod
+    def sticky_until(seconds=None):
+        """쓰기 이후 primary에서 읽을 마감 시각"""
+        if seconds is None:
+            seconds = getattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 10)
+        return time.time() + seconds
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +42,7 @@ INSTALLED_APPS = [
     "crispy_bootstrap5",
     "memojjang.apps.users.apps.UsersConfig",
     "memojjang.apps.memos.apps.MemosConfig",
+    "memojjang.apps.jobs.apps.JobsConfig",
     'django_bootstrap5',
 ]
 
@@ -49,8 +51,14 @@ CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 MIDDLEWARE = [
+    # 전체 처리 시간을 재기 위해 가장 바깥에 둔다
+    'memojjang.metrics.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # 정적 파일 요청은 세션/인증 미들웨어에 닿기 전에 응답한다
+    'memojjang.staticfiles.StaticFilesMiddleware',
+    'memojjang.apps.users.hashing.HashingPoolMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'memojjang.routers.ReplicaRoutingMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -58,11 +66,16 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'memojjang.urls'
+# ASGI로 실행하면(memojjang.asgi) 비동기 뷰를 사용하는 URL 설정을 쓴다
+if os.environ.get("MEMOJJANG_ASYNC_VIEWS") == "1":
+    ROOT_URLCONF = "memojjang.async_urls"
+else:
+    ROOT_URLCONF = 'memojjang.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # 장고 템플릿 백엔드에 렌더링 시간 측정을 더한 백엔드
+        'BACKEND': 'memojjang.metrics.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'memojjang' / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -72,6 +85,10 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # 프로젝트 패키지는 앱이 아니므로 템플릿 태그 라이브러리를 직접 등록한다
+            'libraries': {
+                'vendor_assets': 'memojjang.templatetags.vendor_assets',
+            },
         },
     },
 ]
@@ -82,14 +99,125 @@ WSGI_APPLICATION = 'memojjang.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# SQLite 연결이 열릴 때마다 적용하는 PRAGMA
+# - WAL: 읽기와 쓰기가 서로를 막지 않는다
+# - synchronous=NORMAL: WAL 모드에서는 커밋마다 fsync하지 않아도 손상되지 않는다
+# - mmap_size / cache_size(음수는 KiB 단위): 페이지 캐시를 늘려 디스크 읽기를 줄인다
+# - busy_timeout(ms): 다른 워커가 쓰는 중이면 바로 실패하지 않고 기다린다
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 128 * 1024 * 1024)),
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", -20000)),
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000)),
+    "temp_store": "MEMORY",
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 요청마다 연결을 새로 열지 않고 워커별 연결을 재사용한다
+        'CONN_MAX_AGE': int(os.environ.get("DB_CONN_MAX_AGE", 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # 쓰기 트랜잭션은 BEGIN IMMEDIATE로 시작해 잠금 승격 실패(database is locked)를 막는다
+            "transaction_mode": "IMMEDIATE",
+            "timeout": SQLITE_PRAGMAS["busy_timeout"] / 1000,
+            "init_command": ";".join(
+                f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()
+            ),
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# 메모 렌더링 캐시 백엔드: "locmem"(프로세스 메모리) 또는 "file"(파일 기반, 워커 간 공유).
+# 사용자별 캐시 세대가 모든 워커에 보여야 수정한 메모가 다른 워커에서 바로 보이므로 "file"이
+# 기본이고, "locmem"은 DEBUG(개발 서버, 테스트)에서만 기본으로 쓴다
+MEMO_CACHE_BACKEND = os.environ.get("MEMO_CACHE_BACKEND", "locmem" if DEBUG else "file")
+
+MEMO_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "memojjang-memos",
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("MEMO_CACHE_LOCATION", BASE_DIR / "cache" / "memos"),
+    },
+}
+
+# 세션과 인증 사용자 캐시 백엔드. 로그아웃이 모든 워커에 보이도록 워커끼리 공유하는 "file"이
+# 기본이고, 워커마다 따로인 "locmem"은 DEBUG(개발 서버, 테스트)에서만 기본으로 쓴다
+SESSION_CACHE_BACKEND = os.environ.get("SESSION_CACHE_BACKEND", "locmem" if DEBUG else "file")
+SESSION_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "memojjang-sessions",
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("SESSION_CACHE_LOCATION", BASE_DIR / "cache" / "sessions"),
+    },
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "memojjang-default",
+    },
+    "memos": MEMO_CACHE_BACKENDS[MEMO_CACHE_BACKEND],
+    "sessions": SESSION_CACHE_BACKENDS[SESSION_CACHE_BACKEND],
+}
+
+# 메모 렌더링 캐시에 사용할 캐시 별칭과 조각 유지 시간(초)
+MEMO_CACHE_ALIAS = "memos"
+MEMO_CACHE_TIMEOUT = 300
+
+# 세션/인증 캐시 모드: 세션은 캐시에서 읽고 DB에도 기록(cached_db)하며, 세션의 사용자는
+# MEMO_USER_CACHE_TIMEOUT(초) 동안 캐시한다. MEMO_AUTH_CACHE=0이면 장고 기본 방식(DB)을 쓴다.
+# locmem에서는 로그아웃한 세션을 다른 워커가 세션 유지 기간 내내 받아 주므로 DEBUG가 아니면 켜지 않는다.
+if os.environ.get("MEMO_AUTH_CACHE", "1") == "1" and (DEBUG or SESSION_CACHE_BACKEND != "locmem"):
+    SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+    SESSION_CACHE_ALIAS = "sessions"
+    AUTHENTICATION_BACKENDS = ["memojjang.apps.users.backends.CachedModelBackend"]
+MEMO_USER_CACHE_ALIAS = "sessions"
+MEMO_USER_CACHE_TIMEOUT = 60
+
+# 비밀번호 해싱/검증은 크기가 정해진 전용 스레드 풀에서만 실행한다. 실행 중(작업자 수)과
+# 대기 중(MEMO_HASHING_QUEUE_LIMIT)인 작업이 모두 차면 기다리지 않고 503으로 거절한다.
+# 같은 알고리즘 이름의 해셔는 목록의 뒤쪽이 검증에 쓰이므로 기본 PBKDF2 해셔는 넣지 않는다.
+PASSWORD_HASHERS = [
+    "memojjang.apps.users.hashing.PooledPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+MEMO_HASHING_WORKERS = int(os.environ.get("MEMO_HASHING_WORKERS", os.cpu_count() or 1))
+MEMO_HASHING_QUEUE_LIMIT = int(os.environ.get("MEMO_HASHING_QUEUE_LIMIT", 16))
+
+# 읽기 전용 복제본: DB_REPLICA_NAME 환경 변수로 복제본 SQLite 파일을 지정하면 활성화된다
+DATABASE_REPLICAS = []
+if os.environ.get("DB_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.environ["DB_REPLICA_NAME"],
+        # 테스트에서는 별도 DB를 만들지 않고 default를 복제본으로 사용한다
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append("replica")
+
+DATABASE_ROUTERS = ["memojjang.routers.PrimaryReplicaRouter"]
+# 복제본에서 읽을 수 있는 앱과 쓰기 이후 primary에서 읽는 기간(초, 세션별로 변경 가능)
+DATABASE_REPLICA_APPS = ["memos"]
+DATABASE_REPLICA_STICKY_SECONDS = 10
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -128,6 +256,26 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [
     BASE_DIR / 'memojjang' / 'static',
 ]
+STATIC_ROOT = os.environ.get("STATIC_ROOT", BASE_DIR / 'staticfiles')
+
+# collectstatic 때 내용 해시 파일 이름과 gzip/brotli 압축본을 만든다
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "memojjang.staticfiles.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# 앞단 프록시(nginx 등)가 정적 파일을 제공하지 않을 때 앱이 STATIC_ROOT를 직접 제공한다
+MEMO_SERVE_STATIC = os.environ.get("MEMO_SERVE_STATIC", "1") == "1"
+
+# Bootstrap 파일(memojjang/static/vendor/)은 저장소에 들어 있지 않으므로 배포 전에 인터넷이 되는 곳에서
+# manage.py vendor_static으로 내려받아야 한다(manage.py check --deploy가 없으면 경고). 파일이 없을 때
+# CDN 주소로 대신 참조할지 여부: 외부망이 막힌 배포에서는 페이지가 CDN 시간 초과를 기다리므로
+# DEBUG(개발 서버, 테스트)에서만 기본으로 켜고, 꺼져 있으면 Bootstrap 없이 렌더링한다
+MEMO_VENDOR_CDN_FALLBACK = os.environ.get("MEMO_VENDOR_CDN_FALLBACK", "1" if DEBUG else "0") == "1"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -136,3 +284,80 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # 사용자 정의 모델 설정
 AUTH_USER_MODEL = "users.User"
+
+# 메모 목록 페이지네이션 설정
+MEMO_PAGE_SIZE = 20
+MEMO_PAGE_SIZE_MAX = 100
+
+# JSON API 일괄 처리 요청 한 번에 허용하는 최대 항목 수
+MEMO_API_BATCH_LIMIT = 100
+
+# 메모 내보내기 시 한 번에 데이터베이스에서 읽는 행 수
+MEMO_EXPORT_CHUNK_SIZE = 2000
+
+# 메모 검색 결과 페이지 크기
+MEMO_SEARCH_PAGE_SIZE = 20
+
+# 휴지통의 메모를 되살릴 수 있는 기간(일). 지나면 purge_memos 명령이 실제로 삭제한다
+MEMO_TRASH_RETENTION_DAYS = 30
+# purge_memos가 한 트랜잭션에서 삭제하는 행 수와 배치 사이 대기 시간(초)
+MEMO_PURGE_BATCH_SIZE = 500
+MEMO_PURGE_BATCH_DELAY = 0.05
+
+# 메모 하나에 붙일 수 있는 태그 수와 태그 이름의 최대 길이
+MEMO_TAGS_MAX = 20
+MEMO_TAG_MAX_LENGTH = 50
+
+# 메모 수정 이력: 이 수만큼의 이력마다 본문 전체(스냅숏)를 저장하고, 그 사이는 델타로 저장한다.
+# 델타가 본문 길이의 이 비율보다 크면 델타 대신 스냅숏을 저장한다
+MEMO_REVISION_SNAPSHOT_INTERVAL = 20
+MEMO_REVISION_DELTA_MAX_RATIO = 0.5
+# 기준이나 새 본문이 이 줄 수를 넘으면 줄 비교(저장 트랜잭션 안에서 실행) 없이 스냅숏을 저장한다
+MEMO_REVISION_DELTA_MAX_LINES = 1000
+# compact_memo_revisions가 이력을 모두 보존하는 기간(일). 지난 이력은 하루에 하나만 남긴다
+MEMO_REVISION_KEEP_DAYS = 30
+# 메모 하나에 남기는 최대 이력 수
+MEMO_REVISION_MAX_COUNT = 200
+
+# 동기화 변경 피드: 페이지 크기(기본/최대), long-poll 최대 대기 시간(초)과 대기 중 변경 확인 간격(초),
+# SSE 연결 최대 유지 시간(초)과 keepalive 간격(초)
+MEMO_SYNC_PAGE_SIZE = 200
+MEMO_SYNC_PAGE_SIZE_MAX = 1000
+MEMO_SYNC_WAIT_MAX = 30
+MEMO_SYNC_POLL_INTERVAL = 1.0
+MEMO_SYNC_STREAM_TIMEOUT = 300
+MEMO_SYNC_HEARTBEAT_INTERVAL = 15
+
+# reconcile_memo_stats가 한 트랜잭션에서 비교/수정하는 사용자 수
+MEMO_STATS_RECONCILE_BATCH_SIZE = 200
+
+# 백그라운드 작업 큐(jobs 앱): run_workers의 기본 동시 실행 수(자식 프로세스 수)와
+# 큐가 비었을 때 다시 확인하는 간격(초)
+MEMO_JOB_CONCURRENCY = int(os.environ.get("MEMO_JOB_CONCURRENCY", 2))
+MEMO_JOB_POLL_INTERVAL = 1.0
+# 워커가 이 시간(초) 동안 응답하지 않으면 다른 워커가 작업을 다시 가져간다
+MEMO_JOB_VISIBILITY_TIMEOUT = 300
+# 작업의 기본 최대 시도 횟수와 첫 재시도까지의 대기 시간(초, 시도마다 두 배)
+MEMO_JOB_MAX_ATTEMPTS = 3
+MEMO_JOB_RETRY_DELAY = 10
+# 내보내기처럼 파일을 만드는 작업의 결과를 저장하는 디렉터리
+MEMO_JOB_FILES_DIR = os.environ.get("MEMO_JOB_FILES_DIR", BASE_DIR / "jobfiles")
+# 내보내기 파일을 내려받을 수 있는 기간(시간). 지나면 다음 내보내기 작업이나 purge_memo_exports 명령이 지운다
+MEMO_EXPORT_RETENTION_HOURS = 24
+
+# 메모 본문 압축: 코덱 이름(zlib, lzma, bz2) 또는 Codec 클래스 경로와 압축을 시작할 크기(UTF-8 바이트)
+MEMO_CONTENT_CODEC = os.environ.get("MEMO_CONTENT_CODEC", "zlib")
+MEMO_CONTENT_COMPRESS_THRESHOLD = int(os.environ.get("MEMO_CONTENT_COMPRESS_THRESHOLD", 1024))
+
+# 요청 성능 계측: 워커별 누적값을 내려 둘 디렉터리(여러 gunicorn 워커의 /metrics 합산용)와 기록 간격(초)
+MEMO_METRICS_DIR = os.environ.get("MEMO_METRICS_DIR")
+MEMO_METRICS_FLUSH_INTERVAL = 1.0
+# /metrics 접근 허용: Authorization: Bearer 토큰과 클라이언트 주소(REMOTE_ADDR, 앞단 프록시 뒤라면 프록시의
+# 주소) 목록(쉼표로 구분). 둘 다 비어 있으면 로그인한 스태프만 볼 수 있다
+MEMO_METRICS_TOKEN = os.environ.get("MEMO_METRICS_TOKEN", "")
+MEMO_METRICS_ALLOWED_IPS = [
+    address.strip() for address in os.environ.get("MEMO_METRICS_ALLOWED_IPS", "").split(",") if address.strip()
+]
+
+# 관리자 변경 목록이 정확히 세는 최대 행 수. 넘으면 테이블 통계(ANALYZE)로 추정한다
+ADMIN_EXACT_COUNT_LIMIT = 10000
@@ -0,0 +1,275 @@
+"""
+정적 파일 파이프라인
+
+collectstatic 때 내용 해시가 붙은 파일 이름(ManifestStaticFilesStorage)을 만들고, 압축이 잘 되는
+파일은 gzip(.gz)과 brotli(.br, brotli 패키지가 있을 때) 사본을 미리 만들어 둡니다.
+앞단 프록시 없이 실행할 때는 StaticFilesMiddleware가 STATIC_ROOT의 파일을 직접 제공하며,
+Accept-Encoding에 맞는 사본을 고르고 해시가 붙은 파일에는 immutable 캐시 헤더를 붙입니다.
+"""
+import gzip
+import mimetypes
+import os
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core import checks
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 미리 압축할 확장자. 이미지/폰트처럼 이미 압축된 형식은 제외한다
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".mjs", ".map", ".svg", ".json", ".txt", ".html", ".xml", ".ico"}
+# 이보다 작은 파일은 압축 이득보다 헤더 부담이 크다
+COMPRESS_MIN_SIZE = 512
+# 압축본이 원본의 이 비율보다 크면 저장하지 않는다
+COMPRESS_MAX_RATIO = 0.95
+
+# base.html이 사용하는 외부 에셋. STATICFILES_DIRS의 path에 고정해 두고(vendor_static 명령),
+# integrity는 배포처가 공개한 SRI 해시(sha384)이다.
+VENDOR_ASSETS = [
+    {
+        "url": "https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css",
+        "path": "vendor/bootstrap/css/bootstrap.min.css",
+        "integrity": "sha384-1BmE4kWBq78iYhFldvKuhfTAU6auU8tT94WrHftjDbrCEXSU1oBoqyl2qvZ6jIW3",
+    },
+    {
+        "url": "https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js",
+        "path": "vendor/bootstrap/js/bootstrap.bundle.min.js",
+        "integrity": "sha384-ka7Sk0Gln4gmtz2MlQnikT1wXgYsOg+OMhuP+IlRH9sENBO0LRn5q+8nbTov4+1p",
+    },
+]
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# Accept-Encoding이 허용할 때 우선 사용하는 순서
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+def compress_gzip(data):
+    """재현 가능한 gzip 압축 (헤더의 수정 시각을 0으로 고정)"""
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+def get_compressors():
+    """사용할 수 있는 (확장자, 압축 함수) 목록"""
+    compressors = [(".gz", compress_gzip)]
+    if brotli is not None:
+        compressors.append((".br", compress_brotli))
+    return compressors
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """해시 파일 이름과 함께 gzip/brotli 압축본을 만들어 두는 정적 파일 저장소
+
+    collectstatic을 아직 실행하지 않아 매니페스트가 비어 있으면 해시 없는 이름을
+    그대로 돌려주므로, 개발 서버와 테스트에서도 {% static %}이 동작한다.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            self.compress(name)
+
+    def compress(self, name):
+        """한 파일의 압축본을 만들고 만든 파일 이름 목록을 반환합니다."""
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS or not self.exists(name):
+            return []
+        with self.open(name) as file:
+            data = file.read()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return []
+        written = []
+        for suffix, compress in get_compressors():
+            compressed = compress(data)
+            if len(compressed) > len(data) * COMPRESS_MAX_RATIO:
+                continue
+            compressed_name = name + suffix
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
+            written.append(compressed_name)
+        return written
+
+
+def accepted_encodings(header):
+    """Accept-Encoding 헤더에서 q=0이 아닌 인코딩 이름 집합"""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    return accepted
+
+
+def choose_variant(path, accept_encoding):
+    """요청 헤더에 맞는 (파일 경로, Content-Encoding, 압축본 존재 여부)를 고릅니다."""
+    accepted = accepted_encodings(accept_encoding)
+    has_variants = False
+    chosen = None
+    for encoding, suffix in ENCODINGS:
+        if os.path.isfile(path + suffix):
+            has_variants = True
+            if chosen is None and (encoding in accepted or "*" in accepted):
+                chosen = (path + suffix, encoding)
+    if chosen is None:
+        chosen = (path, None)
+    return chosen[0], chosen[1], has_variants
+
+
+def is_vendored(path):
+    """고정해 둔 외부 에셋 파일이 정적 파일에 있는지 확인합니다.
+
+    매니페스트에 없는 이름을 {% static %}으로 찾으면 DEBUG=False에서 ValueError가 나므로,
+    collectstatic 뒤에는 매니페스트에, 그 전에는 STATICFILES_DIRS에 있는지 확인한다.
+    """
+    hashed_files = getattr(staticfiles_storage, "hashed_files", None)
+    if hashed_files:
+        return path in hashed_files
+    return finders.find(path) is not None
+
+
+def vendor_asset(path):
+    """외부 에셋을 참조할 (URL, integrity)를 반환합니다.
+
+    고정해 둔 파일이 있으면 해시 이름의 로컬 URL을, 없으면 MEMO_VENDOR_CDN_FALLBACK이 켜져 있을 때
+    CDN URL과 SRI 해시를, 꺼져 있으면 (None, None)을 돌려준다.
+    """
+    asset = next(asset for asset in VENDOR_ASSETS if asset["path"] == path)
+    if is_vendored(path):
+        return staticfiles_storage.url(path), None
+    if not getattr(settings, "MEMO_VENDOR_CDN_FALLBACK", False):
+        return None, None
+    return asset["url"], asset["integrity"]
+
+
+def check_vendor_assets(app_configs, **kwargs):
+    """고정해 둔 외부 에셋 파일이 없으면 경고하는 배포 점검(manage.py check --deploy)"""
+    missing = [asset["path"] for asset in VENDOR_ASSETS if not is_vendored(asset["path"])]
+    if not missing:
+        return []
+    return [
+        checks.Warning(
+            f"정적 파일에 {', '.join(missing)}이(가) 없습니다.",
+            hint="인터넷이 되는 곳에서 manage.py vendor_static을 실행해 파일을 내려받으세요.",
+            id="memojjang.W001",
+        )
+    ]
+
+
+_hashed_names = {}
+
+
+def is_immutable(name):
+    """내용 해시가 붙은(매니페스트에 있는) 파일 이름인지 확인합니다."""
+    hashed_files = getattr(staticfiles_storage, "hashed_files", None)
+    if not hashed_files:
+        return False
+    key = (id(hashed_files), len(hashed_files))
+    names = _hashed_names.get(key)
+    if names is None:
+        _hashed_names.clear()
+        names = _hashed_names[key] = frozenset(hashed_files.values())
+    return name in names
+
+
+class StaticFilesMiddleware:
+    """앞단 프록시가 없을 때 STATIC_ROOT의 정적 파일을 직접 제공하는 미들웨어
+
+    MEMO_SERVE_STATIC이 켜져 있고 STATIC_ROOT에 파일이 있을 때만 응답하며,
+    세션/인증 미들웨어보다 앞에 두어 정적 파일 요청이 DB에 닿지 않게 한다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.serve(request)
+        if response is None:
+            response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request):
+        response = self.serve(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
+
+    def serve(self, request):
+        """정적 파일 요청이면 응답을, 아니면 None을 반환합니다."""
+        if not getattr(settings, "MEMO_SERVE_STATIC", False) or not settings.STATIC_ROOT:
+            return None
+        if request.method not in ("GET", "HEAD"):
+            return None
+        prefix = settings.STATIC_URL
+        if not prefix.startswith("/") or not request.path.startswith(prefix):
+            return None
+        name = request.path[len(prefix):]
+        if not name or name.endswith("/") or name.endswith(tuple(suffix for _, suffix in ENCODINGS)):
+            # 압축본은 원본 이름으로 요청했을 때만 Content-Encoding과 함께 제공한다
+            return None
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        file_path, encoding, has_variants = choose_variant(
+            path, request.headers.get("Accept-Encoding", "")
+        )
+        stat = os.stat(file_path)
+        response = get_conditional_response(request, last_modified=int(stat.st_mtime))
+        if response is None:
+            with open(file_path, "rb") as file:
+                response = HttpResponse(file.read())
+            content_type, _ = mimetypes.guess_type(path)
+            response["Content-Type"] = content_type or "application/octet-stream"
+            if encoding:
+                response["Content-Encoding"] = encoding
+        response["Last-Modified"] = http_date(stat.st_mtime)
+        if has_variants:
+            response["Vary"] = "Accept-Encoding"
+        response["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL if is_immutable(name) else REVALIDATE_CACHE_CONTROL
+        )
+        return response
@@ -0,0 +1,29 @@
+from django import template
+from django.utils.html import format_html
+from ..staticfiles import vendor_asset
+
+register = template.Library()
+
+
+def _integrity_attrs(integrity):
+    if not integrity:
+        return ""
+    return format_html(' integrity="{}" crossorigin="anonymous"', integrity)
+
+
+@register.simple_tag
+def vendor_css(path):
+    """고정해 둔 외부 CSS의 <link> 태그 (파일이 없으면 SRI 해시를 붙인 CDN 주소, CDN을 쓰지 않으면 빈 문자열)"""
+    url, integrity = vendor_asset(path)
+    if url is None:
+        return ""
+    return format_html('<link href="{}" rel="stylesheet"{}>', url, _integrity_attrs(integrity))
+
+
+@register.simple_tag
+def vendor_js(path):
+    """고정해 둔 외부 스크립트의 <script> 태그 (파일이 없으면 SRI 해시를 붙인 CDN 주소, CDN을 쓰지 않으면 빈 문자열)"""
+    url, integrity = vendor_asset(path)
+    if url is None:
+        return ""
+    return format_html('<script src="{}"{}></script>', url, _integrity_attrs(integrity))
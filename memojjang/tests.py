@@ -1,5 +1,25 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core import checks
+from django.core.management import call_command
+from django.db import connection, router
+from django.http import HttpResponse
+from django.template import engines
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from . import metrics
+from .apps.memos.models import Memo
 from .forms import MemoForm, UserRegistrationForm
+from .routers import STICKY_SECONDS_SESSION_KEY, ReplicaRoutingMiddleware
+from .staticfiles import VENDOR_ASSETS
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -70,3 +90,275 @@ class UserRegistrationFormTest(TestCase):
         self.assertFalse(form.is_valid())
         # username 필드에 대한 에러 메시지가 있는지 확인
         self.assertIn("username", form.errors)
+
+
+class SqliteProfileTest(TestCase):
+    """SQLite 운영 프로파일 테스트"""
+
+    def pragma(self, name):
+        """현재 연결의 PRAGMA 값을 조회"""
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_per_connection(self):
+        """연결마다 PRAGMA가 적용되는지 확인"""
+        # synchronous=NORMAL은 1
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("cache_size"), -20000)
+        self.assertEqual(self.pragma("busy_timeout"), 5000)
+
+    def test_write_transactions_begin_immediate(self):
+        """쓰기 트랜잭션이 BEGIN IMMEDIATE로 시작하는지 확인"""
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTest(TestCase):
+    """읽기/쓰기 데이터베이스 라우터 테스트"""
+
+    def setUp(self):
+        """요청 팩토리와 세션 준비"""
+        self.factory = RequestFactory()
+        self.session = SessionStore()
+        self.read_db = None
+
+    def read_view(self, request):
+        """메모 읽기가 어느 데이터베이스로 가는지 기록하는 뷰"""
+        self.read_db = Memo.objects.all().db
+        return HttpResponse()
+
+    def write_view(self, request):
+        """메모 쓰기를 흉내 내는 뷰"""
+        router.db_for_write(Memo)
+        self.read_db = Memo.objects.all().db
+        return HttpResponse()
+
+    def request(self, method, view):
+        """미들웨어를 거쳐 뷰를 호출"""
+        request = getattr(self.factory, method)("/memos/")
+        request.session = self.session
+        ReplicaRoutingMiddleware(view)(request)
+        return self.read_db
+
+    def test_reads_outside_request_use_primary(self):
+        """요청 밖의 읽기는 primary"""
+        self.assertEqual(Memo.objects.all().db, "default")
+
+    def test_safe_request_reads_replica(self):
+        """읽기 요청의 메모 조회는 복제본"""
+        self.assertEqual(self.request("get", self.read_view), "replica")
+
+    def test_unrouted_app_reads_primary(self):
+        """복제본 대상이 아닌 앱의 모델은 primary"""
+        def view(request):
+            self.read_db = User.objects.all().db
+            return HttpResponse()
+        self.assertEqual(self.request("get", view), "default")
+
+    def test_read_after_write_is_sticky(self):
+        """쓰기 이후 같은 요청과 sticky 기간 안의 다음 요청은 primary"""
+        self.assertEqual(self.request("post", self.write_view), "default")
+        self.assertEqual(self.request("get", self.read_view), "default")
+
+    def test_sticky_window_configurable_per_session(self):
+        """세션별 sticky 기간을 0으로 두면 바로 복제본에서 읽음"""
+        self.session[STICKY_SECONDS_SESSION_KEY] = 0
+        self.request("post", self.write_view)
+        self.assertEqual(self.request("get", self.read_view), "replica")
+
+
+@override_settings(MEMO_METRICS_TOKEN="scrape-token", MEMO_METRICS_ALLOWED_IPS=[])
+class PerformanceMetricsTest(TestCase):
+    """요청 성능 계측 미들웨어와 /metrics 엔드포인트 테스트"""
+
+    scrape_headers = {"authorization": "Bearer scrape-token"}
+
+    def setUp(self):
+        """계측값을 비우고 로그인한 클라이언트 준비"""
+        metrics.registry.reset()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username="metricuser",
+            email="metric@example.com",
+            password="testpassword123"
+        )
+        self.client.login(username="metricuser", password="testpassword123")
+
+    def test_server_timing_header(self):
+        """응답에 쿼리 수와 시간, 템플릿 시간, 전체 시간, 크기가 Server-Timing으로 포함"""
+        response = self.client.get(reverse("memo_list"))
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertRegex(timing, r"tpl;dur=[\d.]+")
+        self.assertRegex(timing, r"total;dur=[\d.]+")
+        self.assertIn(f'size;desc="{len(response.content)} bytes"', timing)
+
+    @override_settings(ROOT_URLCONF="memojjang.async_urls")
+    async def test_async_view_counts_queries(self):
+        """비동기 뷰가 sync_to_async로 실행한 쿼리도 Server-Timing에 포함"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("memo_list"))
+        queries = int(re.search(r'desc="(\d+) queries"', response["Server-Timing"]).group(1))
+        self.assertGreater(queries, 0)
+
+    def test_nested_render_timed_once(self):
+        """렌더링 도중 다른 템플릿을 렌더링해도 템플릿 시간은 한 번만 더함"""
+        engine = engines.all()[0]
+
+        def inner():
+            return engine.from_string("{{ wait }}").render({"wait": lambda: time.sleep(0.05)})
+
+        timings = metrics.RequestTimings()
+        token = metrics._current.set(timings)
+        try:
+            engine.from_string("{{ inner }}").render({"inner": inner})
+        finally:
+            metrics._current.reset(token)
+        self.assertGreaterEqual(timings.template_time, 0.05)
+        self.assertLess(timings.template_time, 0.1)
+
+    def test_metrics_endpoint(self):
+        """/metrics가 뷰별 히스토그램을 Prometheus 텍스트 형식으로 제공"""
+        self.client.get(reverse("memo_list"))
+        response = self.client.get(reverse("metrics"), headers=self.scrape_headers)
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('memojjang_requests_total{view="memo_list",method="GET",status="200"} 1', body)
+        self.assertIn('memojjang_request_duration_seconds_count{view="memo_list"} 1', body)
+        self.assertIn('memojjang_db_queries_per_request_bucket{view="memo_list",le="+Inf"} 1', body)
+        self.assertIn("# TYPE memojjang_template_render_seconds histogram", body)
+
+    def test_metrics_aggregated_across_workers(self):
+        """MEMO_METRICS_DIR의 다른 워커 파일과 합산"""
+        with tempfile.TemporaryDirectory() as directory, override_settings(MEMO_METRICS_DIR=directory):
+            with open(os.path.join(directory, "metrics_1.json"), "w", encoding="utf-8") as file:
+                json.dump({"memojjang_requests_total": [[["memo_list", "GET", "200"], 4]]}, file)
+            self.client.get(reverse("memo_list"))
+            body = self.client.get(reverse("metrics"), headers=self.scrape_headers).content.decode()
+            self.assertIn('memojjang_requests_total{view="memo_list",method="GET",status="200"} 5', body)
+            self.assertTrue(os.path.exists(os.path.join(directory, f"metrics_{os.getpid()}.json")))
+
+    def test_metrics_denied_without_token_or_staff(self):
+        """토큰이 없거나 틀린 요청, 스태프가 아닌 사용자와 익명 사용자는 403"""
+        self.client.get(reverse("memo_list"))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn(b"memojjang_requests_total", response.content)
+        response = self.client.get(reverse("metrics"), headers={"authorization": "Bearer wrong-token"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Client().get(reverse("metrics")).status_code, 403)
+
+    def test_metrics_allowed_for_staff_and_allowed_ips(self):
+        """스태프 사용자와 허용한 주소의 요청은 토큰 없이 볼 수 있음"""
+        self.assertEqual(Client(REMOTE_ADDR="10.0.0.5").get(reverse("metrics")).status_code, 403)
+        with override_settings(MEMO_METRICS_ALLOWED_IPS=["10.0.0.5"]):
+            self.assertEqual(Client(REMOTE_ADDR="10.0.0.5").get(reverse("metrics")).status_code, 200)
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 200)
+
+
+class StaticAssetPipelineTest(TestCase):
+    """해시 파일 이름, 미리 압축한 정적 파일 제공 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        """임시 STATIC_ROOT에 collectstatic 실행"""
+        super().setUpClass()
+        directory = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+        # vendor_static으로 내려받는 파일 대신 같은 경로의 테스트용 파일을 둔다
+        vendor = directory / "vendor_src"
+        (vendor / "vendor/bootstrap/css").mkdir(parents=True)
+        (vendor / "vendor/bootstrap/js").mkdir(parents=True)
+        (vendor / "vendor/bootstrap/css/bootstrap.min.css").write_text(".btn{display:inline-block}\n" * 100)
+        (vendor / "vendor/bootstrap/js/bootstrap.bundle.min.js").write_text("var bootstrap={};\n" * 100)
+        cls.enterClassContext(override_settings(
+            STATIC_ROOT=str(directory / "root"),
+            STATICFILES_DIRS=[*settings.STATICFILES_DIRS, vendor],
+            MEMO_SERVE_STATIC=True,
+        ))
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def test_collectstatic_hashes_and_precompresses(self):
+        """collectstatic이 해시 이름과 gzip 압축본을 생성"""
+        hashed = staticfiles_storage.stored_name("vendor/bootstrap/css/bootstrap.min.css")
+        self.assertNotEqual(hashed, "vendor/bootstrap/css/bootstrap.min.css")
+        with staticfiles_storage.open(hashed) as original, staticfiles_storage.open(hashed + ".gz") as packed:
+            self.assertEqual(gzip.decompress(packed.read()), original.read())
+
+    def test_serves_precompressed_with_immutable_cache(self):
+        """해시 이름 요청은 Accept-Encoding에 맞는 압축본과 immutable 캐시 헤더로 응답"""
+        url = staticfiles_storage.url("vendor/bootstrap/css/bootstrap.min.css")
+        with self.assertNumQueries(0):
+            response = self.client.get(url, headers={"accept-encoding": "br;q=0, gzip, deflate"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertTrue(gzip.decompress(response.content).startswith(b".btn{"))
+
+        response = self.client.get(url)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertTrue(response.content.startswith(b".btn{"))
+
+        response = self.client.get(settings.STATIC_URL + "vendor/bootstrap/css/bootstrap.min.css")
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+    def test_deploy_check_passes_with_vendor(self):
+        """vendor 파일이 있으면 check --deploy가 경고하지 않음"""
+        messages = checks.run_checks(include_deployment_checks=True)
+        self.assertNotIn("memojjang.W001", [message.id for message in messages])
+
+    @override_settings(DEBUG=False)
+    def test_pages_use_hashed_local_assets(self):
+        """페이지가 CDN 대신 해시 이름의 로컬 정적 파일을 참조"""
+        response = self.client.get(reverse("home"))
+        self.assertNotContains(response, "cdn.jsdelivr.net")
+        self.assertContains(response, staticfiles_storage.url("css/style.css"))
+        self.assertContains(response, staticfiles_storage.url("vendor/bootstrap/js/bootstrap.bundle.min.js"))
+
+
+class VendorAssetFallbackTest(TestCase):
+    """고정한 vendor 파일이 없을 때 매니페스트 저장소에서의 페이지 렌더링 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        """vendor 파일 없이 임시 STATIC_ROOT에 collectstatic 실행"""
+        super().setUpClass()
+        directory = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+        source = directory / "static_src"
+        (source / "css").mkdir(parents=True)
+        (source / "css/style.css").write_text("body{margin:0}\n")
+        cls.enterClassContext(override_settings(
+            STATIC_ROOT=str(directory / "root"),
+            STATICFILES_DIRS=[source],
+        ))
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    @override_settings(DEBUG=False, MEMO_VENDOR_CDN_FALLBACK=True)
+    def test_missing_vendor_falls_back_to_cdn(self):
+        """매니페스트에 없는 vendor 파일은 500 대신 SRI 해시를 붙인 CDN 주소로 참조"""
+        self.assertTrue(staticfiles_storage.hashed_files)
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, staticfiles_storage.url("css/style.css"))
+        for asset in VENDOR_ASSETS:
+            self.assertContains(response, asset["url"])
+            self.assertContains(response, f'integrity="{asset["integrity"]}"')
+
+    @override_settings(DEBUG=False, MEMO_VENDOR_CDN_FALLBACK=False)
+    def test_missing_vendor_without_cdn_fallback(self):
+        """CDN을 쓰지 않으면 외부 주소 없이 렌더링"""
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, staticfiles_storage.url("css/style.css"))
+        self.assertNotContains(response, "cdn.jsdelivr.net")
+        self.assertNotContains(response, "vendor/bootstrap")
+
+    def test_deploy_check_warns_missing_vendor(self):
+        """vendor 파일이 없으면 check --deploy가 경고"""
+        messages = checks.run_checks(include_deployment_checks=True)
+        self.assertIn("memojjang.W001", [message.id for message in messages])
+        self.assertNotIn("memojjang.W001", [message.id for message in checks.run_checks()])
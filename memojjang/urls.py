@@ -16,6 +16,9 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path
+from . import metrics
+from .apps.jobs import views as job_views
+from .apps.memos import api
 from .apps.memos import views
 
 urlpatterns = [
@@ -23,12 +26,32 @@ urlpatterns = [
     path("", views.home, name="home"),
     path("memos/", views.memo_list, name="memo_list"),
     path("memos/create/", views.memo_create, name="memo_create"),
+    path("memos/export/", views.memo_export, name="memo_export"),
+    path("memos/export/jobs/", views.memo_export_job, name="memo_export_job"),
+    path("memos/export/jobs/<int:pk>/download/", views.memo_export_download, name="memo_export_download"),
+    path("memos/search/", views.memo_search, name="memo_search"),
+    path("memos/trash/", views.memo_trash, name="memo_trash"),
     path("memos/<int:pk>/", views.memo_detail, name="memo_detail"),
     path("memos/<int:pk>/edit/", views.memo_edit, name="memo_edit"),
     path("memos/<int:pk>/delete/", views.memo_delete, name="memo_delete"),
+    path("memos/<int:pk>/restore/", views.memo_restore, name="memo_restore"),
+    path("memos/<int:pk>/history/", views.memo_history, name="memo_history"),
+    path("memos/<int:pk>/history/<int:number>/", views.memo_revision, name="memo_revision"),
+    path(
+        "memos/<int:pk>/history/<int:number>/restore/",
+        views.memo_revision_restore,
+        name="memo_revision_restore",
+    ),
     path("login/", views.login_view, name="login"),
     path("logout/", views.logout_view, name="logout"),
     path("register/", views.register, name="register"),
+    path("api/memos/", api.memo_list, name="api_memo_list"),
+    path("api/memos/batch/", api.memo_batch, name="api_memo_batch"),
+    path("api/memos/changes/", api.memo_changes, name="api_memo_changes"),
+    path("api/memos/<int:pk>/", api.memo_retrieve, name="api_memo_retrieve"),
+    path("jobs/<int:pk>/", job_views.job_detail, name="job_detail"),
+    path("api/jobs/<int:pk>/", job_views.api_job_detail, name="api_job_detail"),
+    path("metrics", metrics.metrics_view, name="metrics"),
 ]
 
 